@@ -0,0 +1,277 @@
+"""
+Location priors from past high-quality geocodes.
+
+Tickets recur: the same lease roads, pads and pipeline crossings come up
+again and again, often for the same excavator. LocationPriorIndex keeps the
+current EXCELLENT and GOOD records of the cache in memory, bucketed by
+
+- county + road pair (street & intersection, in either order)
+- county + road name (street or intersection)
+- county + excavator + work type
+
+with a spatial index (STRtree) over each county's records. ``locate()``
+looks up a ticket's buckets (dictionary hits) and returns the densest
+cluster of prior locations in the most specific bucket that has one, found
+with radius queries on the county tree, with a confidence that grows with
+the number of records supporting it.
+
+The index follows the cache incrementally: geocode_cache is append-only
+(a new version is a new row), so ``refresh()`` reads only rows with a
+cache_id above the last one seen, and only the changed counties' trees are
+rebuilt on their next query.
+"""
+
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import shapely
+
+# Records that can serve as priors
+PRIOR_QUALITY_TIERS = ("EXCELLENT", "GOOD")
+
+# Records placed from priors are not priors themselves (no self-reinforcement)
+PRIOR_APPROACH = "historical_prior"
+
+# Bucket kinds, most specific first, with the confidence a prior approaches
+# as its support grows
+SOURCE_CONFIDENCE = {
+    "road_pair": 0.80,
+    "road": 0.65,
+    "excavator": 0.60,
+}
+
+EARTH_RADIUS_M = 6371008.8
+
+_SEPARATORS = re.compile(r"[-\s]+")
+
+
+def normalize_key(value: Optional[str]) -> str:
+    """Upper-case, separator-collapsed form used for bucket keys."""
+    if not value:
+        return ""
+    return _SEPARATORS.sub(" ", str(value).upper()).strip()
+
+
+def _project(lat: np.ndarray, lng: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sinusoidal projection in meters (distances are true within a county)."""
+    lat_rad = np.radians(lat)
+    return EARTH_RADIUS_M * np.radians(lng) * np.cos(lat_rad), EARTH_RADIUS_M * lat_rad
+
+
+@dataclass
+class LocationPrior:
+    """Likely location of a ticket from prior verified work."""
+    latitude: float
+    longitude: float
+    source: str                 # road_pair, road or excavator
+    key: str                    # Bucket key, for the reasoning
+    support: int                # Records within the cluster radius of the location
+    total: int                  # Records in the bucket
+    confidence: float
+    ticket_numbers: List[str] = field(default_factory=list)  # Supporting records
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "key": self.key,
+            "support": self.support,
+            "total": self.total,
+            "ticket_numbers": self.ticket_numbers,
+        }
+
+
+@dataclass
+class _Record:
+    ticket_number: str
+    county: str
+    latitude: float
+    longitude: float
+    keys: List[Tuple[str, tuple]]
+
+
+class LocationPriorIndex:
+    """In-memory index of current EXCELLENT/GOOD geocodes, refreshed incrementally."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        cluster_radius_m: float = 500.0,
+        min_support: int = 2,
+    ):
+        """Initialize the index (empty until refresh()).
+
+        Args:
+            db_path: Pipeline cache database
+            cluster_radius_m: Records within this distance support the same location
+            min_support: Fewest supporting records for a prior
+        """
+        self.db_path = Path(db_path)
+        self.cluster_radius_m = cluster_radius_m
+        self.min_support = min_support
+
+        self._watermark = 0
+        self._records: Dict[str, _Record] = {}
+        self._buckets: Dict[Tuple[str, tuple], Set[str]] = {}
+        self._county_tickets: Dict[str, Set[str]] = {}
+        # county -> (tree, tickets, ticket -> position, points); dropped when the county changes
+        self._county_trees: Dict[str, Tuple[shapely.STRtree, List[str], Dict[str, int], np.ndarray]] = {}
+
+    # -- Maintenance ----------------------------------------------------------
+
+    @staticmethod
+    def _keys(county: str, street: str, intersection: str, excavator: str, work_type: str):
+        keys = []
+        if street and intersection:
+            keys.append(("road_pair", (county, *sorted((street, intersection)))))
+        for road in dict.fromkeys(name for name in (street, intersection) if name):
+            keys.append(("road", (county, road)))
+        if excavator:
+            keys.append(("excavator", (county, excavator, work_type)))
+        return keys
+
+    def _remove(self, ticket_number: str) -> None:
+        record = self._records.pop(ticket_number, None)
+        if record is None:
+            return
+        for key in record.keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(ticket_number)
+                if not bucket:
+                    del self._buckets[key]
+        self._county_tickets[record.county].discard(ticket_number)
+        self._county_trees.pop(record.county, None)
+
+    def _add(self, row: sqlite3.Row) -> None:
+        county = normalize_key(row["county"])
+        record = _Record(
+            ticket_number=row["ticket_number"],
+            county=county,
+            latitude=row["latitude"],
+            longitude=row["longitude"],
+            keys=self._keys(
+                county,
+                normalize_key(row["street"]),
+                normalize_key(row["intersection"]),
+                normalize_key(row["excavator"]),
+                normalize_key(row["work_type"]),
+            ),
+        )
+        self._records[record.ticket_number] = record
+        for key in record.keys:
+            self._buckets.setdefault(key, set()).add(record.ticket_number)
+        self._county_tickets.setdefault(county, set()).add(record.ticket_number)
+        self._county_trees.pop(county, None)
+
+    def refresh(self) -> int:
+        """Apply cache rows written since the last refresh; returns rows read."""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(
+                """SELECT cache_id, ticket_number, street, intersection, county, excavator,
+                          work_type, latitude, longitude, quality_tier, approach
+                   FROM geocode_cache WHERE cache_id > ? ORDER BY cache_id""",
+                (self._watermark,),
+            ).fetchall()
+        finally:
+            conn.close()
+
+        # Rows come in version order, so the last row of a ticket decides
+        for row in rows:
+            self._remove(row["ticket_number"])
+            if (
+                row["quality_tier"] in PRIOR_QUALITY_TIERS
+                and row["approach"] != PRIOR_APPROACH
+                and row["latitude"] is not None
+                and row["longitude"] is not None
+            ):
+                self._add(row)
+            self._watermark = row["cache_id"]
+        return len(rows)
+
+    # -- Lookup ---------------------------------------------------------------
+
+    def _county_tree(self, county: str) -> Tuple[shapely.STRtree, List[str], Dict[str, int], np.ndarray]:
+        """STRtree over a county's projected record locations (rebuilt after changes)."""
+        cached = self._county_trees.get(county)
+        if cached is None:
+            tickets = sorted(self._county_tickets.get(county, ()))
+            lat = np.array([self._records[t].latitude for t in tickets], dtype=float)
+            lng = np.array([self._records[t].longitude for t in tickets], dtype=float)
+            x, y = _project(lat, lng)
+            points = shapely.points(x, y)
+            cached = (shapely.STRtree(points), tickets, {t: i for i, t in enumerate(tickets)}, points)
+            self._county_trees[county] = cached
+        return cached
+
+    def _cluster(self, source: str, key: tuple, tickets: Set[str]) -> LocationPrior:
+        """Densest cluster of a bucket's records (radius queries on the county tree)."""
+        county = key[0]
+        tree, county_tickets, positions, points = self._county_tree(county)
+        members = np.array(sorted(positions[t] for t in tickets), dtype=np.int64)
+
+        query, found = tree.query(points[members], predicate="dwithin", distance=self.cluster_radius_m)
+        in_bucket = np.isin(found, members)
+        query, found = query[in_bucket], found[in_bucket]
+        counts = np.bincount(query, minlength=len(members))
+
+        best = int(np.argmax(counts))
+        cluster = [county_tickets[i] for i in found[query == best]]
+        support = len(cluster)
+        return LocationPrior(
+            latitude=float(np.mean([self._records[t].latitude for t in cluster])),
+            longitude=float(np.mean([self._records[t].longitude for t in cluster])),
+            source=source,
+            key=" & ".join(key[1:]) if source == "road_pair" else " / ".join(v for v in key[1:] if v),
+            support=support,
+            total=len(tickets),
+            confidence=round(SOURCE_CONFIDENCE[source] * support / (support + 1), 4),
+            ticket_numbers=sorted(cluster)[:20],
+        )
+
+    def locate(
+        self,
+        street: Optional[str],
+        intersection: Optional[str],
+        county: Optional[str],
+        excavator: Optional[str] = None,
+        work_type: Optional[str] = None,
+    ) -> Optional[LocationPrior]:
+        """Likely location of a ticket from prior verified work, or None.
+
+        Buckets are tried from most to least specific (road pair, each road,
+        excavator + work type); the first whose densest cluster has at least
+        min_support records wins.
+        """
+        keys = self._keys(
+            normalize_key(county),
+            normalize_key(street),
+            normalize_key(intersection),
+            normalize_key(excavator),
+            normalize_key(work_type),
+        )
+        for source, key in keys:
+            tickets = self._buckets.get((source, key))
+            if not tickets or len(tickets) < self.min_support:
+                continue
+            prior = self._cluster(source, key, tickets)
+            if prior.support >= self.min_support:
+                return prior
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Index summary."""
+        buckets: Dict[str, int] = {source: 0 for source in SOURCE_CONFIDENCE}
+        for source, _ in self._buckets:
+            buckets[source] += 1
+        return {
+            "records": len(self._records),
+            "counties": sum(1 for tickets in self._county_tickets.values() if tickets),
+            "buckets": buckets,
+            "watermark": self._watermark,
+        }
@@ -0,0 +1,244 @@
+"""
+Persistent cache of raw geocoding API responses.
+
+API calls cost money, so every response worth keeping is stored in the
+``api_response_cache`` table keyed by provider and normalized request (the
+request without credentials, with whitespace/case-insensitive values):
+
+- successful responses are reused for ``ttl_days``
+- negative responses (ZERO_RESULTS, permanent errors) for ``negative_ttl_hours``,
+  so an address that does not geocode is not paid for on every run
+
+Each hit is counted against the provider's per-request price, and
+``report()`` gives the requests and dollars saved since ``start_run()``.
+Stage 1 (core/api_client.py) and scripts/geocode_routes.py share it.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from kcci_maintenance.cache.migrations import apply_schema
+
+# Request fields that are credentials, not part of the request identity
+CREDENTIAL_FIELDS = {"key", "api_key", "apikey", "token", "access_token", "client_secret"}
+
+# USD per request (Google Maps Platform list prices)
+DEFAULT_COST_PER_REQUEST = {
+    "google": 0.005,
+    "google_address_validation": 0.017,
+}
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split()).upper()
+    if isinstance(value, dict):
+        return {k: _normalize_value(v) for k, v in value.items() if k not in CREDENTIAL_FIELDS}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(v) for v in value]
+    return value
+
+
+def normalize_request(request: Dict[str, Any]) -> str:
+    """Canonical JSON of a request (``requests`` kwargs) without credentials."""
+    normalized = {
+        field: _normalize_value(value)
+        for field, value in request.items()
+        if field in ("method", "url", "params", "json", "data")
+    }
+    if "url" in normalized:
+        normalized["url"] = str(request["url"]).strip()  # URLs are case-sensitive
+    return json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+
+@dataclass
+class CachedResponse:
+    """A stored API response."""
+    provider: str
+    status: str
+    response: Optional[Any]
+    negative: bool
+    fetched_at: float
+
+
+class ApiResponseCache:
+    """SQLite-backed API response cache with TTLs and cost accounting."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl_days: float = 30,
+        negative_ttl_hours: float = 24,
+        cost_per_request: Optional[Dict[str, float]] = None,
+    ):
+        """Initialize response cache.
+
+        Args:
+            db_path: SQLite database (normally the pipeline's geocode cache DB)
+            ttl_days: Lifetime of successful responses
+            negative_ttl_hours: Lifetime of ZERO_RESULTS / permanent-error responses
+            cost_per_request: {provider: USD per request} overrides
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = int(ttl_days * 86400)
+        self.negative_ttl_seconds = int(negative_ttl_hours * 3600)
+        self.cost_per_request = {**DEFAULT_COST_PER_REQUEST, **(cost_per_request or {})}
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        apply_schema(self.db_path)
+        self.start_run()
+
+    @contextmanager
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def request_key(request: Dict[str, Any]) -> str:
+        """SHA256 of the normalized request."""
+        return hashlib.sha256(normalize_request(request).encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        provider: str,
+        request: Dict[str, Any],
+        now: Optional[float] = None,
+    ) -> Optional[CachedResponse]:
+        """Unexpired response for a request, or None (counted as a hit or miss)."""
+        now = time.time() if now is None else now
+        key = self.request_key(request)
+        with self._get_connection() as conn:
+            row = conn.execute(
+                """SELECT status, response_json, negative, fetched_at FROM api_response_cache
+                   WHERE provider = ? AND request_key = ? AND fetched_at + ttl_seconds > ?""",
+                (provider, key, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE api_response_cache SET hits = hits + 1 WHERE provider = ? AND request_key = ?",
+                    (provider, key),
+                )
+
+        if row is None:
+            self._count(provider, "misses")
+            return None
+
+        status, response_json, negative, fetched_at = row
+        self._count(provider, "negative_hits" if negative else "hits")
+        return CachedResponse(
+            provider=provider,
+            status=status,
+            response=json.loads(response_json) if response_json is not None else None,
+            negative=bool(negative),
+            fetched_at=fetched_at,
+        )
+
+    def put(
+        self,
+        provider: str,
+        request: Dict[str, Any],
+        status: str,
+        response: Optional[Any] = None,
+        negative: bool = False,
+        now: Optional[float] = None,
+    ) -> None:
+        """Store (or replace) the response to a request."""
+        now = time.time() if now is None else now
+        with self._get_connection() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO api_response_cache
+                   (provider, request_key, request_json, status, response_json,
+                    negative, fetched_at, ttl_seconds, hits)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)""",
+                (
+                    provider,
+                    self.request_key(request),
+                    normalize_request(request),
+                    status,
+                    json.dumps(response, ensure_ascii=False) if response is not None else None,
+                    int(negative),
+                    now,
+                    self.negative_ttl_seconds if negative else self.ttl_seconds,
+                ),
+            )
+        self._count(provider, "stored")
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Delete expired entries; returns how many were removed."""
+        now = time.time() if now is None else now
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM api_response_cache WHERE fetched_at + ttl_seconds <= ?", (now,)
+            )
+            return cursor.rowcount
+
+    # -- Cost accounting ------------------------------------------------------------
+
+    def start_run(self) -> None:
+        """Reset the per-run counters reported by report()."""
+        with self._lock:
+            self._run: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, provider: str, counter: str) -> None:
+        with self._lock:
+            counters = self._run.setdefault(
+                provider, {"hits": 0, "negative_hits": 0, "misses": 0, "stored": 0}
+            )
+            counters[counter] += 1
+
+    def report(self) -> Dict[str, Any]:
+        """Requests served from cache and USD saved since start_run(), per provider and total."""
+        with self._lock:
+            providers = {name: dict(counters) for name, counters in self._run.items()}
+
+        for name, counters in providers.items():
+            saved = counters["hits"] + counters["negative_hits"]
+            counters["requests_saved"] = saved
+            counters["cost_saved_usd"] = round(saved * self.cost_per_request.get(name, 0.0), 4)
+
+        return {
+            "providers": providers,
+            "requests_saved": sum(c["requests_saved"] for c in providers.values()),
+            "cost_saved_usd": round(sum(c["cost_saved_usd"] for c in providers.values()), 4),
+        }
+
+    def summary(self) -> str:
+        """One-line report for logs."""
+        report = self.report()
+        misses = sum(c["misses"] for c in report["providers"].values())
+        return (
+            f"API response cache: {report['requests_saved']} requests served from cache, "
+            f"{misses} sent (saved ${report['cost_saved_usd']:.2f})"
+        )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Table contents: entries per provider and lifetime hits/savings."""
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                """SELECT provider, COUNT(*), SUM(negative), SUM(hits) FROM api_response_cache
+                   GROUP BY provider"""
+            ).fetchall()
+        return {
+            provider: {
+                "entries": entries,
+                "negative_entries": negative or 0,
+                "lifetime_hits": hits or 0,
+                "lifetime_cost_saved_usd": round((hits or 0) * self.cost_per_request.get(provider, 0.0), 2),
+            }
+            for provider, entries, negative, hits in rows
+        }
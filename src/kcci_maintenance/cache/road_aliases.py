@@ -0,0 +1,95 @@
+"""
+Persistent road-name aliases learned by fuzzy matching.
+
+When Stage 4 resolves a misspelled ticket road name ("MONAHNS HWY") to a
+road in the network ("MONAHANS HWY"), the pair is stored per county in the
+``road_name_aliases`` table. Later runs look the alias up first and go
+straight to the exact-match road index, without another fuzzy search.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from kcci_maintenance.cache.migrations import apply_schema
+
+
+def normalize_alias_key(value: Optional[str]) -> str:
+    """Upper-case, whitespace-collapsed form used for alias and county keys."""
+    if not value:
+        return ""
+    return " ".join(str(value).upper().split())
+
+
+class RoadAliasStore:
+    """SQLite-backed misspelling -> canonical road name map."""
+
+    def __init__(self, db_path: Path):
+        """Initialize alias store.
+
+        Args:
+            db_path: SQLite database (normally the pipeline's geocode cache DB)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        apply_schema(self.db_path)
+
+    @contextmanager
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def get(self, county: Optional[str], alias: str) -> Optional[Tuple[str, int]]:
+        """(canonical name, edit distance) for alias in county, or None (found = a hit)."""
+        county_key, alias_key = normalize_alias_key(county), normalize_alias_key(alias)
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT canonical, distance FROM road_name_aliases WHERE county = ? AND alias = ?",
+                (county_key, alias_key),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE road_name_aliases SET hits = hits + 1 WHERE county = ? AND alias = ?",
+                    (county_key, alias_key),
+                )
+        return (row[0], row[1]) if row is not None else None
+
+    def put(self, county: Optional[str], alias: str, canonical: str, distance: int) -> None:
+        """Store (or replace) an alias."""
+        with self._get_connection() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO road_name_aliases (county, alias, canonical, distance, hits)
+                   VALUES (?, ?, ?, ?, 0)""",
+                (normalize_alias_key(county), normalize_alias_key(alias), canonical, int(distance)),
+            )
+
+    def delete(self, county: Optional[str], alias: str) -> bool:
+        """Forget an alias (e.g. a wrong correction found in review)."""
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM road_name_aliases WHERE county = ? AND alias = ?",
+                (normalize_alias_key(county), normalize_alias_key(alias)),
+            )
+            return cursor.rowcount > 0
+
+    def all(self) -> Dict[tuple, str]:
+        """{(county, alias): canonical} for every stored alias."""
+        with self._get_connection() as conn:
+            rows = conn.execute("SELECT county, alias, canonical FROM road_name_aliases").fetchall()
+        return {(county, alias): canonical for county, alias, canonical in rows}
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Alias count and lifetime hits."""
+        with self._get_connection() as conn:
+            entries, hits = conn.execute(
+                "SELECT COUNT(*), SUM(hits) FROM road_name_aliases"
+            ).fetchone()
+        return {"aliases": entries, "lifetime_hits": hits or 0}
@@ -194,6 +194,60 @@ FROM geocode_cache old
 INNER JOIN geocode_cache new ON new.supersedes_cache_id = old.cache_id
 WHERE new.is_current = 1;
 
+-- ============================================================================
+-- API RESPONSE CACHE
+-- ============================================================================
+-- Raw geocoding API responses, shared by Stage 1 and scripts/geocode_routes.py
+-- so a request is paid for once per TTL. Negative entries (ZERO_RESULTS,
+-- permanent errors) are kept for a shorter TTL.
+
+CREATE TABLE IF NOT EXISTS api_response_cache (
+    provider TEXT NOT NULL,        -- google, google_address_validation, ...
+    request_key TEXT NOT NULL,     -- SHA256 of the normalized request (no credentials)
+    request_json TEXT NOT NULL,    -- Normalized request, for inspection
+    status TEXT NOT NULL,          -- OK, ZERO_RESULTS, http_error_400, ...
+    response_json TEXT,            -- Response body (NULL when there was none)
+    negative BOOLEAN NOT NULL DEFAULT 0,
+    fetched_at REAL NOT NULL,      -- Unix time of the API call
+    ttl_seconds INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,  -- Requests served from this entry
+
+    PRIMARY KEY (provider, request_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_api_response_fetched_at ON api_response_cache(fetched_at);
+
+-- ============================================================================
+-- ROAD NAME ALIASES
+-- ============================================================================
+-- Misspelled ticket road names resolved by Stage 4's fuzzy matching, so later
+-- runs map them straight to the canonical network name.
+
+CREATE TABLE IF NOT EXISTS road_name_aliases (
+    county TEXT NOT NULL,          -- Upper-cased ticket county ("WARD")
+    alias TEXT NOT NULL,           -- Upper-cased ticket road name ("MONAHNS HWY")
+    canonical TEXT NOT NULL,       -- Road name/ref in the network ("MONAHANS HWY")
+    distance INTEGER NOT NULL,     -- Edit distance of the match
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    hits INTEGER NOT NULL DEFAULT 0,  -- Later lookups resolved through the alias
+
+    PRIMARY KEY (county, alias)
+);
+
+-- ============================================================================
+-- API DAILY USAGE
+-- ============================================================================
+-- Requests sent per provider and UTC day, so the configured daily quota holds
+-- across runs and processes sharing the cache DB.
+
+CREATE TABLE IF NOT EXISTS api_daily_usage (
+    provider TEXT NOT NULL,        -- google, google_address_validation, ...
+    day TEXT NOT NULL,             -- UTC date (YYYY-MM-DD)
+    used INTEGER NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (provider, day)
+);
+
 -- ============================================================================
 -- SCHEMA VERSION TRACKING
 -- ============================================================================
@@ -205,3 +259,6 @@ CREATE TABLE IF NOT EXISTS schema_version (
 );
 
 INSERT OR IGNORE INTO schema_version (version, description) VALUES (1, 'Initial schema');
+INSERT OR IGNORE INTO schema_version (version, description) VALUES (2, 'API response cache');
+INSERT OR IGNORE INTO schema_version (version, description) VALUES (3, 'Road name aliases');
+INSERT OR IGNORE INTO schema_version (version, description) VALUES (4, 'API daily usage');
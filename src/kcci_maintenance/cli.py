@@ -14,11 +14,16 @@ import pandas as pd
 from pipeline import Pipeline
 from cache.cache_manager import CacheManager
 from config_manager import ConfigManager
+from stages.stage_1_api import Stage1APIGeocoder
+from stages.stage_2_geometric import Stage2GeometricIntersection
 from stages.stage_3_proximity import Stage3ProximityGeocoder
+from stages.stage_4_fallback import Stage4Fallback
 from stages.stage_5_validation import Stage5Validation
 from stages.stage_6_enrichment import Stage6Enrichment
+from utils.result_stream import record_to_row
 from utils.ticket_loader import TicketLoader
-from utils.maintenance_estimate import generate_maintenance_estimate
+from utils.maintenance_estimate import MaintenanceEstimateGenerator, generate_maintenance_estimate
+from utils.sampling import StratifiedSampler, progressive_sample
 
 
 def main():
@@ -44,6 +49,15 @@ Examples:
 
   # Show cache statistics
   %(prog)s --stats
+
+  # Watch ticket folders and ingest new exports as they arrive
+  %(prog)s --watch projects/wink/tickets --output results.csv --generate-estimate projects/wink/route/wink.kmz
+
+  # Quick frequency/cost preview from a 300-ticket sample, refined to ±10%%
+  %(prog)s projects/wink/tickets --generate-estimate projects/wink/route/wink.kmz --sample-size 300 --target-ci 0.1
+
+  # Keep road network and layers loaded and serve lookups on localhost
+  %(prog)s --serve --config my_config.yaml --port 8765
         """
     )
 
@@ -122,6 +136,66 @@ Examples:
         help='Output path for maintenance estimate (default: maintenance_estimate_TIMESTAMP.xlsx)'
     )
 
+    # Sampling (fast estimate) options
+    parser.add_argument(
+        '--sample-size',
+        type=int,
+        help='Fast estimate: geocode a stratified random sample (county, ticket type, year) '
+             'of this many tickets and extrapolate leg counts with confidence intervals '
+             '(requires --generate-estimate)'
+    )
+    parser.add_argument(
+        '--target-ci',
+        type=float,
+        help='Keep growing the sample until the overall CI half-width is at most this '
+             'fraction of the estimate (e.g. 0.1 for ±10%%)'
+    )
+    parser.add_argument(
+        '--sample-step',
+        type=int,
+        help='Tickets added per refinement round with --target-ci (default: --sample-size)'
+    )
+    parser.add_argument(
+        '--max-sample',
+        type=int,
+        help='Upper bound on the sample size with --target-ci (default: all tickets)'
+    )
+    parser.add_argument(
+        '--confidence-level',
+        type=float,
+        default=0.95,
+        help='Confidence level for sample intervals (default: 0.95)'
+    )
+    parser.add_argument(
+        '--sample-seed',
+        type=int,
+        help='Random seed for a reproducible sample'
+    )
+
+    parser.add_argument(
+        '--priority-order',
+        nargs='+',
+        choices=['ticket_type', 'recency', 'corridor'],
+        help='Process tickets in priority order, in chunks (e.g. ticket_type recency). '
+             'corridor uses the --generate-estimate KMZ as a cheap proximity prefilter'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=250,
+        help='Tickets per chunk when using --priority-order (default: 250)'
+    )
+    parser.add_argument(
+        '--max-memory-mb',
+        type=float,
+        help='Memory budget in MB; chunk, cache and worker sizes shrink to stay under it and peak memory is reported per stage'
+    )
+    parser.add_argument(
+        '--stream-output',
+        type=Path,
+        help='Append finished results to this CSV/JSONL file as each chunk completes'
+    )
+
     # Review queue options
     parser.add_argument(
         '--review-priority',
@@ -154,6 +228,55 @@ Examples:
         help='Clear all cache records (WARNING: destructive!)'
     )
 
+    # Service mode
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run a warm geocoding service (geocode/validate/enrich endpoints) instead of a batch run'
+    )
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='Service bind address (default: 127.0.0.1)'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8765,
+        help='Service port (default: 8765)'
+    )
+    parser.add_argument(
+        '--socket',
+        type=Path,
+        help='Serve on a Unix socket at this path instead of a TCP port'
+    )
+
+    # Watch mode
+    parser.add_argument(
+        '--watch',
+        nargs='+',
+        type=Path,
+        metavar='DIR',
+        help='Watch ticket directories and process new exports as they arrive'
+    )
+    parser.add_argument(
+        '--watch-state',
+        type=Path,
+        help='Watch state file of ingested files/tickets (default: next to --cache-db)'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=5.0,
+        help='Watch polling interval in seconds (default: 5)'
+    )
+    parser.add_argument(
+        '--settle-seconds',
+        type=float,
+        default=2.0,
+        help='Seconds a file must stay unchanged before it is ingested (default: 2)'
+    )
+
     # Output options
     parser.add_argument(
         '-v', '--verbose',
@@ -174,8 +297,20 @@ Examples:
     args = parser.parse_args()
 
     # Validate arguments
-    if not args.input_file and not args.export_cache and not args.stats and not args.clear_cache:
-        parser.error("input_file is required unless using --export-cache, --stats, or --clear-cache")
+    if args.serve:
+        return run_service(args)
+
+    if (not args.input_file and not args.export_cache and not args.stats
+            and not args.clear_cache and not args.watch):
+        parser.error("input_file is required unless using --export-cache, --stats, --clear-cache, --watch, or --serve")
+
+    if args.sample_size is not None:
+        if not args.generate_estimate:
+            parser.error("--sample-size requires --generate-estimate")
+        if args.sample_size <= 0:
+            parser.error("--sample-size must be positive")
+    elif args.target_ci is not None:
+        parser.error("--target-ci requires --sample-size")
 
     # Initialize cache manager
     args.cache_db.parent.mkdir(parents=True, exist_ok=True)
@@ -208,6 +343,9 @@ Examples:
         generate_review_queue_only(cache_manager, args, args.quiet)
         return 0
 
+    if args.watch:
+        return run_watcher(cache_manager, args)
+
     # Validate input file
     if not args.input_file.exists():
         print(f"❌ Error: Input file not found: {args.input_file}", file=sys.stderr)
@@ -218,17 +356,7 @@ Examples:
         return 1
 
     # Load configuration
-    if args.config:
-        config_manager = ConfigManager(args.config)
-        config = config_manager.load()
-        pipeline_config = config.to_dict()
-    else:
-        # Use default config
-        pipeline_config = {
-            'name': 'geocoding_pipeline_cli',
-            'fail_fast': args.fail_fast,
-            'save_intermediate': True,
-        }
+    pipeline_config = load_pipeline_config(args)
 
     # Load tickets
     if not args.quiet:
@@ -261,48 +389,10 @@ Examples:
         print(f"   Loaded {len(tickets)} tickets")
 
     # Create pipeline
-    pipeline = Pipeline(cache_manager, pipeline_config)
-
-    # Add stages
-    if not args.skip_stage3:
-        stage3_config = {
-            'road_network_path': str(args.roads),
-            'skip_rules': {
-                'skip_if_quality': [] if args.force_reprocess else ['EXCELLENT', 'GOOD'],
-                'skip_if_locked': True,
-            }
-        }
-        stage3 = Stage3ProximityGeocoder(cache_manager, stage3_config)
-        pipeline.add_stage(stage3)
-        if not args.quiet:
-            print("✅ Added Stage 3: Proximity Geocoding")
-
-    if not args.skip_stage5:
-        stage5_config = {
-            'validation_rules': [
-                'low_confidence',
-                'emergency_low_confidence',
-                'city_distance',
-                'fallback_geocode',
-                'missing_road',
-            ],
-            'skip_rules': {
-                'skip_if_locked': True,
-            }
-        }
-        stage5 = Stage5Validation(cache_manager, stage5_config)
-        pipeline.add_stage(stage5)
-        if not args.quiet:
-            print("✅ Added Stage 5: Validation")
+    pipeline = build_pipeline(cache_manager, pipeline_config, args)
 
-    if not args.skip_stage6 and args.config:
-        # Stage 6 requires config file with jurisdiction settings
-        if 'stages' in pipeline_config and 'stage_6_enrichment' in pipeline_config['stages']:
-            stage6_config = pipeline_config['stages']['stage_6_enrichment']
-            stage6 = Stage6Enrichment(cache_manager, stage6_config)
-            pipeline.add_stage(stage6)
-            if not args.quiet:
-                print("✅ Added Stage 6: Enrichment")
+    if args.sample_size is not None:
+        return run_sampled_estimate(pipeline, df, tickets, args)
 
     # Run pipeline
     if not args.quiet:
@@ -391,6 +481,269 @@ Examples:
     return 0
 
 
+def run_sampled_estimate(pipeline, df, tickets, args):
+    """Geocode a stratified sample and write an extrapolated maintenance estimate."""
+    if not args.generate_estimate.exists():
+        print(f"❌ Error: KMZ file not found: {args.generate_estimate}", file=sys.stderr)
+        return 1
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    estimate_path = args.estimate_output or Path(f'maintenance_estimate_sample_{timestamp}.xlsx')
+    project_name = args.config.stem.replace('_', ' ').title() if args.config else "Project"
+
+    generator = MaintenanceEstimateGenerator(kmz_path=args.generate_estimate, buffer_distance_m=500.0)
+    sampler = StratifiedSampler(tickets, seed=args.sample_seed)
+
+    # Ticket dates come from the export (results only carry cache timestamps),
+    # so the annualization span reflects the full population
+    creation = {t['ticket_number']: t.get('creation') for t in tickets}
+    population_years, _ = generator.calculate_time_span_years(
+        pd.DataFrame({'Creation': list(creation.values())})
+    )
+    rows = []
+
+    def evaluate(new_tickets):
+        if not args.quiet:
+            print(f"\n🚀 Geocoding {len(new_tickets)} sampled tickets "
+                  f"(sample {sampler.sample.size}/{sampler.sample.population_size})...")
+        pipeline.run(new_tickets)
+
+        for ticket in new_tickets:
+            record = pipeline.cache_manager.get_current(ticket['ticket_number'])
+            if record is not None:
+                row = record_to_row(record)
+                row['Creation'] = creation.get(ticket['ticket_number'])
+                rows.append(row)
+
+        estimate = generator.estimate_from_sample(
+            pd.DataFrame(rows), sampler.sample, args.confidence_level,
+            years_span=population_years,
+        )
+        if not args.quiet:
+            overall = estimate[estimate['Route Leg'] == 'All Legs'].iloc[0]
+            print(f"   Estimated annual tickets on route: {overall['Estimated Annual Tickets']:.0f} "
+                  f"({overall['Annual CI Low']:.0f}-{overall['Annual CI High']:.0f}, "
+                  f"±{overall['Relative Half-Width']:.1%})")
+        return estimate
+
+    if not args.quiet:
+        print(f"\n📊 Sampling {args.sample_size} of {len(tickets)} tickets "
+              f"across {len(sampler.sample.population_sizes)} strata...")
+
+    try:
+        progressive_sample(
+            sampler,
+            evaluate,
+            initial_size=args.sample_size,
+            step_size=args.sample_step or args.sample_size,
+            target_relative_half_width=args.target_ci,
+            max_size=args.max_sample,
+        )
+
+        results_df = pd.DataFrame(rows)
+        results_df = results_df[results_df['latitude'].notna() & results_df['longitude'].notna()]
+        generator.generate_estimate(
+            tickets_df=results_df,
+            output_path=estimate_path,
+            project_name=project_name,
+            sample=sampler.sample,
+            confidence_level=args.confidence_level,
+            years_span=population_years,
+        )
+    except Exception as e:
+        print(f"\n❌ Error generating sampled estimate: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+    if not args.quiet:
+        print(f"✅ Sampled maintenance estimate ({sampler.sample.size} tickets) saved to {estimate_path}")
+
+    return 0
+
+
+def load_pipeline_config(args):
+    """Build the pipeline config dict from --config and command-line overrides."""
+    if args.config:
+        config_manager = ConfigManager(args.config)
+        config = config_manager.load()
+        pipeline_config = config.to_dict()
+    else:
+        # Use default config
+        pipeline_config = {
+            'name': 'geocoding_pipeline_cli',
+            'fail_fast': args.fail_fast,
+            'save_intermediate': True,
+        }
+
+    if args.priority_order:
+        scheduling_config = {
+            'enabled': True,
+            'order': args.priority_order,
+            'chunk_size': args.chunk_size,
+        }
+        if 'corridor' in args.priority_order and args.generate_estimate:
+            scheduling_config['corridor_kmz'] = str(args.generate_estimate)
+        pipeline_config['scheduling'] = scheduling_config
+
+    if args.max_memory_mb:
+        pipeline_config['max_memory_mb'] = args.max_memory_mb
+
+    if args.stream_output:
+        pipeline_config['streaming_output'] = {'path': str(args.stream_output)}
+
+    return pipeline_config
+
+
+def build_pipeline(cache_manager, pipeline_config, args):
+    """Create a pipeline with the stages selected on the command line."""
+    pipeline = Pipeline(cache_manager, pipeline_config)
+
+    # Add stages
+    # Stage 1 runs only when enabled in the config file (API requests cost quota)
+    stage1_config = (pipeline_config.get('stages') or {}).get('stage_1_api') or {}
+    if stage1_config.get('enabled', False):
+        stage1 = Stage1APIGeocoder(cache_manager, stage1_config)
+        pipeline.add_stage(stage1)
+        if not args.quiet:
+            print("✅ Added Stage 1: API Geocoding")
+
+    # Stage 2 runs only when enabled in the config file (junction table lookups)
+    stage2_config = (pipeline_config.get('stages') or {}).get('stage_2_geometric') or {}
+    if stage2_config.get('enabled', False):
+        stage2 = Stage2GeometricIntersection(
+            cache_manager, {'road_network_path': str(args.roads), **stage2_config}
+        )
+        pipeline.add_stage(stage2)
+        if not args.quiet:
+            print("✅ Added Stage 2: Geometric Intersection")
+
+    if not args.skip_stage3:
+        # Stage 3 options come from the config file; --force-reprocess overrides its skip rules
+        stage3_yaml = (pipeline_config.get('stages') or {}).get('stage_3_proximity') or {}
+        skip_rules = {
+            'skip_if_quality': ['EXCELLENT', 'GOOD'],
+            'skip_if_locked': True,
+            **(stage3_yaml.get('skip_rules') or {}),
+        }
+        if args.force_reprocess:
+            skip_rules['skip_if_quality'] = []
+        stage3_config = {
+            'road_network_path': str(args.roads),
+            **stage3_yaml,
+            'skip_rules': skip_rules,
+        }
+        stage3 = Stage3ProximityGeocoder(cache_manager, stage3_config)
+        pipeline.add_stage(stage3)
+        if not args.quiet:
+            print("✅ Added Stage 3: Proximity Geocoding")
+
+        # Stage 4 runs only when enabled in the config file; it reuses Stage 3's road network
+        stage4_config = (pipeline_config.get('stages') or {}).get('stage_4_fallback') or {}
+        if stage4_config.get('enabled', False):
+            stage4 = Stage4Fallback(cache_manager, stage4_config, geocoder=stage3.geocoder)
+            pipeline.add_stage(stage4)
+            if not args.quiet:
+                print("✅ Added Stage 4: Fuzzy Road-Name Fallback")
+
+    if not args.skip_stage5:
+        stage5_config = {
+            'validation_rules': [
+                'low_confidence',
+                'emergency_low_confidence',
+                'city_distance',
+                'fallback_geocode',
+                'missing_road',
+            ],
+            'skip_rules': {
+                'skip_if_locked': True,
+            }
+        }
+        stage5 = Stage5Validation(cache_manager, stage5_config)
+        pipeline.add_stage(stage5)
+        if not args.quiet:
+            print("✅ Added Stage 5: Validation")
+
+    if not args.skip_stage6 and args.config:
+        # Stage 6 requires config file with jurisdiction settings
+        if 'stages' in pipeline_config and 'stage_6_enrichment' in pipeline_config['stages']:
+            stage6_config = pipeline_config['stages']['stage_6_enrichment']
+            stage6 = Stage6Enrichment(cache_manager, stage6_config)
+            pipeline.add_stage(stage6)
+            if not args.quiet:
+                print("✅ Added Stage 6: Enrichment")
+
+    return pipeline
+
+
+def run_watcher(cache_manager, args):
+    """Watch ticket directories and run new tickets through a warm pipeline."""
+    from watcher import TicketWatcher
+
+    missing = [d for d in args.watch if not d.is_dir()]
+    if missing:
+        print(f"❌ Error: Watch directory not found: {missing[0]}", file=sys.stderr)
+        return 1
+
+    if args.roads and not args.skip_stage3 and not args.roads.exists():
+        print(f"❌ Error: Road network file not found: {args.roads}", file=sys.stderr)
+        return 1
+
+    if args.generate_estimate and not args.generate_estimate.exists():
+        print(f"❌ Error: KMZ file not found: {args.generate_estimate}", file=sys.stderr)
+        return 1
+
+    pipeline_config = load_pipeline_config(args)
+    pipeline = build_pipeline(cache_manager, pipeline_config, args)
+
+    output_dir = args.cache_db.parent
+    project_name = args.config.stem.replace('_', ' ').title() if args.config else "Project"
+
+    watcher = TicketWatcher(
+        directories=args.watch,
+        pipeline=pipeline,
+        state_path=args.watch_state or output_dir / 'watch_state.json',
+        results_path=args.output or output_dir / 'watch_results.csv',
+        review_queue_path=args.review_queue or output_dir / 'watch_review_queue.csv',
+        review_priorities=args.review_priority,
+        estimate_kmz=args.generate_estimate,
+        estimate_path=args.estimate_output or output_dir / 'watch_maintenance_estimate.xlsx',
+        project_name=project_name,
+        poll_interval_s=args.poll_interval,
+        settle_s=args.settle_seconds,
+    )
+    watcher.run()
+    return 0
+
+
+def run_service(args):
+    """Load geocoding components once and serve lookups until interrupted."""
+    from service import GeocodingService, serve
+
+    stages_config = {}
+    if args.config:
+        config = ConfigManager(args.config).load()
+        stages_config = config.stages
+
+    roads_path = args.roads if args.roads and args.roads.exists() else None
+    if roads_path is None and not stages_config.get('stage_3_proximity', {}).get('road_network_path'):
+        print(f"❌ Error: Road network file not found: {args.roads}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print("📦 Loading geocoding service components...")
+
+    try:
+        service = GeocodingService.from_config(roads_path=roads_path, stages_config=stages_config)
+    except Exception as e:
+        print(f"❌ Error starting service: {e}", file=sys.stderr)
+        return 1
+
+    serve(service, host=args.host, port=args.port, socket_path=args.socket, verbose=args.verbose)
+    return 0
+
+
 def show_statistics(cache_manager, quiet=False):
     """Show cache statistics."""
     stats = cache_manager.get_statistics()
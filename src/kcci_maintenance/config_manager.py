@@ -9,7 +9,7 @@ import os
 import yaml
 from typing import Dict, Any, Optional
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -23,6 +23,9 @@ class PipelineConfig:
     output_dir: Path = Path("outputs")
     config_version: int = 1
     project_root: Optional[Path] = None
+    scheduling: Dict[str, Any] = field(default_factory=dict)
+    streaming_output: Dict[str, Any] = field(default_factory=dict)
+    max_memory_mb: Optional[float] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -35,6 +38,9 @@ class PipelineConfig:
             "output_dir": str(self.output_dir),
             "config_version": self.config_version,
             "project_root": str(self.project_root) if self.project_root else None,
+            "scheduling": self.scheduling,
+            "streaming_output": self.streaming_output,
+            "max_memory_mb": self.max_memory_mb,
         }
 
 
@@ -225,6 +231,11 @@ class ConfigManager:
             output_dir=output_dir,
             config_version=config_version,
             project_root=project_root,
+            scheduling=config.get("scheduling") or {},
+            streaming_output=config.get("streaming_output") or {},
+            max_memory_mb=(config.get("pipeline") or {}).get(
+                "max_memory_mb", config.get("max_memory_mb")
+            ),
         )
 
     def get_stage_config(self, stage_name: str) -> Dict[str, Any]:
@@ -0,0 +1,564 @@
+"""
+Concurrent, rate-limited client for external geocoding APIs.
+
+Geocoding APIs are latency-bound: a single request spends most of its time
+on the round trip, so issuing requests one at a time (as the legacy
+geocode_routes.py does) leaves most of the allowed rate unused. This client
+keeps several requests in flight and paces them to the provider's limits:
+
+- a pool of keep-alive HTTP sessions, one per worker thread
+- a token bucket enforcing the configured QPS (with a small burst)
+- a daily request quota, after which requests fail fast with QUOTA_EXCEEDED
+- retries with full-jitter exponential backoff on 429/5xx, connection
+  errors and provider-level rate limiting (Retry-After is honored)
+- coalescing of concurrent requests for the same geocode key, so duplicate
+  tickets cost one API call
+- an optional persistent response cache (cache/response_cache.py), so a
+  location is paid for once per TTL across runs
+
+Providers translate a GeocodeQuery into an HTTP request and the response
+back into an ApiResult; Google Geocoding is built in and others register in
+PROVIDERS. utils/fake_geocode_server.py serves the Google response format
+locally for tests and dry runs.
+"""
+
+import random
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache.response_cache import ApiResponseCache
+from cache.migrations import apply_schema
+
+GOOGLE_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+
+# HTTP statuses worth retrying (rate limited / transient server errors)
+RETRYABLE_HTTP_STATUSES = {429, 500, 502, 503, 504}
+
+# Status reported when the daily quota is used up
+QUOTA_EXCEEDED = "QUOTA_EXCEEDED"
+
+# Statuses never stored in the response cache (quota, credentials, billing)
+UNCACHEABLE_STATUSES = {
+    QUOTA_EXCEEDED, "REQUEST_DENIED", "OVER_DAILY_LIMIT", "OVER_QUERY_LIMIT",
+    "http_error_401", "http_error_403",
+}
+
+
+@dataclass(frozen=True)
+class GeocodeQuery:
+    """One location to geocode; ``key`` identifies duplicates for coalescing."""
+    key: str
+    street: str = ""
+    intersection: str = ""
+    city: str = ""
+    county: str = ""
+    state: str = "TX"
+
+    @property
+    def is_intersection(self) -> bool:
+        return bool(self.street and self.intersection)
+
+    def address_line(self) -> str:
+        """Free-form query line ("TX 302 and FM 1232, Kermit, TX")."""
+        if self.is_intersection:
+            line = f"{self.street} and {self.intersection}"
+        else:
+            line = self.street or self.intersection
+        return ", ".join(part for part in (line, self.city, self.state) if part)
+
+
+@dataclass
+class ApiResult:
+    """Provider response for one query."""
+    status: str
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    formatted_address: str = ""
+    place_id: str = ""
+    location_type: Optional[str] = None
+    result_types: List[str] = field(default_factory=list)
+    attempts: int = 0
+    retryable: bool = False
+    error: Optional[str] = None
+    cached: bool = False
+    raw: Optional[Any] = field(default=None, repr=False)  # Response body, for the response cache
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "OK" and self.lat is not None and self.lng is not None
+
+
+class QuotaExceeded(Exception):
+    """Raised when the daily request quota is used up."""
+
+
+class GeocodeProvider(ABC):
+    """Translates queries to HTTP requests and responses to ApiResults."""
+
+    name = "provider"
+
+    @abstractmethod
+    def build_request(self, query: GeocodeQuery) -> Dict[str, Any]:
+        """Keyword arguments for ``requests.Session.request`` (method, url, params, ...)."""
+
+    @abstractmethod
+    def parse_response(self, status_code: int, payload: Any) -> ApiResult:
+        """ApiResult for a successful (2xx) HTTP response."""
+
+
+class GoogleGeocodingProvider(GeocodeProvider):
+    """Google Geocoding API (same query shape as geocode_routes.call_google_geocode)."""
+
+    name = "google"
+
+    # Statuses Google returns with HTTP 200 that are worth retrying
+    RETRYABLE_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+
+    def __init__(self, api_key: str, base_url: str = GOOGLE_GEOCODE_URL, region: str = "US"):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.region = region
+
+    def build_request(self, query: GeocodeQuery) -> Dict[str, Any]:
+        components = [f"country:{self.region}"]
+        if query.county and query.state:
+            components.insert(0, f"administrative_area:{query.state}")
+        return {
+            "method": "GET",
+            "url": self.base_url,
+            "params": {
+                "key": self.api_key,
+                "region": self.region,
+                "address": query.address_line(),
+                "components": "|".join(components),
+            },
+        }
+
+    def parse_response(self, status_code: int, payload: Any) -> ApiResult:
+        status = payload.get("status", "UNKNOWN") if isinstance(payload, dict) else "UNKNOWN"
+        if status != "OK":
+            return ApiResult(
+                status=status,
+                retryable=status in self.RETRYABLE_STATUSES,
+                error=payload.get("error_message") if isinstance(payload, dict) else None,
+            )
+
+        results = payload.get("results") or []
+        if not results:
+            return ApiResult(status="ZERO_RESULTS")
+
+        best = results[0]
+        geometry = best.get("geometry", {})
+        location = geometry.get("location", {})
+        return ApiResult(
+            status="OK",
+            lat=float(location["lat"]),
+            lng=float(location["lng"]),
+            formatted_address=best.get("formatted_address", ""),
+            place_id=best.get("place_id", ""),
+            location_type=geometry.get("location_type"),
+            result_types=list(best.get("types", [])),
+        )
+
+
+# Provider name (stage config ``provider``) -> class
+PROVIDERS = {
+    GoogleGeocodingProvider.name: GoogleGeocodingProvider,
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, up to ``capacity``."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long to wait until it is available."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens may go negative: later callers queue behind earlier ones
+            self._tokens -= 1.0
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the time waited."""
+        wait = self._reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class DailyQuota:
+    """Requests allowed per UTC day (None = unlimited).
+
+    With a db_path, usage is kept per provider and day in the pipeline DB's
+    api_daily_usage table, so the quota holds across runs and processes;
+    without one it is counted in memory only.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        today: Optional[Callable[[], str]] = None,
+        db_path: Optional[Path] = None,
+        provider: str = "default",
+    ):
+        self.limit = int(limit) if limit else None
+        self._today = today or (lambda: datetime.now(timezone.utc).date().isoformat())
+        self.db_path = Path(db_path) if db_path is not None else None
+        self.provider = provider
+        self._lock = threading.Lock()
+
+        if self.db_path is not None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            apply_schema(self.db_path)
+        self._day = self._today()
+        self.used = self._load(self._day)
+
+    @contextmanager
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _load(self, day: str) -> int:
+        """Requests already counted for day (0 without a DB)."""
+        if self.db_path is None:
+            return 0
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT used FROM api_daily_usage WHERE provider = ? AND day = ?",
+                (self.provider, day),
+            ).fetchone()
+        return row[0] if row is not None else 0
+
+    def consume(self) -> None:
+        """Count one request; raises QuotaExceeded when the day's quota is used."""
+        with self._lock:
+            day = self._today()
+            if day != self._day:
+                self._day, self.used = day, self._load(day)
+            if self.db_path is None:
+                if self.limit is not None and self.used >= self.limit:
+                    raise QuotaExceeded(f"Daily quota of {self.limit} requests used")
+                self.used += 1
+                return
+
+            # Read and increment in one write transaction, so processes
+            # sharing the DB cannot overrun the quota between them
+            with self._get_connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT used FROM api_daily_usage WHERE provider = ? AND day = ?",
+                    (self.provider, day),
+                ).fetchone()
+                self.used = row[0] if row is not None else 0
+                if self.limit is not None and self.used >= self.limit:
+                    raise QuotaExceeded(f"Daily quota of {self.limit} requests used")
+                conn.execute(
+                    """INSERT INTO api_daily_usage (provider, day, used) VALUES (?, ?, 1)
+                       ON CONFLICT (provider, day) DO UPDATE SET used = used + 1""",
+                    (self.provider, day),
+                )
+                self.used += 1
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return None if self.limit is None else max(0, self.limit - self.used)
+
+
+class ApiGeocodingClient:
+    """Concurrent geocoding client over a pluggable provider."""
+
+    def __init__(
+        self,
+        provider: GeocodeProvider,
+        qps: float = 10.0,
+        burst: Optional[float] = None,
+        daily_quota: Optional[int] = None,
+        max_workers: int = 8,
+        max_retries: int = 4,
+        backoff_base_s: float = 0.5,
+        backoff_max_s: float = 30.0,
+        timeout_s: float = 10.0,
+        response_cache: Optional[ApiResponseCache] = None,
+        quota_db: Optional[Path] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize client.
+
+        Args:
+            provider: Request/response translation for the API
+            qps: Sustained requests per second across all workers
+            burst: Token bucket capacity (default: one second of requests)
+            daily_quota: Requests allowed per UTC day (None = unlimited)
+            max_workers: Concurrent requests (and pooled sessions)
+            max_retries: Retries after the first attempt for retryable failures
+            backoff_base_s: Backoff before the first retry (doubles per retry, full jitter)
+            backoff_max_s: Backoff cap
+            timeout_s: Per-request timeout
+            response_cache: Persistent response cache (checked before any request)
+            quota_db: SQLite database keeping daily quota usage across runs
+                (None = counted in memory for this client only)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.provider = provider
+        self.response_cache = response_cache
+        self.max_workers = max(1, int(max_workers))
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.timeout_s = timeout_s
+        self._sleep = sleep
+
+        self.bucket = TokenBucket(qps, burst, sleep=sleep)
+        self.quota = DailyQuota(daily_quota, db_path=quota_db, provider=provider.name)
+
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "retries": 0, "coalesced": 0, "cache_hits": 0, "failures": 0}
+
+    # -- Sessions ---------------------------------------------------------------
+
+    def _session(self) -> requests.Session:
+        """Keep-alive session of the calling thread (created on first use)."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        """Close pooled sessions."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+    def __enter__(self) -> "ApiGeocodingClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _count(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += n
+
+    # -- Requests ---------------------------------------------------------------
+
+    def geocode(self, query: GeocodeQuery) -> ApiResult:
+        """Geocode one query, sharing the request with concurrent calls for the same key."""
+        with self._lock:
+            future = self._inflight.get(query.key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[query.key] = future
+            else:
+                self._counters["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = self._fetch(query)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(query.key, None)
+
+    def geocode_many(self, queries: Iterable[GeocodeQuery]) -> Dict[str, ApiResult]:
+        """Geocode queries concurrently; returns {key: ApiResult} (one request per key)."""
+        unique: Dict[str, GeocodeQuery] = {}
+        for query in queries:
+            if query.key in unique:
+                self._count("coalesced")
+            else:
+                unique[query.key] = query
+        if not unique:
+            return {}
+
+        workers = min(self.max_workers, len(unique))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="geocode-api") as pool:
+            futures = {key: pool.submit(self.geocode, query) for key, query in unique.items()}
+            return {key: future.result() for key, future in futures.items()}
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> None:
+        """Full-jitter exponential backoff (at least Retry-After when given)."""
+        delay = random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max_s))
+        self._sleep(delay)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def _attempt(self, request: Dict[str, Any]) -> Tuple[ApiResult, Optional[float]]:
+        """One request: (result, Retry-After seconds if given)."""
+        self.quota.consume()
+        self.bucket.acquire()
+        self._count("requests")
+        try:
+            response = self._session().request(timeout=self.timeout_s, **request)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            return ApiResult(status="exception", retryable=True, error=str(e)), None
+
+        if response.status_code in RETRYABLE_HTTP_STATUSES:
+            return (
+                ApiResult(status=f"http_error_{response.status_code}", retryable=True),
+                self._retry_after(response),
+            )
+        if response.status_code >= 400:
+            return ApiResult(status=f"http_error_{response.status_code}", error=response.text[:200]), None
+
+        try:
+            payload = response.json()
+        except ValueError as e:
+            return ApiResult(status="invalid_response", retryable=True, error=str(e)), None
+        result = self.provider.parse_response(response.status_code, payload)
+        result.raw = payload
+        return result, None
+
+    def _from_cache(self, request: Dict[str, Any]) -> Optional[ApiResult]:
+        """Result rebuilt from a cached response, or None."""
+        if self.response_cache is None:
+            return None
+        cached = self.response_cache.get(self.provider.name, request)
+        if cached is None:
+            return None
+
+        self._count("cache_hits")
+        if cached.response is not None:
+            result = self.provider.parse_response(200, cached.response)
+        else:
+            result = ApiResult(status=cached.status)
+        result.cached = True
+        return result
+
+    def _store(self, request: Dict[str, Any], result: ApiResult) -> None:
+        """Cache final responses (negatively when not OK); transient failures are not kept."""
+        if (
+            self.response_cache is None
+            or result.retryable
+            or result.status in UNCACHEABLE_STATUSES
+        ):
+            return
+        self.response_cache.put(
+            self.provider.name, request, result.status, result.raw, negative=not result.ok
+        )
+
+    def _fetch(self, query: GeocodeQuery) -> ApiResult:
+        """Cached response, else request with retries; quota exhaustion is reported, not retried."""
+        request = self.provider.build_request(query)
+        cached = self._from_cache(request)
+        if cached is not None:
+            return cached
+
+        attempt = 0
+        while True:
+            try:
+                result, retry_after = self._attempt(request)
+            except QuotaExceeded as e:
+                result, retry_after = ApiResult(status=QUOTA_EXCEEDED, error=str(e)), None
+
+            result.attempts = attempt + 1
+            if not result.retryable or attempt >= self.max_retries:
+                if not result.ok:
+                    self._count("failures")
+                self._store(request, result)
+                return result
+
+            self._count("retries")
+            self._backoff(attempt, retry_after)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counters and quota usage."""
+        with self._lock:
+            stats = dict(self._counters)
+        stats["provider"] = self.provider.name
+        stats["quota_used"] = self.quota.used
+        stats["quota_remaining"] = self.quota.remaining
+        return stats
+
+
+def build_client(
+    config: Dict[str, Any],
+    api_key: str,
+    response_cache: Optional[ApiResponseCache] = None,
+    quota_db: Optional[Path] = None,
+) -> ApiGeocodingClient:
+    """Client from stage configuration (see Stage1APIGeocoder)."""
+    provider_name = config.get("provider", GoogleGeocodingProvider.name)
+    provider_class = PROVIDERS.get(provider_name)
+    if provider_class is None:
+        raise ValueError(f"Unknown geocoding provider: {provider_name} (known: {sorted(PROVIDERS)})")
+
+    provider_kwargs = {"api_key": api_key}
+    if config.get("base_url"):
+        provider_kwargs["base_url"] = config["base_url"]
+
+    return ApiGeocodingClient(
+        provider_class(**provider_kwargs),
+        qps=float(config.get("qps", 10.0)),
+        burst=config.get("burst"),
+        daily_quota=config.get("daily_quota"),
+        max_workers=int(config.get("max_workers", 8)),
+        max_retries=int(config.get("max_retries", 4)),
+        backoff_base_s=float(config.get("backoff_base_s", 0.5)),
+        backoff_max_s=float(config.get("backoff_max_s", 30.0)),
+        timeout_s=float(config.get("timeout_s", 10.0)),
+        response_cache=response_cache,
+        quota_db=quota_db,
+    )
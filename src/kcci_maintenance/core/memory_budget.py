@@ -0,0 +1,224 @@
+"""
+Memory budget and backpressure for large pipeline runs.
+
+Samples process RSS during a run, tracks peak memory per stage, and lets
+the pipeline (and memory-hungry helpers such as caches and worker pools)
+scale their sizes down when the process approaches ``max_memory_mb``.
+"""
+
+import gc
+import os
+import sys
+import threading
+from typing import Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def current_rss_mb() -> float:
+    """Return the current resident set size of this process in MB.
+
+    Uses /proc on Linux; falls back to the peak RSS reported by
+    ``resource`` elsewhere (an upper bound on current RSS).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+    return 0.0
+
+
+class MemoryBudget:
+    """Tracks RSS against a budget and adapts batch/cache sizes."""
+
+    # Fraction of the budget at which sizes start shrinking / may grow again
+    HIGH_WATERMARK = 0.85
+    LOW_WATERMARK = 0.50
+
+    def __init__(
+        self,
+        max_memory_mb: Optional[float] = None,
+        sample_interval_s: float = 0.25,
+    ):
+        """Initialize memory budget.
+
+        Args:
+            max_memory_mb: Memory budget in MB (None = unlimited, tracking only)
+            sample_interval_s: Background RSS sampling interval while running
+        """
+        self.max_memory_mb = float(max_memory_mb) if max_memory_mb else None
+        self.sample_interval_s = sample_interval_s
+
+        self.peak_mb = 0.0
+        self.stage_peaks_mb: Dict[str, float] = {}
+        self.current_stage: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        """True if a budget is configured."""
+        return self.max_memory_mb is not None
+
+    def sample(self) -> float:
+        """Sample RSS and attribute it to the current stage.
+
+        Returns:
+            Current RSS in MB
+        """
+        rss_mb = current_rss_mb()
+        with self._lock:
+            self.peak_mb = max(self.peak_mb, rss_mb)
+            if self.current_stage is not None:
+                self.stage_peaks_mb[self.current_stage] = max(
+                    self.stage_peaks_mb.get(self.current_stage, 0.0), rss_mb
+                )
+        return rss_mb
+
+    def enter_stage(self, stage_name: Optional[str]) -> None:
+        """Attribute subsequent samples to a stage (None = between stages)."""
+        if stage_name is not None:
+            with self._lock:
+                self.current_stage = stage_name
+            self.sample()
+        else:
+            self.sample()
+            with self._lock:
+                self.current_stage = None
+
+    def pressure(self, rss_mb: Optional[float] = None) -> float:
+        """Fraction of the budget in use (0.0 when no budget is set)."""
+        if not self.enabled:
+            return 0.0
+        if rss_mb is None:
+            rss_mb = self.sample()
+        return rss_mb / self.max_memory_mb
+
+    def over_budget(self) -> bool:
+        """True if RSS is above the high watermark."""
+        return self.pressure() >= self.HIGH_WATERMARK
+
+    def relieve_pressure(self) -> float:
+        """Run garbage collection and re-sample RSS.
+
+        Returns:
+            RSS in MB after collection
+        """
+        gc.collect()
+        return self.sample()
+
+    def adapt_chunk_size(self, chunk_size: int, minimum: int = 1, maximum: Optional[int] = None) -> int:
+        """Shrink or grow a chunk size based on current pressure.
+
+        Halves above the high watermark, grows by half below the low
+        watermark (up to ``maximum``), otherwise leaves it unchanged.
+
+        Args:
+            chunk_size: Current chunk size
+            minimum: Smallest allowed chunk size
+            maximum: Largest allowed chunk size (default: unbounded)
+
+        Returns:
+            New chunk size
+        """
+        if not self.enabled:
+            return chunk_size
+
+        pressure = self.pressure()
+        if pressure >= self.HIGH_WATERMARK:
+            chunk_size = max(minimum, chunk_size // 2)
+        elif pressure <= self.LOW_WATERMARK:
+            grown = chunk_size + max(1, chunk_size // 2)
+            chunk_size = min(maximum, grown) if maximum else grown
+        return chunk_size
+
+    def scaled_size(self, requested: int, minimum: int = 1, item_mb: Optional[float] = None) -> int:
+        """Scale a cache size or worker count to the budget.
+
+        With ``item_mb`` the size is capped so ``size * item_mb`` fits in
+        the remaining headroom; otherwise it is scaled by the free fraction
+        of the budget once past the low watermark.
+
+        Args:
+            requested: Desired size
+            minimum: Smallest allowed size
+            item_mb: Approximate memory per item in MB
+
+        Returns:
+            Size to use
+        """
+        if not self.enabled or requested <= minimum:
+            return requested
+
+        rss_mb = self.sample()
+        headroom_mb = max(0.0, self.max_memory_mb - rss_mb)
+
+        if item_mb:
+            return max(minimum, min(requested, int(headroom_mb / item_mb)))
+
+        pressure = rss_mb / self.max_memory_mb
+        if pressure <= self.LOW_WATERMARK:
+            return requested
+        free_fraction = max(0.0, 1.0 - pressure) / (1.0 - self.LOW_WATERMARK)
+        return max(minimum, int(requested * free_fraction))
+
+    def start(self) -> None:
+        """Start background RSS sampling."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-budget", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop background RSS sampling."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=max(1.0, self.sample_interval_s * 4))
+        self._thread = None
+        self.sample()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.sample_interval_s):
+            self.sample()
+
+    def to_dict(self) -> Dict[str, object]:
+        """Summary for reporting."""
+        return {
+            "max_memory_mb": self.max_memory_mb,
+            "peak_memory_mb": round(self.peak_mb, 1),
+            "stage_peak_memory_mb": {
+                name: round(peak, 1) for name, peak in self.stage_peaks_mb.items()
+            },
+        }
+
+
+if __name__ == "__main__":
+    budget = MemoryBudget(max_memory_mb=2048)
+    budget.start()
+
+    budget.enter_stage("allocate")
+    data = [bytearray(1024 * 1024) for _ in range(50)]
+    budget.enter_stage(None)
+    del data
+
+    budget.stop()
+    print(f"Current RSS: {current_rss_mb():.1f} MB")
+    print(f"Pressure: {budget.pressure():.1%}")
+    print(f"Chunk size 500 -> {budget.adapt_chunk_size(500, maximum=2000)}")
+    print(f"LRU size 4096 -> {budget.scaled_size(4096, minimum=64, item_mb=0.05)}")
+    print(budget.to_dict())
@@ -0,0 +1,191 @@
+"""
+Ticket scheduling for pipeline runs.
+
+Orders tickets so the ones operations care about first (emergencies, recent
+work, work near the project corridor) are processed and streamed out first,
+and splits the ordered list into chunks that the pipeline runs end-to-end.
+"""
+
+from math import radians, sin, cos, sqrt, atan2
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import pandas as pd
+
+from core.validation_rules import load_gazetteer
+
+
+class TicketScheduler:
+    """Priority ordering and chunking of tickets."""
+
+    # Lower rank = processed first
+    DEFAULT_TICKET_TYPE_PRIORITY = {
+        "EMERGENCY": 0,
+        "DIGUP": 1,
+        "DIG UP": 1,
+        "NORMAL": 2,
+        "UPDATE": 3,
+        "SURVEY/DESIGN": 4,
+    }
+
+    DEFAULT_ORDER = ["ticket_type", "recency"]
+    DEFAULT_CHUNK_SIZE = 250
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize scheduler.
+
+        Args:
+            config: Scheduling configuration:
+                order: Priority keys applied in sequence, any of
+                    "ticket_type", "recency", "corridor" (default: ticket_type, recency)
+                ticket_type_priority: {ticket_type: rank} overrides
+                chunk_size: Tickets per pipeline chunk (default: 250)
+                corridor_kmz: Route KMZ for corridor proximity prefilter
+                corridor_points: [[lat, lng], ...] alternative to corridor_kmz
+                places_path: Places file for city centroids (see gazetteer.py)
+        """
+        config = config or {}
+
+        self.order = config.get("order", self.DEFAULT_ORDER)
+        unknown = set(self.order) - {"ticket_type", "recency", "corridor"}
+        if unknown:
+            raise ValueError(f"Unknown scheduling keys: {sorted(unknown)}")
+
+        self.chunk_size = int(config.get("chunk_size", self.DEFAULT_CHUNK_SIZE))
+        if self.chunk_size <= 0:
+            raise ValueError("scheduling.chunk_size must be positive")
+
+        self.ticket_type_priority = dict(self.DEFAULT_TICKET_TYPE_PRIORITY)
+        for ticket_type, rank in (config.get("ticket_type_priority") or {}).items():
+            self.ticket_type_priority[str(ticket_type).upper()] = rank
+        self._default_type_rank = max(self.ticket_type_priority.values()) + 1
+
+        self.corridor_points: List[Tuple[float, float]] = []
+        if config.get("corridor_points"):
+            self.corridor_points = [(float(lat), float(lng)) for lat, lng in config["corridor_points"]]
+        elif config.get("corridor_kmz"):
+            self.corridor_points = self._load_corridor_points(Path(config["corridor_kmz"]))
+
+        if "corridor" in self.order and not self.corridor_points:
+            print("⚠ Warning: corridor scheduling requested but no corridor points loaded")
+
+        self._corridor_distance_cache: Dict[Tuple[str, str], float] = {}
+        self.gazetteer = load_gazetteer(config.get("places_path"))
+
+    @staticmethod
+    def _load_corridor_points(kmz_path: Path) -> List[Tuple[float, float]]:
+        """Load route vertices from a KMZ file as (lat, lng) pairs."""
+        from shapely import get_coordinates
+        from utils.route_corridor import RouteCorridorValidator
+
+        validator = RouteCorridorValidator(kmz_path=kmz_path, buffer_distance_m=0.0)
+        if validator.route_gdf is None:
+            return []
+
+        coords = get_coordinates(validator.route_gdf.geometry.values)
+        return [(float(y), float(x)) for x, y in coords]
+
+    def ticket_type_rank(self, ticket: Dict[str, Any]) -> int:
+        """Rank ticket by type (lower = higher priority)."""
+        ticket_type = str(ticket.get("ticket_type") or "").strip().upper()
+        return self.ticket_type_priority.get(ticket_type, self._default_type_rank)
+
+    def corridor_distance_km(self, ticket: Dict[str, Any]) -> float:
+        """Cheap corridor distance estimate from the ticket's city centroid.
+
+        Returns infinity when the city is unknown or no corridor is loaded.
+        """
+        if not self.corridor_points:
+            return float("inf")
+
+        city = str(ticket.get("city") or "").strip().upper()
+        county = str(ticket.get("county") or "").strip().upper()
+        key = (city, county)
+
+        if key not in self._corridor_distance_cache:
+            centroid = self.gazetteer.lookup(city, county)
+            if centroid is None:
+                distance = float("inf")
+            else:
+                distance = min(
+                    _haversine_km(centroid[0], centroid[1], lat, lng)
+                    for lat, lng in self.corridor_points
+                )
+            self._corridor_distance_cache[key] = distance
+
+        return self._corridor_distance_cache[key]
+
+    def order_tickets(self, tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return tickets sorted by configured priority.
+
+        The sort is stable, so file order breaks ties.
+
+        Args:
+            tickets: List of ticket dictionaries
+
+        Returns:
+            New list of tickets in processing order
+        """
+        if not tickets:
+            return []
+
+        recency = None
+        if "recency" in self.order:
+            created = pd.to_datetime(
+                pd.Series([t.get("creation") for t in tickets], dtype="object"),
+                errors="coerce",
+                format="mixed",
+            )
+            # Newest first; unknown dates last
+            recency = [
+                -ts.value if not pd.isna(ts) else float("inf")
+                for ts in created
+            ]
+
+        def sort_key(index: int):
+            ticket = tickets[index]
+            key = []
+            for name in self.order:
+                if name == "ticket_type":
+                    key.append(self.ticket_type_rank(ticket))
+                elif name == "recency":
+                    key.append(recency[index])
+                elif name == "corridor":
+                    key.append(self.corridor_distance_km(ticket))
+            return tuple(key)
+
+        return [tickets[i] for i in sorted(range(len(tickets)), key=sort_key)]
+
+    def chunk(self, tickets: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split tickets into chunks of chunk_size."""
+        return [
+            tickets[i:i + self.chunk_size]
+            for i in range(0, len(tickets), self.chunk_size)
+        ]
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometers."""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 6371.0 * 2 * atan2(sqrt(a), sqrt(1 - a))
+
+
+if __name__ == "__main__":
+    scheduler = TicketScheduler({
+        "order": ["ticket_type", "corridor", "recency"],
+        "corridor_points": [[31.53, -103.13]],
+        "chunk_size": 2,
+    })
+
+    tickets = [
+        {"ticket_number": "1", "ticket_type": "Normal", "city": "Kermit", "county": "Winkler", "creation": "2025-01-02"},
+        {"ticket_number": "2", "ticket_type": "Emergency", "city": "Andrews", "county": "Andrews", "creation": "2025-01-01"},
+        {"ticket_number": "3", "ticket_type": "Normal", "city": "Pyote", "county": "Ward", "creation": "2025-01-03"},
+        {"ticket_number": "4", "ticket_type": "Emergency", "city": "Pyote", "county": "Ward", "creation": "2024-12-30"},
+    ]
+
+    ordered = scheduler.order_tickets(tickets)
+    print("Processing order:", [t["ticket_number"] for t in ordered])
+    print("Chunks:", [[t["ticket_number"] for t in c] for c in scheduler.chunk(ordered)])
@@ -5,10 +5,19 @@ Each rule checks for specific quality issues and returns validation results
 with severity levels and descriptions.
 """
 
+import sys
+from pathlib import Path
 from typing import List, Optional
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
+import pandas as pd
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "tools" / "geocoding"))
+
+from gazetteer import Gazetteer, load_gazetteer
+
 
 @dataclass
 class ValidationResult:
@@ -57,6 +66,15 @@ class ValidationRule(ABC):
         """
         pass
 
+    def check_batch(self, records: pd.DataFrame) -> List[Optional[ValidationResult]]:
+        """Check every row of a DataFrame of geocode fields.
+
+        The default runs check() per row (NaN becomes None); rules with a
+        vectorized check override this.
+        """
+        rows = records.astype(object).where(records.notna(), None).to_dict("records")
+        return [self.check(**row) for row in rows]
+
 
 class LowConfidenceRule(ValidationRule):
     """Flag geocodes with low confidence."""
@@ -100,21 +118,9 @@ class EmergencyLowConfidenceRule(ValidationRule):
 class CityDistanceRule(ValidationRule):
     """Flag geocodes far from expected city center."""
     
-    # City centroids (from ProximityGeocoder)
-    CITY_CENTROIDS = {
-        ("KERMIT", "WINKLER"): (31.8576, -103.0930),
-        ("PYOTE", "WARD"): (31.5401, -103.1293),
-        ("BARSTOW", "WARD"): (31.4596, -103.3954),
-        ("MONAHANS", "WARD"): (31.5943, -102.8929),
-        ("ANDREWS", "ANDREWS"): (32.3185, -102.5457),
-        ("GARDENDALE", "ANDREWS"): (32.0165, -102.3779),
-        ("COYANOSA", "WARD"): (31.2693, -103.0324),
-        ("WICKETT", "WARD"): (31.5768, -103.0010),
-        ("THORNTONVILLE", "WARD"): (31.4446, -103.1079),
-    }
-    
-    def __init__(self, max_km: float = 50):
+    def __init__(self, max_km: float = 50, gazetteer: Optional[Gazetteer] = None):
         self.max_km = max_km
+        self.gazetteer = gazetteer or load_gazetteer()
     
     @staticmethod
     def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -146,22 +152,38 @@ class CityDistanceRule(ValidationRule):
         if city is None or county is None:
             return None
         
-        city_key = (city.upper(), county.upper())
-        if city_key not in self.CITY_CENTROIDS:
+        centroid = self.gazetteer.lookup(city, county)
+        if centroid is None:
             return None
         
-        city_lat, city_lng = self.CITY_CENTROIDS[city_key]
+        city_lat, city_lng = centroid
         distance = self.haversine_distance(latitude, longitude, city_lat, city_lng)
         
         if distance > self.max_km:
-            return ValidationResult(
-                flag="distance_from_city",
-                severity="WARNING",
-                message=f"Location {distance:.1f}km from {city} center (max: {self.max_km}km)",
-                action="Verify location is correct for this city"
-            )
+            return self._result(distance, city)
         return None
 
+    def check_batch(self, records: pd.DataFrame) -> List[Optional[ValidationResult]]:
+        """Vectorized check: one gazetteer lookup and distance pass for all rows."""
+        distances = self.gazetteer.distances_km(
+            pd.to_numeric(records["latitude"], errors="coerce"),
+            pd.to_numeric(records["longitude"], errors="coerce"),
+            records["city"],
+            records["county"],
+        )
+        return [
+            self._result(distance, city) if distance > self.max_km else None
+            for distance, city in zip(distances, records["city"])
+        ]
+
+    def _result(self, distance: float, city: str) -> ValidationResult:
+        return ValidationResult(
+            flag="distance_from_city",
+            severity="WARNING",
+            message=f"Location {distance:.1f}km from {city} center (max: {self.max_km}km)",
+            action="Verify location is correct for this city"
+        )
+
 
 class FallbackGeocodeRule(ValidationRule):
     """Flag geocodes using fallback methods."""
@@ -244,21 +266,27 @@ class OutOfCorridorRule(ValidationRule):
 class ValidationEngine:
     """Runs validation rules and collects results."""
     
-    def __init__(self, rules: Optional[List[ValidationRule]] = None):
+    def __init__(
+        self,
+        rules: Optional[List[ValidationRule]] = None,
+        gazetteer: Optional[Gazetteer] = None,
+    ):
         """Initialize validation engine.
         
         Args:
             rules: List of validation rules to apply
+            gazetteer: City centroids for the city-distance rule
+                (default: built-in project cities)
         """
-        self.rules = rules or self._get_default_rules()
+        self.rules = rules or self._get_default_rules(gazetteer)
     
     @staticmethod
-    def _get_default_rules() -> List[ValidationRule]:
+    def _get_default_rules(gazetteer: Optional[Gazetteer] = None) -> List[ValidationRule]:
         """Get default validation rules."""
         return [
             LowConfidenceRule(threshold=0.65),
             EmergencyLowConfidenceRule(threshold=0.75),
-            CityDistanceRule(max_km=50),
+            CityDistanceRule(max_km=50, gazetteer=gazetteer),
             FallbackGeocodeRule(),
             MissingRoadRule(),
             PipelineMismatchRule(max_distance_m=500.0),
@@ -283,6 +311,30 @@ class ValidationEngine:
         
         return results
     
+    def validate_batch(self, records: pd.DataFrame) -> List[List[ValidationResult]]:
+        """Run all validation rules over a DataFrame of geocode fields.
+
+        Equivalent to validate() per row, with vectorized rules (city
+        distance) evaluated for the whole batch at once.
+
+        Args:
+            records: One row per geocode (columns as validate() keywords)
+
+        Returns:
+            List of ValidationResult lists, one per row
+        """
+        results = [[] for _ in range(len(records))]
+        if len(records) == 0:
+            return results
+
+        records = records.reset_index(drop=True)
+        for rule in self.rules:
+            for row_results, result in zip(results, rule.check_batch(records)):
+                if result is not None:
+                    row_results.append(result)
+
+        return results
+
     def get_validation_flags(self, results: List[ValidationResult]) -> List[str]:
         """Extract validation flags from results.
         
@@ -15,6 +15,9 @@ from datetime import datetime
 from cache.cache_manager import CacheManager
 from cache.models import GeocodeRecord, QualityTier
 from stages.base_stage import BaseStage, StageResult, StageStatistics
+from core.scheduling import TicketScheduler
+from core.memory_budget import MemoryBudget
+from utils.result_stream import ResultStreamWriter, EXPORT_FIELDNAMES, record_to_row
 
 
 @dataclass
@@ -29,6 +32,8 @@ class PipelineResult:
     stage_statistics: List[StageStatistics] = field(default_factory=list)
     start_time: str = ""
     end_time: str = ""
+    peak_memory_mb: float = 0.0
+    stage_peak_memory_mb: Dict[str, float] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -42,6 +47,8 @@ class PipelineResult:
             "avg_time_ms": self.total_time_ms / self.total_tickets if self.total_tickets > 0 else 0,
             "start_time": self.start_time,
             "end_time": self.end_time,
+            "peak_memory_mb": self.peak_memory_mb,
+            "stage_peak_memory_mb": self.stage_peak_memory_mb,
             "stages": [stage.to_dict() for stage in self.stage_statistics],
         }
 
@@ -49,6 +56,11 @@ class PipelineResult:
 class Pipeline:
     """Orchestrates geocoding pipeline stages."""
 
+    # Chunk sizing when a memory budget is set without a scheduler
+    DEFAULT_CHUNK_SIZE = 500
+    MIN_CHUNK_SIZE = 10
+    MAX_CHUNK_SIZE = 5000
+
     def __init__(
         self,
         cache_manager: CacheManager,
@@ -69,24 +81,55 @@ class Pipeline:
         self.fail_fast = config.get("fail_fast", False)
         self.save_intermediate = config.get("save_intermediate", True)
 
+        # Optional priority scheduling (processes tickets in chunks)
+        scheduling_config = config.get("scheduling") or {}
+        self.scheduler = None
+        if scheduling_config.get("enabled", False):
+            self.scheduler = TicketScheduler(scheduling_config)
+
+        # Optional streaming output (appends results as each chunk commits)
+        self.streaming_config = config.get("streaming_output") or {}
+
+        # Memory budget (pipeline.max_memory_mb); RSS is always tracked per stage
+        max_memory_mb = config.get("max_memory_mb")
+        if max_memory_mb is None:
+            max_memory_mb = (config.get("pipeline") or {}).get("max_memory_mb")
+        self.memory_budget = MemoryBudget(max_memory_mb=max_memory_mb)
+
     def add_stage(self, stage: BaseStage) -> None:
         """Add a stage to the pipeline.
 
         Args:
             stage: Stage instance to add
         """
+        stage.memory_budget = self.memory_budget
         self.stages.append(stage)
 
     def run(
         self,
         tickets: List[Dict[str, Any]],
-        pipeline_id: Optional[str] = None
+        pipeline_id: Optional[str] = None,
+        result_sink: Optional[ResultStreamWriter] = None,
     ) -> PipelineResult:
         """Run all stages on tickets in sequence.
 
+        Tickets run in chunks, each chunk going through all stages before the
+        next one starts:
+
+        - With scheduling enabled, tickets are ordered by priority and split
+          into the scheduler's chunks, so high-priority results land in the
+          cache (and the result sink) first.
+        - Otherwise, with a memory budget, tickets keep their order in chunks
+          of DEFAULT_CHUNK_SIZE, resized between chunks (MIN_CHUNK_SIZE to
+          MAX_CHUNK_SIZE) to stay within the budget.
+        - With neither, all tickets form one chunk: every stage runs over all
+          tickets before the next stage starts.
+
         Args:
             tickets: List of ticket data dictionaries
             pipeline_id: Optional pipeline run ID (generated if not provided)
+            result_sink: Optional ResultStreamWriter receiving each finished
+                chunk (defaults to one built from ``streaming_output`` config)
 
         Returns:
             PipelineResult with overall statistics
@@ -98,11 +141,44 @@ class Pipeline:
         start_time = time.time()
         start_time_str = datetime.now().isoformat()
 
+        if (
+            result_sink is None
+            and self.streaming_config.get("enabled", True)
+            and self.streaming_config.get("path")
+        ):
+            result_sink = ResultStreamWriter(
+                self.streaming_config["path"],
+                output_format=self.streaming_config.get("format"),
+                append=self.streaming_config.get("append", False),
+            )
+
+        # Order tickets
+        if self.scheduler is not None:
+            tickets = self.scheduler.order_tickets(tickets)
+
+        # Chunk size: the scheduler's, the memory budget's starting size,
+        # or a single chunk holding every ticket
+        if self.scheduler is not None:
+            chunk_size = max_chunk_size = self.scheduler.chunk_size
+        elif self.memory_budget.enabled:
+            chunk_size = self.DEFAULT_CHUNK_SIZE
+            max_chunk_size = self.MAX_CHUNK_SIZE
+        else:
+            chunk_size = max_chunk_size = max(1, len(tickets))
+        chunked = chunk_size < len(tickets)
+
         print(f"\n{'='*80}")
         print(f"Starting Pipeline: {self.pipeline_name}")
         print(f"Pipeline ID: {pipeline_id}")
         print(f"Tickets: {len(tickets)}")
         print(f"Stages: {len(self.stages)}")
+        if chunked:
+            order = f" (priority order: {', '.join(self.scheduler.order)})" if self.scheduler else ""
+            print(f"Chunk size: {chunk_size}{order}")
+        if self.memory_budget.enabled:
+            print(f"Memory budget: {self.memory_budget.max_memory_mb:.0f} MB")
+        if result_sink is not None:
+            print(f"Streaming results to: {result_sink.output_path}")
         print(f"{'='*80}\n")
 
         # Record pipeline run in database (optional)
@@ -116,36 +192,86 @@ class Pipeline:
             print(f"⚠️  Warning: Could not record pipeline run to database: {e}")
             print(f"   Continuing with pipeline execution...")
 
-        # Run each stage
-        stage_statistics = []
+        # Reset stage statistics (accumulated across chunks)
         for stage in self.stages:
-            print(f"Running stage: {stage.stage_name}")
-            print(f"-" * 80)
-
-            # Reset stage statistics
             stage.reset_statistics()
+        stage_times_ms = {stage.stage_name: 0 for stage in self.stages}
+        verbose_stages = not chunked
+        stopped = False
 
-            # Run stage on all tickets
-            stage_start = time.time()
-            stage_results = stage.run(tickets)
-            stage_time_ms = int((time.time() - stage_start) * 1000)
-
-            # Get statistics
-            stats = stage.get_statistics()
-            stage_statistics.append(stats)
-
-            # Print stage summary
-            print(f"  Processed: {stats.processed}/{stats.total_tickets}")
-            print(f"  Succeeded: {stats.succeeded}")
-            print(f"  Skipped: {stats.skipped}")
-            print(f"  Failed: {stats.failed}")
-            print(f"  Time: {stage_time_ms}ms ({stats.to_dict()['avg_time_ms']:.1f}ms avg)")
-            print()
+        if self.memory_budget.enabled:
+            self.memory_budget.start()
 
-            # Check fail_fast
-            if self.fail_fast and stats.failed > 0:
-                print(f"⚠️  Stopping pipeline: fail_fast=True and {stats.failed} tickets failed")
-                break
+        # Run each chunk through all stages
+        position = 0
+        chunk_index = 0
+        try:
+            while position < len(tickets) and not stopped:
+                chunk = tickets[position:position + chunk_size]
+                position += len(chunk)
+                chunk_index += 1
+
+                for stage in self.stages:
+                    if verbose_stages:
+                        print(f"Running stage: {stage.stage_name}")
+                        print("-" * 80)
+
+                    failed_before = stage.get_statistics().failed
+
+                    # Run stage on chunk (caches/workers sized to the budget first)
+                    if self.memory_budget.enabled:
+                        stage.apply_memory_budget()
+                    self.memory_budget.enter_stage(stage.stage_name)
+                    stage_start = time.time()
+                    stage.run(chunk)
+                    stage_time_ms = int((time.time() - stage_start) * 1000)
+                    stage_times_ms[stage.stage_name] += stage_time_ms
+                    self.memory_budget.enter_stage(None)
+
+                    if verbose_stages:
+                        self._print_stage_summary(stage.get_statistics(), stage_time_ms)
+
+                    # Check fail_fast
+                    failed = stage.get_statistics().failed - failed_before
+                    if self.fail_fast and failed > 0:
+                        print(f"⚠️  Stopping pipeline: fail_fast=True and {failed} tickets failed")
+                        stopped = True
+                        break
+
+                # Stream finished records for this chunk
+                if result_sink is not None:
+                    chunk_tickets = list(dict.fromkeys(t["ticket_number"] for t in chunk))
+                    result_sink.write_records(self._get_final_results(chunk_tickets))
+
+                if not verbose_stages:
+                    streamed = f", {result_sink.written_count} streamed" if result_sink is not None else ""
+                    print(f"  Chunk {chunk_index}: {len(chunk)} tickets ({position}/{len(tickets)}{streamed})")
+
+                # Backpressure: shrink (or regrow) chunks to stay under budget
+                if self.memory_budget.enabled and chunked:
+                    if self.memory_budget.over_budget():
+                        self.memory_budget.relieve_pressure()
+                    new_chunk_size = self.memory_budget.adapt_chunk_size(
+                        chunk_size, minimum=self.MIN_CHUNK_SIZE, maximum=max_chunk_size
+                    )
+                    if new_chunk_size != chunk_size:
+                        print(
+                            f"  Memory {self.memory_budget.sample():.0f}/"
+                            f"{self.memory_budget.max_memory_mb:.0f} MB: "
+                            f"chunk size {chunk_size} -> {new_chunk_size}"
+                        )
+                        chunk_size = new_chunk_size
+        finally:
+            self.memory_budget.stop()
+
+        stage_statistics = [stage.get_statistics() for stage in self.stages]
+
+        if not verbose_stages:
+            print()
+            for stage, stats in zip(self.stages, stage_statistics):
+                print(f"Stage: {stage.stage_name}")
+                print("-" * 80)
+                self._print_stage_summary(stats, stage_times_ms[stage.stage_name])
 
         # Calculate overall statistics
         total_time_ms = int((time.time() - start_time) * 1000)
@@ -167,6 +293,11 @@ class Pipeline:
             stage_statistics=stage_statistics,
             start_time=start_time_str,
             end_time=end_time_str,
+            peak_memory_mb=round(self.memory_budget.peak_mb, 1),
+            stage_peak_memory_mb={
+                name: round(peak, 1)
+                for name, peak in self.memory_budget.stage_peaks_mb.items()
+            },
         )
 
         # Print final summary
@@ -184,6 +315,16 @@ class Pipeline:
 
         return result
 
+    @staticmethod
+    def _print_stage_summary(stats: StageStatistics, stage_time_ms: int) -> None:
+        """Print summary for one stage."""
+        print(f"  Processed: {stats.processed}/{stats.total_tickets}")
+        print(f"  Succeeded: {stats.succeeded}")
+        print(f"  Skipped: {stats.skipped}")
+        print(f"  Failed: {stats.failed}")
+        print(f"  Time: {stage_time_ms}ms ({stats.to_dict()['avg_time_ms']:.1f}ms avg)")
+        print()
+
     def _record_pipeline_run(
         self,
         pipeline_id: str,
@@ -272,6 +413,8 @@ class Pipeline:
         print(f"Succeeded: {result.total_succeeded} ({result.total_succeeded/result.total_tickets*100:.1f}%)")
         print(f"Failed: {result.total_failed} ({result.total_failed/result.total_tickets*100:.1f}%)")
         print(f"Total Time: {result.total_time_ms}ms ({result.total_time_ms/result.total_tickets:.1f}ms avg)")
+        if result.peak_memory_mb:
+            print(f"Peak Memory: {result.peak_memory_mb:.0f} MB")
         print(f"{'='*80}\n")
 
     def export_results(
@@ -306,39 +449,12 @@ class Pipeline:
                 return 0
 
             # Write header
-            writer = csv.DictWriter(f, fieldnames=[
-                "ticket_number", "geocode_key", "latitude", "longitude",
-                "confidence", "method", "approach", "quality_tier",
-                "review_priority", "validation_flags", "street", "intersection",
-                "city", "county", "ticket_type", "duration", "work_type",
-                "excavator", "created_at", "created_by_stage"
-            ])
+            writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDNAMES)
             writer.writeheader()
 
             # Write records
             for record in records:
-                writer.writerow({
-                    "ticket_number": record.ticket_number,
-                    "geocode_key": record.geocode_key,
-                    "latitude": record.latitude,
-                    "longitude": record.longitude,
-                    "confidence": record.confidence,
-                    "method": record.method,
-                    "approach": record.approach,
-                    "quality_tier": record.quality_tier.value if hasattr(record.quality_tier, 'value') else record.quality_tier,
-                    "review_priority": record.review_priority.value if hasattr(record.review_priority, 'value') else record.review_priority,
-                    "validation_flags": ",".join(record.validation_flags) if record.validation_flags else "",
-                    "street": record.street,
-                    "intersection": record.intersection,
-                    "city": record.city,
-                    "county": record.county,
-                    "ticket_type": record.ticket_type,
-                    "duration": record.duration,
-                    "work_type": record.work_type,
-                    "excavator": record.excavator,
-                    "created_at": record.created_at,
-                    "created_by_stage": record.created_by_stage,
-                })
+                writer.writerow(record_to_row(record))
 
         print(f"Exported {len(records)} records to {output_path}")
         return len(records)
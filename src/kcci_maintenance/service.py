@@ -0,0 +1,729 @@
+"""
+Warm geocoding service.
+
+Loads the road network, pipeline layers, route corridor and jurisdiction
+data once and keeps them resident, exposing single and batch
+geocode/validate/enrich lookups over a localhost HTTP port or a Unix socket.
+
+Endpoints:
+    GET  /health              Service status and loaded components
+    GET  /geocode?street=...  Geocode one ticket (query parameters)
+    POST /geocode             Geocode one ticket (JSON object)
+    POST /geocode/batch       Geocode many tickets (JSON list or {"tickets": [...]})
+    GET  /validate?latitude=...&longitude=...
+    POST /validate            Validate one location
+    POST /validate/batch      Validate many locations
+    GET  /enrich?latitude=...&longitude=...
+    POST /enrich              Enrich one location with jurisdiction data
+    POST /enrich/batch        Enrich many locations
+
+Add ``format=text`` to a GET request to receive ``lat,lng,confidence`` as
+plain text (handy for spreadsheet WEBSERVICE() calls).
+
+Requests are served on threads, but the proximity geocoder swaps and pages
+its road frame and caches in place, so geocoder calls are serialized by a
+service-level lock; validation and enrichment run concurrently.
+"""
+
+import sys
+import json
+import logging
+import os
+import socketserver
+import stat
+import threading
+import time
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+
+# Add paths for imports
+parent_dir = Path(__file__).parent
+tools_dir = parent_dir.parent / "tools" / "geocoding"
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(tools_dir))
+
+from core.quality_assessment import QualityAssessor
+from core.validation_rules import ValidationEngine, ValidationResult
+
+try:
+    from proximity_geocoder import ProximityGeocoder
+except ImportError:
+    ProximityGeocoder = None
+
+logger = logging.getLogger(__name__)
+
+try:
+    from stages.stage_3_proximity import road_region_bounds
+except ImportError:
+    road_region_bounds = None
+
+try:
+    from utils.pipeline_proximity import PipelineProximityAnalyzer
+except ImportError:
+    PipelineProximityAnalyzer = None
+
+try:
+    from utils.route_corridor import RouteCorridorValidator
+except ImportError:
+    RouteCorridorValidator = None
+
+try:
+    from utils.jurisdiction_enrichment import JurisdictionEnricher
+except ImportError:
+    JurisdictionEnricher = None
+
+
+class GeocodingService:
+    """Resident geocoding components shared across requests."""
+
+    def __init__(
+        self,
+        geocoder=None,
+        pipeline_analyzer=None,
+        corridor_validator=None,
+        jurisdiction_enricher=None,
+    ):
+        """Initialize service with already-loaded components.
+
+        Args:
+            geocoder: ProximityGeocoder instance (required for /geocode)
+            pipeline_analyzer: Optional PipelineProximityAnalyzer
+            corridor_validator: Optional RouteCorridorValidator
+            jurisdiction_enricher: Optional JurisdictionEnricher
+        """
+        self.geocoder = geocoder
+        self.pipeline_analyzer = pipeline_analyzer
+        self.corridor_validator = corridor_validator
+        self.jurisdiction_enricher = jurisdiction_enricher
+        self.quality_assessor = QualityAssessor()
+        # Share the geocoder's places (city fallback) with the city-distance rule
+        self.validation_engine = ValidationEngine(gazetteer=getattr(geocoder, "gazetteer", None))
+        self.started_at = time.time()
+        self.request_count = 0
+        # The geocoder is not thread-safe (road frame paging, LRU caches, memo)
+        self._geocoder_lock = threading.RLock()
+        self._count_lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        roads_path: Optional[Path] = None,
+        stages_config: Optional[Dict[str, Any]] = None,
+    ) -> "GeocodingService":
+        """Load all components once from pipeline stage configuration.
+
+        Uses the same config sections as Stages 3, 5 and 6
+        (``pipeline_layers``, ``route_corridor``, ``jurisdiction``).
+
+        Args:
+            roads_path: Road network GeoPackage (overrides stage 3 config)
+            stages_config: The ``stages`` section of a pipeline config
+
+        Returns:
+            GeocodingService with loaded components
+        """
+        stages_config = stages_config or {}
+        stage3_config = stages_config.get("stage_3_proximity", {}) or {}
+        stage5_config = stages_config.get("stage_5_validation", {}) or {}
+        stage6_config = stages_config.get("stage_6_enrichment", {}) or {}
+
+        geocoder = None
+        roads_path = roads_path or stage3_config.get("road_network_path")
+        if roads_path and ProximityGeocoder is not None:
+            roads_path = Path(roads_path)
+            if not roads_path.exists():
+                raise FileNotFoundError(f"Road network file not found: {roads_path}")
+            geocoder = ProximityGeocoder(
+                str(roads_path),
+                geometry_cache_size=stage3_config.get("geometry_cache_size", 512),
+                memo_size=stage3_config.get("proximity_memo_size", 10000),
+                memo_path=stage3_config.get("proximity_memo_path"),
+                county_boundaries=stage3_config.get("county_boundaries_path"),
+                region_bounds=road_region_bounds(stage3_config) if road_region_bounds else None,
+                tile_size=(stage3_config.get("road_region") or {}).get("tile_size", 0.5),
+                max_page_rings=(stage3_config.get("road_region") or {}).get("max_page_rings", 2),
+                projected_crs=stage3_config.get("projected_crs"),
+                network_distance=stage3_config.get("network_distance", False),
+                shared_network=stage3_config.get("shared_network_path"),
+                places_file=stage3_config.get("places_path"),
+            )
+            print(f"✓ Loaded road network from {roads_path}")
+
+        pipeline_analyzer = None
+        pipeline_config = stage3_config.get("pipeline_layers", {})
+        if pipeline_config.get("enabled", False) and PipelineProximityAnalyzer is not None:
+            shapefile_paths = pipeline_config.get("shapefiles", [])
+            if shapefile_paths:
+                try:
+                    pipeline_analyzer = PipelineProximityAnalyzer(
+                        shapefile_paths=[Path(p) for p in shapefile_paths],
+                        boost_thresholds=pipeline_config.get("boost_thresholds"),
+                        validation_distance_m=pipeline_config.get("validation_distance_m", 500.0),
+                    )
+                    print(f"✓ Loaded {len(shapefile_paths)} pipeline layers")
+                except Exception as e:
+                    print(f"⚠ Warning: Failed to initialize pipeline analyzer: {e}")
+
+        corridor_validator = None
+        corridor_config = stage5_config.get("route_corridor", {})
+        if corridor_config.get("enabled", False) and RouteCorridorValidator is not None:
+            kmz_path = corridor_config.get("kmz_path")
+            if kmz_path:
+                try:
+                    corridor_validator = RouteCorridorValidator(
+                        kmz_path=Path(kmz_path),
+                        buffer_distance_m=corridor_config.get("buffer_distance_m", 500.0),
+                    )
+                    print(f"✓ Loaded route corridor from {kmz_path}")
+                except Exception as e:
+                    print(f"⚠ Warning: Failed to initialize corridor validator: {e}")
+
+        jurisdiction_enricher = None
+        jurisdiction_config = stage6_config.get("jurisdiction", {})
+        if jurisdiction_config.get("enabled", False) and JurisdictionEnricher is not None:
+            geojson_path = jurisdiction_config.get("geojson_path")
+            if geojson_path:
+                try:
+                    jurisdiction_enricher = JurisdictionEnricher(
+                        geojson_path=Path(geojson_path),
+                        attributes=jurisdiction_config.get("attributes", []),
+                        cache_spatial_index=jurisdiction_config.get("cache_spatial_index", True),
+                    )
+                    print(f"✓ Loaded jurisdictions from {geojson_path}")
+                except Exception as e:
+                    print(f"⚠ Warning: Failed to initialize jurisdiction enricher: {e}")
+
+        return cls(
+            geocoder=geocoder,
+            pipeline_analyzer=pipeline_analyzer,
+            corridor_validator=corridor_validator,
+            jurisdiction_enricher=jurisdiction_enricher,
+        )
+
+    def count_request(self) -> None:
+        """Count one request (called from the handler threads)."""
+        with self._count_lock:
+            self.request_count += 1
+
+    def health(self) -> Dict[str, Any]:
+        """Report service status and which components are loaded."""
+        with self._geocoder_lock:
+            return self._health()
+
+    def _health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "requests": self.request_count,
+            "components": {
+                "geocoder": self.geocoder is not None,
+                "pipeline_analyzer": self.pipeline_analyzer is not None,
+                "corridor_validator": self.corridor_validator is not None,
+                "jurisdiction_enricher": self.jurisdiction_enricher is not None,
+            },
+            "geometry_cache": (
+                self.geocoder.geometry_cache.stats() if self.geocoder is not None else None
+            ),
+            "proximity_memo": (
+                self.geocoder.memo.stats() if self.geocoder is not None else None
+            ),
+            "county_index": (
+                self.geocoder.county_index.stats() if self.geocoder is not None else None
+            ),
+            "road_region": (
+                self.geocoder.region.stats()
+                if self.geocoder is not None and self.geocoder.region is not None else None
+            ),
+            "road_graph": (
+                self.geocoder.road_graph.stats()
+                if self.geocoder is not None and self.geocoder.network_distance else None
+            ),
+            "gazetteer": (
+                self.geocoder.gazetteer.stats() if self.geocoder is not None else None
+            ),
+            "shared_network": (
+                self.geocoder.shared.stats()
+                if self.geocoder is not None and self.geocoder.shared is not None else None
+            ),
+        }
+
+    def geocode(self, ticket: Dict[str, Any], result=None) -> Dict[str, Any]:
+        """Geocode one ticket the same way Stage 3 does.
+
+        Args:
+            ticket: Dict with street, intersection, city, county and
+                optional ticket_type, duration, work_type, ticket_number
+            result: ProximityResult already computed for the ticket (batches)
+
+        Returns:
+            Dict with location, confidence, quality assessment and metadata
+        """
+        start_time = time.time()
+        if self.geocoder is None:
+            return {"success": False, "error": "No road network loaded"}
+
+        street = ticket.get("street") or ""
+        intersection = ticket.get("intersection") or ""
+        city = ticket.get("city") or ""
+        county = ticket.get("county") or ""
+        ticket_type = ticket.get("ticket_type")
+
+        if result is None:
+            with self._geocoder_lock:
+                result = self.geocoder.geocode_proximity(
+                    street=street,
+                    intersection=intersection,
+                    county=county,
+                    city=city,
+                    ticket_type=ticket_type,
+                    duration=ticket.get("duration"),
+                    work_type=ticket.get("work_type"),
+                )
+
+        if not result.success:
+            return {
+                "ticket_number": ticket.get("ticket_number"),
+                "success": False,
+                "error": result.error or "Proximity geocoding failed",
+                "processing_time_ms": int((time.time() - start_time) * 1000),
+            }
+
+        confidence = result.confidence
+        reasoning = result.reasoning
+        metadata = {}
+
+        # Apply pipeline proximity boost (mirrors Stage 3)
+        if self.pipeline_analyzer is not None:
+            boost, metadata = self.pipeline_analyzer.calculate_proximity_boost(
+                result.lat, result.lng
+            )
+            if boost > 0:
+                distance_m = metadata.get("pipeline_proximity_m", 0)
+                reasoning = (
+                    f"{reasoning or ''} "
+                    f"[Pipeline proximity boost: +{boost * 100:.1f}% "
+                    f"(distance: {distance_m:.1f}m)]"
+                ).strip()
+            confidence = min(1.0, confidence + boost)
+
+        response = {
+            "ticket_number": ticket.get("ticket_number"),
+            "success": True,
+            "latitude": result.lat,
+            "longitude": result.lng,
+            "confidence": confidence,
+            "method": "stage_3_proximity",
+            "approach": result.approach,
+            "reasoning": reasoning,
+        }
+        response.update(self._assess(
+            latitude=result.lat,
+            longitude=result.lng,
+            confidence=confidence,
+            method="stage_3_proximity",
+            approach=result.approach,
+            street=street,
+            intersection=intersection,
+            city=city,
+            county=county,
+            ticket_type=ticket_type,
+            metadata=metadata,
+        ))
+        response["processing_time_ms"] = int((time.time() - start_time) * 1000)
+        return response
+
+    def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a location (corridor containment plus validation rules).
+
+        Args:
+            data: Dict with latitude, longitude and optional confidence,
+                approach, city, county, ticket_type, metadata
+
+        Returns:
+            Dict with validation flags, quality tier, review priority
+        """
+        response, geocode_data = self._validation_input(data)
+        response.update(self._assess(**geocode_data))
+        return response
+
+    def _validation_input(self, data: Dict[str, Any]):
+        """(response skeleton, _assess() keywords) for a location to validate."""
+        latitude, longitude = _coordinates(data)
+        metadata = dict(data.get("metadata") or {})
+
+        if self.corridor_validator is not None:
+            _, corridor_metadata = self.corridor_validator.check_containment(latitude, longitude)
+            metadata.update(corridor_metadata)
+
+        if self.pipeline_analyzer is not None and "pipeline_proximity_m" not in metadata:
+            _, pipeline_metadata = self.pipeline_analyzer.calculate_proximity_boost(
+                latitude, longitude
+            )
+            metadata.update(pipeline_metadata)
+
+        confidence = data.get("confidence")
+        response = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "confidence": float(confidence) if confidence is not None else None,
+        }
+        geocode_data = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "confidence": response["confidence"],
+            "method": data.get("method", "service"),
+            "approach": data.get("approach"),
+            "street": data.get("street"),
+            "intersection": data.get("intersection"),
+            "city": data.get("city"),
+            "county": data.get("county"),
+            "ticket_type": data.get("ticket_type"),
+            "metadata": metadata,
+        }
+        return response, geocode_data
+
+    def enrich(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Enrich a location with jurisdiction data.
+
+        Args:
+            data: Dict with latitude and longitude
+
+        Returns:
+            Dict with jurisdiction attributes
+        """
+        latitude, longitude = _coordinates(data)
+        if self.jurisdiction_enricher is None:
+            return {
+                "latitude": latitude,
+                "longitude": longitude,
+                "success": False,
+                "error": "No jurisdiction data loaded",
+            }
+
+        success, jurisdiction = self.jurisdiction_enricher.determine_jurisdiction(
+            latitude, longitude
+        )
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "success": success,
+            **jurisdiction,
+        }
+
+    def geocode_batch(self, tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Geocode a list of tickets.
+
+        Proximity results for the whole batch are computed first with
+        ProximityGeocoder.geocode_batch, then each ticket is assessed as in
+        geocode() with its batch result.
+        """
+        results: Dict[int, Any] = {}
+        if self.geocoder is not None and len(tickets) > 1:
+            valid = [t for t in tickets if isinstance(t, dict)]
+            try:
+                with self._geocoder_lock:
+                    batch = self.geocoder.geocode_batch(pd.DataFrame(valid))
+                results = {id(t): result for t, result in zip(valid, batch)}
+            except Exception as e:
+                # Per-ticket geocoding still runs and reports its own errors
+                logger.warning(f"Batch geometry prefill failed ({len(tickets)} tickets): {e}")
+        return [
+            self._safe(lambda t: self.geocode(t, results.get(id(t))), ticket)
+            for ticket in tickets
+        ]
+
+    def validate_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validate a list of locations.
+
+        Each item is prepared as in validate(), then the validation rules run
+        over the whole batch with ValidationEngine.validate_batch; items that
+        fail report their own error.
+        """
+        responses: List[Optional[Dict[str, Any]]] = []
+        prepared = []
+        for index, item in enumerate(items):
+            try:
+                response, geocode_data = self._validation_input(_batch_item(item))
+            except Exception as e:
+                responses.append(self._error(item, e))
+                continue
+            responses.append(response)
+            prepared.append((index, geocode_data))
+
+        batch_results: List[Optional[List[ValidationResult]]] = [None] * len(prepared)
+        if prepared:
+            try:
+                batch_results = list(self.validation_engine.validate_batch(
+                    pd.DataFrame([geocode_data for _, geocode_data in prepared])
+                ))
+            except Exception as e:
+                # Per-item validation still runs and reports its own errors
+                logger.warning(f"Batch validation failed ({len(prepared)} items): {e}")
+
+        for (index, geocode_data), validation_results in zip(prepared, batch_results):
+            try:
+                responses[index].update(
+                    self._assess(validation_results=validation_results, **geocode_data)
+                )
+            except Exception as e:
+                responses[index] = self._error(items[index], e)
+        return responses
+
+    def enrich_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Enrich a list of locations."""
+        return [self._safe(self.enrich, item) for item in items]
+
+    def _assess(
+        self,
+        metadata: Dict[str, Any],
+        validation_results: Optional[List[ValidationResult]] = None,
+        **geocode_data,
+    ) -> Dict[str, Any]:
+        """Run validation rules and quality assessment (mirrors BaseStage).
+
+        validation_results, when given, are the rules' results already
+        computed for this location (see validate_batch()).
+        """
+        if validation_results is None:
+            validation_results = self.validation_engine.validate(metadata=metadata, **geocode_data)
+        validation_flags = self.validation_engine.get_validation_flags(validation_results)
+
+        quality_tier = None
+        review_priority = None
+        if geocode_data.get("confidence") is not None:
+            quality_tier = self.quality_assessor.calculate_quality_tier(
+                confidence=geocode_data["confidence"],
+                method=geocode_data.get("method"),
+                approach=geocode_data.get("approach"),
+                validation_flags=validation_flags,
+                ticket_type=geocode_data.get("ticket_type"),
+            )
+            review_priority = self.quality_assessor.calculate_review_priority(
+                confidence=geocode_data["confidence"],
+                quality_tier=quality_tier,
+                validation_flags=validation_flags,
+                ticket_type=geocode_data.get("ticket_type"),
+                approach=geocode_data.get("approach"),
+            )
+
+        return {
+            "quality_tier": _enum_value(quality_tier),
+            "review_priority": _enum_value(review_priority),
+            "validation_flags": validation_flags,
+            "validation_messages": [r.message for r in validation_results],
+            "metadata": metadata,
+        }
+
+    @staticmethod
+    def _safe(func, item: Any) -> Dict[str, Any]:
+        """Run one batch item, reporting errors per item instead of failing the batch."""
+        try:
+            return func(_batch_item(item))
+        except Exception as e:
+            return GeocodingService._error(item, e)
+
+    @staticmethod
+    def _error(item: Any, error: Exception) -> Dict[str, Any]:
+        """Per-item error entry of a batch response."""
+        if not isinstance(item, dict):
+            return {"success": False, "error": str(error)}
+        return {"success": False, "error": str(error), **{
+            k: item.get(k) for k in ("ticket_number",) if k in item
+        }}
+
+
+def _batch_item(item: Any) -> Dict[str, Any]:
+    """A batch item, which must be a JSON object."""
+    if not isinstance(item, dict):
+        raise TypeError(f"Batch items must be JSON objects, not {type(item).__name__}")
+    return item
+
+
+def _coordinates(data: Dict[str, Any]):
+    """Extract (latitude, longitude) floats from request data."""
+    latitude = data.get("latitude", data.get("lat"))
+    longitude = data.get("longitude", data.get("lng"))
+    if latitude is None or longitude is None:
+        raise ValueError("latitude and longitude are required")
+    return float(latitude), float(longitude)
+
+
+def _enum_value(value):
+    return value.value if hasattr(value, "value") else value
+
+
+def make_handler(service: GeocodingService):
+    """Build a request handler class bound to a service instance."""
+
+    single_routes = {
+        "/geocode": service.geocode,
+        "/validate": service.validate,
+        "/enrich": service.enrich,
+    }
+    batch_routes = {
+        "/geocode/batch": service.geocode_batch,
+        "/validate/batch": service.validate_batch,
+        "/enrich/batch": service.enrich_batch,
+    }
+
+    class GeocodingRequestHandler(BaseHTTPRequestHandler):
+        server_version = "KCCIGeocodingService/1.0"
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+            path = parsed.path.rstrip("/") or "/"
+
+            if path in ("/", "/health"):
+                self._send_json(200, service.health())
+                return
+            if path not in single_routes:
+                self._send_json(404, {"error": f"Unknown endpoint: {path}"})
+                return
+
+            response_format = params.pop("format", "json")
+            status, body = self._dispatch(single_routes[path], params)
+            if response_format == "text" and status == 200:
+                text = ""
+                if body.get("latitude") is not None:
+                    text = f"{body['latitude']},{body['longitude']},{body.get('confidence') or ''}"
+                self._send(200, text.encode("utf-8"), "text/plain; charset=utf-8")
+            else:
+                self._send_json(status, body)
+
+        def do_POST(self):
+            path = urlparse(self.path).path.rstrip("/")
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"null")
+            except (ValueError, json.JSONDecodeError) as e:
+                self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+                return
+
+            if path in batch_routes:
+                if isinstance(payload, dict):
+                    payload = payload.get("tickets", payload.get("items"))
+                if not isinstance(payload, list):
+                    self._send_json(400, {"error": "Batch body must be a JSON list"})
+                    return
+                status, body = self._dispatch(batch_routes[path], payload)
+                if status == 200:
+                    body = {"count": len(body), "results": body}
+                self._send_json(status, body)
+            elif path in single_routes:
+                if not isinstance(payload, dict):
+                    self._send_json(400, {"error": "Body must be a JSON object"})
+                    return
+                self._send_json(*self._dispatch(single_routes[path], payload))
+            else:
+                self._send_json(404, {"error": f"Unknown endpoint: {path}"})
+
+        def _dispatch(self, func, payload):
+            service.count_request()
+            try:
+                return 200, func(payload)
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            except Exception as e:
+                return 500, {"error": str(e)}
+
+        def _send_json(self, status: int, body: Any):
+            data = json.dumps(body, default=str).encode("utf-8")
+            self._send(status, data, "application/json")
+
+        def _send(self, status: int, data: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            # client_address is an empty string for Unix sockets
+            if getattr(self.server, "verbose", False):
+                sys.stderr.write(f"[service] {format % args}\n")
+
+    return GeocodingRequestHandler
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server bound to a Unix domain socket."""
+
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) style address
+        return request, ("unix", 0)
+
+
+def create_server(
+    service: GeocodingService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[Path] = None,
+    verbose: bool = False,
+):
+    """Create (but do not start) an HTTP server for the service.
+
+    Args:
+        service: Loaded GeocodingService
+        host: Bind address for TCP mode
+        port: Port for TCP mode (0 picks a free port)
+        socket_path: Unix socket path (takes precedence over host/port)
+        verbose: Log each request to stderr
+
+    Returns:
+        Server instance; call serve_forever() to start
+    """
+    handler = make_handler(service)
+    if socket_path is not None:
+        socket_path = Path(socket_path)
+        if socket_path.exists():
+            # Only replace a stale socket, never a regular file at that path
+            if not stat.S_ISSOCK(socket_path.stat().st_mode):
+                raise FileExistsError(f"Not a socket, refusing to replace: {socket_path}")
+            socket_path.unlink()
+        server = ThreadingUnixHTTPServer(str(socket_path), handler)
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def serve(
+    service: GeocodingService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[Path] = None,
+    verbose: bool = False,
+) -> None:
+    """Run the service until interrupted."""
+    server = create_server(service, host, port, socket_path, verbose)
+    if socket_path is not None:
+        print(f"🚀 Geocoding service listening on unix:{socket_path}")
+    else:
+        print(f"🚀 Geocoding service listening on http://{host}:{server.server_address[1]}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✓ Shutting down geocoding service")
+    finally:
+        server.server_close()
+        if socket_path is not None and Path(socket_path).exists():
+            os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    # Run a service over the default road network
+    roads = Path(__file__).parent.parent.parent / "roads_merged.gpkg"
+    service = GeocodingService.from_config(roads_path=roads if roads.exists() else None)
+    print(json.dumps(service.health(), indent=2))
+    serve(service)
@@ -5,13 +5,11 @@ Each stage implements the BaseStage abstract class and provides
 a specific geocoding approach (API, proximity, geometric, etc.).
 
 Implemented Stages:
+- Stage1APIGeocoder: Concurrent, rate-limited API geocoding (Google Geocoding, etc.)
+- Stage2GeometricIntersection: Geometric intersection from the precomputed junction table
 - Stage3ProximityGeocoder: Proximity-based geocoding using road networks
+- Stage4Fallback: Fallback strategies for difficult cases (fuzzy road names, location priors)
 - Stage5Validation: Validation and quality reassessment
-
-Stub Stages (Not Yet Implemented):
-- Stage1APIGeocoder: API-based geocoding (Google Maps, etc.)
-- Stage2GeometricIntersection: Geometric intersection calculation
-- Stage4Fallback: Fallback strategies for difficult cases
 """
 
 from .base_stage import BaseStage, StageResult, StageStatistics
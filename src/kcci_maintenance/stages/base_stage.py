@@ -13,7 +13,7 @@ import time
 from cache.cache_manager import CacheManager
 from cache.models import GeocodeRecord, QualityTier, ReviewPriority
 from core.quality_assessment import QualityAssessor
-from core.validation_rules import ValidationEngine
+from core.validation_rules import ValidationEngine, load_gazetteer
 from core.reprocessing_rules import ReprocessingDecider
 
 
@@ -92,11 +92,27 @@ class BaseStage(ABC):
         
         # Initialize helper components
         self.quality_assessor = QualityAssessor()
-        self.validation_engine = ValidationEngine()
+        self.validation_engine = ValidationEngine(
+            gazetteer=load_gazetteer(config.get("places_path"))
+        )
         self.reprocessing_decider = ReprocessingDecider()
         
         # Statistics
         self.stats = StageStatistics(stage_name=stage_name)
+
+        # Memory budget (set by Pipeline.add_stage; None when run standalone)
+        self.memory_budget = None
+
+        # Skip decisions made ahead of run_single (see _pending_tickets)
+        self._skip_decisions: Dict[str, tuple[bool, Optional[str]]] = {}
+
+    def apply_memory_budget(self) -> None:
+        """Resize caches and worker pools to the memory budget.
+
+        Called by the pipeline before each chunk when a budget is set.
+        Stages with memory-hungry helpers override this using
+        ``self.memory_budget.scaled_size(...)`` on their configured sizes.
+        """
     
     @abstractmethod
     def process_ticket(self, ticket_data: Dict[str, Any]) -> GeocodeRecord:
@@ -144,6 +160,22 @@ class BaseStage(ABC):
         
         return should_skip, reason
     
+    def _pending_tickets(self, tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tickets the stage will process, for stages that prepare a whole run up front.
+
+        The skip decisions are kept and reused by run_single, so should_skip
+        runs once per ticket. A decision is used once: a ticket number seen
+        again in the same run is re-checked against the records written since.
+        """
+        self._skip_decisions = {}
+        pending = []
+        for ticket_data in tickets:
+            decision = self.should_skip(ticket_data)
+            self._skip_decisions[ticket_data.get("ticket_number")] = decision
+            if not decision[0]:
+                pending.append(ticket_data)
+        return pending
+
     def run(self, tickets: List[Dict[str, Any]]) -> List[StageResult]:
         """Run stage on list of tickets.
         
@@ -175,7 +207,8 @@ class BaseStage(ABC):
         start_time = time.time()
         
         # Check if should skip
-        should_skip, skip_reason = self.should_skip(ticket_data)
+        decision = self._skip_decisions.pop(ticket_data.get("ticket_number"), None)
+        should_skip, skip_reason = decision if decision is not None else self.should_skip(ticket_data)
         if should_skip:
             return StageResult(
                 ticket_number=ticket_number,
@@ -225,6 +258,7 @@ class BaseStage(ABC):
                 ticket_type=ticket_data.get("ticket_type"),
                 duration=ticket_data.get("duration"),
                 work_type=ticket_data.get("work_type"),
+                excavator=ticket_data.get("excavator"),
                 method=self.stage_name,
                 quality_tier=QualityTier.FAILED,
                 review_priority=ReviewPriority.CRITICAL,
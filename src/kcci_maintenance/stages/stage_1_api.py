@@ -1,25 +1,45 @@
 """
-Stage 1: API-based geocoding (STUB - Not Yet Implemented).
+Stage 1: API-based geocoding.
 
-Will use external geocoding API (e.g., Google Maps Geocoding API)
-for high-quality geocoding of intersections.
+Geocodes tickets through an external geocoding API (Google Geocoding by
+default, see core/api_client.py for providers). A stage run geocodes all
+of its non-skipped tickets concurrently up front, within the configured
+QPS and daily quota, and then records each ticket from those results, so a
+chunk costs roughly (distinct locations / QPS) seconds instead of one
+round trip per ticket. Responses are kept in the API response cache
+(cache/response_cache.py) in the pipeline database, so a location is paid
+for once per TTL, and each run reports the cost the cache saved.
 """
 
+import os
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 # Add paths for imports
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
-from stages.base_stage import BaseStage
+from stages.base_stage import BaseStage, StageResult
 from cache.cache_manager import CacheManager
-from cache.models import GeocodeRecord
+from cache.models import GeocodeRecord, QualityTier, ReviewPriority
+from cache.response_cache import ApiResponseCache
+from core.api_client import ApiResult, GeocodeQuery, build_client
 
 
 class Stage1APIGeocoder(BaseStage):
-    """Stage 1: API-based geocoding using external services (STUB)."""
+    """Stage 1: API-based geocoding using external services."""
+
+    DEFAULT_API_KEY_ENV = "GOOGLE_MAPS_API_KEY"
+
+    # Confidence by Google location_type (intersection results get INTERSECTION_CONFIDENCE)
+    INTERSECTION_CONFIDENCE = 0.95
+    LOCATION_TYPE_CONFIDENCE = {
+        "ROOFTOP": 0.95,
+        "RANGE_INTERPOLATED": 0.90,
+        "GEOMETRIC_CENTER": 0.80,
+        "APPROXIMATE": 0.50,
+    }
 
     def __init__(
         self,
@@ -30,7 +50,23 @@ class Stage1APIGeocoder(BaseStage):
 
         Args:
             cache_manager: Cache manager instance
-            config: Stage configuration with API credentials
+            config: Stage configuration:
+                provider: Geocoding provider (default: "google")
+                api_key: API key (default: read from api_key_env)
+                api_key_env: Environment variable holding the key
+                    (default: GOOGLE_MAPS_API_KEY)
+                base_url: Provider endpoint override (e.g. utils/fake_geocode_server.py)
+                qps: Requests per second (default: 10)
+                burst: Requests allowed at once after idling (default: one second's worth)
+                daily_quota: Requests per UTC day (default: unlimited)
+                max_workers: Concurrent requests (default: 8)
+                max_retries: Retries on 429/5xx (default: 4)
+                timeout_s: Per-request timeout (default: 10)
+                response_cache: Cache API responses in the pipeline DB (default: true)
+                response_ttl_days: Lifetime of cached results (default: 30)
+                negative_ttl_hours: Lifetime of cached ZERO_RESULTS/errors (default: 24)
+                cost_per_request: USD per request, for the savings report
+                    (default: provider list price)
         """
         super().__init__(
             stage_name="stage_1_api",
@@ -38,33 +74,159 @@ class Stage1APIGeocoder(BaseStage):
             config=config,
         )
 
-        print("⚠️  Stage1APIGeocoder is a STUB - not yet implemented")
-        print("    Will be implemented with Google Maps Geocoding API or similar")
+        api_key_env = config.get("api_key_env", self.DEFAULT_API_KEY_ENV)
+        api_key = config.get("api_key") or os.environ.get(api_key_env)
+        if not api_key:
+            raise ValueError(f"stage_1_api requires 'api_key' in config or ${api_key_env}")
+
+        self.response_cache = None
+        if config.get("response_cache", True):
+            provider = config.get("provider", "google")
+            self.response_cache = ApiResponseCache(
+                cache_manager.db_path,
+                ttl_days=float(config.get("response_ttl_days", 30)),
+                negative_ttl_hours=float(config.get("negative_ttl_hours", 24)),
+                cost_per_request=(
+                    {provider: float(config["cost_per_request"])}
+                    if config.get("cost_per_request") is not None else None
+                ),
+            )
+
+        self.client = build_client(
+            config, api_key, response_cache=self.response_cache, quota_db=cache_manager.db_path
+        )
+        # Configured concurrency (upper bound when a memory budget is set)
+        self.max_workers = self.client.max_workers
+        self._prefetched: Dict[str, ApiResult] = {}
+        print(
+            f"✓ Initialized Stage1APIGeocoder ({self.client.provider.name}, "
+            f"{self.client.bucket.rate:g} qps, {self.client.max_workers} workers)"
+        )
+
+    @staticmethod
+    def _query(ticket_data: Dict[str, Any]) -> GeocodeQuery:
+        """API query for a ticket, keyed by its geocode key."""
+        street = ticket_data.get("street") or ""
+        intersection = ticket_data.get("intersection") or ""
+        city = ticket_data.get("city") or ""
+        county = ticket_data.get("county") or ""
+        return GeocodeQuery(
+            key=CacheManager.generate_geocode_key(street, intersection, city, county),
+            street=street,
+            intersection=intersection,
+            city=city,
+            county=county,
+            state=ticket_data.get("state") or "TX",
+        )
+
+    def apply_memory_budget(self) -> None:
+        """Use fewer concurrent requests under memory pressure."""
+        if self.memory_budget is not None:
+            self.client.max_workers = self.memory_budget.scaled_size(self.max_workers, minimum=1)
+
+    def run(self, tickets: List[Dict[str, Any]]) -> List[StageResult]:
+        """Geocode the tickets' distinct locations concurrently, then record each ticket."""
+        pending = self._pending_tickets(tickets)
+        if self.response_cache is not None:
+            self.response_cache.start_run()
+        self._prefetched = self.client.geocode_many(self._query(ticket) for ticket in pending)
+        try:
+            return super().run(tickets)
+        finally:
+            self._prefetched = {}
+            if self.response_cache is not None and pending:
+                print(f"  {self.response_cache.summary()}")
+
+    def _confidence(self, result: ApiResult) -> float:
+        if "intersection" in result.result_types:
+            return self.INTERSECTION_CONFIDENCE
+        return self.LOCATION_TYPE_CONFIDENCE.get(result.location_type, 0.5)
 
     def process_ticket(self, ticket_data: Dict[str, Any]) -> GeocodeRecord:
         """Process a single ticket using API-based geocoding.
 
         Args:
             ticket_data: Dictionary with ticket fields
+                Required: ticket_number, street, intersection, city, county
+                Optional: ticket_type, duration, work_type, state
 
         Returns:
             GeocodeRecord with result
 
         Raises:
-            NotImplementedError: This stage is not yet implemented
+            Exception: If the API returns no location (ZERO_RESULTS, quota, errors)
         """
-        raise NotImplementedError(
-            "Stage1APIGeocoder is not yet implemented. "
-            "Future implementation will use Google Maps Geocoding API or similar service."
+        query = self._query(ticket_data)
+        result = self._prefetched.get(query.key) or self.client.geocode(query)
+        if not result.ok:
+            detail = f": {result.error}" if result.error else ""
+            raise Exception(f"API geocoding failed ({result.status}){detail}")
+
+        approach = (
+            "api_intersection" if "intersection" in result.result_types
+            else f"api_{(result.location_type or 'unknown').lower()}"
+        )
+
+        return GeocodeRecord(
+            ticket_number=ticket_data["ticket_number"],
+            geocode_key=query.key,
+            street=query.street,
+            intersection=query.intersection,
+            city=query.city,
+            county=query.county,
+            latitude=result.lat,
+            longitude=result.lng,
+            confidence=self._confidence(result),
+            method=self.stage_name,
+            approach=approach,
+            reasoning=f"{self.client.provider.name} geocoding: {result.formatted_address}",
+            ticket_type=ticket_data.get("ticket_type"),
+            duration=ticket_data.get("duration"),
+            work_type=ticket_data.get("work_type"),
+            excavator=ticket_data.get("excavator"),
+            metadata={
+                "provider": self.client.provider.name,
+                "query": query.address_line(),
+                "place_id": result.place_id,
+                "location_type": result.location_type,
+                "result_types": result.result_types,
+                "attempts": result.attempts,
+                "cached_response": result.cached,
+            },
+            # Quality tier will be calculated by _assess_quality()
+            quality_tier=QualityTier.GOOD,
+            review_priority=ReviewPriority.NONE,
         )
 
 
 if __name__ == "__main__":
-    print("Stage1APIGeocoder is a STUB implementation.")
-    print("\nPlanned features:")
-    print("  - Google Maps Geocoding API integration")
-    print("  - Intersection geocoding (e.g., 'CR 426 & CR 432')")
-    print("  - High-quality results with 90%+ confidence")
-    print("  - API key management and rate limiting")
-    print("  - Error handling for API failures")
-    print("\nStatus: Not yet implemented")
+    # Test Stage1APIGeocoder against the local fake server
+    from utils.fake_geocode_server import FakeGeocodeServer
+
+    print("Testing Stage1APIGeocoder...\n")
+
+    cache_db = Path(__file__).parent.parent / "outputs" / "test_stage1.db"
+    cache_db.parent.mkdir(parents=True, exist_ok=True)
+    if cache_db.exists():
+        cache_db.unlink()
+
+    locations = {"CR 426 and CR 432, Pyote, TX": (31.5401, -103.1293)}
+    with FakeGeocodeServer(locations, latency_s=0.05) as server:
+        stage = Stage1APIGeocoder(CacheManager(str(cache_db)), {
+            "api_key": "test",
+            "base_url": server.url,
+            "qps": 50,
+            "skip_rules": {"skip_if_locked": True},
+        })
+        tickets = [
+            {"ticket_number": f"TEST_API_{i:03d}", "street": "CR 426", "intersection": "CR 432",
+             "city": "Pyote", "county": "Ward"}
+            for i in range(20)
+        ] + [{"ticket_number": "TEST_API_MISS", "street": "Nowhere Rd", "intersection": "",
+              "city": "Pyote", "county": "Ward"}]
+        results = stage.run(tickets)
+
+    print(f"Succeeded: {sum(r.success for r in results)}/{len(results)}")
+    print(f"Server requests: {len(server.requests)}")
+    print(f"Client stats: {stage.client.stats()}")
+    print(f"Cost report: {stage.response_cache.report()}")
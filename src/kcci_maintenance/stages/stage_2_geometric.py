@@ -1,8 +1,8 @@
 """
-Stage 2: Geometric intersection calculation (STUB - Not Yet Implemented).
+Stage 2: Geometric intersection calculation.
 
-Will calculate actual geometric intersection points of two roads
-using road network data.
+Places a ticket at the actual intersection of its two roads, looked up in
+the junction table precomputed once per road network (junction_table.py).
 """
 
 import sys
@@ -11,15 +11,18 @@ from typing import Dict, Any
 
 # Add paths for imports
 parent_dir = Path(__file__).parent.parent
+grandparent_dir = parent_dir.parent
 sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(grandparent_dir / "tools" / "geocoding"))
 
+from geometric_geocoder import GeometricGeocoder, IntersectionResult
 from stages.base_stage import BaseStage
 from cache.cache_manager import CacheManager
-from cache.models import GeocodeRecord
+from cache.models import GeocodeRecord, QualityTier, ReviewPriority
 
 
 class Stage2GeometricIntersection(BaseStage):
-    """Stage 2: Geometric intersection calculation using road network (STUB)."""
+    """Stage 2: Geometric intersection calculation using road network."""
 
     def __init__(
         self,
@@ -30,7 +33,7 @@ class Stage2GeometricIntersection(BaseStage):
 
         Args:
             cache_manager: Cache manager instance
-            config: Stage configuration with road network path
+            config: Stage configuration with road_network_path
         """
         super().__init__(
             stage_name="stage_2_geometric",
@@ -38,34 +41,109 @@ class Stage2GeometricIntersection(BaseStage):
             config=config,
         )
 
-        print("⚠️  Stage2GeometricIntersection is a STUB - not yet implemented")
-        print("    Will be implemented with road network geometric analysis")
+        road_network_path = config.get("road_network_path")
+        if not road_network_path:
+            raise ValueError("stage_2_geometric requires 'road_network_path' in config")
+
+        road_network_path = Path(road_network_path)
+        if not road_network_path.exists():
+            raise FileNotFoundError(f"Road network file not found: {road_network_path}")
+
+        self.geocoder = GeometricGeocoder(
+            road_network_path,
+            junctions=True,
+            county_boundaries=config.get("county_boundaries_path"),
+            places_file=config.get("places_path"),
+        )
+        print(f"✓ Initialized Stage2GeometricIntersection ({len(self.geocoder.junctions)} junctions)")
 
     def process_ticket(self, ticket_data: Dict[str, Any]) -> GeocodeRecord:
         """Process a single ticket using geometric intersection calculation.
 
         Args:
             ticket_data: Dictionary with ticket fields
+                Required: ticket_number, street, intersection, city, county
+                Optional: ticket_type, duration, work_type
 
         Returns:
             GeocodeRecord with result
 
         Raises:
-            NotImplementedError: This stage is not yet implemented
+            Exception: If the roads are not found or do not intersect
         """
-        raise NotImplementedError(
-            "Stage2GeometricIntersection is not yet implemented. "
-            "Future implementation will calculate true geometric intersections "
-            "from road network data."
+        ticket_number = ticket_data["ticket_number"]
+        street = ticket_data.get("street", "")
+        intersection = ticket_data.get("intersection", "")
+        city = ticket_data.get("city", "")
+        county = ticket_data.get("county", "")
+
+        result: IntersectionResult = self.geocoder.geocode_intersection(
+            street=street,
+            intersection=intersection,
+            county=county,
+            city=city,
+        )
+        if not result.success:
+            raise Exception(result.error or "Geometric intersection failed")
+
+        metadata = result.metadata or {}
+        total = metadata.get("total_intersections", 1)
+        reasoning = (
+            f"Geometric intersection: {street} & {intersection} "
+            f"({total} junction point{'s' if total != 1 else ''} in the road network)"
+        )
+
+        return GeocodeRecord(
+            ticket_number=ticket_number,
+            geocode_key=CacheManager.generate_geocode_key(street, intersection, city, county),
+            street=street,
+            intersection=intersection,
+            city=city,
+            county=county,
+            latitude=result.lat,
+            longitude=result.lng,
+            confidence=result.confidence,
+            method=self.stage_name,
+            approach="geometric_intersection",
+            reasoning=reasoning,
+            ticket_type=ticket_data.get("ticket_type"),
+            duration=ticket_data.get("duration"),
+            work_type=ticket_data.get("work_type"),
+            excavator=ticket_data.get("excavator"),
+            metadata=metadata,
+            # Quality tier will be calculated by _assess_quality()
+            quality_tier=QualityTier.GOOD,
+            review_priority=ReviewPriority.NONE,
         )
 
 
 if __name__ == "__main__":
-    print("Stage2GeometricIntersection is a STUB implementation.")
-    print("\nPlanned features:")
-    print("  - Load road network from GeoPackage/Shapefile")
-    print("  - Find geometric intersection of two roads")
-    print("  - Handle multiple intersection points (select closest to city)")
-    print("  - High confidence for actual intersections (85-95%)")
-    print("  - Fallback to nearest point if no intersection found")
-    print("\nStatus: Not yet implemented")
+    # Test Stage2GeometricIntersection
+    print("Testing Stage2GeometricIntersection...\n")
+
+    cache_db = Path(__file__).parent.parent / "outputs" / "test_stage2.db"
+    cache_db.parent.mkdir(parents=True, exist_ok=True)
+    if cache_db.exists():
+        cache_db.unlink()
+
+    cache_manager = CacheManager(str(cache_db))
+    stage = Stage2GeometricIntersection(cache_manager, {
+        "road_network_path": Path(__file__).parent.parent.parent / "roads_merged.gpkg",
+        "skip_rules": {"skip_if_quality": ["EXCELLENT"], "skip_if_locked": True},
+    })
+
+    result = stage.run_single({
+        "ticket_number": "TEST_GEOM_001",
+        "street": "US 385",
+        "intersection": "FM 1788",
+        "city": "Andrews",
+        "county": "Andrews",
+    })
+    print(f"Success: {result.success}")
+    if result.geocode_record is not None:
+        record = result.geocode_record
+        print(f"  Location: {record.latitude}, {record.longitude}")
+        print(f"  Confidence: {record.confidence}")
+        print(f"  Quality: {record.quality_tier}")
+    else:
+        print(f"  Error: {result.error}")
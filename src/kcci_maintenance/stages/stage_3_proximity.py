@@ -7,18 +7,23 @@ Uses spatial proximity and road network analysis to geocode intersections.
 
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+import pandas as pd
 
 # Add paths for imports
 parent_dir = Path(__file__).parent.parent
 grandparent_dir = parent_dir.parent
 sys.path.insert(0, str(parent_dir))
 sys.path.insert(0, str(grandparent_dir))
+sys.path.insert(0, str(grandparent_dir / "tools" / "geocoding"))
 
+from county_index import load_county_boundaries, normalize_county
 from proximity_geocoder import ProximityGeocoder, ProximityResult
-from stages.base_stage import BaseStage
+from stages.base_stage import BaseStage, StageResult
 from cache.cache_manager import CacheManager
 from cache.models import GeocodeRecord, QualityTier, ReviewPriority
+from core.validation_rules import ValidationEngine
 
 # Import pipeline proximity analyzer
 try:
@@ -26,6 +31,60 @@ try:
 except ImportError:
     PipelineProximityAnalyzer = None
 
+try:
+    from utils.route_corridor import RouteCorridorValidator
+except ImportError:
+    RouteCorridorValidator = None
+
+
+def road_region_bounds(config: Dict[str, Any]) -> Optional[Tuple[float, float, float, float]]:
+    """Bounding box of the road network to load, from the ``road_region`` config.
+
+    The region is the union of whichever of these are given (EPSG:4326):
+        bounds: [minx, miny, maxx, maxy]
+        route_kmz: Route KMZ, buffered by buffer_km (default 25)
+        counties: County names, looked up in county_boundaries_path
+
+    Args:
+        config: Stage 3 configuration
+
+    Returns:
+        (minx, miny, maxx, maxy), or None to load the whole network
+    """
+    region = config.get("road_region") or {}
+    if not region or not region.get("enabled", True):
+        return None
+
+    boxes = []
+    if region.get("bounds"):
+        boxes.append(tuple(float(v) for v in region["bounds"]))
+
+    if region.get("route_kmz") and RouteCorridorValidator is not None:
+        validator = RouteCorridorValidator(
+            kmz_path=Path(region["route_kmz"]),
+            buffer_distance_m=float(region.get("buffer_km", 25)) * 1000,
+        )
+        if validator.buffered_corridor is not None:
+            boxes.append(tuple(validator.buffered_corridor.total_bounds))
+
+    if region.get("counties") and config.get("county_boundaries_path"):
+        counties = load_county_boundaries(Path(config["county_boundaries_path"]), crs="EPSG:4326")
+        wanted = {normalize_county(county) for county in region["counties"]}
+        selected = counties[counties["county"].isin(wanted)]
+        if len(selected) > 0:
+            boxes.append(tuple(selected.total_bounds))
+
+    if not boxes:
+        print("⚠ Warning: road_region has no usable bounds; loading the whole road network")
+        return None
+
+    return (
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+    )
+
 
 class Stage3ProximityGeocoder(BaseStage):
     """Stage 3: Proximity-based geocoding using road network analysis."""
@@ -56,8 +115,29 @@ class Stage3ProximityGeocoder(BaseStage):
         if not road_network_path.exists():
             raise FileNotFoundError(f"Road network file not found: {road_network_path}")
 
+        # Configured LRU sizes (upper bounds when a memory budget is set)
+        self.geometry_cache_size = int(config.get("geometry_cache_size", 512))
+        self.memo_size = int(config.get("proximity_memo_size", 10000))
+
         # Initialize proximity geocoder
-        self.geocoder = ProximityGeocoder(str(road_network_path))
+        self.geocoder = ProximityGeocoder(
+            str(road_network_path),
+            geometry_cache_size=self.geometry_cache_size,
+            memo_size=self.memo_size,
+            memo_path=config.get("proximity_memo_path"),
+            county_boundaries=config.get("county_boundaries_path"),
+            region_bounds=road_region_bounds(config),
+            tile_size=(config.get("road_region") or {}).get("tile_size", 0.5),
+            max_page_rings=(config.get("road_region") or {}).get("max_page_rings", 2),
+            projected_crs=config.get("projected_crs"),
+            network_distance=config.get("network_distance", False),
+            shared_network=config.get("shared_network_path"),
+            places_file=config.get("places_path"),
+        )
+        # Validate against the same places the city fallback uses
+        self.validation_engine = ValidationEngine(gazetteer=self.geocoder.gazetteer)
+        # Batch results for the current run, by ticket (see run)
+        self._prefetched: Dict[int, ProximityResult] = {}
 
         # Initialize pipeline proximity analyzer (optional)
         self.pipeline_analyzer = None
@@ -83,6 +163,40 @@ class Stage3ProximityGeocoder(BaseStage):
 
         print(f"✓ Initialized Stage3ProximityGeocoder with {road_network_path}")
 
+    def apply_memory_budget(self) -> None:
+        """Shrink the geometry cache and proximity memo under memory pressure."""
+        if self.memory_budget is None:
+            return
+        self.geocoder.geometry_cache.resize(
+            self.memory_budget.scaled_size(self.geometry_cache_size, minimum=min(16, self.geometry_cache_size))
+        )
+        self.geocoder.memo.resize(
+            self.memory_budget.scaled_size(self.memo_size, minimum=min(256, self.memo_size))
+        )
+
+    def run(self, tickets: List[Dict[str, Any]]) -> List[StageResult]:
+        """Run stage on list of tickets.
+
+        Results for all tickets that will be processed are computed up front
+        with ProximityGeocoder.geocode_batch and handed to the per-ticket
+        pass, which then only applies pipeline boosts and quality assessment
+        (independent of the proximity memo's size). Disable with
+        ``batch_geometry: false``.
+        """
+        if self.config.get("batch_geometry", True):
+            pending = self._pending_tickets(tickets)
+            if len(pending) > 1:
+                try:
+                    results = self.geocoder.geocode_batch(pd.DataFrame(pending))
+                    self._prefetched = {id(t): result for t, result in zip(pending, results)}
+                except Exception as e:
+                    print(f"⚠ Warning: Batch proximity geometry failed, geocoding per ticket: {e}")
+
+        try:
+            return super().run(tickets)
+        finally:
+            self._prefetched = {}
+
     def process_ticket(self, ticket_data: Dict[str, Any]) -> GeocodeRecord:
         """Process a single ticket using proximity-based geocoding.
 
@@ -109,16 +223,18 @@ class Stage3ProximityGeocoder(BaseStage):
         duration = ticket_data.get("duration")
         work_type = ticket_data.get("work_type")
 
-        # Call proximity geocoder
-        result: ProximityResult = self.geocoder.geocode_proximity(
-            street=street,
-            intersection=intersection,
-            county=county,
-            city=city,
-            ticket_type=ticket_type,
-            duration=duration,
-            work_type=work_type,
-        )
+        # Batch result from run(), or call the proximity geocoder
+        result: Optional[ProximityResult] = self._prefetched.pop(id(ticket_data), None)
+        if result is None:
+            result = self.geocoder.geocode_proximity(
+                street=street,
+                intersection=intersection,
+                county=county,
+                city=city,
+                ticket_type=ticket_type,
+                duration=duration,
+                work_type=work_type,
+            )
 
         # Convert ProximityResult to GeocodeRecord
         if result.success:
@@ -166,6 +282,7 @@ class Stage3ProximityGeocoder(BaseStage):
                 ticket_type=ticket_type,
                 duration=duration,
                 work_type=work_type,
+                excavator=ticket_data.get("excavator"),
                 metadata=pipeline_metadata,  # Store pipeline proximity metadata
                 # Quality tier will be calculated by _assess_quality()
                 quality_tier=QualityTier.GOOD,  # Default, will be reassessed
@@ -1,37 +1,77 @@
 """
-Stage 4: Fallback strategies for difficult cases (STUB - Not Yet Implemented).
+Stage 4: Fallback strategies for difficult cases.
 
-Will provide various fallback strategies for tickets that couldn't be
-geocoded by previous stages, including fuzzy matching, partial matches,
-and heuristic approaches.
+Implemented: fuzzy road-name matching. Tickets whose road names do not
+resolve in the road network (typos such as "MONAHNS HWY" or "FN 1216") are
+matched by bounded edit distance against the roads of the ticket's county
+(road_fuzzy.py) and geocoded with the corrected names by the proximity
+geocoder. Corrections are stored as aliases in the pipeline database
+(cache/road_aliases.py), so later runs resolve them with an exact lookup.
+Aliases are applied here only, not in Stage 3: a corrected geocode carries a
+per-edit confidence penalty and the corrections in its metadata, and Stage 3
+records would have neither. A corrected geocode replaces the earlier stages'
+result only when it is more confident.
+
+Implemented: historical location priors (optional, historical_priors.enabled).
+Tickets with no name to correct are placed near prior verified work: the
+densest cluster of current EXCELLENT/GOOD records sharing the ticket's road
+pair, a road, or its excavator and work type in the same county
+(cache/location_priors.py), with confidence growing with the number of
+supporting records. A prior replaces the earlier stages' result only when it
+is more confident.
+
+Tickets with neither are skipped, leaving the earlier stages' result in place.
 """
 
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 # Add paths for imports
 parent_dir = Path(__file__).parent.parent
+grandparent_dir = parent_dir.parent
 sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(grandparent_dir / "tools" / "geocoding"))
 
-from stages.base_stage import BaseStage
+from proximity_geocoder import ProximityGeocoder, ProximityResult
+from stages.base_stage import BaseStage, StageResult
 from cache.cache_manager import CacheManager
-from cache.models import GeocodeRecord
+from cache.location_priors import PRIOR_APPROACH, LocationPrior, LocationPriorIndex
+from cache.models import GeocodeRecord, QualityTier, ReviewPriority
+from cache.road_aliases import RoadAliasStore
 
 
 class Stage4Fallback(BaseStage):
-    """Stage 4: Fallback strategies for difficult geocoding cases (STUB)."""
+    """Stage 4: Fallback strategies for difficult geocoding cases (fuzzy road names, priors)."""
+
+    # Confidence lost per edit of road-name correction
+    DISTANCE_PENALTY = 0.05
+
+    ROAD_FIELDS = ("street", "intersection")
 
     def __init__(
         self,
         cache_manager: CacheManager,
         config: Dict[str, Any],
+        geocoder: Optional[ProximityGeocoder] = None,
     ):
         """Initialize fallback stage.
 
         Args:
             cache_manager: Cache manager instance
-            config: Stage configuration
+            config: Stage configuration:
+                road_network_path: Road network (required unless geocoder is given)
+                county_boundaries_path: County polygons scoping the candidates
+                places_path: Places file for the proximity geocoder's city fallback
+                max_edit_distance: Largest edit distance of a correction (default: 2;
+                    names shorter than 4 characters per edit get fewer)
+                learn_aliases: Persist corrections as aliases (default: true)
+                historical_priors: Place uncorrectable tickets near prior verified work
+                    enabled: (default: false)
+                    min_support: Fewest agreeing records for a prior (default: 2)
+                    cluster_radius_m: Radius within which records agree (default: 500)
+            geocoder: Proximity geocoder to share (normally Stage 3's), so the
+                road network is not loaded twice
         """
         super().__init__(
             stage_name="stage_4_fallback",
@@ -39,35 +79,275 @@ class Stage4Fallback(BaseStage):
             config=config,
         )
 
-        print("⚠️  Stage4Fallback is a STUB - not yet implemented")
-        print("    Will be implemented with various fallback strategies")
+        if geocoder is None:
+            road_network_path = config.get("road_network_path")
+            if not road_network_path:
+                raise ValueError("stage_4_fallback requires 'road_network_path' in config")
+            road_network_path = Path(road_network_path)
+            if not road_network_path.exists():
+                raise FileNotFoundError(f"Road network file not found: {road_network_path}")
+            geocoder = ProximityGeocoder(
+                road_network_path,
+                county_boundaries=config.get("county_boundaries_path"),
+                places_file=config.get("places_path"),
+            )
+        self.geocoder = geocoder
+
+        max_edit_distance = config.get("max_edit_distance")
+        self.max_edit_distance = int(max_edit_distance) if max_edit_distance is not None else None
+        self.aliases = (
+            RoadAliasStore(cache_manager.db_path) if config.get("learn_aliases", True) else None
+        )
+
+        priors_config = config.get("historical_priors") or {}
+        self.priors = (
+            LocationPriorIndex(
+                cache_manager.db_path,
+                cluster_radius_m=float(priors_config.get("cluster_radius_m", 500.0)),
+                min_support=int(priors_config.get("min_support", 2)),
+            )
+            if priors_config.get("enabled", False) else None
+        )
+
+        # Corrected geocodes and priors found by should_skip, used by process_ticket
+        # (only tickets that will be processed; cleared at the end of each run)
+        self._plans: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        print(
+            f"✓ Initialized Stage4Fallback (fuzzy road names"
+            f"{', learned aliases' if self.aliases is not None else ''}"
+            f"{', historical priors' if self.priors is not None else ''})"
+        )
+
+    def run(self, tickets: List[Dict[str, Any]]) -> List[StageResult]:
+        """Run stage on list of tickets, first bringing the prior index up to date."""
+        if self.priors is not None:
+            changed = self.priors.refresh()
+            if changed:
+                stats = self.priors.stats()
+                print(f"  Location priors: {stats['records']} records in {stats['counties']} counties")
+        try:
+            return super().run(tickets)
+        finally:
+            self._plans.clear()
+
+    def _resolve_road(self, name: str, county: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Name to geocode with, and the correction applied (if any).
+
+        Returns:
+            (name, None) when the name resolves as is, (corrected, correction)
+            when an alias or fuzzy match resolves it, (None, None) otherwise
+        """
+        if not name or self.geocoder.find_road(name, county) is not None:
+            return name, None
+
+        if self.aliases is not None:
+            alias = self.aliases.get(county, name)
+            if alias is not None and self.geocoder.find_road(alias[0], county) is not None:
+                return alias[0], {"from": name, "to": alias[0], "distance": alias[1], "source": "alias"}
+
+        match = self.geocoder.correct_road_name(name, county, self.max_edit_distance)
+        if match is None:
+            return None, None
+        if self.aliases is not None:
+            self.aliases.put(county, name, match.name, match.distance)
+        return match.name, {"from": name, "to": match.name, "distance": match.distance, "source": "fuzzy"}
+
+    def _plan(self, ticket_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Corrected road names for a ticket, or None when there is nothing to correct."""
+        county = ticket_data.get("county") or ""
+        plan: Dict[str, Any] = {"corrections": []}
+        for field in self.ROAD_FIELDS:
+            name, correction = self._resolve_road(ticket_data.get(field) or "", county)
+            if name is None:
+                return None  # Still unresolvable; a geocode would not improve on earlier stages
+            plan[field] = name
+            if correction is not None:
+                plan["corrections"].append({"field": field, **correction})
+        return plan if plan["corrections"] else None
+
+    def _beats_current(self, ticket_data: Dict[str, Any], confidence: float) -> bool:
+        """True when a ticket has no current geocode or it is less confident."""
+        current = self.cache_manager.get_current(ticket_number=ticket_data.get("ticket_number"))
+        return current is None or current.latitude is None or (current.confidence or 0.0) < confidence
+
+    def _corrected_plan(self, ticket_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Geocode with corrected road names, when it beats the ticket's current geocode."""
+        plan = self._plan(ticket_data)
+        if plan is None:
+            return None
+
+        result: ProximityResult = self.geocoder.geocode_proximity(
+            street=plan["street"],
+            intersection=plan["intersection"],
+            county=ticket_data.get("county", ""),
+            city=ticket_data.get("city", ""),
+            ticket_type=ticket_data.get("ticket_type"),
+            duration=ticket_data.get("duration"),
+            work_type=ticket_data.get("work_type"),
+        )
+        edits = sum(correction["distance"] for correction in plan["corrections"])
+        confidence = max(0.0, result.confidence - self.DISTANCE_PENALTY * edits) if result.success else 0.0
+        if not self._beats_current(ticket_data, confidence):
+            return None
+        return {**plan, "result": result, "confidence": confidence}
+
+    def _prior_plan(self, ticket_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Location prior for a ticket, when one beats its current geocode."""
+        prior = self.priors.locate(
+            ticket_data.get("street"),
+            ticket_data.get("intersection"),
+            ticket_data.get("county"),
+            excavator=ticket_data.get("excavator"),
+            work_type=ticket_data.get("work_type"),
+        )
+        if prior is None or not self._beats_current(ticket_data, prior.confidence):
+            return None
+        return {"prior": prior}
+
+    def _ticket_plan(self, ticket_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Corrected geocode, else location prior, that beats a ticket's current geocode."""
+        plan = self._corrected_plan(ticket_data)
+        if plan is None and self.priors is not None:
+            plan = self._prior_plan(ticket_data)
+        return plan
+
+    def should_skip(self, ticket_data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
+        """Skip by the reprocessing rules, and skip tickets with no road name to correct
+        (or, with historical priors, no prior) giving a geocode more confident than the
+        current one."""
+        should_skip, reason = super().should_skip(ticket_data)
+        if should_skip:
+            return should_skip, reason
+
+        plan = self._ticket_plan(ticket_data)
+        if plan is None:
+            if self.priors is not None:
+                return True, "No correctable road name or location prior"
+            return True, "No correctable road name"
+        self._plans[ticket_data.get("ticket_number")] = plan
+        return False, reason
 
     def process_ticket(self, ticket_data: Dict[str, Any]) -> GeocodeRecord:
-        """Process a single ticket using fallback strategies.
+        """Process a single ticket with fuzzy-corrected road names or a location prior.
 
         Args:
             ticket_data: Dictionary with ticket fields
+                Required: ticket_number, street, intersection, city, county
+                Optional: ticket_type, duration, work_type, excavator
 
         Returns:
             GeocodeRecord with result
 
         Raises:
-            NotImplementedError: This stage is not yet implemented
+            Exception: If no road name can be corrected or geocoding fails
         """
-        raise NotImplementedError(
-            "Stage4Fallback is not yet implemented. "
-            "Future implementation will provide various fallback strategies "
-            "for difficult geocoding cases."
+        ticket_number = ticket_data["ticket_number"]
+        street = ticket_data.get("street", "")
+        intersection = ticket_data.get("intersection", "")
+        city = ticket_data.get("city", "")
+        county = ticket_data.get("county", "")
+
+        plan = self._plans.pop(ticket_number, None) or self._ticket_plan(ticket_data)
+        if plan is None:
+            raise Exception("No correctable road name")
+        if "prior" in plan:
+            return self._prior_record(ticket_data, plan["prior"])
+
+        result: ProximityResult = plan["result"]
+        if not result.success:
+            raise Exception(result.error or "Proximity geocoding with corrected road names failed")
+
+        corrections = plan["corrections"]
+        corrected = ", ".join(
+            f"{c['from']} → {c['to']} ({c['distance']} edit{'s' if c['distance'] != 1 else ''})"
+            for c in corrections
+        )
+
+        return GeocodeRecord(
+            ticket_number=ticket_number,
+            geocode_key=CacheManager.generate_geocode_key(street, intersection, city, county),
+            street=street,
+            intersection=intersection,
+            city=city,
+            county=county,
+            latitude=result.lat,
+            longitude=result.lng,
+            confidence=plan["confidence"],
+            method=self.stage_name,
+            approach=result.approach,
+            reasoning=f"Fuzzy road name: {corrected}. {result.reasoning or ''}".strip(),
+            ticket_type=ticket_data.get("ticket_type"),
+            duration=ticket_data.get("duration"),
+            work_type=ticket_data.get("work_type"),
+            excavator=ticket_data.get("excavator"),
+            metadata={"road_name_corrections": corrections},
+            # Quality tier will be calculated by _assess_quality()
+            quality_tier=QualityTier.GOOD,
+            review_priority=ReviewPriority.NONE,
+        )
+
+    def _prior_record(self, ticket_data: Dict[str, Any], prior: LocationPrior) -> GeocodeRecord:
+        """Geocode record placing a ticket at a location prior."""
+        street = ticket_data.get("street", "")
+        intersection = ticket_data.get("intersection", "")
+        city = ticket_data.get("city", "")
+        county = ticket_data.get("county", "")
+        basis = {
+            "road_pair": "on",
+            "road": "on",
+            "excavator": "by excavator / work type",
+        }[prior.source]
+
+        return GeocodeRecord(
+            ticket_number=ticket_data["ticket_number"],
+            geocode_key=CacheManager.generate_geocode_key(street, intersection, city, county),
+            street=street,
+            intersection=intersection,
+            city=city,
+            county=county,
+            latitude=prior.latitude,
+            longitude=prior.longitude,
+            confidence=prior.confidence,
+            method=self.stage_name,
+            approach=PRIOR_APPROACH,
+            reasoning=(
+                f"Historical prior: {prior.support} of {prior.total} verified tickets {basis} "
+                f"{prior.key} within {self.priors.cluster_radius_m:.0f} m"
+            ),
+            ticket_type=ticket_data.get("ticket_type"),
+            duration=ticket_data.get("duration"),
+            work_type=ticket_data.get("work_type"),
+            excavator=ticket_data.get("excavator"),
+            metadata={"location_prior": prior.to_dict()},
+            # Quality tier will be calculated by _assess_quality()
+            quality_tier=QualityTier.ACCEPTABLE,
+            review_priority=ReviewPriority.NONE,
         )
 
 
 if __name__ == "__main__":
-    print("Stage4Fallback is a STUB implementation.")
-    print("\nPlanned features:")
-    print("  - Fuzzy road name matching (typos, abbreviations)")
-    print("  - Partial address geocoding (city + street only)")
-    print("  - Road type inference (CR vs FM vs TX)")
-    print("  - Historical ticket location analysis")
-    print("  - Excavator/utility company pattern learning")
-    print("  - County/city centroid with expanded search radius")
-    print("\nStatus: Not yet implemented")
+    # Test Stage4Fallback on a misspelled road name
+    print("Testing Stage4Fallback...\n")
+
+    cache_db = Path(__file__).parent.parent / "outputs" / "test_stage4.db"
+    cache_db.parent.mkdir(parents=True, exist_ok=True)
+    if cache_db.exists():
+        cache_db.unlink()
+
+    stage = Stage4Fallback(CacheManager(str(cache_db)), {
+        "road_network_path": Path(__file__).parent.parent.parent / "roads_merged.gpkg",
+        "skip_rules": {"skip_if_quality": ["EXCELLENT", "GOOD", "ACCEPTABLE"], "skip_if_locked": True},
+    })
+    ticket = {
+        "ticket_number": "TEST_FUZZY_001",
+        "street": "CR 426",
+        "intersection": "COUNTY RAOD 432",
+        "city": "Pyote",
+        "county": "Ward",
+    }
+    result = stage.run_single(ticket)
+    print(f"✓ Success: {result.success}  Skipped: {result.skipped} ({result.skip_reason})")
+    if result.geocode_record and not result.skipped:
+        print(f"  Reasoning: {result.geocode_record.reasoning}")
+    print(f"  Aliases: {stage.aliases.get_statistics()}")
@@ -126,6 +126,7 @@ class Stage6Enrichment(BaseStage):
             ticket_type=cached_record.ticket_type,
             duration=cached_record.duration,
             work_type=cached_record.work_type,
+            excavator=cached_record.excavator,
             metadata=enriched_metadata,  # Enriched metadata
             quality_tier=cached_record.quality_tier,
             review_priority=cached_record.review_priority,
@@ -0,0 +1,136 @@
+"""
+Unit tests for the rate-limited API geocoding client (against the fake server).
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.api_client import (
+    QUOTA_EXCEEDED, ApiGeocodingClient, DailyQuota, GeocodeQuery,
+    GoogleGeocodingProvider, QuotaExceeded, TokenBucket,
+)
+from utils.fake_geocode_server import FakeGeocodeServer
+
+PYOTE = "CR 426 and CR 432, Pyote, TX"
+
+
+@pytest.fixture
+def server():
+    with FakeGeocodeServer({PYOTE: (31.5401, -103.1293)}) as server:
+        yield server
+
+
+def _client(server, **kwargs):
+    kwargs.setdefault("qps", 1000)
+    kwargs.setdefault("backoff_base_s", 0.001)
+    return ApiGeocodingClient(GoogleGeocodingProvider("test", base_url=server.url), **kwargs)
+
+
+def _query(key="k1", street="CR 426", intersection="CR 432"):
+    return GeocodeQuery(key=key, street=street, intersection=intersection, city="Pyote", county="Ward")
+
+
+def test_token_bucket_paces_requests():
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=10, capacity=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(6):
+        bucket.acquire()
+    # Two from the burst, then one every 0.1s
+    assert now[0] == pytest.approx(0.4)
+    assert slept == pytest.approx([0.1, 0.1, 0.1, 0.1])
+
+
+def test_daily_quota_resets_each_day():
+    day = ["2026-01-01"]
+    quota = DailyQuota(2, today=lambda: day[0])
+    quota.consume()
+    quota.consume()
+    with pytest.raises(QuotaExceeded):
+        quota.consume()
+    day[0] = "2026-01-02"
+    quota.consume()
+    assert quota.remaining == 1
+
+
+def test_daily_quota_persists_across_runs(tmp_path):
+    db_path = tmp_path / "cache.db"
+    first = DailyQuota(3, today=lambda: "2026-01-01", db_path=db_path, provider="google")
+    first.consume()
+    first.consume()
+
+    # A later run (or another process) sees the day's usage
+    second = DailyQuota(3, today=lambda: "2026-01-01", db_path=db_path, provider="google")
+    assert second.used == 2
+    second.consume()
+    with pytest.raises(QuotaExceeded):
+        second.consume()
+    with pytest.raises(QuotaExceeded):
+        first.consume()
+    # Usage is per provider
+    assert DailyQuota(3, today=lambda: "2026-01-01", db_path=db_path, provider="other").remaining == 3
+
+
+def test_geocode_ok_and_zero_results(server):
+    with _client(server) as client:
+        result = client.geocode(_query())
+        assert result.ok and (result.lat, result.lng) == (31.5401, -103.1293)
+        assert result.result_types == ["intersection"]
+        assert client.geocode(_query(key="k2", street="Nowhere Rd", intersection="")).status == "ZERO_RESULTS"
+    assert server.requests[0]["components"] == "administrative_area:TX|country:US"
+
+
+def test_retries_on_rate_limit_and_server_errors(server):
+    server.fail_next([429, 503, "OVER_QUERY_LIMIT"])
+    with _client(server) as client:
+        result = client.geocode(_query())
+        assert result.ok and result.attempts == 4
+        assert client.stats()["retries"] == 3
+
+    server.fail_next([503] * 5)
+    with _client(server, max_retries=2) as client:
+        result = client.geocode(_query())
+        assert result.status == "http_error_503" and result.attempts == 3
+
+
+def test_quota_is_not_retried(server):
+    with _client(server, daily_quota=1) as client:
+        assert client.geocode(_query()).ok
+        result = client.geocode(_query(key="k2"))
+        assert result.status == QUOTA_EXCEEDED and result.attempts == 1
+    assert len(server.requests) == 1
+
+
+def test_concurrent_requests_and_coalescing(server):
+    server.latency_s = 0.05
+    queries = [_query(key=f"k{i}", street=f"CR {i}") for i in range(16)]
+    with _client(server, max_workers=8) as client:
+        start = time.time()
+        results = client.geocode_many(queries + queries[:4])
+        elapsed = time.time() - start
+        assert len(results) == 16 and client.stats()["coalesced"] == 4
+    assert len(server.requests) == 16
+    assert server.max_concurrent > 1
+    assert elapsed < 16 * 0.05  # Not serial
+
+    # Concurrent geocode() calls for one key share a single request
+    server.requests.clear()
+    with _client(server) as client:
+        threads = [threading.Thread(target=client.geocode, args=(_query(),)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(server.requests) < 5
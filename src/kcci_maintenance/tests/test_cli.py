@@ -0,0 +1,61 @@
+"""
+Unit tests for building the CLI pipeline from the config file.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+gpd = pytest.importorskip("geopandas")
+from shapely.geometry import LineString
+
+from cache.cache_manager import CacheManager
+from cli import build_pipeline
+
+
+@pytest.fixture
+def roads_file(tmp_path):
+    path = tmp_path / "roads.gpkg"
+    gpd.GeoDataFrame(
+        {"road_name": ["County Road 426"], "road_ref": ["CR 426"], "road_type": ["CR"]},
+        geometry=[LineString([(-103.2, 31.4), (-103.0, 31.4)])],
+        crs="EPSG:4326",
+    ).to_file(path, layer="roads", driver="GPKG")
+    return path
+
+
+def make_args(roads_file, **overrides):
+    return argparse.Namespace(**{
+        "roads": roads_file,
+        "force_reprocess": False,
+        "skip_stage3": False,
+        "skip_stage5": True,
+        "skip_stage6": True,
+        "config": None,
+        "quiet": True,
+        **overrides,
+    })
+
+
+def test_stage3_reads_its_config_block(tmp_path, roads_file):
+    pipeline_config = {
+        "name": "test",
+        "stages": {"stage_3_proximity": {
+            "geometry_cache_size": 7,
+            "proximity_memo_size": 0,
+            "skip_rules": {"skip_if_quality": ["EXCELLENT"]},
+        }},
+    }
+    cache_manager = CacheManager(str(tmp_path / "cache.db"))
+
+    stage3 = build_pipeline(cache_manager, pipeline_config, make_args(roads_file)).stages[0]
+    assert stage3.geocoder.geometry_cache.maxsize == 7
+    assert stage3.config["skip_rules"] == {"skip_if_quality": ["EXCELLENT"], "skip_if_locked": True}
+
+    forced = build_pipeline(cache_manager, pipeline_config, make_args(roads_file, force_reprocess=True))
+    assert forced.stages[0].config["skip_rules"]["skip_if_quality"] == []
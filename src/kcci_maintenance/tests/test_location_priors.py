@@ -0,0 +1,75 @@
+"""
+Unit tests for the historical location prior index.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cache.cache_manager import CacheManager
+from cache.location_priors import LocationPriorIndex
+from cache.models import GeocodeRecord, QualityTier
+
+
+def record(number, lat, lng, tier=QualityTier.EXCELLENT, street="Lease Rd 12",
+           intersection="CR 426", excavator="Acme Pipeline", approach="closest_point"):
+    return GeocodeRecord(
+        ticket_number=number,
+        geocode_key=CacheManager.generate_geocode_key(street, intersection, "Pyote", "Ward"),
+        street=street, intersection=intersection, city="Pyote", county="Ward",
+        work_type="Pipeline", excavator=excavator,
+        latitude=lat, longitude=lng, confidence=0.9,
+        method="stage_3_proximity", approach=approach, quality_tier=tier,
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheManager(str(tmp_path / "cache.db"))
+
+
+def test_locate_returns_densest_cluster_with_support(cache):
+    for i in range(3):
+        cache.set(record(f"T{i}", 31.5 + i * 0.001, -103.1), "stage_3_proximity")
+    cache.set(record("T9", 31.8, -103.4), "stage_3_proximity")  # Same roads, elsewhere
+
+    index = LocationPriorIndex(cache.db_path, cluster_radius_m=500, min_support=2)
+    assert index.refresh() == 4
+
+    # Road pair matches in either order and with different spacing/case
+    prior = index.locate("cr  426", "LEASE-RD 12", "ward")
+    assert prior.source == "road_pair"
+    assert (prior.support, prior.total) == (3, 4)
+    assert prior.latitude == pytest.approx(31.501)
+    assert prior.confidence == pytest.approx(0.80 * 3 / 4)
+    assert prior.ticket_numbers == ["T0", "T1", "T2"]
+
+    # Falls back to one road, then to the excavator's pattern
+    assert index.locate("CR 426", "Unknown Trail", "Ward").source == "road"
+    excavator = index.locate("Unknown Trail", None, "Ward", "ACME PIPELINE", "pipeline")
+    assert excavator.source == "excavator"
+    assert index.locate("Unknown Trail", None, "Winkler", "Acme Pipeline", "Pipeline") is None
+
+
+def test_refresh_is_incremental_and_follows_new_versions(cache):
+    index = LocationPriorIndex(cache.db_path, min_support=2)
+    cache.set(record("T1", 31.5, -103.1), "stage_3_proximity")
+    cache.set(record("T2", 31.5, -103.1), "stage_3_proximity")
+    assert index.refresh() == 2
+    assert index.refresh() == 0
+    assert index.locate("Lease Rd 12", "CR 426", "Ward").support == 2
+
+    # A new version below GOOD withdraws the record; priors never count themselves
+    cache.set(record("T2", 31.5, -103.1, tier=QualityTier.REVIEW_NEEDED), "stage_5_validation")
+    cache.set(record("T3", 31.5, -103.1, approach="historical_prior"), "stage_4_fallback")
+    assert index.refresh() == 2
+    assert index.locate("Lease Rd 12", "CR 426", "Ward") is None
+    assert index.stats()["records"] == 1
+
+    cache.set(record("T2", 31.5, -103.1, tier=QualityTier.GOOD), "stage_5_validation")
+    index.refresh()
+    assert index.locate("Lease Rd 12", "CR 426", "Ward").support == 2
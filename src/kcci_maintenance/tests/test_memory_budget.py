@@ -0,0 +1,63 @@
+"""
+Unit tests for memory budget and backpressure.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.memory_budget import MemoryBudget, current_rss_mb
+
+
+def test_current_rss_is_positive():
+    """RSS sampling works on this platform."""
+    assert current_rss_mb() > 0
+
+
+def test_unlimited_budget_tracks_but_never_adapts():
+    """Without a budget sizes are unchanged but peaks are still recorded."""
+    budget = MemoryBudget()
+
+    budget.enter_stage("stage_a")
+    budget.enter_stage(None)
+
+    assert not budget.enabled
+    assert budget.adapt_chunk_size(500) == 500
+    assert budget.scaled_size(4096, item_mb=1000) == 4096
+    assert budget.stage_peaks_mb["stage_a"] > 0
+
+
+def test_over_budget_shrinks_sizes():
+    """A budget below current RSS halves chunks and caps caches/workers."""
+    budget = MemoryBudget(max_memory_mb=1)
+
+    assert budget.over_budget()
+    assert budget.adapt_chunk_size(500, minimum=10) == 250
+    assert budget.adapt_chunk_size(15, minimum=10) == 10
+    assert budget.scaled_size(4096, minimum=64) == 64
+    assert budget.scaled_size(8, minimum=1, item_mb=100) == 1
+
+
+def test_ample_budget_grows_chunks_up_to_maximum():
+    """Low pressure regrows chunk sizes, bounded by the maximum."""
+    budget = MemoryBudget(max_memory_mb=1_000_000)
+
+    assert budget.adapt_chunk_size(100, maximum=120) == 120
+    assert budget.scaled_size(4096, minimum=64) == 4096
+
+
+def test_background_sampling_attributes_to_stage():
+    """Background sampler records samples against the active stage."""
+    budget = MemoryBudget(max_memory_mb=1_000_000, sample_interval_s=0.01)
+    budget.start()
+    budget.enter_stage("allocate")
+    data = [bytearray(1024 * 1024) for _ in range(20)]
+    budget.enter_stage(None)
+    budget.stop()
+    del data
+
+    summary = budget.to_dict()
+    assert summary["stage_peak_memory_mb"]["allocate"] > 0
+    assert summary["peak_memory_mb"] >= summary["stage_peak_memory_mb"]["allocate"]
@@ -267,5 +267,81 @@ def test_pipeline_generate_review_queue(cache_manager, pipeline_config, tmp_path
     assert output_path.exists()
 
 
+def test_pipeline_scheduled_run_streams_priority_first(cache_manager, pipeline_config, tmp_path):
+    """Test priority scheduling processes emergencies first and streams each chunk."""
+    tickets = [
+        {"ticket_number": "N1", "ticket_type": "Normal", "creation": "2025-01-05"},
+        {"ticket_number": "E1", "ticket_type": "Emergency", "creation": "2025-01-01"},
+        {"ticket_number": "N2", "ticket_type": "Normal", "creation": "2025-01-06"},
+        {"ticket_number": "E2", "ticket_type": "Emergency", "creation": "2025-01-03"},
+        {"ticket_number": "U1", "ticket_type": "Update", "creation": "2025-01-07"},
+    ]
+    stream_path = tmp_path / "stream.csv"
+    config = {
+        **pipeline_config,
+        "scheduling": {"enabled": True, "order": ["ticket_type", "recency"], "chunk_size": 2},
+        "streaming_output": {"path": str(stream_path)},
+    }
+
+    pipeline = Pipeline(cache_manager, config)
+    stage = MockStage("test_stage", cache_manager, {})
+    pipeline.add_stage(stage)
+
+    result = pipeline.run(tickets)
+
+    assert stage.processed_tickets == ["E2", "E1", "N2", "N1", "U1"]
+    assert result.total_succeeded == 5
+    assert result.stage_statistics[0].total_tickets == 5
+
+    import csv
+    with open(stream_path) as f:
+        streamed = [row["ticket_number"] for row in csv.DictReader(f)]
+    assert streamed == ["E2", "E1", "N2", "N1", "U1"]
+
+
+def test_pipeline_memory_budget_reports_stage_peaks(cache_manager, pipeline_config, sample_tickets):
+    """Test memory budget chunks the run and reports peak memory per stage."""
+    config = {**pipeline_config, "pipeline": {"max_memory_mb": 1}}
+    pipeline = Pipeline(cache_manager, config)
+    pipeline.DEFAULT_CHUNK_SIZE = 2
+    pipeline.MIN_CHUNK_SIZE = 1
+    stage1 = MockStage("stage_1", cache_manager, {"skip_rules": {}})
+    stage2 = MockStage("stage_2", cache_manager, {"skip_rules": {}})
+    pipeline.add_stage(stage1)
+    pipeline.add_stage(stage2)
+
+    result = pipeline.run(sample_tickets)
+
+    assert result.total_succeeded == 5
+    assert result.stage_statistics[0].total_tickets == 5
+    assert set(result.stage_peak_memory_mb) == {"stage_1", "stage_2"}
+    assert result.peak_memory_mb >= max(result.stage_peak_memory_mb.values())
+    assert "stage_peak_memory_mb" in result.to_dict()
+
+
+def test_pipeline_memory_budget_resizes_stage_caches(cache_manager, pipeline_config, sample_tickets):
+    """Test stages resize their caches to the budget before each chunk."""
+
+    class CachingStage(MockStage):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.cache_sizes = []
+
+        def apply_memory_budget(self):
+            self.cache_sizes.append(self.memory_budget.scaled_size(4096, minimum=64))
+
+    config = {**pipeline_config, "pipeline": {"max_memory_mb": 1}}
+    pipeline = Pipeline(cache_manager, config)
+    pipeline.DEFAULT_CHUNK_SIZE = 2
+    pipeline.MIN_CHUNK_SIZE = 2
+    stage = CachingStage("stage_1", cache_manager, {"skip_rules": {}})
+    pipeline.add_stage(stage)
+
+    pipeline.run(sample_tickets)
+
+    # 5 tickets in chunks of 2; always over a 1 MB budget
+    assert stage.cache_sizes == [64, 64, 64]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+"""
+Unit tests for the persistent API response cache.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cache.response_cache import ApiResponseCache, normalize_request
+from core.api_client import ApiGeocodingClient, GeocodeQuery, GoogleGeocodingProvider
+from utils.fake_geocode_server import FakeGeocodeServer
+
+URL = "https://maps.example.com/geocode/json"
+
+
+def _request(address, key="secret"):
+    return {"method": "GET", "url": URL, "params": {"key": key, "address": address}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ApiResponseCache(tmp_path / "cache.db", ttl_days=30, negative_ttl_hours=1)
+
+
+def test_request_key_ignores_credentials_and_spacing():
+    assert normalize_request(_request("CR 426 and  cr 432", key="a")) == \
+        normalize_request(_request("cr 426 AND CR 432", key="b"))
+    assert normalize_request(_request("CR 426")) != normalize_request(_request("CR 432"))
+    assert "secret" not in normalize_request(_request("CR 426"))
+
+
+def test_ttl_and_negative_ttl(cache):
+    cache.put("google", _request("CR 426"), "OK", {"status": "OK", "results": []}, now=0)
+    cache.put("google", _request("Nowhere"), "ZERO_RESULTS", {"status": "ZERO_RESULTS"},
+              negative=True, now=0)
+
+    assert cache.get("google", _request("CR 426"), now=3600).response["status"] == "OK"
+    assert cache.get("google", _request("Nowhere"), now=1800).negative
+    assert cache.get("google", _request("Nowhere"), now=3600) is None  # Negative TTL: 1h
+    assert cache.get("google", _request("CR 426"), now=31 * 86400) is None
+    assert cache.get("other", _request("CR 426"), now=0) is None  # Keyed by provider
+    assert cache.purge_expired(now=31 * 86400) == 2
+
+
+def test_report_counts_cost_saved(cache):
+    cache.put("google", _request("CR 426"), "OK", {"status": "OK"})
+    cache.start_run()
+    for _ in range(4):
+        cache.get("google", _request("CR 426"))
+    cache.get("google", _request("Nowhere"))
+
+    report = cache.report()
+    assert report["requests_saved"] == 4
+    assert report["cost_saved_usd"] == pytest.approx(4 * 0.005)
+    assert report["providers"]["google"]["misses"] == 1
+    assert cache.get_statistics()["google"]["lifetime_hits"] == 4
+
+
+def test_client_uses_cache_across_runs(cache):
+    locations = {"CR 426 and CR 432, Pyote, TX": (31.5401, -103.1293)}
+    found = GeocodeQuery(key="k1", street="CR 426", intersection="CR 432", city="Pyote", county="Ward")
+    missing = GeocodeQuery(key="k2", street="Nowhere Rd", city="Pyote", county="Ward")
+    denied = GeocodeQuery(key="k3", street="CR 1", city="Pyote", county="Ward")
+
+    with FakeGeocodeServer(locations) as server:
+        provider = GoogleGeocodingProvider("test", base_url=server.url)
+        server.fail_next(["REQUEST_DENIED"], address=denied.address_line())
+        with ApiGeocodingClient(provider, qps=1000, response_cache=cache) as client:
+            client.geocode_many([found, missing, denied])
+        assert len(server.requests) == 3
+
+        with ApiGeocodingClient(provider, qps=1000, response_cache=cache) as client:
+            results = client.geocode_many([found, missing, denied])
+            assert results["k1"].ok and results["k1"].cached
+            assert results["k2"].status == "ZERO_RESULTS" and results["k2"].cached
+            assert not results["k3"].cached  # Credential errors are not cached
+            assert client.stats()["cache_hits"] == 2
+        assert len(server.requests) == 4
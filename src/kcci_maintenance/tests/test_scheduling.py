@@ -0,0 +1,111 @@
+"""
+Unit tests for ticket scheduling and streaming result output.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.scheduling import TicketScheduler
+from utils.result_stream import ResultStreamWriter, EXPORT_FIELDNAMES
+from cache.models import GeocodeRecord, QualityTier, ReviewPriority
+
+
+def _record(ticket_number):
+    return GeocodeRecord(
+        ticket_number=ticket_number,
+        geocode_key="key",
+        latitude=31.5,
+        longitude=-103.1,
+        confidence=0.85,
+        method="test_stage",
+        quality_tier=QualityTier.GOOD,
+        review_priority=ReviewPriority.NONE,
+        validation_flags=["low_confidence"],
+    )
+
+
+def test_default_order_is_ticket_type_then_recency():
+    """Emergencies first, newest first within a type, file order breaks ties."""
+    scheduler = TicketScheduler()
+    tickets = [
+        {"ticket_number": "1", "ticket_type": "Normal", "creation": "2025-02-01"},
+        {"ticket_number": "2", "ticket_type": "Emergency", "creation": "2025-01-01"},
+        {"ticket_number": "3", "ticket_type": "Normal"},
+        {"ticket_number": "4", "ticket_type": "Emergency", "creation": "2025-03-01"},
+        {"ticket_number": "5", "ticket_type": "Normal", "creation": "2025-02-01"},
+        {"ticket_number": "6", "ticket_type": "Something Else", "creation": "2026-01-01"},
+    ]
+
+    ordered = [t["ticket_number"] for t in scheduler.order_tickets(tickets)]
+
+    assert ordered == ["4", "2", "1", "5", "3", "6"]
+
+
+def test_ticket_type_priority_override():
+    """Configured ranks override the defaults."""
+    scheduler = TicketScheduler({"order": ["ticket_type"], "ticket_type_priority": {"DigUp": -1}})
+    tickets = [
+        {"ticket_number": "1", "ticket_type": "Emergency"},
+        {"ticket_number": "2", "ticket_type": "DigUp"},
+    ]
+
+    assert [t["ticket_number"] for t in scheduler.order_tickets(tickets)] == ["2", "1"]
+
+
+def test_corridor_order_uses_city_centroid_prefilter():
+    """Tickets in cities nearer the corridor come first; unknown cities last."""
+    scheduler = TicketScheduler({
+        "order": ["corridor"],
+        "corridor_points": [[31.40, -103.16]],  # near Pyote
+    })
+    tickets = [
+        {"ticket_number": "1", "city": "Andrews", "county": "Andrews"},
+        {"ticket_number": "2", "city": "Nowhere", "county": "Ward"},
+        {"ticket_number": "3", "city": "Pyote", "county": "Ward"},
+        {"ticket_number": "4", "city": "Monahans", "county": "Ward"},
+    ]
+
+    assert [t["ticket_number"] for t in scheduler.order_tickets(tickets)] == ["3", "4", "1", "2"]
+
+
+def test_chunking_and_validation():
+    """Chunks respect chunk_size; unknown keys are rejected."""
+    scheduler = TicketScheduler({"chunk_size": 2})
+    chunks = scheduler.chunk([{"ticket_number": str(i)} for i in range(5)])
+    assert [len(c) for c in chunks] == [2, 2, 1]
+
+    with pytest.raises(ValueError):
+        TicketScheduler({"order": ["alphabetical"]})
+
+
+def test_stream_writer_csv_appends_with_single_header(tmp_path):
+    """CSV sink writes the header once and appends each chunk."""
+    path = tmp_path / "results.csv"
+    writer = ResultStreamWriter(path)
+
+    writer.write_records([_record("T1")])
+    writer.write_records([_record("T2"), _record("T3")])
+
+    lines = path.read_text().splitlines()
+    assert lines[0] == ",".join(EXPORT_FIELDNAMES)
+    assert len(lines) == 4
+    assert writer.written_count == 3
+    assert writer.written_tickets == {"T1", "T2", "T3"}
+
+
+def test_stream_writer_jsonl(tmp_path):
+    """JSONL sink is inferred from suffix and writes one object per line."""
+    path = tmp_path / "results.jsonl"
+    writer = ResultStreamWriter(path)
+    writer.write_records([_record("T1")])
+
+    row = json.loads(path.read_text().splitlines()[0])
+    assert row["ticket_number"] == "T1"
+    assert row["quality_tier"] == "GOOD"
+    assert row["validation_flags"] == "low_confidence"
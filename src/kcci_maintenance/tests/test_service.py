@@ -0,0 +1,234 @@
+"""
+Unit tests for the warm geocoding service.
+"""
+
+import http.client
+import json
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+gpd = pytest.importorskip("geopandas")
+from shapely.geometry import LineString
+
+from service import GeocodingService, create_server, ProximityGeocoder
+
+
+@pytest.fixture
+def roads_file(tmp_path):
+    """Create a small synthetic road network near Pyote, TX."""
+    roads = gpd.GeoDataFrame(
+        {
+            "road_name": ["County Road 426", "County Road 432", "Farm to Market Road 1927"],
+            "road_ref": ["CR 426", "CR 432", "FM 1927"],
+            "road_type": ["CR", "CR", "FM"],
+        },
+        geometry=[
+            LineString([(-103.20, 31.40), (-103.05, 31.40)]),
+            LineString([(-103.12, 31.35), (-103.12, 31.45)]),
+            LineString([(-103.15, 31.30), (-103.15, 31.50)]),
+        ],
+        crs="EPSG:4326",
+    )
+    path = tmp_path / "roads.gpkg"
+    roads.to_file(path, layer="roads", driver="GPKG")
+    return path
+
+
+@pytest.fixture
+def service(roads_file):
+    """Service with only the road network loaded."""
+    if ProximityGeocoder is None:
+        pytest.skip("proximity_geocoder not importable")
+    return GeocodingService.from_config(roads_path=roads_file)
+
+
+@pytest.fixture
+def http_server(service):
+    """Run the service on a free localhost port."""
+    server = create_server(service, host="127.0.0.1", port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _request(server, method, path, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response.status, data
+
+
+def test_geocode_matches_geocoder(service):
+    """Service geocode returns the same location as the geocoder."""
+    result = service.geocode({
+        "street": "CR 426",
+        "intersection": "CR 432",
+        "city": "Pyote",
+        "county": "Ward",
+    })
+    direct = service.geocoder.geocode_proximity(
+        street="CR 426", intersection="CR 432", county="Ward", city="Pyote"
+    )
+
+    assert result["success"] is True
+    assert result["latitude"] == pytest.approx(direct.lat)
+    assert result["longitude"] == pytest.approx(direct.lng)
+    assert result["approach"] == direct.approach
+    assert result["quality_tier"] is not None
+
+
+def test_validate_flags_distance_from_city(service):
+    """Validation runs the same rules as the pipeline."""
+    result = service.validate({
+        "latitude": 33.0,
+        "longitude": -101.0,
+        "confidence": 0.9,
+        "city": "Pyote",
+        "county": "Ward",
+    })
+
+    assert "distance_from_city" in result["validation_flags"]
+
+
+def test_enrich_without_jurisdictions(service):
+    """Enrich reports missing jurisdiction data instead of failing."""
+    result = service.enrich({"latitude": 31.4, "longitude": -103.1})
+
+    assert result["success"] is False
+    assert "error" in result
+
+
+def test_batch_reports_errors_per_item(service):
+    """One bad item does not fail the whole batch."""
+    results = service.validate_batch([
+        {"latitude": 31.4, "longitude": -103.1, "confidence": 0.9},
+        {"latitude": None},
+    ])
+
+    assert len(results) == 2
+    assert "validation_flags" in results[0]
+    assert results[1]["success"] is False
+
+
+@pytest.mark.parametrize("bad_item", [42, "CR 426", ["CR 426"], None])
+def test_batch_rejects_non_object_items(service, bad_item):
+    """Items that are not JSON objects fail alone, like other invalid items."""
+    for batch in (service.validate_batch, service.enrich_batch, service.geocode_batch):
+        results = batch([{"latitude": 31.4, "longitude": -103.1, "street": "CR 426",
+                          "intersection": "CR 432", "city": "Pyote", "county": "Ward"}, bad_item])
+
+        assert len(results) == 2
+        assert results[0]["latitude"] == pytest.approx(31.4, abs=0.01)
+        assert results[1] == {"success": False, "error": results[1]["error"]}
+        assert "JSON objects" in results[1]["error"]
+
+
+def test_validate_batch_matches_validate(service):
+    """Batch validation runs the rules over the batch with the same results."""
+    items = [
+        {"latitude": 33.0, "longitude": -101.0, "confidence": 0.9, "city": "Pyote", "county": "Ward"},
+        {"latitude": 31.4, "longitude": -103.1, "confidence": 0.5, "approach": "city_centroid"},
+    ]
+
+    results = service.validate_batch(items)
+
+    assert "distance_from_city" in results[0]["validation_flags"]
+    assert "low_confidence" in results[1]["validation_flags"]
+    for item, result in zip(items, results):
+        expected = service.validate(item)
+        assert result["validation_flags"] == expected["validation_flags"]
+        assert result["quality_tier"] == expected["quality_tier"]
+
+
+def test_http_endpoints(http_server):
+    """Health, GET, POST and batch endpoints over HTTP."""
+    status, data = _request(http_server, "GET", "/health")
+    assert status == 200
+    assert json.loads(data)["components"]["geocoder"] is True
+
+    status, data = _request(http_server, "POST", "/geocode", {
+        "street": "CR 426", "intersection": "CR 432", "city": "Pyote", "county": "Ward",
+    })
+    assert status == 200
+    assert json.loads(data)["success"] is True
+
+    status, data = _request(
+        http_server, "GET",
+        "/geocode?street=CR%20426&intersection=CR%20432&city=Pyote&county=Ward&format=text",
+    )
+    assert status == 200
+    lat, _, confidence = data.decode().split(",")
+    assert float(lat) == pytest.approx(31.40, abs=0.01)
+    assert 0 < float(confidence) <= 1
+
+    status, data = _request(http_server, "POST", "/validate/batch", {
+        "items": [{"latitude": 31.4, "longitude": -103.1, "confidence": 0.9}],
+    })
+    assert status == 200
+    assert json.loads(data)["count"] == 1
+
+    status, _ = _request(http_server, "GET", "/validate")
+    assert status == 400
+
+    status, _ = _request(http_server, "GET", "/unknown")
+    assert status == 404
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available")
+def test_unix_socket(service, tmp_path):
+    """Service answers over a Unix domain socket."""
+    socket_path = tmp_path / "geocode.sock"
+    server = create_server(service, socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(str(socket_path))
+        client.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+        response = b""
+        while chunk := client.recv(4096):
+            response += chunk
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.startswith(b"HTTP/1.1 200")
+    assert b'"status": "ok"' in response
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available")
+def test_unix_socket_never_replaces_regular_file(service, tmp_path):
+    """Only a stale socket is removed before binding."""
+    socket_path = tmp_path / "geocode.sock"
+    socket_path.write_text("not a socket")
+
+    with pytest.raises(FileExistsError):
+        create_server(service, socket_path=socket_path)
+    assert socket_path.read_text() == "not a socket"
+
+
+def test_concurrent_requests_are_counted(service):
+    """The request counter is safe to update from handler threads."""
+    threads = [
+        threading.Thread(target=lambda: [service.count_request() for _ in range(1000)])
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert service.health()["requests"] == 8000
@@ -0,0 +1,60 @@
+"""
+Unit tests for Stage 1 API geocoding (against the fake geocode server).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cache.cache_manager import CacheManager
+from cache.models import QualityTier
+from stages.stage_1_api import Stage1APIGeocoder
+from utils.fake_geocode_server import FakeGeocodeServer
+
+
+@pytest.fixture
+def server():
+    with FakeGeocodeServer({"CR 426 and CR 432, Pyote, TX": (31.5401, -103.1293)}) as server:
+        yield server
+
+
+@pytest.fixture
+def stage(tmp_path, server):
+    return Stage1APIGeocoder(CacheManager(str(tmp_path / "cache.db")), {
+        "api_key": "test",
+        "base_url": server.url,
+        "qps": 1000,
+        "skip_rules": {"skip_if_quality": ["EXCELLENT"], "skip_if_locked": True},
+    })
+
+
+def test_stage1_requires_api_key(tmp_path, monkeypatch):
+    monkeypatch.delenv("GOOGLE_MAPS_API_KEY", raising=False)
+    with pytest.raises(ValueError, match="api_key"):
+        Stage1APIGeocoder(CacheManager(str(tmp_path / "cache.db")), {})
+
+
+def test_stage1_run_geocodes_distinct_locations_once(stage, server):
+    tickets = [
+        {"ticket_number": f"T{i}", "street": "CR 426", "intersection": "CR 432",
+         "city": "Pyote", "county": "Ward"}
+        for i in range(5)
+    ] + [{"ticket_number": "T9", "street": "Nowhere Rd", "intersection": "",
+          "city": "Pyote", "county": "Ward"}]
+
+    results = stage.run(tickets)
+    assert [r.success for r in results] == [True] * 5 + [False]
+    record = results[0].geocode_record
+    assert (record.latitude, record.longitude) == (31.5401, -103.1293)
+    assert record.approach == "api_intersection"
+    assert record.quality_tier == QualityTier.EXCELLENT
+    assert "ZERO_RESULTS" in results[-1].error
+    assert len(server.requests) == 2
+
+    # EXCELLENT results are skipped on the next run: no new requests
+    stage.run(tickets[:5])
+    assert len(server.requests) == 2
@@ -0,0 +1,63 @@
+"""
+Unit tests for Stage 2 geometric intersection.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+gpd = pytest.importorskip("geopandas")
+from shapely.geometry import LineString
+
+from cache.cache_manager import CacheManager
+from cache.models import QualityTier
+from stages.stage_2_geometric import Stage2GeometricIntersection
+
+
+@pytest.fixture
+def stage(tmp_path):
+    roads_file = tmp_path / "roads.gpkg"
+    gpd.GeoDataFrame(
+        {
+            "road_name": ["County Road 426", "County Road 432", "Farm-to-Market Road 1788"],
+            "road_ref": ["CR 426", "CR 432", "FM 1788"],
+            "road_type": ["CR", "CR", "FM"],
+        },
+        geometry=[
+            LineString([(-103.2, 31.5), (-103.0, 31.5)]),
+            LineString([(-103.15, 31.45), (-103.15, 31.6)]),
+            LineString([(-103.3, 31.7), (-103.0, 31.7)]),
+        ],
+        crs="EPSG:4326",
+    ).to_file(roads_file, layer="roads", driver="GPKG")
+
+    cache_manager = CacheManager(str(tmp_path / "cache.db"))
+    return Stage2GeometricIntersection(cache_manager, {
+        "road_network_path": str(roads_file),
+        "skip_rules": {"skip_if_locked": True},
+    })
+
+
+def test_stage2_geocodes_intersection(stage):
+    result = stage.run_single({
+        "ticket_number": "T1", "street": "CR 426", "intersection": "CR 432",
+        "city": "Pyote", "county": "Ward",
+    })
+    record = result.geocode_record
+    assert result.success
+    assert (record.latitude, record.longitude) == (31.5, -103.15)
+    assert record.approach == "geometric_intersection"
+    assert record.quality_tier == QualityTier.EXCELLENT
+
+
+def test_stage2_fails_when_roads_do_not_intersect(stage):
+    result = stage.run_single({
+        "ticket_number": "T2", "street": "CR 426", "intersection": "FM 1788",
+        "city": "Pyote", "county": "Ward",
+    })
+    assert not result.success
+    assert result.geocode_record.quality_tier == QualityTier.FAILED
@@ -0,0 +1,78 @@
+"""
+Unit tests for Stage 3 batch proximity geocoding.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+gpd = pytest.importorskip("geopandas")
+from shapely.geometry import LineString
+
+from cache.cache_manager import CacheManager
+from stages.stage_3_proximity import Stage3ProximityGeocoder
+
+
+@pytest.fixture
+def stage(tmp_path):
+    roads_file = tmp_path / "roads.gpkg"
+    gpd.GeoDataFrame(
+        {
+            "road_name": ["County Road 426", "County Road 432", "Farm-to-Market Road 1788"],
+            "road_ref": ["CR 426", "CR 432", "FM 1788"],
+            "road_type": ["CR", "CR", "FM"],
+        },
+        geometry=[
+            LineString([(-103.2, 31.5), (-103.0, 31.5)]),
+            LineString([(-103.15, 31.45), (-103.15, 31.6)]),
+            LineString([(-103.3, 31.7), (-103.0, 31.7)]),
+        ],
+        crs="EPSG:4326",
+    ).to_file(roads_file, layer="roads", driver="GPKG")
+
+    cache_manager = CacheManager(str(tmp_path / "cache.db"))
+    return Stage3ProximityGeocoder(cache_manager, {
+        "road_network_path": str(roads_file),
+        "proximity_memo_size": 0,  # Batch results must not depend on the memo
+        "skip_rules": {"skip_if_quality": ["EXCELLENT", "GOOD"], "skip_if_locked": True},
+    })
+
+
+def ticket(number, street, intersection):
+    return {
+        "ticket_number": number, "street": street, "intersection": intersection,
+        "city": "Pyote", "county": "Ward",
+    }
+
+
+def test_stage3_uses_batch_results_and_checks_skips_once(stage, monkeypatch):
+    calls = {"geocode_proximity": 0, "should_skip": 0}
+    geocode_proximity = stage.geocoder.geocode_proximity
+    should_skip = stage.should_skip
+
+    def count(name, func):
+        def counted(*args, **kwargs):
+            calls[name] += 1
+            return func(*args, **kwargs)
+        return counted
+
+    monkeypatch.setattr(stage.geocoder, "geocode_proximity", count("geocode_proximity", geocode_proximity))
+    monkeypatch.setattr(stage, "should_skip", count("should_skip", should_skip))
+
+    results = stage.run([
+        ticket("T1", "CR 426", "CR 432"),
+        ticket("T2", "CR 432", "FM 1788"),
+        ticket("T3", "CR 426", "CR 432"),
+    ])
+
+    assert all(result.success and not result.skipped for result in results)
+    assert calls == {"geocode_proximity": 0, "should_skip": 3}
+    assert results[0].geocode_record.latitude == pytest.approx(31.5)
+
+    # A ticket seen again in the same run is re-checked against its new record
+    results = stage.run([ticket("T4", "CR 426", "CR 432"), ticket("T4", "CR 426", "CR 432")])
+    assert [result.skipped for result in results] == [False, True]
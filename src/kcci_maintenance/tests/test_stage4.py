@@ -0,0 +1,139 @@
+"""
+Unit tests for Stage 4 fallback (fuzzy road names, location priors).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+gpd = pytest.importorskip("geopandas")
+from shapely.geometry import LineString
+
+from cache.cache_manager import CacheManager
+from cache.models import GeocodeRecord, QualityTier
+from cache.road_aliases import RoadAliasStore
+from stages.stage_4_fallback import Stage4Fallback
+
+
+@pytest.fixture
+def roads_file(tmp_path):
+    path = tmp_path / "roads.gpkg"
+    gpd.GeoDataFrame(
+        {
+            "road_name": ["County Road 426", "Farm-to-Market Road 1788", "Monahans Highway"],
+            "road_ref": ["CR 426", "FM 1788", None],
+            "road_type": ["CR", "FM", "SH"],
+        },
+        geometry=[
+            LineString([(-103.2, 31.5), (-103.0, 31.5)]),
+            LineString([(-103.15, 31.45), (-103.15, 31.6)]),
+            LineString([(-103.3, 31.55), (-103.0, 31.58)]),
+        ],
+        crs="EPSG:4326",
+    ).to_file(path, layer="roads", driver="GPKG")
+    return path
+
+
+def make_stage(tmp_path, roads_file, **config):
+    cache_manager = CacheManager(str(tmp_path / "cache.db"))
+    return Stage4Fallback(cache_manager, {
+        "road_network_path": str(roads_file),
+        "skip_rules": {"skip_if_locked": True},
+        **config,
+    })
+
+
+def ticket(number, street, intersection):
+    return {
+        "ticket_number": number, "street": street, "intersection": intersection,
+        "city": "Pyote", "county": "Ward",
+    }
+
+
+def test_stage4_geocodes_with_corrected_name(tmp_path, roads_file):
+    stage = make_stage(tmp_path, roads_file)
+    result = stage.run_single(ticket("T1", "CR 426", "FN 1788"))
+
+    assert result.success and not result.skipped
+    record = result.geocode_record
+    assert record.intersection == "FN 1788"  # Ticket fields are kept as entered
+    corrections = record.metadata["road_name_corrections"]
+    assert corrections == [{
+        "field": "intersection", "from": "FN 1788", "to": "FM 1788", "distance": 1, "source": "fuzzy",
+    }]
+    assert "FN 1788 → FM 1788" in record.reasoning
+
+
+def test_stage4_persists_aliases_for_later_runs(tmp_path, roads_file):
+    make_stage(tmp_path, roads_file).run_single(ticket("T1", "MONAHNS HWY", "CR 426"))
+    assert RoadAliasStore(tmp_path / "cache.db").all() == {("WARD", "MONAHNS HWY"): "MONAHANS HIGHWAY"}
+
+    later = make_stage(tmp_path, roads_file)
+    result = later.run_single(ticket("T2", "MONAHNS HWY", "CR 426"))
+    assert result.success and not result.skipped
+    assert result.geocode_record.metadata["road_name_corrections"][0]["source"] == "alias"
+    assert later.aliases.get_statistics() == {"aliases": 1, "lifetime_hits": 1}
+
+
+def test_stage4_skips_tickets_without_correctable_names(tmp_path, roads_file):
+    stage = make_stage(tmp_path, roads_file, learn_aliases=False)
+
+    resolved = stage.run_single(ticket("T3", "CR 426", "FM 1788"))
+    unresolvable = stage.run_single(ticket("T4", "CR 426", "XYZZY RANCH TRAIL"))
+
+    for result in (resolved, unresolvable):
+        assert result.skipped
+        assert result.skip_reason == "No correctable road name"
+    assert stage.cache_manager.get_current(ticket_number="T3") is None
+
+
+def test_stage4_places_uncorrectable_tickets_at_location_priors(tmp_path, roads_file):
+    stage = make_stage(tmp_path, roads_file, learn_aliases=False, historical_priors={"enabled": True})
+    for number, lat in [("P1", 31.5200), ("P2", 31.5205), ("P3", 31.5210)]:
+        stage.cache_manager.set(GeocodeRecord(
+            ticket_number=number, geocode_key=number,
+            street="XYZZY RANCH TRAIL", intersection="CR 426", city="Pyote", county="Ward",
+            latitude=lat, longitude=-103.1, confidence=0.92,
+            method="stage_3_proximity", quality_tier=QualityTier.EXCELLENT,
+        ), "stage_3_proximity")
+
+    placed, unknown = stage.run([
+        ticket("T5", "Xyzzy Ranch Trail", "CR 426"),
+        ticket("T6", "PLUGH DRAW", "CR 9999"),
+    ])
+
+    assert placed.success and not placed.skipped
+    record = placed.geocode_record
+    assert record.approach == "historical_prior"
+    assert record.latitude == pytest.approx(31.5205)
+    assert record.confidence == pytest.approx(0.80 * 3 / 4)
+    assert record.metadata["location_prior"]["support"] == 3
+    assert unknown.skip_reason == "No correctable road name or location prior"
+
+
+def test_stage4_keeps_more_confident_current_geocode(tmp_path, roads_file):
+    stage = make_stage(tmp_path, roads_file, learn_aliases=False)
+    for number, confidence in [("T7", 0.99), ("T8", 0.10)]:
+        stage.cache_manager.set(GeocodeRecord(
+            ticket_number=number, geocode_key=number,
+            street="CR 426", intersection="FN 1788", city="Pyote", county="Ward",
+            latitude=31.6, longitude=-103.2, confidence=confidence,
+            method="stage_3_proximity", quality_tier=QualityTier.REVIEW_NEEDED,
+        ), "stage_3_proximity")
+
+    kept, replaced, unresolvable = stage.run([
+        ticket("T7", "CR 426", "FN 1788"),
+        ticket("T8", "CR 426", "FN 1788"),
+        ticket("T9", "CR 426", "XYZZY RANCH TRAIL"),
+    ])
+
+    assert kept.skipped
+    assert stage.cache_manager.get_current(ticket_number="T7").confidence == pytest.approx(0.99)
+    assert not replaced.skipped
+    assert replaced.geocode_record.metadata["road_name_corrections"][0]["to"] == "FM 1788"
+    assert unresolvable.skipped
+    assert stage._plans == {}
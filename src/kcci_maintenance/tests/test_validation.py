@@ -0,0 +1,65 @@
+"""
+Unit tests for the validation engine and its gazetteer-backed city-distance rule.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.validation_rules import CityDistanceRule, ValidationEngine
+from gazetteer import Gazetteer
+
+
+def _geocode(**fields):
+    geocode = dict(
+        latitude=31.5401, longitude=-103.1293, confidence=0.95, method="stage_3_proximity",
+        approach="closest_point", street="CR 426", intersection="CR 432",
+        city="Pyote", county="Ward", ticket_type="Normal",
+    )
+    geocode.update(fields)
+    return geocode
+
+
+def test_city_distance_uses_gazetteer():
+    gazetteer = Gazetteer(
+        np.array(["TOYAH"], dtype=object), np.array(["REEVES"], dtype=object),
+        np.array([31.3135]), np.array([-103.7930]),
+    )
+    engine = ValidationEngine(gazetteer=gazetteer)
+
+    results = engine.validate(**_geocode(city="Toyah", county="Reeves County", latitude=32.0))
+    assert engine.get_validation_flags(results) == ["distance_from_city"]
+    # Built-in cities are not in this gazetteer
+    assert engine.validate(**_geocode(latitude=33.0)) == []
+
+
+def test_validate_batch_matches_validate():
+    geocodes = [
+        _geocode(),
+        _geocode(city="Barstow", latitude=32.0, longitude=-102.0, confidence=0.6),
+        _geocode(latitude=None, longitude=None, approach="city_centroid_fallback"),
+        _geocode(city=None, ticket_type="Emergency", confidence=0.7),
+    ]
+    engine = ValidationEngine()
+
+    batch = engine.validate_batch(pd.DataFrame(geocodes))
+    assert batch == [engine.validate(**geocode) for geocode in geocodes]
+    assert engine.get_validation_flags(batch[1]) == ["low_confidence", "distance_from_city"]
+    assert engine.validate_batch(pd.DataFrame(columns=list(geocodes[0]))) == []
+
+
+def test_city_distance_batch_flags_only_known_cities():
+    rule = CityDistanceRule(max_km=50)
+    records = pd.DataFrame([
+        _geocode(latitude=33.0),
+        _geocode(city="Nowhere", latitude=33.0),
+        _geocode(latitude=None),
+    ])
+    results = rule.check_batch(records)
+    assert results[0].flag == "distance_from_city"
+    assert results[1:] == [None, None]
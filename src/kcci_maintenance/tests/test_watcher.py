@@ -0,0 +1,171 @@
+"""
+Unit tests for the watch-folder ingestion daemon.
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline import Pipeline
+from cache.cache_manager import CacheManager
+from watcher import TicketWatcher
+from tests.test_pipeline import MockStage
+
+
+@pytest.fixture
+def cache_manager(tmp_path):
+    """Create a temporary cache manager for testing."""
+    return CacheManager(str(tmp_path / "test_watch.db"))
+
+
+@pytest.fixture
+def tickets_dir(tmp_path):
+    """Ticket directory with the tickets/[county]/[year]/ layout."""
+    directory = tmp_path / "tickets" / "ward" / "2025"
+    directory.mkdir(parents=True)
+    return tmp_path / "tickets"
+
+
+def _write_export(path, numbers):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Number", "Ticket Type", "County", "City", "Street", "Intersection"])
+        for number in numbers:
+            writer.writerow([number, "Normal", "Ward", "Pyote", "CR 426", "CR 432"])
+
+
+def _make_watcher(cache_manager, tickets_dir, tmp_path):
+    pipeline = Pipeline(cache_manager, {"name": "watch_test"})
+    stage = MockStage("test_stage", cache_manager, {"skip_rules": {}})
+    pipeline.add_stage(stage)
+    watcher = TicketWatcher(
+        directories=[tickets_dir],
+        pipeline=pipeline,
+        state_path=tmp_path / "out" / "watch_state.json",
+        results_path=tmp_path / "out" / "results.csv",
+        review_queue_path=tmp_path / "out" / "review.csv",
+        settle_s=1.0,
+        use_inotify=False,
+    )
+    return watcher, stage
+
+
+def test_files_are_debounced_until_settled(cache_manager, tickets_dir, tmp_path):
+    """A file is only ready once its size/mtime are stable for settle_s."""
+    watcher, _ = _make_watcher(cache_manager, tickets_dir, tmp_path)
+    export = tickets_dir / "ward" / "2025" / "GeoCallSearchResult_1.csv"
+    _write_export(export, ["1001"])
+
+    assert watcher.ready_files(now=100.0) == []
+    assert watcher.ready_files(now=100.5) == []
+
+    # Still being written: timer restarts
+    _write_export(export, ["1001", "1002"])
+    assert watcher.ready_files(now=101.2) == []
+    assert watcher.ready_files(now=102.3) == [export]
+
+
+def test_truncated_xlsx_is_not_ready(cache_manager, tickets_dir, tmp_path):
+    """Partially written workbooks are skipped until they are valid archives."""
+    watcher, _ = _make_watcher(cache_manager, tickets_dir, tmp_path)
+    partial = tickets_dir / "ward" / "2025" / "GeoCallSearchResult_2.xlsx"
+    partial.write_bytes(b"PK\x03\x04 partial")
+    lock_file = tickets_dir / "ward" / "2025" / "~$GeoCallSearchResult_2.xlsx"
+    lock_file.write_bytes(b"lock")
+
+    watcher.ready_files(now=0.0)
+    assert watcher.ready_files(now=10.0) == []
+
+
+def test_ingest_only_new_tickets_and_persist_state(cache_manager, tickets_dir, tmp_path):
+    """Only unseen tickets are processed; state survives a restart."""
+    watcher, stage = _make_watcher(cache_manager, tickets_dir, tmp_path)
+    first = tickets_dir / "ward" / "2025" / "GeoCallSearchResult_1.csv"
+    _write_export(first, ["1001", "1002"])
+
+    batch = watcher.ingest([first])
+    assert batch.new_tickets == 2
+    assert stage.processed_tickets == ["1001", "1002"]
+
+    # Next export overlaps the previous one
+    second = tickets_dir / "ward" / "2025" / "GeoCallSearchResult_2.csv"
+    _write_export(second, ["1002", "1003"])
+
+    restarted, stage2 = _make_watcher(cache_manager, tickets_dir, tmp_path)
+    restarted.ready_files(now=0.0)
+    ready = restarted.ready_files(now=5.0)
+    assert ready == [second]
+
+    batch = restarted.ingest(ready)
+    assert batch.new_tickets == 1
+    assert batch.duplicate_tickets == 1
+    assert stage2.processed_tickets == ["1003"]
+
+    with open(tmp_path / "out" / "results.csv") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["ticket_number"] for row in rows] == ["1001", "1002", "1003"]
+    assert (tmp_path / "out" / "review.csv").exists()
+
+
+def test_run_polls_until_max_iterations(cache_manager, tickets_dir, tmp_path):
+    """Polling loop ingests a settled file."""
+    watcher, stage = _make_watcher(cache_manager, tickets_dir, tmp_path)
+    watcher.settle_s = 0.0
+    watcher.poll_interval_s = 0.01
+    _write_export(tickets_dir / "ward" / "2025" / "GeoCallSearchResult_1.csv", ["2001"])
+
+    watcher.run(max_iterations=2)
+
+    assert stage.processed_tickets == ["2001"]
+    assert watcher.mode == "polling"
+
+
+def test_unreadable_file_is_skipped_until_it_changes(cache_manager, tickets_dir, tmp_path, monkeypatch):
+    """A file that fails to load is not retried on every poll."""
+    watcher, stage = _make_watcher(cache_manager, tickets_dir, tmp_path)
+    export = tickets_dir / "ward" / "2025" / "GeoCallSearchResult_1.csv"
+    _write_export(export, ["3001"])
+
+    def fail(path):
+        raise ValueError("missing Number column")
+
+    monkeypatch.setattr(watcher.loader, "load", fail)
+    watcher.ready_files(now=0.0)
+    batch = watcher.ingest(watcher.ready_files(now=5.0))
+    assert list(batch.errors) == [str(export)]
+
+    watcher.ready_files(now=10.0)
+    assert watcher.ready_files(now=20.0) == []
+
+    monkeypatch.undo()
+    _write_export(export, ["3001", "3002"])
+    watcher.ready_files(now=30.0)
+    assert watcher.ingest(watcher.ready_files(now=35.0)).new_tickets == 2
+    assert stage.processed_tickets == ["3001", "3002"]
+
+
+def test_pipeline_failure_does_not_stop_the_watcher(cache_manager, tickets_dir, tmp_path, monkeypatch):
+    """A failing pipeline run is logged; its tickets are retried once the file changes."""
+    watcher, stage = _make_watcher(cache_manager, tickets_dir, tmp_path)
+    watcher.settle_s = 0.0
+    watcher.poll_interval_s = 0.01
+    export = tickets_dir / "ward" / "2025" / "GeoCallSearchResult_1.csv"
+    _write_export(export, ["4001"])
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(watcher.pipeline, "run", fail)
+    watcher.run(max_iterations=3)
+    assert watcher.seen_tickets == set()
+    assert not (tmp_path / "out" / "watch_state.json").exists()
+
+    monkeypatch.undo()
+    _write_export(export, ["4001", "4002"])
+    watcher.run(max_iterations=2)
+    assert stage.processed_tickets == ["4001", "4002"]
@@ -0,0 +1,193 @@
+"""
+Local stand-in for the Google Geocoding API.
+
+Serves ``/maps/api/geocode/json`` in the Google response format from an
+in-memory table of addresses, so Stage 1 and core/api_client.py can be
+exercised without an API key or network access (tests, dry runs). Failures
+can be scripted to check retry and rate-limit handling.
+
+Usage:
+    from utils.fake_geocode_server import FakeGeocodeServer
+
+    with FakeGeocodeServer({"CR 426 and CR 432, Pyote, TX": (31.54, -103.13)}) as server:
+        config = {"api_key": "test", "base_url": server.url}
+
+    # Standalone (point stage_1_api.base_url at it)
+    python utils/fake_geocode_server.py --port 8765
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+GEOCODE_PATH = "/maps/api/geocode/json"
+
+# A scripted failure: an HTTP status (e.g. 429, 503) or a Google status
+# string returned with HTTP 200 (e.g. "OVER_QUERY_LIMIT")
+Failure = Union[int, str]
+
+
+class FakeGeocodeServer:
+    """Threaded HTTP server answering geocode requests from a lookup table."""
+
+    def __init__(
+        self,
+        locations: Optional[Dict[str, Tuple[float, float]]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_s: float = 0.0,
+    ):
+        """Initialize server (not started until start() / ``with``).
+
+        Args:
+            locations: {address query: (lat, lng)}; other queries get ZERO_RESULTS
+            host: Bind address
+            port: Bind port (0 = any free port)
+            latency_s: Delay before each response (simulated round trip)
+        """
+        self.locations = dict(locations or {})
+        self.latency_s = latency_s
+        self.requests: list = []
+        self._failures: Deque[Failure] = deque()
+        self._key_failures: Dict[str, Deque[Failure]] = {}
+        self._lock = threading.Lock()
+        self._active = 0
+        self.max_concurrent = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{GEOCODE_PATH}"
+
+    def fail_next(self, failures: Iterable[Failure], address: Optional[str] = None) -> None:
+        """Answer the next requests (for one address, or any) with these failures."""
+        with self._lock:
+            if address is None:
+                self._failures.extend(failures)
+            else:
+                self._key_failures.setdefault(address, deque()).extend(failures)
+
+    def _next_failure(self, address: str) -> Optional[Failure]:
+        with self._lock:
+            queue = self._key_failures.get(address)
+            if queue:
+                return queue.popleft()
+            if self._failures:
+                return self._failures.popleft()
+        return None
+
+    def respond(self, params: Dict[str, str]) -> Tuple[int, dict]:
+        """(HTTP status, JSON body) for a request's query parameters."""
+        address = params.get("address", "")
+        with self._lock:
+            self.requests.append(params)
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+        try:
+            if self.latency_s:
+                time.sleep(self.latency_s)
+
+            failure = self._next_failure(address)
+            if isinstance(failure, int):
+                return failure, {"status": "UNKNOWN_ERROR"}
+            if failure is not None:
+                return 200, {"status": failure, "results": []}
+            if not params.get("key"):
+                return 200, {"status": "REQUEST_DENIED", "error_message": "Missing API key"}
+
+            location = self.locations.get(address)
+            if location is None:
+                return 200, {"status": "ZERO_RESULTS", "results": []}
+
+            lat, lng = location
+            return 200, {
+                "status": "OK",
+                "results": [{
+                    "formatted_address": address,
+                    "place_id": f"fake:{abs(hash(address)) % 10**10}",
+                    "types": ["intersection"] if " and " in address else ["route"],
+                    "geometry": {
+                        "location": {"lat": lat, "lng": lng},
+                        "location_type": "GEOMETRIC_CENTER",
+                    },
+                }],
+            }
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path != GEOCODE_PATH:
+                    status, body = 404, {"status": "NOT_FOUND"}
+                else:
+                    params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                    status, body = server.respond(params)
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeGeocodeServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeGeocodeServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Google Geocoding API server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per response")
+    parser.add_argument(
+        "--locations", help="JSON file of {address query: [lat, lng]}"
+    )
+    args = parser.parse_args()
+
+    locations = {}
+    if args.locations:
+        with open(args.locations, encoding="utf-8") as f:
+            locations = {k: tuple(v) for k, v in json.load(f).items()}
+
+    server = FakeGeocodeServer(locations, port=args.port, latency_s=args.latency)
+    print(f"Fake geocode server on {server.url} ({len(locations)} locations)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
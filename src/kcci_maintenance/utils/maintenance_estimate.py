@@ -21,6 +21,8 @@ import pandas as pd
 from shapely.geometry import Point, LineString
 from shapely.ops import nearest_points
 
+from kcci_maintenance.utils.sampling import StratifiedSample, estimate_leg_totals
+
 logger = logging.getLogger(__name__)
 
 
@@ -253,7 +255,7 @@ class MaintenanceEstimateGenerator:
 
         return excavation_tickets, filter_stats
 
-    def _calculate_time_span_years(self, tickets_df: pd.DataFrame) -> tuple[float, dict]:
+    def calculate_time_span_years(self, tickets_df: pd.DataFrame) -> tuple[float, dict]:
         """Calculate the time span of ticket data in years.
 
         Args:
@@ -472,6 +474,9 @@ class MaintenanceEstimateGenerator:
         tickets_df: pd.DataFrame,
         output_path: Path,
         project_name: str = "Project",
+        sample: Optional[StratifiedSample] = None,
+        confidence_level: float = 0.95,
+        years_span: Optional[float] = None,
     ) -> None:
         """Generate maintenance estimate Excel workbook.
 
@@ -479,11 +484,31 @@ class MaintenanceEstimateGenerator:
             tickets_df: DataFrame with geocoded tickets
             output_path: Path for output Excel file
             project_name: Name of project for report title
+            sample: Sample design when tickets_df is a stratified sample;
+                leg counts are then extrapolated to the full population and a
+                "Sample Estimate" sheet with confidence intervals is added
+            confidence_level: Confidence level for sample intervals
+            years_span: Years of data for annualization (default: from
+                tickets_df dates); pass the population's span for a sample,
+                whose own dates may cover less
         """
         logger.info(f"Generating maintenance estimate for {len(tickets_df)} tickets")
 
+        if sample is not None:
+            tickets_df = tickets_df.copy()
+            tickets_df['sample_weight'] = sample.weights(
+                tickets_df['ticket_number'].astype(str).tolist()
+            ).to_numpy()
+
         # Calculate time span of data for annualization
-        years_span, time_info = self._calculate_time_span_years(tickets_df)
+        if years_span is None:
+            years_span, time_info = self.calculate_time_span_years(tickets_df)
+        else:
+            time_info = {
+                'years': round(years_span, 2),
+                'method': 'provided',
+                'note': f'{round(years_span, 1)} years (ticket population)',
+            }
 
         # Filter to excavation tickets only
         excavation_tickets, filter_stats = self._filter_excavation_tickets(tickets_df)
@@ -501,6 +526,22 @@ class MaintenanceEstimateGenerator:
         breakdown_df = self._generate_breakdowns(tickets_with_legs)
         cost_projections_df = self._generate_cost_projections(tickets_with_legs, leg_details_df)
 
+        sample_estimate_df = None
+        if sample is not None:
+            sample_estimate_df = self.estimate_from_sample(
+                tickets_df, sample, confidence_level,
+                years_span=years_span, tickets_with_legs=tickets_with_legs,
+            )
+            summary_df = pd.concat([summary_df, pd.DataFrame({
+                'Metric': ['Sampled Tickets', 'Population Tickets', 'Confidence Level'],
+                'Value': [sample.size, sample.population_size, confidence_level],
+                'Notes': [
+                    'Stratified random sample (county, ticket type, year); leg counts are extrapolated',
+                    'Tickets the sample was drawn from',
+                    'See Sample Estimate sheet for per-leg confidence intervals',
+                ],
+            })], ignore_index=True)
+
         # Create Excel workbook
         with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
             # First write Maintenance Estimate to get the row mappings
@@ -551,6 +592,14 @@ class MaintenanceEstimateGenerator:
             # Apply Arial font to Ticket Breakdowns
             self._apply_arial_font(ws_breakdowns)
 
+            if sample_estimate_df is not None:
+                sample_estimate_df.to_excel(writer, sheet_name='Sample Estimate', index=False)
+                ws_sample = writer.book['Sample Estimate']
+                col_idx = list(sample_estimate_df.columns).index('Relative Half-Width') + 1
+                for row in range(2, len(sample_estimate_df) + 2):
+                    ws_sample.cell(row=row, column=col_idx).number_format = '0.0%'
+                self._apply_arial_font(ws_sample)
+
             # Sheet 6: Raw Data (tickets with leg assignments)
             tickets_with_legs.to_excel(writer, sheet_name='Ticket Assignments', index=False)
 
@@ -560,6 +609,50 @@ class MaintenanceEstimateGenerator:
 
         logger.info(f"Maintenance estimate saved to {output_path}")
 
+    def estimate_from_sample(
+        self,
+        tickets_df: pd.DataFrame,
+        sample: StratifiedSample,
+        confidence_level: float = 0.95,
+        years_span: Optional[float] = None,
+        tickets_with_legs: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """Extrapolate per-leg ticket counts from a geocoded sample.
+
+        Args:
+            tickets_df: Geocoded sampled tickets (rows without coordinates
+                are treated as not observed)
+            sample: Sample design the tickets were drawn with
+            confidence_level: Confidence level for intervals
+            years_span: Years of data (default: from tickets_df dates)
+            tickets_with_legs: Excavation tickets already assigned to legs
+                (computed when not given)
+
+        Returns:
+            DataFrame with estimated totals and confidence intervals per leg
+        """
+        if years_span is None:
+            years_span, _ = self.calculate_time_span_years(tickets_df)
+
+        observed = tickets_df[tickets_df['latitude'].notna() & tickets_df['longitude'].notna()]
+        if tickets_with_legs is None:
+            excavation_tickets, _ = self._filter_excavation_tickets(observed)
+            tickets_with_legs = self.assign_tickets_to_legs(excavation_tickets)
+
+        leg_assignments = pd.Series(
+            tickets_with_legs['route_leg'].to_numpy(),
+            index=tickets_with_legs['ticket_number'].astype(str),
+        ).dropna()
+
+        return estimate_leg_totals(
+            observed_tickets=observed['ticket_number'].astype(str),
+            leg_assignments=leg_assignments,
+            sample=sample,
+            leg_names=self.route_legs['name'].tolist(),
+            years_span=years_span,
+            confidence_level=confidence_level,
+        )
+
     def _generate_summary_stats(self, tickets_df: pd.DataFrame, filter_stats: dict = None) -> pd.DataFrame:
         """Generate overall summary statistics.
 
@@ -637,16 +730,22 @@ class MaintenanceEstimateGenerator:
             else:
                 leg_length_mi = None
 
-            # Basic counts (total in dataset)
-            total_tickets_dataset = len(group)
+            # Basic counts (total in dataset; weighted up to the population for samples)
+            weighted = 'sample_weight' in group.columns
+            total_tickets_dataset = group['sample_weight'].sum() if weighted else len(group)
 
             # Annualized count
             total_tickets = round(total_tickets_dataset / years_span)
 
             # By ticket type (if column exists) - also annualized
             if 'ticket_type' in group.columns:
-                emergency_tickets_dataset = len(group[group['ticket_type'] == 'Emergency'])
-                normal_tickets_dataset = len(group[group['ticket_type'] != 'Emergency'])
+                is_emergency = group['ticket_type'] == 'Emergency'
+                if weighted:
+                    emergency_tickets_dataset = group.loc[is_emergency, 'sample_weight'].sum()
+                    normal_tickets_dataset = group.loc[~is_emergency, 'sample_weight'].sum()
+                else:
+                    emergency_tickets_dataset = len(group[is_emergency])
+                    normal_tickets_dataset = len(group[~is_emergency])
                 emergency_tickets = round(emergency_tickets_dataset / years_span)
                 normal_tickets = round(normal_tickets_dataset / years_span)
             else:
@@ -1184,6 +1283,9 @@ def generate_maintenance_estimate(
     output_path: Path,
     project_name: str = "Project",
     buffer_distance_m: float = 500.0,
+    sample: Optional[StratifiedSample] = None,
+    confidence_level: float = 0.95,
+    years_span: Optional[float] = None,
 ) -> None:
     """Convenience function to generate maintenance estimate.
 
@@ -1193,6 +1295,11 @@ def generate_maintenance_estimate(
         output_path: Path for output Excel file
         project_name: Name of project
         buffer_distance_m: Buffer distance for ticket assignment
+        sample: Sample design when tickets_df is a stratified sample
+            (see utils.sampling.StratifiedSampler)
+        confidence_level: Confidence level for sample intervals
+        years_span: Years of data for annualization (default: from
+            tickets_df dates; see generate_estimate)
     """
     generator = MaintenanceEstimateGenerator(
         kmz_path=kmz_path,
@@ -1202,7 +1309,10 @@ def generate_maintenance_estimate(
     generator.generate_estimate(
         tickets_df=tickets_df,
         output_path=output_path,
-        project_name=project_name
+        project_name=project_name,
+        sample=sample,
+        confidence_level=confidence_level,
+        years_span=years_span,
     )
 
 
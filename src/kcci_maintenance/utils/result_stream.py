@@ -0,0 +1,141 @@
+"""
+Streaming result output.
+
+Appends finished geocode records to a results CSV or JSONL file as each
+pipeline chunk commits, so early results (e.g. emergencies scheduled first)
+are visible before the whole run finishes.
+"""
+
+import csv
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+
+# Column order shared with Pipeline.export_results
+EXPORT_FIELDNAMES = [
+    "ticket_number", "geocode_key", "latitude", "longitude",
+    "confidence", "method", "approach", "quality_tier",
+    "review_priority", "validation_flags", "street", "intersection",
+    "city", "county", "ticket_type", "duration", "work_type",
+    "excavator", "created_at", "created_by_stage"
+]
+
+
+def record_to_row(record) -> Dict[str, Any]:
+    """Convert a GeocodeRecord to a flat export row.
+
+    Args:
+        record: GeocodeRecord
+
+    Returns:
+        Dictionary keyed by EXPORT_FIELDNAMES
+    """
+    return {
+        "ticket_number": record.ticket_number,
+        "geocode_key": record.geocode_key,
+        "latitude": record.latitude,
+        "longitude": record.longitude,
+        "confidence": record.confidence,
+        "method": record.method,
+        "approach": record.approach,
+        "quality_tier": record.quality_tier.value if hasattr(record.quality_tier, 'value') else record.quality_tier,
+        "review_priority": record.review_priority.value if hasattr(record.review_priority, 'value') else record.review_priority,
+        "validation_flags": ",".join(record.validation_flags) if record.validation_flags else "",
+        "street": record.street,
+        "intersection": record.intersection,
+        "city": record.city,
+        "county": record.county,
+        "ticket_type": record.ticket_type,
+        "duration": record.duration,
+        "work_type": record.work_type,
+        "excavator": record.excavator,
+        "created_at": record.created_at,
+        "created_by_stage": record.created_by_stage,
+    }
+
+
+class ResultStreamWriter:
+    """Append-only CSV/JSONL sink for pipeline results."""
+
+    FORMATS = ("csv", "jsonl")
+
+    def __init__(
+        self,
+        output_path: Union[str, Path],
+        output_format: Optional[str] = None,
+        append: bool = False,
+    ):
+        """Initialize writer.
+
+        Args:
+            output_path: Output file path
+            output_format: "csv" or "jsonl" (default: inferred from suffix)
+            append: Keep existing file contents (header is not repeated)
+        """
+        self.output_path = Path(output_path)
+        if output_format is None:
+            output_format = "jsonl" if self.output_path.suffix.lower() in (".jsonl", ".ndjson") else "csv"
+        if output_format not in self.FORMATS:
+            raise ValueError(f"Unsupported stream format: {output_format}")
+        self.output_format = output_format
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not append and self.output_path.exists():
+            self.output_path.unlink()
+
+        self._needs_header = (
+            self.output_format == "csv"
+            and (not self.output_path.exists() or self.output_path.stat().st_size == 0)
+        )
+        self.written_count = 0
+        self.written_tickets: Set[str] = set()
+
+    def write_records(self, records: Iterable) -> int:
+        """Append records and flush them to disk.
+
+        Args:
+            records: Iterable of GeocodeRecord
+
+        Returns:
+            Number of records written
+        """
+        rows = [record_to_row(record) for record in records]
+        if not rows:
+            return 0
+
+        with open(self.output_path, "a", newline="") as f:
+            if self.output_format == "csv":
+                writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDNAMES)
+                if self._needs_header:
+                    writer.writeheader()
+                    self._needs_header = False
+                writer.writerows(rows)
+            else:
+                for row in rows:
+                    f.write(json.dumps(row, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.written_count += len(rows)
+        self.written_tickets.update(str(row["ticket_number"]) for row in rows)
+        logger.debug(f"Streamed {len(rows)} records to {self.output_path}")
+        return len(rows)
+
+
+if __name__ == "__main__":
+    import tempfile
+    from types import SimpleNamespace
+
+    record = SimpleNamespace(**{name: None for name in EXPORT_FIELDNAMES})
+    record.ticket_number = "TEST_001"
+    record.validation_flags = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = ResultStreamWriter(Path(tmp) / "results.jsonl")
+        writer.write_records([record])
+        print((Path(tmp) / "results.jsonl").read_text())
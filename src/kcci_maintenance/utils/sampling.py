@@ -0,0 +1,378 @@
+"""
+Stratified sampling for fast maintenance estimates.
+
+Draws a stratified random sample of tickets (by county, ticket type and
+year), and extrapolates route-leg ticket counts from the geocoded sample
+with confidence intervals, so a tickets/mile/year preview is available
+before committing to a full geocode.
+
+Leg totals use the stratified (Horvitz-Thompson) estimator
+    T = sum_h N_h * ybar_h
+with variance
+    Var(T) = sum_h N_h^2 * (1 - n_h/N_h) * s_h^2 / n_h
+where y is 1 if a ticket is an excavation ticket assigned to the leg. Sampled
+tickets that fail to geocode are treated as missing at random within their
+stratum (n_h counts geocoded tickets only).
+"""
+
+import logging
+import random
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+StratumKey = Tuple[str, ...]
+
+DEFAULT_STRATA = ("county", "ticket_type", "year")
+
+
+def ticket_stratum(ticket: Dict[str, Any], strata: Sequence[str] = DEFAULT_STRATA) -> StratumKey:
+    """Stratum key for a ticket dict (as produced by TicketLoader.prepare_tickets).
+
+    ``year`` comes from the ticket creation date, falling back to the
+    ``_source_year`` directory; ``county`` falls back to ``_source_county``.
+    """
+    key = []
+    for name in strata:
+        if name == "year":
+            value = ""
+            creation = ticket.get("creation")
+            if creation:
+                timestamp = pd.to_datetime(creation, errors="coerce")
+                if not pd.isna(timestamp):
+                    value = str(timestamp.year)
+            value = value or str(ticket.get("_source_year") or "")
+        elif name == "county":
+            value = str(ticket.get("county") or ticket.get("_source_county") or "")
+        else:
+            value = str(ticket.get(name) or "")
+        key.append(value.strip().upper())
+    return tuple(key)
+
+
+@dataclass
+class StratifiedSample:
+    """A stratified sample: population sizes and sampled tickets per stratum."""
+    strata: Tuple[str, ...]
+    population_sizes: Dict[StratumKey, int]
+    ticket_strata: Dict[str, StratumKey] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        """Number of sampled tickets."""
+        return len(self.ticket_strata)
+
+    @property
+    def population_size(self) -> int:
+        """Number of tickets in the population."""
+        return sum(self.population_sizes.values())
+
+    @property
+    def sample_sizes(self) -> Dict[StratumKey, int]:
+        """Sampled tickets per stratum."""
+        sizes: Dict[StratumKey, int] = {}
+        for key in self.ticket_strata.values():
+            sizes[key] = sizes.get(key, 0) + 1
+        return sizes
+
+    def effective_sizes(self, observed_tickets: Iterable[str]) -> Dict[StratumKey, int]:
+        """Sampled tickets per stratum that were actually observed (geocoded)."""
+        sizes: Dict[StratumKey, int] = {}
+        for number in observed_tickets:
+            key = self.ticket_strata.get(str(number))
+            if key is not None:
+                sizes[key] = sizes.get(key, 0) + 1
+        return sizes
+
+    def weights(self, observed_tickets: Sequence[str]) -> pd.Series:
+        """Design weights (N_h / n_h) for observed sampled tickets.
+
+        Args:
+            observed_tickets: Ticket numbers with usable (geocoded) results
+
+        Returns:
+            Series of weights indexed like observed_tickets
+        """
+        effective = self.effective_sizes(observed_tickets)
+        weights = []
+        for number in observed_tickets:
+            key = self.ticket_strata.get(str(number))
+            if key is None or not effective.get(key):
+                weights.append(0.0)
+            else:
+                weights.append(self.population_sizes[key] / effective[key])
+        return pd.Series(weights, dtype=float)
+
+
+class StratifiedSampler:
+    """Draws (and progressively extends) a stratified random ticket sample."""
+
+    def __init__(
+        self,
+        tickets: List[Dict[str, Any]],
+        strata: Sequence[str] = DEFAULT_STRATA,
+        seed: Optional[int] = None,
+        min_per_stratum: int = 2,
+    ):
+        """Initialize sampler.
+
+        Args:
+            tickets: Population of ticket dicts
+            strata: Ticket fields defining strata
+            seed: Random seed for reproducible samples
+            min_per_stratum: Minimum draws per stratum (when the budget allows)
+                so every stratum has a variance estimate
+        """
+        self.strata = tuple(strata)
+        self.min_per_stratum = min_per_stratum
+        rng = random.Random(seed)
+
+        # Shuffle each stratum once; draws take the next tickets in order
+        self._groups: Dict[StratumKey, List[Dict[str, Any]]] = {}
+        for ticket in tickets:
+            self._groups.setdefault(ticket_stratum(ticket, self.strata), []).append(ticket)
+        for group in self._groups.values():
+            rng.shuffle(group)
+
+        self._drawn: Dict[StratumKey, int] = {key: 0 for key in self._groups}
+        self.sample = StratifiedSample(
+            strata=self.strata,
+            population_sizes={key: len(group) for key, group in self._groups.items()},
+        )
+
+    @property
+    def exhausted(self) -> bool:
+        """True once every ticket has been sampled."""
+        return self.sample.size >= self.sample.population_size
+
+    def _allocate(self, target_total: int) -> Dict[StratumKey, int]:
+        """Proportional allocation of target_total across strata."""
+        population = self.sample.population_size
+        floor_min = self.min_per_stratum if target_total >= self.min_per_stratum * len(self._groups) else 1
+
+        allocation = {}
+        remainders = []
+        for key, size in self.sample.population_sizes.items():
+            ideal = target_total * size / population
+            count = min(size, max(min(floor_min, size), int(ideal), self._drawn[key]))
+            allocation[key] = count
+            remainders.append((ideal - int(ideal), key))
+
+        # Hand out the rest by largest remainder, largest strata first on ties
+        shortfall = target_total - sum(allocation.values())
+        for _, key in sorted(remainders, key=lambda r: (-r[0], -self.sample.population_sizes[r[1]])):
+            if shortfall <= 0:
+                break
+            if allocation[key] < self.sample.population_sizes[key]:
+                allocation[key] += 1
+                shortfall -= 1
+
+        return allocation
+
+    def draw(self, n: int) -> List[Dict[str, Any]]:
+        """Draw n more tickets (stratified, proportional to stratum size).
+
+        Previously drawn tickets stay in the sample, so calling draw()
+        repeatedly refines the same sample.
+
+        Args:
+            n: Number of additional tickets
+
+        Returns:
+            Newly drawn tickets
+        """
+        target_total = min(self.sample.population_size, self.sample.size + n)
+        allocation = self._allocate(target_total)
+
+        new_tickets = []
+        for key, count in allocation.items():
+            start = self._drawn[key]
+            for ticket in self._groups[key][start:count]:
+                new_tickets.append(ticket)
+                self.sample.ticket_strata[str(ticket["ticket_number"])] = key
+            self._drawn[key] = max(start, count)
+
+        logger.info(
+            f"Drew {len(new_tickets)} tickets "
+            f"(sample {self.sample.size}/{self.sample.population_size}, {len(self._groups)} strata)"
+        )
+        return new_tickets
+
+
+def z_score(confidence_level: float) -> float:
+    """Two-sided normal critical value for a confidence level."""
+    return NormalDist().inv_cdf(0.5 + confidence_level / 2)
+
+
+def stratified_total(
+    values: pd.Series,
+    strata: pd.Series,
+    sample: StratifiedSample,
+) -> Tuple[float, float]:
+    """Estimate a population total and its standard error.
+
+    Args:
+        values: Per-ticket values (e.g. 0/1 leg indicator) for observed tickets
+        strata: Stratum key for each observed ticket (aligned with values)
+        sample: Sample design
+
+    Returns:
+        Tuple of (estimated_total, standard_error)
+    """
+    frame = pd.DataFrame({"y": values.to_numpy(dtype=float), "stratum": strata.to_numpy()})
+    grouped = {key: group["y"].to_numpy() for key, group in frame.groupby("stratum", sort=False)}
+
+    observed_mean = frame["y"].mean() if len(frame) else 0.0
+    total = 0.0
+    variance = 0.0
+
+    for key, population in sample.population_sizes.items():
+        y = grouped.get(key)
+        if y is None or len(y) == 0:
+            # Nothing observed in this stratum: impute the overall mean
+            # with a conservative (maximum binomial) variance.
+            total += population * observed_mean
+            variance += population ** 2 * 0.25
+            continue
+
+        n = len(y)
+        mean = float(y.mean())
+        total += population * mean
+        if n >= 2:
+            s2 = float(y.var(ddof=1))
+        else:
+            s2 = 0.25
+        finite_population = max(0.0, 1.0 - n / population) if population else 0.0
+        variance += population ** 2 * finite_population * s2 / n
+
+    return total, float(np.sqrt(variance))
+
+
+def estimate_leg_totals(
+    observed_tickets: pd.Series,
+    leg_assignments: pd.Series,
+    sample: StratifiedSample,
+    leg_names: Sequence[str],
+    years_span: float = 1.0,
+    confidence_level: float = 0.95,
+) -> pd.DataFrame:
+    """Extrapolate per-leg ticket counts from a sample with confidence intervals.
+
+    Args:
+        observed_tickets: Ticket numbers of geocoded sampled tickets
+        leg_assignments: Route leg for each observed ticket that counts towards
+            a leg (excavation ticket assigned to a leg), indexed by ticket
+            number; tickets missing from it count as 0 for every leg
+        sample: Sample design
+        leg_names: Route legs to report
+        years_span: Years of data, for annualized figures
+        confidence_level: Confidence level for intervals
+
+    Returns:
+        DataFrame with one row per leg plus an "All Legs" row
+    """
+    z = z_score(confidence_level)
+    observed = pd.Series([str(t) for t in observed_tickets], dtype=object)
+    observed = observed[observed.isin(sample.ticket_strata.keys())].reset_index(drop=True)
+    strata = observed.map(sample.ticket_strata)
+    assignments = observed.map(
+        {str(k): v for k, v in leg_assignments.items()}
+    )
+
+    rows = []
+    for leg_name in list(leg_names) + ["All Legs"]:
+        if leg_name == "All Legs":
+            indicator = assignments.notna() & (assignments != "Unassigned")
+        else:
+            indicator = assignments == leg_name
+        total, se = stratified_total(indicator.astype(float), strata, sample)
+
+        half_width = z * se
+        rows.append({
+            "Route Leg": leg_name,
+            "Sampled Tickets": int(indicator.sum()),
+            "Estimated Tickets": round(total, 1),
+            "CI Low": round(max(0.0, total - half_width), 1),
+            "CI High": round(total + half_width, 1),
+            "Estimated Annual Tickets": round(total / years_span, 1),
+            "Annual CI Low": round(max(0.0, total - half_width) / years_span, 1),
+            "Annual CI High": round((total + half_width) / years_span, 1),
+            "Relative Half-Width": half_width / total if total > 0 else float("inf"),
+        })
+
+    return pd.DataFrame(rows)
+
+
+def progressive_sample(
+    sampler: StratifiedSampler,
+    evaluate: Callable[[List[Dict[str, Any]]], pd.DataFrame],
+    initial_size: int,
+    step_size: int,
+    target_relative_half_width: Optional[float] = None,
+    max_size: Optional[int] = None,
+) -> pd.DataFrame:
+    """Grow a sample until the "All Legs" interval is narrow enough.
+
+    Args:
+        sampler: StratifiedSampler to draw from
+        evaluate: Called with each batch of newly drawn tickets; geocodes them
+            and returns the current estimate_leg_totals() table
+        initial_size: First sample size
+        step_size: Tickets added per refinement round
+        target_relative_half_width: Stop once CI half-width / estimate is at
+            or below this (None = single round)
+        max_size: Upper bound on the sample size
+
+    Returns:
+        Final estimate table
+    """
+    max_size = max_size or sampler.sample.population_size
+    estimate = evaluate(sampler.draw(min(initial_size, max_size)))
+
+    while target_relative_half_width is not None:
+        overall = estimate[estimate["Route Leg"] == "All Legs"].iloc[0]
+        width = overall["Relative Half-Width"]
+        logger.info(f"Sample {sampler.sample.size}: relative CI half-width {width:.1%}")
+        if width <= target_relative_half_width:
+            break
+        if sampler.exhausted or sampler.sample.size >= max_size:
+            logger.warning(
+                f"Stopped at sample {sampler.sample.size} before reaching "
+                f"target ±{target_relative_half_width:.0%} (currently ±{width:.1%})"
+            )
+            break
+        estimate = evaluate(sampler.draw(min(step_size, max_size - sampler.sample.size)))
+
+    return estimate
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    tickets = [
+        {
+            "ticket_number": str(i),
+            "county": rng.choice(["Ward", "Winkler"]),
+            "ticket_type": rng.choice(["Normal", "Emergency"], p=[0.9, 0.1]),
+            "creation": f"{rng.choice([2023, 2024])}-06-01",
+        }
+        for i in range(5000)
+    ]
+    truth = {t["ticket_number"]: ("Leg 1" if rng.random() < 0.3 else "Unassigned") for t in tickets}
+
+    sampler = StratifiedSampler(tickets, seed=42)
+    observed: List[str] = []
+
+    def evaluate(new_tickets):
+        observed.extend(t["ticket_number"] for t in new_tickets)
+        assignments = pd.Series({n: truth[n] for n in observed})
+        return estimate_leg_totals(pd.Series(observed), assignments, sampler.sample, ["Leg 1"])
+
+    result = progressive_sample(sampler, evaluate, initial_size=200, step_size=200,
+                                target_relative_half_width=0.05)
+    print(result.to_string(index=False))
+    print(f"True Leg 1 total: {sum(v == 'Leg 1' for v in truth.values())}")
@@ -274,6 +274,7 @@ class TicketLoader:
                 'duration': clean_value(row.get('duration', row.get('Duration'))),
                 'work_type': clean_value(row.get('work_type', row.get('Nature of Work'))),
                 'excavator': clean_value(row.get('excavator', row.get('Excavator'))),
+                'creation': clean_value(row.get('creation', row.get('Creation'))),
             }
 
             # Add source metadata if available
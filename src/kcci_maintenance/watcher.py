@@ -0,0 +1,393 @@
+"""
+Watch-folder ingestion daemon.
+
+Watches project ticket directories for new 811 exports
+(``GeoCallSearchResult*.xlsx`` and friends), waits until each file has
+finished writing, ingests only tickets that have not been seen before, runs
+them through an already-initialized (warm) pipeline, and refreshes the
+results CSV, review queue and maintenance estimate.
+
+Uses inotify (via the optional ``inotify_simple`` package) on Linux and falls
+back to polling everywhere else.
+"""
+
+import sys
+import json
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+# Add paths for imports
+parent_dir = Path(__file__).parent
+sys.path.insert(0, str(parent_dir))
+
+from pipeline import Pipeline
+from utils.result_stream import ResultStreamWriter
+from utils.ticket_loader import TicketLoader
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+    inotify_flags = None
+
+
+DEFAULT_PATTERNS = ("*.xlsx", "*.xls", "*.csv")
+
+
+@dataclass
+class WatchBatchResult:
+    """Result of ingesting one batch of new files."""
+    files: List[str] = field(default_factory=list)
+    new_tickets: int = 0
+    duplicate_tickets: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+class TicketWatcher:
+    """Watches ticket directories and incrementally runs the pipeline."""
+
+    def __init__(
+        self,
+        directories: List[Path],
+        pipeline: Pipeline,
+        state_path: Path,
+        results_path: Path,
+        review_queue_path: Optional[Path] = None,
+        review_priorities: Optional[List[str]] = None,
+        estimate_kmz: Optional[Path] = None,
+        estimate_path: Optional[Path] = None,
+        project_name: str = "Project",
+        patterns: Tuple[str, ...] = DEFAULT_PATTERNS,
+        poll_interval_s: float = 5.0,
+        settle_s: float = 2.0,
+        use_inotify: bool = True,
+    ):
+        """Initialize watcher.
+
+        Args:
+            directories: Ticket directories to watch (recursively)
+            pipeline: Pipeline with stages already added (kept warm)
+            state_path: JSON file recording ingested files and ticket numbers
+            results_path: Results CSV that new records are appended to
+            review_queue_path: Review queue CSV regenerated after each batch
+            review_priorities: Review priorities to include in the queue
+            estimate_kmz: Route KMZ; enables estimate refresh when given
+            estimate_path: Maintenance estimate output (.xlsx)
+            project_name: Project name for the estimate
+            patterns: Glob patterns of ticket files to ingest
+            poll_interval_s: Polling interval (and inotify read timeout)
+            settle_s: Time a file's size/mtime must stay unchanged before ingest
+            use_inotify: Use inotify when available
+        """
+        self.directories = [Path(d) for d in directories]
+        self.pipeline = pipeline
+        self.state_path = Path(state_path)
+        self.results_path = Path(results_path)
+        self.review_queue_path = Path(review_queue_path) if review_queue_path else None
+        self.review_priorities = review_priorities
+        self.estimate_kmz = Path(estimate_kmz) if estimate_kmz else None
+        self.estimate_path = Path(estimate_path) if estimate_path else None
+        self.project_name = project_name
+        self.patterns = patterns
+        self.poll_interval_s = poll_interval_s
+        self.settle_s = settle_s
+
+        self.loader = TicketLoader(normalize_columns=True)
+
+        # path -> (size, mtime_ns) of files already ingested
+        self.ingested_files: Dict[str, Tuple[int, int]] = {}
+        self.seen_tickets: Set[str] = set()
+        self._load_state()
+
+        # path -> ((size, mtime_ns), time the signature was first observed)
+        self._pending: Dict[str, Tuple[Tuple[int, int], float]] = {}
+        # path -> (size, mtime_ns) of files that could not be ingested; skipped until they change
+        self._failed: Dict[str, Tuple[int, int]] = {}
+
+        self._inotify = None
+        self._watch_dirs: Dict[int, Path] = {}
+        if use_inotify and INotify is not None:
+            try:
+                self._inotify = INotify()
+                for directory in self.directories:
+                    self._add_inotify_watches(directory)
+            except OSError as e:
+                print(f"⚠ Warning: inotify unavailable ({e}); falling back to polling")
+                self._inotify = None
+
+    @property
+    def mode(self) -> str:
+        """Watch mechanism in use."""
+        return "inotify" if self._inotify is not None else "polling"
+
+    def _load_state(self) -> None:
+        """Load ingested files and seen tickets from the state file."""
+        if not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠ Warning: Could not read watch state {self.state_path}: {e}")
+            return
+
+        self.ingested_files = {
+            path: tuple(signature) for path, signature in state.get("files", {}).items()
+        }
+        self.seen_tickets = set(state.get("tickets", []))
+
+    def _save_state(self) -> None:
+        """Atomically write ingested files and seen tickets."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "files": {path: list(sig) for path, sig in self.ingested_files.items()},
+                "tickets": sorted(self.seen_tickets),
+                "updated_at": pd.Timestamp.now().isoformat(),
+            }, f)
+        tmp_path.replace(self.state_path)
+
+    def _add_inotify_watches(self, directory: Path) -> None:
+        """Watch a directory and all of its subdirectories."""
+        if not directory.is_dir():
+            return
+        mask = (
+            inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO
+            | inotify_flags.CREATE | inotify_flags.MODIFY
+        )
+        for path in [directory, *[p for p in directory.rglob("*") if p.is_dir()]]:
+            if path not in self._watch_dirs.values():
+                wd = self._inotify.add_watch(str(path), mask)
+                self._watch_dirs[wd] = path
+
+    def _matches(self, path: Path) -> bool:
+        """True for ticket files (skips temp/lock files like ~$book.xlsx)."""
+        if path.name.startswith(("~$", ".")):
+            return False
+        return any(path.match(pattern) for pattern in self.patterns)
+
+    def _candidate_files(self) -> List[Path]:
+        """All ticket files under the watched directories."""
+        files = []
+        for directory in self.directories:
+            if directory.is_dir():
+                files.extend(p for p in directory.rglob("*") if p.is_file() and self._matches(p))
+        return sorted(files)
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _is_complete(path: Path) -> bool:
+        """Check the file can be read as a whole (xlsx is a zip archive)."""
+        if path.stat().st_size == 0:
+            return False
+        if path.suffix.lower() == ".xlsx":
+            try:
+                with zipfile.ZipFile(path) as zf:
+                    return zf.testzip() is None
+            except (zipfile.BadZipFile, OSError):
+                return False
+        return True
+
+    def ready_files(self, now: Optional[float] = None) -> List[Path]:
+        """Return new/changed files whose size and mtime have settled.
+
+        Args:
+            now: Current time (for testing)
+
+        Returns:
+            Files ready to ingest
+        """
+        now = time.monotonic() if now is None else now
+        ready = []
+
+        for path in self._candidate_files():
+            key = str(path.resolve())
+            signature = self._signature(path)
+            done = (self.ingested_files.get(key), self._failed.get(key))
+            if signature is None or signature in done:
+                self._pending.pop(key, None)
+                continue
+
+            pending = self._pending.get(key)
+            if pending is None or pending[0] != signature:
+                # New or still being written: restart the settle timer
+                self._pending[key] = (signature, now)
+                continue
+
+            if now - pending[1] >= self.settle_s and self._is_complete(path):
+                ready.append(path)
+
+        return ready
+
+    def ingest(self, files: List[Path]) -> WatchBatchResult:
+        """Ingest new tickets from files and refresh outputs.
+
+        Args:
+            files: Settled ticket files
+
+        Returns:
+            WatchBatchResult
+        """
+        batch = WatchBatchResult()
+        new_tickets = []
+        batch_numbers: Set[str] = set()
+
+        for path in files:
+            key = str(path.resolve())
+            try:
+                df = self.loader.load(path)
+                tickets = self.loader.prepare_tickets(df)
+            except Exception as e:
+                # Skip it until its size or mtime changes
+                batch.errors[str(path)] = str(e)
+                print(f"⚠ Warning: Could not load {path}: {e}")
+                self._failed[key] = self._signature(path)
+                self._pending.pop(key, None)
+                continue
+
+            for ticket in tickets:
+                number = ticket["ticket_number"]
+                if not number or number in self.seen_tickets or number in batch_numbers:
+                    batch.duplicate_tickets += 1
+                    continue
+                batch_numbers.add(number)
+                new_tickets.append(ticket)
+
+            batch.files.append(str(path))
+            self.ingested_files[key] = self._signature(path)
+            self._failed.pop(key, None)
+            self._pending.pop(key, None)
+
+        batch.new_tickets = len(new_tickets)
+
+        if new_tickets:
+            sink = ResultStreamWriter(self.results_path, append=True)
+            try:
+                result = self.pipeline.run(new_tickets, result_sink=sink)
+            except Exception as e:
+                # Tickets stay unseen; the files are retried once they change
+                # (or on restart, as the state is not saved)
+                print(f"⚠ Warning: Pipeline run failed: {e}")
+                for path in batch.files:
+                    key = str(Path(path).resolve())
+                    self._failed[key] = self.ingested_files.pop(key)
+                    batch.errors[path] = str(e)
+                batch.failed = batch.new_tickets
+                batch.files = []
+                return batch
+            batch.succeeded = result.total_succeeded
+            batch.failed = result.total_failed
+            self.seen_tickets.update(batch_numbers)
+            self._refresh_outputs()
+
+        if batch.files:
+            self._save_state()
+
+        return batch
+
+    def _refresh_outputs(self) -> None:
+        """Regenerate the review queue and maintenance estimate."""
+        if self.review_queue_path is not None:
+            self.pipeline.generate_review_queue(
+                self.review_queue_path,
+                priority_filter=self.review_priorities,
+            )
+
+        if self.estimate_kmz is not None and self.estimate_path is not None:
+            try:
+                from utils.maintenance_estimate import generate_maintenance_estimate
+
+                results_df = pd.read_csv(self.results_path)
+                # Keep the latest row per ticket, geocoded only
+                results_df = results_df.drop_duplicates("ticket_number", keep="last")
+                results_df = results_df[
+                    results_df["latitude"].notna() & results_df["longitude"].notna()
+                ]
+                generate_maintenance_estimate(
+                    tickets_df=results_df,
+                    kmz_path=self.estimate_kmz,
+                    output_path=self.estimate_path,
+                    project_name=self.project_name,
+                )
+            except Exception as e:
+                print(f"⚠ Warning: Could not refresh maintenance estimate: {e}")
+
+    def poll_once(self) -> Optional[WatchBatchResult]:
+        """Check for settled files once and ingest them.
+
+        Returns:
+            WatchBatchResult if any files were ingested, else None
+        """
+        files = self.ready_files()
+        if not files:
+            return None
+
+        print(f"\n📥 {len(files)} new ticket file(s): {', '.join(p.name for p in files)}")
+        batch = self.ingest(files)
+        print(
+            f"✅ Ingested {batch.new_tickets} new tickets "
+            f"({batch.duplicate_tickets} already seen, {batch.failed} failed)"
+        )
+        return batch
+
+    def _wait_for_events(self) -> None:
+        """Block until a filesystem event or the poll interval elapses."""
+        if self._inotify is None:
+            time.sleep(self.poll_interval_s)
+            return
+
+        # Short timeout while files are settling so they are picked up promptly
+        timeout_s = min(self.poll_interval_s, self.settle_s) if self._pending else self.poll_interval_s
+        for event in self._inotify.read(timeout=int(timeout_s * 1000)):
+            if event.mask & inotify_flags.ISDIR and event.mask & inotify_flags.CREATE:
+                parent = self._watch_dirs.get(event.wd)
+                if parent is not None:
+                    self._add_inotify_watches(parent / event.name)
+
+    def run(self, max_iterations: Optional[int] = None) -> None:
+        """Watch until interrupted.
+
+        Args:
+            max_iterations: Stop after this many checks (for testing)
+        """
+        print(f"👀 Watching {len(self.directories)} director(ies) via {self.mode}")
+        for directory in self.directories:
+            print(f"   {directory}")
+
+        iterations = 0
+        try:
+            while max_iterations is None or iterations < max_iterations:
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    print(f"⚠ Warning: Watch iteration failed: {e}")
+                iterations += 1
+                if max_iterations is not None and iterations >= max_iterations:
+                    break
+                self._wait_for_events()
+        except KeyboardInterrupt:
+            print("\n✓ Stopping watcher")
+        finally:
+            if self._inotify is not None:
+                self._inotify.close()
+
+
+if __name__ == "__main__":
+    print("TicketWatcher is a class - use it via the CLI:")
+    print("  kcci-pipeline --watch projects/wink/tickets --config configs/wink_project_full.yaml \\")
+    print("      --output outputs/results.csv --generate-estimate projects/wink/route/wink.kmz")
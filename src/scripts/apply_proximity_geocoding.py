@@ -176,6 +176,7 @@ def main():
             "closest_point": "Closest Point (parallel roads)",
             "corridor_midpoint": "Corridor Midpoint (highway segment)",
             "city_primary": "City + Primary Street",
+            "network_distance": "Network Distance (connected roads)",
         }.get(approach, approach)
         print(f"  {approach_name:40s} {count:4,} ({pct:5.1f}%)")
 
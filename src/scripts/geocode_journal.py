@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+"""
+geocode_journal.py
+
+Append-only journal for the geocode-routes cache (replaces geocode_cache.json).
+
+geocode_routes.py used to rewrite the whole geocode_cache.json after every
+batch and parse all of it at startup. The journal (geocode_cache.jsonl)
+stores one ``[geo_key, entry]`` JSON array per line instead:
+
+- flush() appends only the entries set since the last flush
+- a deleted key is a ``[geo_key, null]`` tombstone
+- opening the journal only indexes it (key -> byte offset, read with a
+  prefix parse of each line); entries are parsed when accessed
+- once superseded lines outnumber live ones, flush() compacts the file
+  (rewrite of live entries, then an atomic rename)
+
+GeocodeJournal is a MutableMapping, so code written against the old dict
+(``key in cache``, ``cache[key] = entry``, ``cache.items()``) works unchanged.
+An existing geocode_cache.json is migrated on first open and kept as
+geocode_cache.pre_journal.backup.json.
+
+Usage:
+    from geocode_journal import open_geocode_cache
+
+    cache = open_geocode_cache(Path("geocode_cache.json"))
+    cache[geo_key] = entry
+    cache.flush()
+
+    python geocode_journal.py geocode_cache.json            # migrate / show stats
+    python geocode_journal.py geocode_cache.json --compact  # force compaction
+    python geocode_journal.py geocode_cache.json --export out.json
+"""
+
+import argparse
+import json
+import logging
+import os
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+JOURNAL_SUFFIX = ".jsonl"
+MIGRATED_BACKUP_NAME = "{stem}.pre_journal.backup.json"
+
+# Compact when superseded/tombstone lines exceed this fraction of all lines
+# (and there are at least COMPACT_MIN_LINES lines)
+COMPACT_STALE_RATIO = 0.5
+COMPACT_MIN_LINES = 1000
+
+_decoder = json.JSONDecoder()
+
+
+def journal_path_for(cache_file: Path) -> Path:
+    """Journal location for a legacy JSON cache path (geocode_cache.json -> .jsonl)."""
+    return Path(cache_file).with_suffix(JOURNAL_SUFFIX)
+
+
+def _encode(key: str, entry: Optional[Dict[str, Any]]) -> bytes:
+    return (json.dumps([key, entry], ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _line_key(line: bytes) -> str:
+    """geo_key of a journal line without parsing the entry."""
+    text = line.decode("utf-8")
+    key, _ = _decoder.raw_decode(text, text.index("[") + 1)
+    return key
+
+
+class GeocodeJournal(MutableMapping):
+    """Dict-like geocode cache backed by an append-only JSONL journal."""
+
+    def __init__(self, path: Path):
+        """Open (or create on first flush) a journal and index it.
+
+        Args:
+            path: Journal file (geocode_cache.jsonl)
+        """
+        self.path = Path(path)
+        self._offsets: Dict[str, int] = {}
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lines = 0
+        self._reader = None
+        self._index()
+
+    def _index(self) -> None:
+        """Map each live key to the offset of its latest line."""
+        self.close()
+        self._offsets.clear()
+        self._lines = 0
+        if not self.path.exists():
+            return
+
+        offset = 0
+        with self.path.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Torn write from an interrupted run: drop the partial line
+                    logging.warning(f"Ignoring incomplete last line of {self.path}")
+                    with self.path.open("r+b") as out:
+                        out.truncate(offset)
+                    break
+                key = _line_key(line)
+                if line.rstrip().endswith(b", null]"):
+                    self._offsets.pop(key, None)
+                else:
+                    self._offsets[key] = offset
+                self._lines += 1
+                offset += len(line)
+
+    def _read(self, offset: int) -> Dict[str, Any]:
+        if self._reader is None:
+            self._reader = self.path.open("rb")
+        self._reader.seek(offset)
+        return json.loads(self._reader.readline())[1]
+
+    def close(self) -> None:
+        """Close the read handle (reopened on the next lookup)."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    # -- Mapping interface ----------------------------------------------------
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        if key in self._pending:
+            entry = self._pending[key]
+            if entry is None:
+                raise KeyError(key)
+            return entry
+        return self._read(self._offsets[key])
+
+    def __setitem__(self, key: str, entry: Dict[str, Any]) -> None:
+        if entry is None:
+            raise ValueError("None is reserved for deletions; use del")
+        self._pending[key] = entry
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._pending[key] = None
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._pending:
+            return self._pending[key] is not None
+        return key in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._offsets:
+            if key not in self._pending:
+                yield key
+        for key, entry in self._pending.items():
+            if entry is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(key, entry) pairs, reading the journal sequentially."""
+        live = {offset: key for key, offset in self._offsets.items() if key not in self._pending}
+        if live:
+            offset = 0
+            with self.path.open("rb") as f:
+                for line in f:
+                    key = live.get(offset)
+                    if key is not None:
+                        yield key, json.loads(line)[1]
+                    offset += len(line)
+        for key, entry in self._pending.items():
+            if entry is not None:
+                yield key, entry
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """All live entries as a plain dict."""
+        return dict(self.items())
+
+    # -- Persistence ----------------------------------------------------------
+
+    @property
+    def stale_lines(self) -> int:
+        """Journal lines superseded by later lines or deleted."""
+        return self._lines - len(self._offsets)
+
+    def flush(self, compact: bool = True) -> int:
+        """Append pending changes; compacts when stale lines dominate. Returns lines written."""
+        if not self._pending:
+            return 0
+
+        written = 0
+        with self.path.open("ab") as f:
+            offset = f.tell()
+            for key, entry in self._pending.items():
+                line = _encode(key, entry)
+                f.write(line)
+                if entry is None:
+                    self._offsets.pop(key, None)
+                else:
+                    self._offsets[key] = offset
+                offset += len(line)
+                written += 1
+            f.flush()
+            os.fsync(f.fileno())
+        if self._reader is not None:
+            self._reader.seek(0, os.SEEK_END)  # drop buffered reads from before the append
+        self._lines += written
+        self._pending.clear()
+
+        if (
+            compact
+            and self._lines >= COMPACT_MIN_LINES
+            and self.stale_lines > COMPACT_STALE_RATIO * self._lines
+        ):
+            self.compact()
+        return written
+
+    def compact(self) -> None:
+        """Rewrite the journal with only live entries."""
+        self.flush(compact=False)
+        before = self._lines
+        self._write_all(self.items())
+        logging.info(f"Compacted {self.path}: {before} -> {self._lines} lines")
+
+    def replace_all(self, entries: Mapping[str, Dict[str, Any]]) -> None:
+        """Replace the whole cache (tools that rekey or purge it)."""
+        self._pending.clear()
+        self._write_all(entries.items())
+
+    def _write_all(self, items) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            for key, entry in items:
+                f.write(_encode(key, entry))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._index()
+
+
+def migrate_json_cache(cache_file: Path, journal: GeocodeJournal) -> int:
+    """Copy a legacy geocode_cache.json into an empty journal and back the JSON up.
+
+    Returns:
+        Number of entries migrated
+    """
+    cache_file = Path(cache_file)
+    with cache_file.open("r", encoding="utf-8") as f:
+        cache = json.load(f)
+
+    journal.replace_all(cache)
+    backup = cache_file.with_name(MIGRATED_BACKUP_NAME.format(stem=cache_file.stem))
+    os.replace(cache_file, backup)
+    logging.info(
+        f"Migrated {len(cache)} entries from {cache_file} to {journal.path} "
+        f"(original kept as {backup})"
+    )
+    return len(cache)
+
+
+def open_geocode_cache(cache_file: Path) -> GeocodeJournal:
+    """Journal for a geocode cache path, migrating a legacy JSON cache on first use.
+
+    Args:
+        cache_file: Legacy cache path (geocode_cache.json); the journal is
+            stored next to it with a .jsonl suffix
+    """
+    cache_file = Path(cache_file)
+    journal = GeocodeJournal(journal_path_for(cache_file))
+    if cache_file.exists() and cache_file.suffix != JOURNAL_SUFFIX:
+        if journal.path.exists():
+            logging.warning(
+                f"Both {cache_file} and {journal.path} exist; using the journal "
+                f"(remove {cache_file} once it is no longer needed)"
+            )
+        else:
+            migrate_json_cache(cache_file, journal)
+    return journal
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate, inspect or compact the geocode cache journal")
+    parser.add_argument("cache_file", type=Path, nargs="?", default=Path("geocode_cache.json"))
+    parser.add_argument("--compact", action="store_true", help="Rewrite the journal with live entries only")
+    parser.add_argument("--export", type=Path, help="Write the live entries as a JSON dict")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    journal = open_geocode_cache(args.cache_file)
+    if args.compact:
+        journal.compact()
+    if args.export:
+        with args.export.open("w", encoding="utf-8") as f:
+            json.dump(journal.to_dict(), f, ensure_ascii=False, indent=2)
+        logging.info(f"Exported {len(journal)} entries to {args.export}")
+    logging.info(f"{journal.path}: {len(journal)} entries, {journal.stale_lines} stale lines")
+
+
+if __name__ == "__main__":
+    main()
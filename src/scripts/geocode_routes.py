@@ -7,10 +7,15 @@ Restart-safe geocoding pipeline with:
 - Google Geocoding API for lat/lng
 - libpostal-based normalization (if installed)
 - Per-county JSONL output for validation and geocoding
-- Shared geocode_cache.json keyed by normalized geo_key
+- Shared geocode cache keyed by normalized geo_key, kept as an append-only
+  journal (geocode_cache.jsonl, see geocode_journal.py); an existing
+  geocode_cache.json is migrated on first run
+- API response cache (kcci_maintenance/cache/response_cache.py, shared with
+  Stage 1): identical requests are not paid for again within the TTL
 
 Environment:
     export GOOGLE_MAPS_API_KEY="YOUR_KEY"
+    export KCCI_CACHE_DB="outputs/pipeline_cache.db"  # optional: pipeline cache DB
 
 Dependencies (typical):
     pip install pandas requests shapely pyproj postal
@@ -22,6 +27,7 @@ Note:
 """
 
 import os
+import sys
 import json
 import re
 import time
@@ -32,6 +38,11 @@ from typing import Dict, Any, Optional, Tuple
 import pandas as pd
 import requests
 
+# kcci_maintenance lives next to this scripts directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from kcci_maintenance.cache.response_cache import ApiResponseCache
+from geocode_journal import GeocodeJournal, open_geocode_cache
+
 # Optional: libpostal
 try:
     from postal.expand import expand_address  # type: ignore
@@ -53,7 +64,7 @@ STREET_COL_CANDIDATES = ["Street", "STREET", "Address", "ADDRESS", "LOCATE_STREE
 INTERSECTION_COL_CANDIDATES = ["Intersection", "INTERSECTION", "CrossStreet", "CROSS_STREET"]
 STATE_COL_CANDIDATES = ["State", "STATE"]
 
-CACHE_FILE = Path("geocode_cache.json")
+CACHE_FILE = Path("geocode_cache.json")  # legacy JSON cache; the journal is geocode_cache.jsonl
 COUNTIES_DIR = Path("counties")
 
 GOOGLE_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
@@ -62,6 +73,19 @@ GOOGLE_ADDRESS_VALIDATION_URL = "https://addressvalidation.googleapis.com/v1:val
 BATCH_SIZE = 40
 BATCH_SLEEP_SECONDS = 0.2  # simple rate smoothing
 
+# API response cache: the pipeline's cache DB (the CLI's --cache-db default),
+# so responses are shared with stage_1_api
+RESPONSE_CACHE_DB = Path(os.environ.get("KCCI_CACHE_DB", "outputs/pipeline_cache.db"))
+RESPONSE_TTL_DAYS = 30
+NEGATIVE_TTL_HOURS = 24  # ZERO_RESULTS and permanent request errors
+GEOCODE_PROVIDER = "google"
+ADDRESS_VALIDATION_PROVIDER = "google_address_validation"
+
+# Responses never cached (rate limits, credentials/billing, transient errors)
+UNCACHEABLE_API_STATUSES = {"OVER_QUERY_LIMIT", "OVER_DAILY_LIMIT", "REQUEST_DENIED", "UNKNOWN_ERROR"}
+# HTTP errors cached negatively (the same request would fail again)
+NEGATIVE_CACHE_HTTP_STATUSES = {400, 404}
+
 logging.basicConfig(
     level=logging.INFO,
     format="[%(levelname)s] %(message)s",
@@ -209,12 +233,51 @@ def get_api_key() -> str:
     return key
 
 
+def fetch_json(
+    provider: str,
+    request: Dict[str, Any],
+    response_cache: Optional[ApiResponseCache] = None,
+) -> Any:
+    """
+    Send a request (``requests.request`` kwargs) and return its JSON body,
+    answering from the response cache when it holds an unexpired response.
+
+    Raises requests.HTTPError like ``raise_for_status`` (also for cached
+    negative HTTP errors), so callers handle cached and live failures alike.
+    """
+    if response_cache is not None:
+        cached = response_cache.get(provider, request)
+        if cached is not None:
+            if cached.response is None:
+                response = requests.Response()
+                response.status_code = int(cached.status.rsplit("_", 1)[-1])
+                raise requests.HTTPError(f"{cached.status} (cached)", response=response)
+            return cached.response
+
+    try:
+        r = requests.request(timeout=10, **request)
+        r.raise_for_status()
+    except requests.HTTPError as e:
+        status_code = e.response.status_code if e.response is not None else None
+        if response_cache is not None and status_code in NEGATIVE_CACHE_HTTP_STATUSES:
+            response_cache.put(provider, request, f"http_error_{status_code}", negative=True)
+        raise
+
+    data = r.json()
+    # Geocoding reports a status in the body; Address Validation does not
+    status = data.get("status", "OK") if isinstance(data, dict) else "OK"
+    if response_cache is not None and status not in UNCACHEABLE_API_STATUSES:
+        response_cache.put(provider, request, status, data, negative=status != "OK")
+    return data
+
+
 def call_google_address_validation(
     key: str,
     address_line: str,
     locality: str,
     admin_area: str,
     region_code: str = "US",
+    response_cache: Optional[ApiResponseCache] = None,
 ) -> Dict[str, Any]:
     """
     Call Google's Address Validation API in a NON-FATAL way.
@@ -242,14 +305,16 @@ def call_google_address_validation(
     params = {"key": key}
 
     try:
-        r = requests.post(
-            GOOGLE_ADDRESS_VALIDATION_URL,
-            params=params,
-            json=payload,
-            timeout=10,
+        data = fetch_json(
+            ADDRESS_VALIDATION_PROVIDER,
+            {
+                "method": "POST",
+                "url": GOOGLE_ADDRESS_VALIDATION_URL,
+                "params": params,
+                "json": payload,
+            },
+            response_cache,
         )
-        r.raise_for_status()
-        data = r.json()
         # Extract something simple as "validated line" if present
         validated_line = None
         try:
@@ -299,6 +364,34 @@ def call_google_address_validation(
         }
 
 
+def google_geocode_request(
+    key: str,
+    address_line: str,
+    city: str,
+    county: str,
+    state: str,
+    region_code: str = "US",
+) -> Dict[str, Any]:
+    """
+    Geocoding request (``requests.request`` kwargs) in the same shape as
+    GoogleGeocodingProvider.build_request in kcci_maintenance/core/api_client.py,
+    so this script and Stage 1 share response cache entries for a location.
+    """
+    components = [f"country:{region_code}"]
+    if county and state:
+        components.insert(0, f"administrative_area:{state}")
+    return {
+        "method": "GET",
+        "url": GOOGLE_GEOCODE_URL,
+        "params": {
+            "key": key,
+            "region": region_code,
+            "address": ", ".join(part for part in (address_line, city, state) if part),
+            "components": "|".join(components),
+        },
+    }
+
+
 def call_google_geocode(
     key: str,
     address_line: str,
@@ -306,6 +399,7 @@ def call_google_geocode(
     county: str,
     state: str,
     region_code: str = "US",
+    response_cache: Optional[ApiResponseCache] = None,
 ) -> Dict[str, Any]:
     """
     Call Google Geocoding API. Any HTTP error is handled gracefully.
@@ -321,35 +415,12 @@ def call_google_geocode(
             "raw_error": "no_address",
         }
 
-    params = {
-        "key": key,
-        "region": region_code,
-    }
-
-    # Structured query: prefer components over free-form when we can
-    address = address_line
-    components = []
-
-    if county:
-        components.append(f"administrative_area:{state}")  # TX etc.
-        components.append(f"country:{region_code}")
-    else:
-        components.append(f"country:{region_code}")
-
-    # city as locality
-    if city:
-        # we keep city primarily in free-form; structured locality is optional
-        pass
-
-    params["address"] = ", ".join(
-        part for part in [address_line, city, state] if part
-    )
-    params["components"] = "|".join(components)
-
     try:
-        r = requests.get(GOOGLE_GEOCODE_URL, params=params, timeout=10)
-        r.raise_for_status()
-        data = r.json()
+        data = fetch_json(
+            GEOCODE_PROVIDER,
+            google_geocode_request(key, address_line, city, county, state, region_code),
+            response_cache,
+        )
         status = data.get("status", "UNKNOWN")
 
         if status != "OK":
@@ -414,24 +485,24 @@ def call_google_geocode(
 # Cache I/O
 # ---------------------------------------------------------------------------
 
-def load_cache() -> Dict[str, Any]:
-    if CACHE_FILE.exists():
-        with CACHE_FILE.open("r", encoding="utf-8") as f:
-            cache = json.load(f)
+def load_cache() -> GeocodeJournal:
+    """Open the cache journal (indexes it; entries are read on access)."""
+    cache = open_geocode_cache(CACHE_FILE)
+    if len(cache):
         logging.info(
-            f"[INFO] Loaded existing geocode cache: {CACHE_FILE} "
+            f"[INFO] Loaded existing geocode cache: {cache.path} "
             f"({len(cache)} keys)."
         )
-        return cache
-    logging.info("[INFO] No existing cache, starting fresh.")
-    return {}
+    else:
+        logging.info("[INFO] No existing cache, starting fresh.")
+    return cache
 
 
-def save_cache(cache: Dict[str, Any]) -> None:
-    with CACHE_FILE.open("w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+def save_cache(cache: GeocodeJournal) -> None:
+    """Append the entries added since the last save."""
+    written = cache.flush()
     logging.info(
-        f"[INFO] Cache flushed to {CACHE_FILE} ({len(cache)} keys)."
+        f"[INFO] Cache flushed to {cache.path} ({written} new, {len(cache)} keys)."
     )
 
 
@@ -541,6 +612,11 @@ def main():
     )
 
     cache = load_cache()
+    response_cache = ApiResponseCache(
+        RESPONSE_CACHE_DB,
+        ttl_days=RESPONSE_TTL_DAYS,
+        negative_ttl_hours=NEGATIVE_TTL_HOURS,
+    )
 
     # Determine which keys need geocoding
     keys_to_geocode = [g for g in unique_geo_keys if g not in cache]
@@ -591,6 +667,7 @@ def main():
                 locality=city,
                 admin_area="TX",  # you can refine by row-specific state if needed
                 region_code="US",
+                response_cache=response_cache,
             )
 
             # Choose address to geocode: prefer validated_address if status=ok
@@ -608,6 +685,7 @@ def main():
                 county=county,
                 state=state,
                 region_code="US",
+                response_cache=response_cache,
             )
 
             cache[gk] = {
@@ -631,6 +709,7 @@ def main():
     logging.info(
         f"[INFO] Geocoding complete for this run. Total runtime: {total_time:.1f} seconds"
     )
+    logging.info(f"[INFO] {response_cache.summary()}")
 
     # Attach geocode_ok to each row by joining on _geo_key
     def is_geocode_ok(geo_info: Dict[str, Any]) -> bool:
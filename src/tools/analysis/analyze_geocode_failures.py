@@ -13,13 +13,19 @@ Output:
 
 import json
 import logging
+import sys
 from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
 
-CACHE_FILE = Path("geocode_cache.json")
+# src/scripts isn't a package; add it to the path like geocode_routes.py does.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from geocode_journal import journal_path_for, open_geocode_cache
+
+CACHE_FILE = Path("geocode_cache.json")  # legacy JSON cache, migrated on open
 OUTPUT_REPORT = Path("failures_report.json")
 OUTPUT_CSV = Path("failures_by_type.csv")
 
@@ -233,13 +239,13 @@ def print_report(analysis: dict[str, Any]) -> None:
 
 
 def main() -> None:
-    if not CACHE_FILE.exists():
-        logging.error(f"Cache file not found: {CACHE_FILE}")
+    if not CACHE_FILE.exists() and not journal_path_for(CACHE_FILE).exists():
+        logging.error(f"Cache file not found: {journal_path_for(CACHE_FILE)}")
         return
 
-    logging.info(f"Loading cache from {CACHE_FILE}")
-    with CACHE_FILE.open("r", encoding="utf-8") as f:
-        cache = json.load(f)
+    journal = open_geocode_cache(CACHE_FILE)
+    logging.info(f"Loading cache from {journal.path}")
+    cache = journal.to_dict()
 
     logging.info(f"Analyzing {len(cache):,} cache entries...")
     analysis = analyze_cache(cache)
@@ -51,7 +51,12 @@ from shapely.geometry import Point, LineString, MultiLineString
 from shapely.ops import transform, unary_union
 from pyproj import CRS, Transformer
 import xml.etree.ElementTree as ET
-import json
+import sys
+
+# src/scripts isn't a package; add it to the path like geocode_routes.py does.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from geocode_journal import journal_path_for, open_geocode_cache
 
 # ---------------------------------------------------------------------------
 # CONFIG
@@ -61,7 +66,7 @@ import json
 INPUT_811_FILE = "GeoCallSearchResult_geocoded_with_corridor_all.csv"
 INPUT_811_TYPE = "csv"  # "csv" or "xlsx"
 
-# New geocoding persistence cache
+# New geocoding persistence cache (journal: geocode_cache.jsonl)
 GEOCODE_CACHE_FILE = Path("geocode_cache.json")
 
 # Wink route & buffer configuration
@@ -236,11 +241,10 @@ def project_geometry(geom, src_crs: CRS, dst_crs: CRS):
 # ---------------------------------------------------------------------------
 
 def load_geocode_cache(cache_file: Path) -> Dict[str, Dict[str, Any]]:
-    if not cache_file.exists():
-        raise FileNotFoundError(f"Geocode cache not found: {cache_file}")
-    with cache_file.open("r", encoding="utf-8") as f:
-        cache = json.load(f)
-    logging.info(f"Loaded geocode cache: {cache_file} ({len(cache)} geo_keys)")
+    if not cache_file.exists() and not journal_path_for(cache_file).exists():
+        raise FileNotFoundError(f"Geocode cache not found: {journal_path_for(cache_file)}")
+    cache = open_geocode_cache(cache_file).to_dict()
+    logging.info(f"Loaded geocode cache: {journal_path_for(cache_file)} ({len(cache)} geo_keys)")
     return cache
 
 
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+county_index.py
+
+County membership of road segments, for scoping road-name candidates.
+
+Names like "CR 426" or "FM 516" exist in many Texas counties, so a name
+lookup on a statewide network returns segments hundreds of kilometers apart.
+CountyRoadIndex assigns every segment to the county (or counties, for
+boundary roads) it lies in and restricts name-lookup candidates to the
+ticket's county, falling back to neighboring counties when the road is not
+found in the county itself.
+
+County membership comes from, in order of preference:
+
+- county polygons (e.g. TxDOT county boundaries): segments are assigned to
+  every county they intersect, and counties that touch are neighbors
+- a ``county`` column on the road network: neighbors are counties whose
+  segment bounding boxes overlap
+
+Without either, the index is disabled and candidates are returned unscoped.
+
+Usage:
+    from county_index import CountyRoadIndex, load_county_boundaries
+
+    counties = load_county_boundaries(Path("texas_counties.geojson"))
+    index = CountyRoadIndex(roads, counties)
+    positions, scope = index.restrict(candidate_positions, "Ward")
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+# Attribute columns tried, in order, for the county name
+COUNTY_NAME_COLUMNS = ("county", "county_name", "CNTY_NM", "COUNTY", "NAME", "name")
+
+# Scopes reported by restrict()
+SCOPE_COUNTY = "county"
+SCOPE_NEIGHBORS = "neighbors"
+SCOPE_UNSCOPED = "unscoped"
+
+
+def normalize_county(name) -> str:
+    """Upper-case county name without a trailing "COUNTY" ("Ward County" -> "WARD")."""
+    if not isinstance(name, str):
+        return ""
+    name = " ".join(name.upper().split())
+    if name.endswith(" COUNTY"):
+        name = name[: -len(" COUNTY")]
+    return name
+
+
+def _county_name_column(gdf: gpd.GeoDataFrame) -> str:
+    for column in COUNTY_NAME_COLUMNS:
+        if column in gdf.columns:
+            return column
+    raise ValueError(
+        f"County boundaries need one of the columns {', '.join(COUNTY_NAME_COLUMNS)}"
+    )
+
+
+def load_county_boundaries(path: Path, crs=None) -> gpd.GeoDataFrame:
+    """Read county polygons as a GeoDataFrame with a normalized ``county`` column.
+
+    Args:
+        path: GeoJSON/GeoPackage/shapefile of county polygons
+        crs: Reproject to this CRS (normally the road network's)
+
+    Returns:
+        GeoDataFrame with ``county`` and ``geometry`` columns
+    """
+    counties = gpd.read_file(path)
+    column = _county_name_column(counties)
+    if crs is not None and counties.crs is not None and counties.crs != crs:
+        counties = counties.to_crs(crs)
+
+    counties = gpd.GeoDataFrame(
+        {"county": [normalize_county(name) for name in counties[column]]},
+        geometry=counties.geometry.values,
+        crs=counties.crs,
+    )
+    logging.info(f"Loaded {len(counties)} county boundaries from {path}")
+    return counties
+
+
+class CountyRoadIndex:
+    """Road segment positions per county, with neighbor-county fallback."""
+
+    def __init__(
+        self,
+        roads: gpd.GeoDataFrame,
+        counties: Optional[gpd.GeoDataFrame] = None,
+    ):
+        """Build the index.
+
+        Args:
+            roads: Road segments (same frame the RoadNameIndex positions refer to)
+            counties: Optional county polygons with a county name column
+        """
+        self.roads = roads
+        self._county_ids: dict[str, int] = {}
+        self._neighbors: dict[int, np.ndarray] = {}
+
+        # Primary county per segment (-1 = none) plus extra counties of boundary segments
+        self._segment_county = np.full(len(roads), -1, dtype=np.int32)
+        self._extra_positions = np.empty(0, dtype=np.int64)
+        self._extra_counties: dict[int, np.ndarray] = {}
+
+        # Kept for assigning segments added later (see extend())
+        self._county_tree: Optional[shapely.STRtree] = None
+        self._polygon_county = np.empty(0, dtype=np.int32)
+        self._county_extents: dict[int, np.ndarray] = {}
+        self._from_column = False
+
+        everything = np.arange(len(roads), dtype=np.int64)
+        if counties is not None and len(counties) > 0:
+            self._assign_from_polygons(counties, everything)
+        elif "county" in roads.columns:
+            self._from_column = True
+            self._assign_from_column(everything)
+
+        if self.enabled:
+            logging.info(
+                f"Indexed road segments in {len(self._county_ids)} counties "
+                f"({int((self._segment_county >= 0).sum())} of {len(roads)} segments assigned)"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        """True when segments could be assigned to counties."""
+        return len(self._county_ids) > 0
+
+    @property
+    def counties(self) -> list[str]:
+        """Indexed county names."""
+        return list(self._county_ids)
+
+    def _assign_from_polygons(self, counties: gpd.GeoDataFrame, positions: np.ndarray) -> None:
+        """Assign segments to every county polygon they intersect."""
+        names = [normalize_county(name) for name in counties[_county_name_column(counties)]]
+        self._polygon_county = np.array(
+            [self._county_ids.setdefault(name, len(self._county_ids)) for name in names],
+            dtype=np.int32,
+        )
+        tree = self._county_tree = shapely.STRtree(counties.geometry.values)
+        self._assign_to_polygons(tree, positions)
+
+        # Counties whose polygons touch or overlap are neighbors
+        left, right = tree.query(counties.geometry.values, predicate="intersects")
+        self._set_neighbors(self._polygon_county[left], self._polygon_county[right])
+
+    def _assign_to_polygons(self, tree: shapely.STRtree, positions: np.ndarray) -> None:
+        """Assign the segments at positions to the county polygons (in tree) they intersect."""
+        segments, polygons = tree.query(
+            self.roads.geometry.values[positions], predicate="intersects"
+        )
+        self._set_memberships(positions[segments], self._polygon_county[polygons])
+
+    def _assign_from_column(self, positions: np.ndarray) -> None:
+        """Assign the segments at positions from the road network's own county column."""
+        names = [normalize_county(value) for value in self.roads["county"].to_numpy()[positions]]
+        segment_county = np.array(
+            [self._county_ids.setdefault(name, len(self._county_ids)) if name else -1
+             for name in names],
+            dtype=np.int32,
+        )
+        assigned = segment_county >= 0
+        self._set_memberships(positions[assigned], segment_county[assigned])
+
+        # No polygons: counties whose segment extents overlap are neighbors
+        bounds = shapely.bounds(self.roads.geometry.values[positions])
+        for county_id in np.unique(segment_county[assigned]).tolist():
+            county_bounds = bounds[segment_county == county_id]
+            extent = np.array([
+                np.nanmin(county_bounds[:, 0]), np.nanmin(county_bounds[:, 1]),
+                np.nanmax(county_bounds[:, 2]), np.nanmax(county_bounds[:, 3]),
+            ])
+            previous = self._county_extents.get(county_id)
+            if previous is not None:
+                extent = np.concatenate([
+                    np.fmin(previous[:2], extent[:2]), np.fmax(previous[2:], extent[2:])
+                ])
+            self._county_extents[county_id] = extent
+        if not self._county_extents:
+            return
+        boxes = [shapely.box(*self._county_extents[i]) for i in range(len(self._county_ids))]
+        left, right = shapely.STRtree(boxes).query(boxes, predicate="intersects")
+        self._set_neighbors(left, right)
+
+    def extend(self, roads: gpd.GeoDataFrame) -> None:
+        """Re-point the index at roads with segments added, assigning only the new ones.
+
+        roads must hold every indexed segment under the same index label (as
+        road_region.merge_segments produces); their memberships carry over by
+        label, so paging in segments costs a county lookup of the new
+        segments instead of a rebuild over all of them.
+        """
+        moved = roads.index.get_indexer(self.roads.index)
+        if (moved < 0).any():
+            raise ValueError("extend() needs roads containing every indexed segment")
+
+        segment_county = np.full(len(roads), -1, dtype=np.int32)
+        segment_county[moved] = self._segment_county
+        self._segment_county = segment_county
+        self._extra_counties = {
+            int(moved[segment]): ids for segment, ids in self._extra_counties.items()
+        }
+        self._extra_positions = np.array(sorted(self._extra_counties), dtype=np.int64)
+
+        added = np.ones(len(roads), dtype=bool)
+        added[moved] = False
+        self.roads = roads
+        added_positions = np.flatnonzero(added)
+        if len(added_positions) == 0:
+            return
+        if self._county_tree is not None:
+            self._assign_to_polygons(self._county_tree, added_positions)
+        elif self._from_column:
+            self._assign_from_column(added_positions)
+
+    def _set_memberships(self, segments: np.ndarray, county_ids: np.ndarray) -> None:
+        """Record (segment, county) pairs; first county per segment is primary."""
+        order = np.lexsort((county_ids, segments))
+        segments, county_ids = segments[order], county_ids[order]
+
+        first = np.ones(len(segments), dtype=bool)
+        first[1:] = segments[1:] != segments[:-1]
+        self._segment_county[segments[first]] = county_ids[first]
+
+        extra = ~first
+        extra_counties: dict[int, list[int]] = {}
+        for segment, county_id in zip(segments[extra].tolist(), county_ids[extra].tolist()):
+            extra_counties.setdefault(segment, []).append(county_id)
+        self._extra_counties.update(
+            (segment, np.array(ids, dtype=np.int32)) for segment, ids in extra_counties.items()
+        )
+        self._extra_positions = np.array(sorted(self._extra_counties), dtype=np.int64)
+
+    def _set_neighbors(self, left: np.ndarray, right: np.ndarray) -> None:
+        neighbors: dict[int, set[int]] = {}
+        for a, b in zip(left.tolist(), right.tolist()):
+            if a != b:
+                neighbors.setdefault(a, set()).add(b)
+        self._neighbors = {
+            county_id: np.array(sorted(ids), dtype=np.int32) for county_id, ids in neighbors.items()
+        }
+
+    def neighbors(self, county: str) -> list[str]:
+        """Names of the counties adjacent to county."""
+        county_id = self._county_ids.get(normalize_county(county))
+        if county_id is None:
+            return []
+        names = list(self._county_ids)
+        return [names[i] for i in self._neighbors.get(county_id, [])]
+
+    def _in_counties(self, positions: np.ndarray, county_ids: np.ndarray) -> np.ndarray:
+        """Subset of positions belonging to any of county_ids."""
+        mask = np.isin(self._segment_county[positions], county_ids)
+        if len(self._extra_positions):
+            boundary = np.flatnonzero(np.isin(positions, self._extra_positions) & ~mask)
+            for i in boundary:
+                if np.isin(self._extra_counties[int(positions[i])], county_ids).any():
+                    mask[i] = True
+        return positions[mask]
+
+    def restrict(self, positions: np.ndarray, county: str) -> tuple[np.ndarray, str]:
+        """Restrict candidate segment positions to a county, then its neighbors.
+
+        Args:
+            positions: Sorted candidate positions (e.g. from RoadNameIndex)
+            county: Ticket county
+
+        Returns:
+            Tuple of (positions, scope). Scope is "county" or "neighbors" with
+            the matching subset (possibly empty), or "unscoped" with the
+            positions unchanged when the county is not indexed.
+        """
+        county_id = self._county_ids.get(normalize_county(county))
+        if county_id is None:
+            return positions, SCOPE_UNSCOPED
+
+        in_county = self._in_counties(positions, np.array([county_id], dtype=np.int32))
+        if len(in_county) > 0:
+            return in_county, SCOPE_COUNTY
+
+        neighbors = self._neighbors.get(county_id)
+        if neighbors is None or len(neighbors) == 0:
+            return in_county, SCOPE_NEIGHBORS
+        return self._in_counties(positions, neighbors), SCOPE_NEIGHBORS
+
+    def stats(self) -> dict:
+        """Index summary."""
+        return {
+            "counties": len(self._county_ids),
+            "assigned_segments": int((self._segment_county >= 0).sum()),
+            "boundary_segments": len(self._extra_positions),
+        }
+
+
+if __name__ == "__main__":
+    from shapely.geometry import LineString, box
+
+    roads = gpd.GeoDataFrame(
+        {"name": ["CR 426", "CR 426", "CR 426"]},
+        geometry=[
+            LineString([(0.2, 0.5), (0.8, 0.5)]),   # Ward
+            LineString([(1.2, 0.5), (1.8, 0.5)]),   # Winkler
+            LineString([(5.2, 0.5), (5.8, 0.5)]),   # far away
+        ],
+        crs="EPSG:4326",
+    )
+    counties = gpd.GeoDataFrame(
+        {"county": ["WARD", "WINKLER", "REEVES", "BREWSTER"]},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1), box(-1, 0, 0, 1), box(5, 0, 6, 1)],
+        crs="EPSG:4326",
+    )
+
+    index = CountyRoadIndex(roads, counties)
+    everything = np.arange(len(roads))
+    for county in ["Ward", "Reeves County", "Pecos"]:
+        positions, scope = index.restrict(everything, county)
+        print(f"{county}: {positions.tolist()} ({scope}); neighbors {index.neighbors(county)}")
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+gazetteer.py
+
+City/place centroids for the city fallback and city-distance validation.
+
+The geocoder and the validation rules used to carry their own nine-city
+centroid tables, so every other city silently skipped the city-distance
+check or failed the centroid fallback. Gazetteer loads places from a local
+file into compact arrays:
+
+- a CSV with ``city``/``county``/``lat``/``lng`` columns, or
+- a Census Gazetteer places file (``*_Gaz_place_*.txt``: ``NAME``,
+  ``USPS``, ``INTPTLAT``, ``INTPTLONG``); it has no county column, so
+  counties come from county boundaries when given, and a city name that is
+  unique in the file matches regardless of the ticket's county
+
+and answers:
+
+- exact (city, county) lookups, one at a time or vectorized (``positions``)
+- city-distance checks for whole batches (``distances_km``)
+- nearest-place queries from a grid index over the centroids
+
+Without a places file the built-in project cities are used. Gazetteers are
+loaded once per file (``load_gazetteer``), so the geocoder and the
+validation engine share one instance.
+
+Usage:
+    from gazetteer import load_gazetteer
+
+    gazetteer = load_gazetteer(Path("2023_Gaz_place_48.txt"), state="TX")
+    gazetteer.lookup("Kermit", "Winkler")                  # (31.8576, -103.093)
+    gazetteer.distances_km(df.lat, df.lng, df.city, df.county)
+    gazetteer.nearest(31.6, -103.0)                        # PlaceMatch(city="WICKETT", ...)
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from county_index import normalize_county
+
+EARTH_RADIUS_KM = 6371.0
+
+# Project cities used when no places file is configured
+BUILTIN_PLACES = {
+    ("KERMIT", "WINKLER"): (31.8576, -103.0930),
+    ("PYOTE", "WARD"): (31.5401, -103.1293),
+    ("BARSTOW", "WARD"): (31.4596, -103.3954),
+    ("MONAHANS", "WARD"): (31.5943, -102.8929),
+    ("ANDREWS", "ANDREWS"): (32.3185, -102.5457),
+    ("GARDENDALE", "ANDREWS"): (32.0165, -102.3779),
+    ("COYANOSA", "WARD"): (31.2693, -103.0324),
+    ("WICKETT", "WARD"): (31.5768, -103.0010),
+    ("THORNTONVILLE", "WARD"): (31.4446, -103.1079),
+}
+
+# Columns tried, in order, for each field of a places file
+PLACE_COLUMNS = {
+    "city": ("city", "name", "place", "place_name"),
+    "county": ("county", "county_name", "cnty_nm"),
+    "lat": ("lat", "latitude", "intptlat"),
+    "lng": ("lng", "lon", "longitude", "intptlong"),
+    "state": ("state", "usps", "state_abbr"),
+}
+
+# Census legal/statistical area suffixes ("Kermit city", "Gardendale CDP")
+PLACE_SUFFIXES = (" CITY", " TOWN", " VILLAGE", " CDP", " BOROUGH")
+
+
+def normalize_place(name) -> str:
+    """Upper-case place name without a Census area suffix ("Kermit city" -> "KERMIT")."""
+    if not isinstance(name, str):
+        return ""
+    name = " ".join(name.upper().split())
+    for suffix in PLACE_SUFFIXES:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Great-circle distance in km (vectorized over numpy arrays)."""
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+@dataclass
+class PlaceMatch:
+    """Nearest place to a point."""
+    city: str
+    county: str
+    lat: float
+    lng: float
+    distance_km: float
+
+
+class Gazetteer:
+    """Place centroids in flat arrays with key and grid indexes."""
+
+    def __init__(
+        self,
+        cities: np.ndarray,
+        counties: np.ndarray,
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        cell_deg: float = 0.5,
+        source: str = "builtin",
+    ):
+        """Initialize gazetteer (see from_file / builtin).
+
+        Args:
+            cities: Normalized city names
+            counties: Normalized county names ("" when unknown)
+            lats: Centroid latitudes
+            lngs: Centroid longitudes
+            cell_deg: Grid cell size in degrees for nearest()
+            source: Where the places came from (part of memo fingerprints)
+        """
+        self.cities = np.asarray(cities, dtype=object)
+        self.counties = np.asarray(counties, dtype=object)
+        self.lats = np.asarray(lats, dtype=float)
+        self.lngs = np.asarray(lngs, dtype=float)
+        self.cell_deg = cell_deg
+        self.source = source
+
+        # (city, county) -> first row with that key
+        keys = pd.Index(self.cities + "|" + self.counties)
+        first = ~keys.duplicated()
+        self._keys = keys[first]
+        self._key_rows = np.flatnonzero(first)
+
+        # Places without a county match on a city name that is unique in the file
+        names = pd.Series(self.cities)
+        unique_city = ~names.duplicated(keep=False).to_numpy() & (self.counties == "")
+        self._cities = pd.Index(self.cities[unique_city])
+        self._city_rows = np.flatnonzero(unique_city)
+
+        # Grid cell -> rows, for nearest()
+        self._cells: Dict[Tuple[int, int], np.ndarray] = {}
+        if len(self.lats) > 0:
+            cells = np.column_stack([
+                np.floor(self.lats / cell_deg), np.floor(self.lngs / cell_deg)
+            ]).astype(np.int64)
+            unique_cells, owners = np.unique(cells, axis=0, return_inverse=True)
+            order = np.argsort(owners.reshape(-1), kind="stable")
+            bounds = np.cumsum(np.bincount(owners.reshape(-1), minlength=len(unique_cells)))
+            for cell, rows in zip(map(tuple, unique_cells.tolist()), np.split(order, bounds[:-1])):
+                self._cells[cell] = rows
+            self._cell_min = unique_cells.min(axis=0)
+            self._cell_max = unique_cells.max(axis=0)
+            self._max_abs_lat = float(np.abs(self.lats).max())
+
+    @classmethod
+    def builtin(cls) -> "Gazetteer":
+        """Gazetteer of the built-in project cities."""
+        keys = list(BUILTIN_PLACES)
+        return cls(
+            np.array([city for city, _ in keys], dtype=object),
+            np.array([county for _, county in keys], dtype=object),
+            np.array([BUILTIN_PLACES[key][0] for key in keys]),
+            np.array([BUILTIN_PLACES[key][1] for key in keys]),
+        )
+
+    @classmethod
+    def from_file(
+        cls,
+        path: Path,
+        state: Optional[str] = None,
+        counties: Optional[gpd.GeoDataFrame] = None,
+        **kwargs,
+    ) -> "Gazetteer":
+        """Load places from a CSV or Census Gazetteer file.
+
+        Args:
+            path: Places file (.csv, or tab-separated .txt/.tsv)
+            state: Keep only places in this state (when the file has a state column)
+            counties: County polygons (see county_index.load_county_boundaries)
+                used to fill in missing counties
+            **kwargs: Passed to Gazetteer (cell_deg)
+        """
+        path = Path(path)
+        sep = "\t" if path.suffix.lower() in (".txt", ".tsv") else ","
+        places = pd.read_csv(path, sep=sep, dtype=str)
+        places.columns = [str(c).strip().lower() for c in places.columns]
+
+        columns = {}
+        for field, candidates in PLACE_COLUMNS.items():
+            columns[field] = next((c for c in candidates if c in places.columns), None)
+        missing = [f for f in ("city", "lat", "lng") if columns[f] is None]
+        if missing:
+            raise ValueError(f"Places file {path} has no column for: {', '.join(missing)}")
+
+        if state and columns["state"] is not None:
+            places = places[places[columns["state"]].str.strip().str.upper() == state.upper()]
+
+        lats = pd.to_numeric(places[columns["lat"]], errors="coerce").to_numpy()
+        lngs = pd.to_numeric(places[columns["lng"]], errors="coerce").to_numpy()
+        valid = ~(np.isnan(lats) | np.isnan(lngs))
+        places, lats, lngs = places[valid], lats[valid], lngs[valid]
+
+        cities = np.array([normalize_place(name) for name in places[columns["city"]]], dtype=object)
+        if columns["county"] is not None:
+            county_names = np.array(
+                [normalize_county(name) for name in places[columns["county"]]], dtype=object
+            )
+        else:
+            county_names = np.full(len(cities), "", dtype=object)
+        if counties is not None:
+            county_names = cls._fill_counties(county_names, lats, lngs, counties)
+
+        stat = path.stat()
+        gazetteer = cls(
+            cities, county_names, lats, lngs,
+            source=f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}:{state or ''}", **kwargs,
+        )
+        logging.info(f"Loaded {len(gazetteer)} places from {path}")
+        return gazetteer
+
+    @staticmethod
+    def _fill_counties(
+        county_names: np.ndarray,
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        counties: gpd.GeoDataFrame,
+    ) -> np.ndarray:
+        """Counties containing the centroids, where the file has none."""
+        missing = np.flatnonzero(county_names == "")
+        if len(missing) == 0:
+            return county_names
+        points = gpd.GeoDataFrame(
+            geometry=gpd.points_from_xy(lngs[missing], lats[missing]), crs="EPSG:4326"
+        )
+        if counties.crs is not None:
+            points = points.to_crs(counties.crs)
+        joined = gpd.sjoin(points, counties[["county", "geometry"]], predicate="within", how="left")
+        joined = joined[~joined.index.duplicated()]
+        filled = county_names.copy()
+        filled[missing] = joined["county"].fillna("").to_numpy(dtype=object)
+        return filled
+
+    def __len__(self) -> int:
+        return len(self.cities)
+
+    def positions(self, cities, counties) -> np.ndarray:
+        """Row of each (city, county) pair, -1 when the place is unknown (vectorized)."""
+        cities = np.array([normalize_place(c) for c in cities], dtype=object)
+        counties = np.array([normalize_county(c) for c in counties], dtype=object)
+        positions = np.full(len(cities), -1, dtype=np.int64)
+        if len(cities) == 0:
+            return positions
+
+        found = self._keys.get_indexer(cities + "|" + counties)
+        positions[found >= 0] = self._key_rows[found[found >= 0]]
+
+        missing = np.flatnonzero(found < 0)
+        if len(missing) > 0 and len(self._cities) > 0:
+            found = self._cities.get_indexer(cities[missing])
+            positions[missing[found >= 0]] = self._city_rows[found[found >= 0]]
+        return positions
+
+    def lookup(self, city, county) -> Optional[Tuple[float, float]]:
+        """(lat, lng) centroid of a city in a county, or None."""
+        position = self.positions([city], [county])[0]
+        if position < 0:
+            return None
+        return float(self.lats[position]), float(self.lngs[position])
+
+    def distances_km(self, lats, lngs, cities, counties) -> np.ndarray:
+        """Distance of each point from its city centroid (NaN for unknown cities)."""
+        positions = self.positions(cities, counties)
+        lats = np.asarray(lats, dtype=float)
+        lngs = np.asarray(lngs, dtype=float)
+        distances = np.full(len(positions), np.nan)
+        known = positions >= 0
+        distances[known] = haversine_km(
+            lats[known], lngs[known], self.lats[positions[known]], self.lngs[positions[known]]
+        )
+        return distances
+
+    def nearest(self, lat: float, lng: float, max_km: Optional[float] = None) -> Optional[PlaceMatch]:
+        """Closest place to a point (within max_km), searching rings of grid cells."""
+        if not self._cells:
+            return None
+        cell_lat = math.floor(lat / self.cell_deg)
+        cell_lng = math.floor(lng / self.cell_deg)
+        # Rings needed to cover every occupied cell
+        max_ring = int(max(
+            abs(cell_lat - self._cell_min[0]), abs(cell_lat - self._cell_max[0]),
+            abs(cell_lng - self._cell_min[1]), abs(cell_lng - self._cell_max[1]),
+        ))
+        # Longitude degrees shrink toward the poles: bound with the highest latitude involved
+        cos_lat = math.cos(math.radians(min(89.0, max(abs(lat), self._max_abs_lat))))
+
+        best, best_distance = None, math.inf
+        for ring in range(max_ring + 1):
+            cells = [
+                self._cells[cell]
+                for cell in self._ring_cells(cell_lat, cell_lng, ring)
+                if cell in self._cells
+            ]
+            if cells:
+                rows = np.concatenate(cells)
+                distances = haversine_km(lat, lng, self.lats[rows], self.lngs[rows])
+                closest = int(np.argmin(distances))
+                if distances[closest] < best_distance:
+                    best, best_distance = int(rows[closest]), float(distances[closest])
+
+            # Lower bound on the distance to any place outside this ring
+            edge_lat = min(lat - (cell_lat - ring) * self.cell_deg, (cell_lat + ring + 1) * self.cell_deg - lat)
+            edge_lng = min(lng - (cell_lng - ring) * self.cell_deg, (cell_lng + ring + 1) * self.cell_deg - lng)
+            bound = min(
+                EARTH_RADIUS_KM * math.radians(edge_lat),
+                2 * EARTH_RADIUS_KM * math.asin(min(1.0, cos_lat * math.sin(math.radians(edge_lng) / 2))),
+            )
+            if best_distance <= bound or (max_km is not None and bound > max_km):
+                break
+
+        if best is None or (max_km is not None and best_distance > max_km):
+            return None
+        return PlaceMatch(
+            str(self.cities[best]), str(self.counties[best]),
+            float(self.lats[best]), float(self.lngs[best]), best_distance,
+        )
+
+    @staticmethod
+    def _ring_cells(cell_lat: int, cell_lng: int, ring: int):
+        """Grid cells at Chebyshev distance ``ring`` from a cell."""
+        if ring == 0:
+            yield cell_lat, cell_lng
+            return
+        for d in range(-ring, ring + 1):
+            yield cell_lat - ring, cell_lng + d
+            yield cell_lat + ring, cell_lng + d
+        for d in range(-ring + 1, ring):
+            yield cell_lat + d, cell_lng - ring
+            yield cell_lat + d, cell_lng + ring
+
+    def stats(self) -> dict:
+        """Place count and grid size."""
+        return {
+            "places": len(self),
+            "with_county": int((self.counties != "").sum()),
+            "grid_cells": len(self._cells),
+            "source": self.source,
+        }
+
+
+_GAZETTEERS: Dict[tuple, Gazetteer] = {}
+
+
+def load_gazetteer(
+    path: Optional[Path] = None,
+    state: Optional[str] = None,
+    counties: Optional[gpd.GeoDataFrame] = None,
+) -> Gazetteer:
+    """Gazetteer for a places file (built-in cities without one), loaded once per file.
+
+    Args:
+        path: Places file (see Gazetteer.from_file)
+        state: Keep only places in this state
+        counties: County polygons used to fill in missing counties
+    """
+    key: tuple
+    if path is None:
+        key = ("builtin",)
+    else:
+        path = Path(path)
+        key = (str(path.resolve()), path.stat().st_mtime_ns, state, counties is not None)
+
+    gazetteer = _GAZETTEERS.get(key)
+    if gazetteer is None:
+        gazetteer = (
+            Gazetteer.builtin() if path is None
+            else Gazetteer.from_file(path, state=state, counties=counties)
+        )
+        _GAZETTEERS[key] = gazetteer
+    return gazetteer
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    gazetteer = load_gazetteer(Path(sys.argv[1]) if len(sys.argv) > 1 else None)
+    print(gazetteer.stats())
+    print(f"Kermit, Winkler: {gazetteer.lookup('Kermit', 'Winkler')}")
+    print(f"Nearest to (31.6, -103.0): {gazetteer.nearest(31.6, -103.0)}")
@@ -11,9 +11,11 @@ Algorithm:
 2. For each failed intersection:
    a. Fuzzy match road names to geometries in network
    b. Find all segments for both roads
-   c. Calculate geometric intersections
-   d. Filter by county/city bounds
-   e. Return best intersection point with confidence score
+   c. Calculate geometric intersections (or look them up in the precomputed
+      junction table, see junction_table.py)
+   d. Filter by county bounds (county polygons) and city radius (gazetteer)
+   e. Return best intersection point (nearest the city center when
+      ambiguous) with confidence score
 
 Usage:
     from geometric_geocoder import GeometricGeocoder
@@ -37,10 +39,18 @@ from pathlib import Path
 from typing import Any, Optional
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
 from shapely.geometry import LineString, MultiLineString, Point
 from shapely.ops import nearest_points
 
+from county_index import load_county_boundaries, normalize_county
+from gazetteer import Gazetteer, haversine_km, load_gazetteer
+from junction_table import JunctionTable, load_junctions, segment_keys
+from road_index import RoadNameIndex
+from road_snapshot import load_roads
+
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
 
@@ -72,31 +82,56 @@ class IntersectionResult:
 class GeometricGeocoder:
     """Geocode intersections using road network geometry."""
 
-    def __init__(self, roads_file: Path):
+    # Intersections farther than this from the ticket's city center are only
+    # used when none is closer (same radius as the city-distance validation rule)
+    CITY_RADIUS_KM = 50.0
+
+    # Nearest point counts as unambiguous when the runner-up is this much farther
+    AMBIGUITY_RATIO = 2.0
+
+    def __init__(
+        self,
+        roads_file: Path,
+        junctions: bool = False,
+        county_boundaries: Optional[Path] = None,
+        places_file: Optional[Path] = None,
+    ):
         """Initialize geocoder with road network data.
 
         Args:
             roads_file: Path to GeoPackage containing road geometries
+            junctions: Look intersections up in the precomputed junction table
+                instead of intersecting candidate segments per ticket
+            county_boundaries: Optional county polygons; intersections are then
+                limited to the ticket's county
+            places_file: Optional places file for city centers (see gazetteer.py);
+                the built-in project cities are used without one
         """
         self.roads_file = Path(roads_file)
-        self.roads: Optional[gpd.GeoDataFrame] = None
+        self.roads: gpd.GeoDataFrame  # Set by _load_roads()
+        self._road_index: Optional[RoadNameIndex] = None
         self._load_roads()
+        self.counties: Optional[gpd.GeoDataFrame] = (
+            load_county_boundaries(Path(county_boundaries), crs=self.roads.crs)
+            if county_boundaries else None
+        )
+        self.gazetteer: Gazetteer = load_gazetteer(places_file, counties=self.counties)
+        self.junctions: Optional[JunctionTable] = (
+            load_junctions(self.roads_file, self.roads, county_boundaries) if junctions else None
+        )
 
-    def _load_roads(self) -> None:
-        """Load road network from GeoPackage."""
-        if not self.roads_file.exists():
-            raise FileNotFoundError(f"Road network file not found: {self.roads_file}")
+    @property
+    def road_index(self) -> RoadNameIndex:
+        """Normalized name/ref index over self.roads (rebuilt if roads are replaced)."""
+        if self._road_index is None or self._road_index.roads is not self.roads:
+            self._road_index = RoadNameIndex(self.roads)
+        return self._road_index
 
-        logging.info(f"Loading road network from {self.roads_file}")
-        self.roads = gpd.read_file(self.roads_file, layer="roads")
+    def _load_roads(self) -> None:
+        """Load road network (from a fresh snapshot when available, else the GeoPackage)."""
+        self.roads, self._road_index = load_roads(self.roads_file)
         logging.info(f"Loaded {len(self.roads)} road segments")
 
-        # Normalize column names for compatibility
-        if "road_name" in self.roads.columns and "name" not in self.roads.columns:
-            self.roads["name"] = self.roads["road_name"]
-        if "road_ref" in self.roads.columns and "ref" not in self.roads.columns:
-            self.roads["ref"] = self.roads["road_ref"]
-
     def _normalize_road_name(self, name: str) -> str:
         """Normalize road name for matching.
 
@@ -145,40 +180,32 @@ class GeometricGeocoder:
         normalized = self._normalize_road_name(road_name)
 
         # Try exact match first (on normalized names)
-        candidates = self.roads[
-            (self.roads["name"].str.upper().str.replace(r'[-\s]+', ' ', regex=True).str.strip() == normalized) |
-            (self.roads["ref"].str.upper().str.replace(r'[-\s]+', ' ', regex=True).str.strip() == normalized)
-        ].copy()
+        candidates = self.road_index.select(normalized)
 
-        if len(candidates) > 0:
+        if candidates is not None:
             logging.debug(f"Found {len(candidates)} exact matches for '{road_name}'")
-            return candidates.head(max_candidates)
+            return candidates.head(max_candidates).copy()
 
         # Try partial match
-        # Split normalized name into tokens and match any
+        # Split normalized name into tokens; for multi-token names require
+        # both tokens present, otherwise a plain contains match
         tokens = normalized.split()
-        if len(tokens) >= 2:
-            # For multi-token names, require both tokens present
-            mask = self.roads["name"].str.upper().str.contains(tokens[0], na=False) & \
-                   self.roads["name"].str.upper().str.contains(tokens[1], na=False)
-            mask |= self.roads["ref"].str.upper().str.contains(tokens[0], na=False) & \
-                    self.roads["ref"].str.upper().str.contains(tokens[1], na=False)
-
-            candidates = self.roads[mask].copy()
-        else:
-            # Single token - just do contains match
-            candidates = self.roads[
-                self.roads["name"].str.upper().str.contains(normalized, na=False) |
-                self.roads["ref"].str.upper().str.contains(normalized, na=False)
-            ].copy()
+        patterns = tokens[:2] if len(tokens) >= 2 else [normalized]
+        candidates = self.road_index.select_containing(patterns)
 
-        if len(candidates) > 0:
+        if candidates is not None:
             logging.debug(f"Found {len(candidates)} partial matches for '{road_name}'")
-            return candidates.head(max_candidates)
+            return candidates.head(max_candidates).copy()
 
         logging.warning(f"No road segments found for '{road_name}'")
         return gpd.GeoDataFrame()
 
+    @staticmethod
+    def _road_keys(roads: gpd.GeoDataFrame) -> list[str]:
+        """Distinct normalized names/refs of matched segments (junction table keys)."""
+        keys = [key for column in segment_keys(roads) for key in column if key is not None]
+        return list(dict.fromkeys(keys))
+
     def _calculate_intersections(
         self,
         roads_a: gpd.GeoDataFrame,
@@ -186,40 +213,35 @@ class GeometricGeocoder:
     ) -> list[Point]:
         """Calculate all intersection points between two sets of road segments.
 
+        Candidate pairs come from one STRtree query of roads_a against
+        roads_b, and all pairs are intersected in a single vectorized call.
+        Points (and the parts of MultiPoints) are kept, overlapping roads
+        (LineString results) contribute their midpoint, and only the points
+        of GeometryCollections are used.
+
         Args:
             roads_a: First set of road segments
             roads_b: Second set of road segments
 
         Returns:
-            List of intersection Points
+            List of intersection Points (in roads_a, roads_b order)
         """
-        intersections = []
-
-        for _, road_a in roads_a.iterrows():
-            geom_a = road_a.geometry
-
-            for _, road_b in roads_b.iterrows():
-                geom_b = road_b.geometry
-
-                # Check if they intersect
-                if geom_a.intersects(geom_b):
-                    intersection = geom_a.intersection(geom_b)
-
-                    # Handle different intersection types
-                    if intersection.geom_type == "Point":
-                        intersections.append(intersection)
-                    elif intersection.geom_type == "MultiPoint":
-                        intersections.extend(list(intersection.geoms))
-                    elif intersection.geom_type == "LineString":
-                        # Roads overlap - use midpoint
-                        intersections.append(intersection.centroid)
-                    elif intersection.geom_type == "GeometryCollection":
-                        # Extract points from collection
-                        for geom in intersection.geoms:
-                            if geom.geom_type == "Point":
-                                intersections.append(geom)
-
-        return intersections
+        if len(roads_a) == 0 or len(roads_b) == 0:
+            return []
+
+        geoms_a = roads_a.geometry.values
+        geoms_b = roads_b.geometry.values
+        idx_a, idx_b = shapely.STRtree(geoms_b).query(geoms_a, predicate="intersects")
+        order = np.lexsort((idx_b, idx_a))
+        intersections = shapely.intersection(geoms_a[idx_a[order]], geoms_b[idx_b[order]])
+
+        # Overlaps: replace with midpoint before flattening
+        types = shapely.get_type_id(intersections)
+        overlap = types == 1  # LineString
+        intersections[overlap] = shapely.centroid(intersections[overlap])
+
+        parts = shapely.get_parts(intersections)
+        return list(parts[shapely.get_type_id(parts) == 0])
 
     def _filter_by_bounds(
         self,
@@ -229,10 +251,12 @@ class GeometricGeocoder:
     ) -> list[Point]:
         """Filter intersection points to those within reasonable bounds.
 
-        For now, this is a placeholder. In a full implementation, you would:
-        - Load county/city boundaries
-        - Filter points to those within bounds
-        - Optionally use route corridor to further filter
+        - County: with county boundaries loaded, points outside the ticket's
+          county polygon are dropped (a county missing from the boundaries
+          does not filter)
+        - City: when the city is in the gazetteer, points within
+          CITY_RADIUS_KM of its center are preferred; if none is that close,
+          all points are kept for _choose_best_intersection to rank
 
         Args:
             points: List of intersection points
@@ -242,25 +266,51 @@ class GeometricGeocoder:
         Returns:
             Filtered list of points
         """
-        # TODO: Implement proper bounds checking
-        # For now, return all points
-        return points
+        if not points:
+            return points
+
+        geometries = np.array(points, dtype=object)
+        keep = np.ones(len(points), dtype=bool)
+
+        county_key = normalize_county(county)
+        if self.counties is not None and county_key:
+            polygons = self.counties.geometry.values[
+                self.counties["county"].to_numpy(dtype=object) == county_key
+            ]
+            if len(polygons) > 0:
+                keep &= shapely.intersects(shapely.union_all(polygons), geometries)
+
+        center = self.gazetteer.lookup(city, county)
+        if center is not None and keep.any():
+            coords = shapely.get_coordinates(geometries)
+            near_city = haversine_km(coords[:, 1], coords[:, 0], *center) <= self.CITY_RADIUS_KM
+            if (keep & near_city).any():
+                keep &= near_city
+
+        if not keep.all():
+            logging.debug(f"Bounds filter kept {int(keep.sum())} of {len(points)} points for {city}, {county}")
+        return list(geometries[keep])
 
     def _choose_best_intersection(
         self,
         points: list[Point],
-        city: str
+        city: str,
+        county: Optional[str] = None
     ) -> tuple[Point, float]:
         """Choose the best intersection point from multiple candidates.
 
         Strategy:
         - If only one point, return it with high confidence
-        - If multiple, prefer points closer to city center (if known)
-        - Otherwise, return first point with moderate confidence
+        - If multiple and the city center is known, return the point closest
+          to it; confidence is higher when the runner-up is clearly farther
+          (AMBIGUITY_RATIO)
+        - Otherwise, return the point closest to the centroid of all points
+          with moderate confidence
 
         Args:
             points: List of candidate intersection points
             city: City name (for disambiguation)
+            county: County name (to pick the right city of that name)
 
         Returns:
             (best_point, confidence_score)
@@ -272,13 +322,25 @@ class GeometricGeocoder:
             # Single intersection - high confidence
             return points[0], 0.95
 
-        # Multiple intersections - need disambiguation
-        # For now, use centroid of all points as a compromise
-        # TODO: Implement city center lookup for better disambiguation
+        # Moderate confidence due to ambiguity, decreasing with more points
+        ambiguous_confidence = max(0.75 - (len(points) * 0.05), 0.5)
+
+        center = self.gazetteer.lookup(city, county)
+        if center is not None:
+            coords = shapely.get_coordinates(np.array(points, dtype=object))
+            distances = haversine_km(coords[:, 1], coords[:, 0], *center)
+            nearest, runner_up = np.argsort(distances, kind="stable")[:2]
+            if distances[runner_up] >= self.AMBIGUITY_RATIO * distances[nearest]:
+                return points[nearest], 0.85
+            logging.warning(
+                f"Found {len(points)} intersection points for {city}; nearest to the "
+                f"city center is {distances[nearest]:.1f}km, next {distances[runner_up]:.1f}km"
+            )
+            return points[nearest], ambiguous_confidence
 
         logging.warning(
-            f"Found {len(points)} intersection points for {city}. "
-            f"Using centroid - consider implementing city-based disambiguation."
+            f"Found {len(points)} intersection points for {city} (city center unknown). "
+            f"Using the point nearest their centroid."
         )
 
         # Calculate centroid of all intersection points
@@ -289,11 +351,7 @@ class GeometricGeocoder:
         # Find closest actual intersection to centroid
         best_point = min(points, key=lambda p: p.distance(centroid))
 
-        # Moderate confidence due to ambiguity
-        confidence = 0.75 - (len(points) * 0.05)  # Decrease confidence with more ambiguity
-        confidence = max(confidence, 0.5)  # Floor at 0.5
-
-        return best_point, confidence
+        return best_point, ambiguous_confidence
 
     def geocode_intersection(
         self,
@@ -337,8 +395,15 @@ class GeometricGeocoder:
             f"{len(roads_b)} segments for '{intersection}'"
         )
 
-        # Calculate intersections
-        intersection_points = self._calculate_intersections(roads_a, roads_b)
+        # Calculate intersections (junction table: one lookup per name pair)
+        if self.junctions is not None:
+            source = "junction_table"
+            intersection_points = self.junctions.points(
+                self._road_keys(roads_a), self._road_keys(roads_b), county
+            )
+        else:
+            source = "segment_intersection"
+            intersection_points = self._calculate_intersections(roads_a, roads_b)
 
         if not intersection_points:
             return IntersectionResult(
@@ -369,7 +434,7 @@ class GeometricGeocoder:
             )
 
         # Choose best intersection
-        best_point, confidence = self._choose_best_intersection(filtered_points, city)
+        best_point, confidence = self._choose_best_intersection(filtered_points, city, county)
 
         if best_point is None:
             return IntersectionResult(
@@ -392,6 +457,7 @@ class GeometricGeocoder:
                 "total_intersections": len(filtered_points),
                 "street_segments": len(roads_a),
                 "intersection_segments": len(roads_b),
+                "source": source,
             }
         )
 
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+geometry_cache.py
+
+LRU cache of dissolved road geometries for the proximity geocoder.
+
+Every proximity approach dissolves the matched road segments
+(``unary_union``) before measuring distances, buffering or taking a
+centroid. Popular roads (I-20, US 385, FM 1788, ...) match the same segment
+set for thousands of tickets, so GeometryCache keeps the dissolved geometry
+per segment set, prepared for fast predicates, together with its centroid
+and buffers as they are first requested.
+
+Usage:
+    from geometry_cache import GeometryCache
+
+    cache = GeometryCache(maxsize=512)
+    road = cache.dissolve(segments)      # DissolvedRoad
+    road.geometry, road.centroid, road.buffer(0.05)
+    cache.stats()                        # hits, misses, evictions, hit_rate
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+import geopandas as gpd
+import shapely
+from shapely.geometry import Point
+from shapely.geometry.base import BaseGeometry
+
+
+@dataclass
+class DissolvedRoad:
+    """Dissolved geometry of a set of road segments plus derived shapes."""
+    geometry: BaseGeometry
+    segment_count: int
+    _centroid: Optional[Point] = field(default=None, repr=False)
+    _buffers: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def centroid(self) -> Point:
+        """Centroid of the dissolved geometry."""
+        if self._centroid is None:
+            self._centroid = self.geometry.centroid
+        return self._centroid
+
+    def buffer(self, distance: float) -> BaseGeometry:
+        """Prepared buffer of the dissolved geometry (cached per distance)."""
+        buffered = self._buffers.get(distance)
+        if buffered is None:
+            buffered = self.geometry.buffer(distance)
+            shapely.prepare(buffered)
+            self._buffers[distance] = buffered
+        return buffered
+
+
+class GeometryCache:
+    """LRU cache of DissolvedRoad keyed by the matched segment set."""
+
+    def __init__(self, maxsize: int = 512, geometry_column: Optional[str] = None):
+        """Initialize cache.
+
+        Args:
+            maxsize: Maximum number of dissolved segment sets kept (0 disables caching)
+            geometry_column: Geometry column to dissolve (default: the active geometry)
+        """
+        self.maxsize = maxsize
+        self.geometry_column = geometry_column
+        self._entries: OrderedDict[tuple, DissolvedRoad] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(segments: gpd.GeoDataFrame) -> tuple:
+        """Cache key for a set of segments (their road-network index labels)."""
+        return tuple(segments.index.tolist())
+
+    def dissolve(self, segments: gpd.GeoDataFrame) -> DissolvedRoad:
+        """Dissolved (and prepared) geometry for a set of road segments.
+
+        Args:
+            segments: Road segments selected from the road network
+
+        Returns:
+            DissolvedRoad shared by all callers with the same segment set
+        """
+        key = self.key(segments)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        geoms = segments[self.geometry_column] if self.geometry_column else segments.geometry
+        geometry = geoms.union_all()
+        shapely.prepare(geometry)
+        entry = DissolvedRoad(geometry=geometry, segment_count=len(segments))
+
+        if self.maxsize > 0:
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return entry
+
+    def resize(self, maxsize: int) -> None:
+        """Change the bound, evicting least recently used entries if needed."""
+        self.maxsize = maxsize
+        while len(self._entries) > max(0, maxsize):
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (statistics are kept)."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Cache hit statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+if __name__ == "__main__":
+    from shapely.geometry import LineString
+
+    roads = gpd.GeoDataFrame(
+        {"name": ["I-20", "I-20", "CR 426"]},
+        geometry=[
+            LineString([(0, 0), (1, 0)]),
+            LineString([(1, 0), (2, 0)]),
+            LineString([(0, 1), (1, 1)]),
+        ],
+        crs="EPSG:4326",
+    )
+
+    cache = GeometryCache(maxsize=2)
+    for _ in range(3):
+        road = cache.dissolve(roads[roads["name"] == "I-20"])
+    print(f"I-20 centroid: {road.centroid}")
+    print(cache.stats())
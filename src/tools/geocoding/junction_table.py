@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+junction_table.py
+
+Precomputed intersections between differently-named roads.
+
+GeometricGeocoder used to intersect every candidate segment of road A with
+every candidate segment of road B for each ticket. JunctionTable does that
+once for the whole network: an STRtree self-join finds every pair of
+intersecting segments, pairs belonging to the same road are dropped, and the
+intersection points are stored under each (name A, name B) pair of
+normalized names/refs (the RoadNameIndex keys), together with the county
+the point lies in. An intersection ticket is then a dictionary lookup.
+
+The table is written next to the road network (``roads_merged.junctions.arrow``)
+and reused while the GPKG (and county boundaries) are unchanged; without
+``pyarrow`` it is rebuilt in memory on every start.
+
+Usage:
+    python junction_table.py roads_merged.gpkg [--counties texas_counties.geojson]
+
+    from junction_table import load_junctions
+    junctions = load_junctions(Path("roads_merged.gpkg"), roads)
+    points = junctions.points(["CR 426"], ["CR 432"], county="Ward")
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import Point
+
+from county_index import load_county_boundaries, normalize_county
+from road_index import RoadNameIndex, normalize_column_value
+from road_snapshot import is_fresh, read_gpkg_roads, source_metadata
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401 (loads pa.ipc)
+except ImportError:
+    pa = None
+
+JUNCTIONS_SUFFIX = ".junctions.arrow"
+JUNCTIONS_VERSION = "junctions-1"
+
+# Points closer than this (CRS units, ~1 cm in degrees) are one junction
+DEDUPE_DECIMALS = 7
+
+
+def junctions_path_for(roads_file: Path) -> Path:
+    """Junction table location for a road network GPKG (stored next to it)."""
+    roads_file = Path(roads_file)
+    return roads_file.with_name(roads_file.stem + JUNCTIONS_SUFFIX)
+
+
+def segment_keys(roads: gpd.GeoDataFrame) -> list[np.ndarray]:
+    """Normalized name and ref of every segment (None where missing)."""
+    return [
+        np.array([normalize_column_value(v) for v in roads[column]], dtype=object)
+        for column in RoadNameIndex.COLUMNS
+        if column in roads.columns
+    ]
+
+
+def _intersection_points(geometries: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Points of intersection geometries (overlaps become their centroid) and their owners."""
+    parts, owners = shapely.get_parts(geometries, return_index=True)
+    types = shapely.get_type_id(parts)
+    is_point = types == 0
+    is_line = (types == 1) | (types == 2)
+
+    points = np.empty(len(parts), dtype=object)
+    points[is_point] = parts[is_point]
+    points[is_line] = shapely.centroid(parts[is_line])
+    keep = is_point | is_line
+    return shapely.get_coordinates(points[keep]), owners[keep]
+
+
+class JunctionTable:
+    """Intersection points keyed by (road key A, road key B)."""
+
+    COLUMNS = ("key_a", "key_b", "county", "x", "y")
+
+    def __init__(self, junctions: pd.DataFrame, crs=None):
+        """Initialize from a frame with COLUMNS (see build / load_junctions).
+
+        Args:
+            junctions: One row per (key pair, point); key_a < key_b
+            crs: CRS of the points (the road network's)
+        """
+        self.junctions = junctions.reset_index(drop=True)
+        self.crs = crs
+        self.x = self.junctions["x"].to_numpy(dtype=float)
+        self.y = self.junctions["y"].to_numpy(dtype=float)
+        self.counties = self.junctions["county"].to_numpy(dtype=object)
+        self.has_counties = bool((self.counties != "").any())
+        self._rows: dict[tuple[str, str], np.ndarray] = (
+            self.junctions.groupby(["key_a", "key_b"], sort=False).indices
+            if len(self.junctions) > 0 else {}
+        )
+
+    @classmethod
+    def build(
+        cls,
+        roads: gpd.GeoDataFrame,
+        counties: Optional[gpd.GeoDataFrame] = None,
+    ) -> "JunctionTable":
+        """Find every intersection between differently-named roads.
+
+        Args:
+            roads: Road segments with ``name``/``ref`` columns
+            counties: Optional county polygons (see county_index.load_county_boundaries);
+                otherwise a ``county`` column on the roads is used if present
+        """
+        start = time.time()
+        geometries = roads.geometry.values
+        keys = segment_keys(roads)
+
+        # Self-join: every pair of intersecting segments, once
+        tree = shapely.STRtree(geometries)
+        left, right = tree.query(geometries, predicate="intersects")
+        ordered = left < right
+        left, right = left[ordered], right[ordered]
+
+        # Drop pairs sharing a name or ref (segments of the same road)
+        same_road = np.zeros(len(left), dtype=bool)
+        for keys_a in keys:
+            for keys_b in keys:
+                a, b = keys_a[left], keys_b[right]
+                same_road |= (a == b) & (a != None)  # noqa: E711 (elementwise)
+        left, right = left[~same_road], right[~same_road]
+
+        coords, owners = _intersection_points(
+            shapely.intersection(geometries[left], geometries[right])
+        )
+        left, right = left[owners], right[owners]
+
+        county = cls._point_counties(coords, left, roads, counties)
+
+        # One row per (key of A, key of B) combination, keys ordered within the pair
+        frames = []
+        for keys_a in keys:
+            for keys_b in keys:
+                a, b = keys_a[left], keys_b[right]
+                valid = (a != None) & (b != None)  # noqa: E711 (elementwise)
+                a, b = a[valid], b[valid]
+                swap = b < a
+                frames.append(pd.DataFrame({
+                    "key_a": np.where(swap, b, a),
+                    "key_b": np.where(swap, a, b),
+                    "county": county[valid],
+                    "x": coords[valid, 0].round(DEDUPE_DECIMALS),
+                    "y": coords[valid, 1].round(DEDUPE_DECIMALS),
+                }))
+        junctions = (
+            pd.concat(frames, ignore_index=True).drop_duplicates(ignore_index=True)
+            if frames else pd.DataFrame(columns=list(cls.COLUMNS))
+        )
+
+        table = cls(junctions, crs=roads.crs)
+        logging.info(
+            f"Built junction table: {len(table)} junction entries for "
+            f"{len(table._rows)} road pairs in {time.time() - start:.1f}s"
+        )
+        return table
+
+    @staticmethod
+    def _point_counties(
+        coords: np.ndarray,
+        segments: np.ndarray,
+        roads: gpd.GeoDataFrame,
+        counties: Optional[gpd.GeoDataFrame],
+    ) -> np.ndarray:
+        """County of each junction point ("" when unknown)."""
+        county = np.full(len(coords), "", dtype=object)
+        if counties is not None and len(counties) > 0:
+            points = shapely.points(coords)
+            polygon_tree = shapely.STRtree(counties.geometry.values)
+            point_idx, polygon_idx = polygon_tree.query(points, predicate="intersects")
+            # First polygon wins for points on a county line
+            first = np.unique(point_idx, return_index=True)[1]
+            names = counties["county"].to_numpy(dtype=object)
+            county[point_idx[first]] = names[polygon_idx[first]]
+        elif "county" in roads.columns:
+            county[:] = [normalize_county(c) for c in roads["county"].to_numpy()[segments]]
+        return county
+
+    def __len__(self) -> int:
+        return len(self.junctions)
+
+    def lookup(
+        self,
+        keys_a: Iterable[str],
+        keys_b: Iterable[str],
+        county: Optional[str] = None,
+    ) -> np.ndarray:
+        """Rows of junctions between any key of road A and any key of road B.
+
+        With a county (and counties in the table), only junctions in that
+        county (or of unknown county) are returned.
+        """
+        found = []
+        keys_b = list(dict.fromkeys(keys_b))
+        for key_a in dict.fromkeys(keys_a):
+            for key_b in keys_b:
+                if key_a == key_b:
+                    continue
+                pair = (key_a, key_b) if key_a < key_b else (key_b, key_a)
+                rows = self._rows.get(pair)
+                if rows is not None:
+                    found.append(rows)
+        if not found:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.unique(np.concatenate(found))
+        if county and self.has_counties:
+            counties = self.counties[rows]
+            rows = rows[(counties == normalize_county(county)) | (counties == "")]
+
+        # Same point stored under several key pairs (name and ref): keep it once
+        _, first = np.unique(np.column_stack([self.x[rows], self.y[rows]]), axis=0, return_index=True)
+        return rows[np.sort(first)]
+
+    def points(
+        self,
+        keys_a: Iterable[str],
+        keys_b: Iterable[str],
+        county: Optional[str] = None,
+    ) -> list[Point]:
+        """Junction points between road A and road B (see lookup)."""
+        rows = self.lookup(keys_a, keys_b, county)
+        return list(shapely.points(self.x[rows], self.y[rows]))
+
+    def stats(self) -> dict:
+        """Table size."""
+        return {
+            "junctions": len(self),
+            "road_pairs": len(self._rows),
+            "with_county": int((self.counties != "").sum()),
+        }
+
+
+def _write(table: JunctionTable, path: Path, metadata: dict) -> None:
+    arrow_table = pa.table({
+        column: pa.array(table.junctions[column].to_numpy(), type=pa.string())
+        if column in ("key_a", "key_b", "county") else table.junctions[column].to_numpy(dtype=float)
+        for column in JunctionTable.COLUMNS
+    }).replace_schema_metadata(metadata)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+    tmp_path.replace(path)
+
+
+def load_junctions(
+    roads_file: Path,
+    roads: Optional[gpd.GeoDataFrame] = None,
+    county_boundaries: Optional[Path] = None,
+    path: Optional[Path] = None,
+) -> JunctionTable:
+    """Junction table for a road network: the stored one when fresh, else built (and stored).
+
+    Args:
+        roads_file: Road network GeoPackage
+        roads: Already-loaded roads (read from roads_file when a build is needed)
+        county_boundaries: Optional county polygons for the junction counties
+        path: Table location (default: next to the GPKG)
+    """
+    roads_file = Path(roads_file)
+    path = Path(path) if path else junctions_path_for(roads_file)
+    counties_source = ""
+    if county_boundaries:
+        stat = Path(county_boundaries).stat()
+        counties_source = f"{Path(county_boundaries).resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    if pa is not None and path.exists():
+        try:
+            with pa.memory_map(str(path), "r") as source:
+                reader = pa.ipc.open_file(source)
+                metadata = reader.schema.metadata or {}
+                if (
+                    metadata.get(b"kcci.counties", b"").decode() == counties_source
+                    and is_fresh(metadata, roads_file, version=JUNCTIONS_VERSION, path=path)
+                ):
+                    junctions = reader.read_all().to_pandas()
+                    crs = metadata.get(b"kcci.crs", b"").decode() or None
+                    logging.info(f"Loaded junction table {path}")
+                    return JunctionTable(junctions, crs=crs)
+                logging.info(f"Junction table {path} is stale; rebuilding")
+        except (OSError, pa.ArrowException) as e:
+            logging.warning(f"Could not read junction table {path}: {e}")
+
+    if roads is None:
+        roads = read_gpkg_roads(roads_file)
+    counties = (
+        load_county_boundaries(Path(county_boundaries), crs=roads.crs) if county_boundaries else None
+    )
+    table = JunctionTable.build(roads, counties)
+
+    if pa is not None:
+        metadata = {
+            b"kcci.snapshot_version": JUNCTIONS_VERSION.encode(),
+            **source_metadata(roads_file),
+            b"kcci.counties": counties_source.encode(),
+            b"kcci.crs": (roads.crs.to_wkt() if roads.crs else "").encode(),
+        }
+        try:
+            _write(table, path, metadata)
+        except OSError as e:
+            logging.warning(f"Could not write junction table {path}: {e}")
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the road junction table")
+    parser.add_argument("roads_file", type=Path, help="Road network GeoPackage (roads layer)")
+    parser.add_argument("--counties", type=Path, help="County boundaries for junction counties")
+    parser.add_argument("--output", type=Path, help="Table path (default: next to the GPKG)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    table = load_junctions(args.roads_file, county_boundaries=args.counties, path=args.output)
+    print(f"✅ {table.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+projection.py
+
+Metric (UTM) copy of the road geometries for proximity calculations.
+
+Distances, buffers and nearest points on EPSG:4326 coordinates are in
+degrees, which is why the approaches used to convert with ``* 111`` and
+buffer by ``0.05``. MetricProjection projects the road network once at load
+time into the UTM zone covering it (13N for the Permian Basin projects, 14N
+further east) and stores the result in a second geometry column. All
+proximity geometry then works in meters, and only the final point is
+transformed back to WGS84.
+
+Usage:
+    from projection import MetricProjection, PROJECTED_COLUMN
+
+    projection = MetricProjection.for_roads(roads)           # picks the UTM zone
+    roads = projection.project(roads)                        # adds roads["geometry_m"]
+    lat_lng_point = projection.to_geographic(point_in_meters)
+"""
+
+import logging
+import math
+from typing import Optional
+
+import geopandas as gpd
+from pyproj import CRS, Transformer
+from shapely.geometry import Point
+
+# Column holding the projected (meter) geometry next to the WGS84 geometry
+PROJECTED_COLUMN = "geometry_m"
+
+GEOGRAPHIC_CRS = "EPSG:4326"
+
+
+def utm_crs_for(lng: float, lat: float) -> str:
+    """EPSG code of the WGS84 UTM zone containing a location (e.g. EPSG:32613)."""
+    zone = min(60, max(1, int(math.floor((lng + 180) / 6)) + 1))
+    return f"EPSG:{32600 + zone if lat >= 0 else 32700 + zone}"
+
+
+class MetricProjection:
+    """Projects road geometries to meters and points back to the roads' CRS."""
+
+    def __init__(self, projected_crs: str, geographic_crs=GEOGRAPHIC_CRS):
+        """Initialize projection.
+
+        Args:
+            projected_crs: Metric CRS for proximity calculations (e.g. "EPSG:32613")
+            geographic_crs: CRS of the road network and of returned points
+        """
+        self.projected_crs = CRS.from_user_input(projected_crs)
+        self.geographic_crs = CRS.from_user_input(geographic_crs or GEOGRAPHIC_CRS)
+        self._to_geographic = Transformer.from_crs(
+            self.projected_crs, self.geographic_crs, always_xy=True
+        )
+        self._to_projected = Transformer.from_crs(
+            self.geographic_crs, self.projected_crs, always_xy=True
+        )
+
+    @classmethod
+    def for_roads(
+        cls,
+        roads: gpd.GeoDataFrame,
+        projected_crs: Optional[str] = None,
+    ) -> "MetricProjection":
+        """Projection for a road network, choosing the UTM zone of its center if not given.
+
+        A network without a CRS is taken to be in WGS84 (as project() does).
+        """
+        bounds = None
+        if len(roads) > 0:
+            if roads.crs is None:
+                logging.warning(f"Road network has no CRS; assuming {GEOGRAPHIC_CRS}")
+                bounds = roads.total_bounds
+            else:
+                bounds = roads.to_crs(GEOGRAPHIC_CRS).total_bounds
+        return cls.for_bounds(bounds, roads.crs, projected_crs)
+
+    @classmethod
+    def for_bounds(
+        cls,
+        bounds: Optional[tuple],
+        geographic_crs=None,
+        projected_crs: Optional[str] = None,
+    ) -> "MetricProjection":
+        """Projection for a WGS84 (minx, miny, maxx, maxy) extent (UTM zone of its center)."""
+        if projected_crs is None:
+            if bounds is not None:
+                minx, miny, maxx, maxy = bounds
+                projected_crs = utm_crs_for((minx + maxx) / 2, (miny + maxy) / 2)
+            else:
+                projected_crs = "EPSG:32613"  # UTM 13N (West Texas)
+        logging.info(f"Proximity geometry projected to {projected_crs}")
+        return cls(projected_crs, geographic_crs or GEOGRAPHIC_CRS)
+
+    @property
+    def name(self) -> str:
+        return self.projected_crs.to_string()
+
+    def project(self, roads: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """Return roads with a projected copy of their geometry in PROJECTED_COLUMN."""
+        roads = roads.copy()
+        geometry = roads.geometry
+        if geometry.crs is None:
+            geometry = geometry.set_crs(self.geographic_crs)
+        roads[PROJECTED_COLUMN] = geometry.to_crs(self.projected_crs)
+        return roads
+
+    def to_geographic(self, point: Point) -> Point:
+        """Transform a projected point back to the road network's CRS."""
+        x, y = self._to_geographic.transform(point.x, point.y)
+        return Point(x, y)
+
+    def to_geographic_xy(self, x, y):
+        """Transform arrays of projected coordinates back to the road network's CRS."""
+        return self._to_geographic.transform(x, y)
+
+    def to_projected_xy(self, x, y):
+        """Transform arrays of road network coordinates to the projected CRS."""
+        return self._to_projected.transform(x, y)
+
+
+if __name__ == "__main__":
+    from shapely.geometry import LineString
+
+    roads = gpd.GeoDataFrame(
+        {"name": ["CR 426", "CR 432"]},
+        geometry=[LineString([(-103.2, 31.5), (-103.1, 31.5)]), LineString([(-103.15, 31.51), (-103.15, 31.6)])],
+        crs=GEOGRAPHIC_CRS,
+    )
+    projection = MetricProjection.for_roads(roads)
+    roads = projection.project(roads)
+    a, b = roads[PROJECTED_COLUMN]
+    print(f"{projection.name}: distance {a.distance(b):.0f} m")
+    print(projection.to_geographic(roads[PROJECTED_COLUMN].iloc[0].centroid))
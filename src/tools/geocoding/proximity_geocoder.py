@@ -22,6 +22,11 @@ Strategy Selection Based on Road Characteristics:
         - Example: "LAKEVIEW DR & I-20" → point on I-20 near city center
         - Why: Local street provides city context, work likely on major road
 
+    Approach 5 (Network Distance): Roads connected along the network (opt-in)
+        - Best for: Roads that meet or connect through short links (CR 426 & FM 1788)
+        - Example: "CR 426 & CR 432" → CR 426 node reached first from a CR 432 junction
+        - Why: Work "on A near B" is usually a short drive along A from B
+
 Author: Corey Klaasmeyer / Claude Code
 Date: 2026-02-08
 """
@@ -32,9 +37,24 @@ from pathlib import Path
 from typing import Optional, Tuple
 
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
 from shapely.geometry import Point, LineString
 from shapely.ops import nearest_points
 
+from county_index import SCOPE_COUNTY, CountyRoadIndex, load_county_boundaries, normalize_county
+from gazetteer import load_gazetteer
+from geometry_cache import DissolvedRoad, GeometryCache
+from projection import PROJECTED_COLUMN, MetricProjection
+from proximity_memo import ProximityGeometry, ProximityMemo
+from road_graph import NetworkMatch, RoadGraph
+from road_fuzzy import FuzzyMatch, FuzzyRoadMatcher
+from road_index import RoadNameIndex
+from road_region import RoadRegion, merge_segments
+from road_shared import SharedRoadNetwork
+from road_snapshot import load_roads
+
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
 
@@ -103,41 +123,270 @@ class RoadCharacteristics:
 class ProximityGeocoder:
     """Geocode 811 tickets using proximity-based approaches."""
 
-    # City centroids for fallback geocoding (approximate coordinates)
-    CITY_CENTROIDS = {
-        ("KERMIT", "WINKLER"): (31.8576, -103.0930),
-        ("PYOTE", "WARD"): (31.5401, -103.1293),
-        ("BARSTOW", "WARD"): (31.4596, -103.3954),
-        ("MONAHANS", "WARD"): (31.5943, -102.8929),
-        ("ANDREWS", "ANDREWS"): (32.3185, -102.5457),
-        ("GARDENDALE", "ANDREWS"): (32.0165, -102.3779),
-        ("COYANOSA", "WARD"): (31.2693, -103.0324),
-        ("WICKETT", "WARD"): (31.5768, -103.0010),
-        ("THORNTONVILLE", "WARD"): (31.4446, -103.1079),
-    }
+    # Proximity thresholds in meters (geometry is projected, see projection.py)
+    CLOSEST_POINT_FALLOFF_M = 2000.0  # approach 2 confidence: 1 - distance / falloff
+    CORRIDOR_BUFFER_M = 5000.0        # approach 3 search radius around the minor road
+    NETWORK_SEARCH_M = 5000.0         # approach 5 bound on the distance along the network
+
+    def __init__(
+        self,
+        roads_file: Path,
+        geometry_cache_size: int = 512,
+        memo_size: int = 10000,
+        memo_path: Optional[Path] = None,
+        county_boundaries: Optional[Path] = None,
+        region_bounds: Optional[Tuple[float, float, float, float]] = None,
+        tile_size: float = 0.5,
+        max_page_rings: int = 2,
+        projected_crs: Optional[str] = None,
+        network_distance: bool = False,
+        shared_network: Optional[Path] = None,
+        places_file: Optional[Path] = None,
+    ):
+        """Initialize with road network data.
+
+        Args:
+            roads_file: GeoPackage with a "roads" layer
+            geometry_cache_size: Dissolved road geometries kept in the LRU cache
+            memo_size: Geocode results (before metadata adjustment) kept in memory
+            memo_path: Optional SQLite file persisting the memo across runs
+            county_boundaries: Optional county polygons; road lookups are then
+                scoped to the ticket's county (and its neighbors). Without
+                them, a ``county`` column on the roads scopes lookups instead
+                (see county_index.py)
+            region_bounds: Optional (minx, miny, maxx, maxy) to load instead of
+                the whole network; other tiles are paged in on demand
+            tile_size: Tile edge (network CRS units) for region paging
+            max_page_rings: Tile rings paged in around the region for roads
+                that are not found
+            projected_crs: Metric CRS for distances, buffers and nearest
+                points (default: UTM zone of the network, e.g. EPSG:32613)
+            network_distance: Build the road topology graph and geocode roads
+                that connect along the network with approach 5
+            shared_network: Optional directory written by road_shared.py; the
+                network is then memory-mapped (shared with other processes)
+                and only segments matched by tickets are materialized
+            places_file: Optional places file (CSV or Census Gazetteer) for the
+                city centroid fallback (default: built-in project cities)
+        """
+        if shared_network is not None and region_bounds is not None:
+            raise ValueError("region_bounds and shared_network cannot be combined")
 
-    def __init__(self, roads_file: Path):
-        """Initialize with road network data."""
         self.roads_file = Path(roads_file)
-        self.roads: Optional[gpd.GeoDataFrame] = None
+        self._shared_path = Path(shared_network) if shared_network is not None else None
+        self.shared: Optional[SharedRoadNetwork] = None
+        self.roads: gpd.GeoDataFrame  # Set by _load_roads()
+        self._road_index: RoadNameIndex  # Set by _load_roads()
+        self._fuzzy_matcher: Optional[FuzzyRoadMatcher] = None
+        self._segment_tree: Optional[shapely.STRtree] = None
+        self._segment_tree_roads: Optional[gpd.GeoDataFrame] = None
+        self.network_distance = network_distance
+        self._road_graph: Optional[RoadGraph] = None
+        self._road_graph_roads: Optional[gpd.GeoDataFrame] = None
+        self.region = (
+            RoadRegion(self.roads_file, region_bounds, tile_size=tile_size, max_rings=max_page_rings)
+            if region_bounds is not None else None
+        )
+        self.geometry_cache = GeometryCache(
+            maxsize=geometry_cache_size, geometry_column=PROJECTED_COLUMN
+        )
+        self.projection: MetricProjection  # Set by _load_roads()
+        self._projected_crs = projected_crs
         self._load_roads()
+        self._county_boundaries = Path(county_boundaries) if county_boundaries else None
+        self._counties = (
+            load_county_boundaries(self._county_boundaries, crs=self.roads.crs)
+            if self._county_boundaries is not None else None
+        )
+        self.county_index = CountyRoadIndex(self.roads, self._counties)
+        self.gazetteer = load_gazetteer(
+            Path(places_file) if places_file else None, counties=self._counties
+        )
+        self.memo = ProximityMemo(
+            maxsize=memo_size,
+            path=memo_path,
+            fingerprint=self._roads_fingerprint(),
+        )
+
+    def _roads_fingerprint(self) -> str:
+        """Identify the loaded road network (invalidates the disk memo when it changes)."""
+        stat = self.roads_file.stat()
+        fingerprint = f"{self.roads_file.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+        if self.region is not None:
+            fingerprint += f":{self.region.initial_bounds}:{self.region.tile_size}"
+        fingerprint += f":{self.projection.name}"
+        if self.network_distance:
+            fingerprint += f":network{self.NETWORK_SEARCH_M:g}"
+        if self.gazetteer.source != "builtin":
+            fingerprint += f":{self.gazetteer.source}"
+        # County scoping changes which segments a name matches
+        if self._county_boundaries is not None:
+            counties = self._county_boundaries.stat()
+            fingerprint += (
+                f":counties={self._county_boundaries.resolve()}:{counties.st_size}:{counties.st_mtime_ns}"
+            )
+        elif "county" in self.roads.columns:
+            fingerprint += ":counties=roads-column"
+        return fingerprint
+
+    def _sync_roads(self) -> None:
+        """Bring the indexes up to date after self.roads was replaced or paged in.
+
+        Projects replaced roads, rebuilds the name and county indexes over
+        them and clears the caches keyed by the old segments. With a shared
+        network only the county index follows self.roads (the name index
+        covers the whole network).
+        """
+        if self.shared is not None:
+            if self.county_index.roads is not self.roads:
+                self.county_index = CountyRoadIndex(self.roads, self._counties)
+            return
+
+        if self._road_index.roads is not self.roads:
+            if PROJECTED_COLUMN not in self.roads.columns:
+                self.roads = self.projection.project(self.roads)
+            self._road_index = RoadNameIndex(self.roads)
+            if self.county_index.roads is not self.roads:
+                self.county_index = CountyRoadIndex(self.roads, self._counties)
+            # Cached geometries are keyed by segment labels of the old roads
+            self.geometry_cache.clear()
+            self.memo.clear()
+
+    @property
+    def road_index(self) -> RoadNameIndex:
+        """Normalized name/ref index over self.roads (rebuilt if roads are replaced).
+
+        With a shared network this is the shared index, whose positions refer
+        to the whole network (see _working_positions).
+        """
+        self._sync_roads()
+        if self.shared is not None:
+            return self.shared.index
+        return self._road_index
+
+    @property
+    def fuzzy_matcher(self) -> FuzzyRoadMatcher:
+        """Typo-tolerant matcher over the road index (rebuilt with the index).
+
+        Candidates are scoped per county except with a shared network, whose
+        county index only covers the materialized segments.
+        """
+        road_index = self.road_index
+        if self._fuzzy_matcher is None or self._fuzzy_matcher.road_index is not road_index:
+            self._fuzzy_matcher = FuzzyRoadMatcher(
+                road_index,
+                None if self.shared is not None else self.county_index,
+                normalize=self._normalize_road_name,
+            )
+        return self._fuzzy_matcher
+
+    @property
+    def segment_tree(self) -> shapely.STRtree:
+        """STRtree over the projected road segments (tree indices are self.roads positions)."""
+        self._sync_roads()
+        if self._segment_tree is None or self._segment_tree_roads is not self.roads:
+            self._segment_tree = shapely.STRtree(self.roads[PROJECTED_COLUMN].values)
+            self._segment_tree_roads = self.roads
+        return self._segment_tree
+
+    @property
+    def road_graph(self) -> Optional[RoadGraph]:
+        """Topology graph of self.roads (None unless network_distance is enabled)."""
+        if not self.network_distance:
+            return None
+        self._sync_roads()
+        if self.shared is not None:
+            # Graph of the whole shared network: mapped from graph.arrow when
+            # it was written with the network, else built in this process
+            if self._road_graph is None:
+                self._road_graph = self.shared.graph(
+                    self.projection, max_distance=self.NETWORK_SEARCH_M
+                )
+                if self._road_graph is None:
+                    self._road_graph = self.shared.build_graph(
+                        self.projection, max_distance=self.NETWORK_SEARCH_M
+                    )
+                    logging.info(
+                        f"Built road graph: {self._road_graph.node_count} nodes "
+                        f"(write it with road_shared.py --graph to share it between workers)"
+                    )
+        elif self._road_graph is None or self._road_graph_roads is not self.roads:
+            self._road_graph = RoadGraph.from_segments(
+                self.roads[PROJECTED_COLUMN].values, max_distance=self.NETWORK_SEARCH_M
+            )
+            self._road_graph_roads = self.roads
+            logging.info(f"Built road graph: {self._road_graph.node_count} nodes")
+        return self._road_graph
+
+    def _dissolve(self, segments: gpd.GeoDataFrame) -> DissolvedRoad:
+        """Dissolved, prepared geometry of matched segments (LRU cached)."""
+        return self.geometry_cache.dissolve(segments)
 
     def _load_roads(self) -> None:
-        """Load road network from GeoPackage."""
-        if not self.roads_file.exists():
-            raise FileNotFoundError(f"Road network file not found: {self.roads_file}")
+        """Load road network (from a fresh snapshot when available, else the GeoPackage).
 
-        logging.info(f"Loading road network from {self.roads_file}")
-        self.roads = gpd.read_file(self.roads_file, layer="roads")
+        With a region, only the tiles covering it are read. With a shared
+        network, nothing is read up front: segments are materialized from the
+        memory-mapped arrays as tickets match them.
+        """
+        if self._shared_path is not None:
+            self.shared = SharedRoadNetwork.open(self.roads_file, self._shared_path)
+            if self.shared is None:
+                logging.warning(
+                    f"No fresh shared road network at {self._shared_path}; loading {self.roads_file}"
+                )
+        if self.shared is not None:
+            self.projection = MetricProjection.for_bounds(
+                self.shared.bounds, self.shared.crs, self._projected_crs
+            )
+            self.roads = self.projection.project(self.shared.segments([]))
+            self._road_index = self.shared.index
+            return
 
-        # Normalize column names
-        if "road_name" in self.roads.columns and "name" not in self.roads.columns:
-            self.roads["name"] = self.roads["road_name"]
-        if "road_ref" in self.roads.columns and "ref" not in self.roads.columns:
-            self.roads["ref"] = self.roads["road_ref"]
+        if self.region is not None:
+            roads = self.region.load_initial()
+            road_index = RoadNameIndex(roads)
+        else:
+            roads, road_index = load_roads(self.roads_file)
 
+        # Metric copy of the geometry for all proximity calculations
+        self.projection = MetricProjection.for_roads(roads, self._projected_crs)
+        self.roads = self.projection.project(roads)
+        road_index.roads = self.roads  # Same rows, positions still valid
+        self._road_index = road_index
         logging.info(f"Loaded {len(self.roads)} road segments")
 
+    def _page_in(self, segments: Optional[gpd.GeoDataFrame]) -> bool:
+        """Add paged-in segments to the roads.
+
+        The county index is extended with the new segments only; the other
+        indexes rebuild on the next lookup.
+        """
+        if segments is None or len(segments) == 0:
+            return False
+        self.roads = merge_segments(self.roads, self.projection.project(segments))
+        self.county_index.extend(self.roads)
+        return True
+
+    def _ensure_county_loaded(self, county: str) -> None:
+        """Page in the tiles covering the ticket's county, if it is outside the region."""
+        if self.region is None or self._counties is None or not county:
+            return
+        rows = self._counties[self._counties["county"] == normalize_county(county)]
+        if len(rows) > 0:
+            self._page_in(self.region.load(tuple(rows.total_bounds)))
+
+    def _find_road_paged(self, road_name: str, county: Optional[str]) -> Optional[gpd.GeoDataFrame]:
+        """_find_road, paging in rings of region tiles while the road is missing."""
+        found = self._find_road(road_name, county)
+        while found is None and road_name and self.region is not None:
+            segments = self.region.expand()
+            if segments is None:
+                break
+            if self._page_in(segments):
+                found = self._find_road(road_name, county)
+        return found
+
     def _normalize_road_name(self, name: str) -> str:
         """Normalize road name for matching."""
         if not name:
@@ -223,182 +472,253 @@ class ProximityGeocoder:
 
         return list(set(variations))  # Remove duplicates
 
-    def _find_road(self, road_name: str) -> Optional[gpd.GeoDataFrame]:
-        """Find road segments matching name with variation support."""
+    def _scoped(self, positions, county: Optional[str]) -> Optional[gpd.GeoDataFrame]:
+        """Candidate segments limited to the ticket's county (then its neighbors), or None."""
+        positions = self._working_positions(positions)
+        if county and self.county_index.enabled:
+            positions, scope = self.county_index.restrict(positions, county)
+            if scope != SCOPE_COUNTY and len(positions) > 0:
+                logging.debug(f"Using {len(positions)} segment(s) from counties neighboring {county}")
+        if len(positions) == 0:
+            return None
+        return self.roads.iloc[positions]
+
+    def _working_positions(self, positions) -> np.ndarray:
+        """Map shared network positions to self.roads positions, materializing new segments."""
+        if self.shared is None:
+            return positions
+        positions = np.asarray(positions, dtype=np.int64)
+        missing = positions[~np.isin(positions, self.roads.index.to_numpy())]
+        if len(missing) > 0:
+            self._page_in(self.shared.segments(missing))
+        return self.roads.index.get_indexer(positions)
+
+    def _graph_positions(self, segments: gpd.GeoDataFrame) -> np.ndarray:
+        """Road graph segment ids (shared network positions, else self.roads positions)."""
+        if self.shared is not None:
+            return segments.index.to_numpy()
+        return self.roads.index.get_indexer(segments.index)
+
+    def _find_road(self, road_name: str, county: Optional[str] = None) -> Optional[gpd.GeoDataFrame]:
+        """Find road segments matching name with variation support.
+
+        With county boundaries loaded, each match is limited to segments in
+        the given county, falling back to neighboring counties; a name that
+        only exists elsewhere in the state does not match.
+        """
         if self.roads is None or not road_name:
             return None
 
         normalized = self._normalize_road_name(road_name)
+        road_index = self.road_index
 
         # Try exact match first
-        candidates = self.roads[
-            (self.roads["name"].str.upper().str.replace(r'[-\s]+', ' ', regex=True).str.strip() == normalized) |
-            (self.roads["ref"].str.upper().str.replace(r'[-\s]+', ' ', regex=True).str.strip() == normalized)
-        ]
-
-        if len(candidates) > 0:
+        candidates = self._scoped(road_index.positions(normalized), county)
+        if candidates is not None:
             return candidates
 
         # Try variations (HWY->SH, CR->FM, etc.)
-        variations = self._get_road_name_variations(road_name)
-        for variation in variations:
-            if variation == normalized:
-                continue  # Already tried
-
-            candidates = self.roads[
-                (self.roads["name"].str.upper().str.replace(r'[-\s]+', ' ', regex=True).str.strip() == variation) |
-                (self.roads["ref"].str.upper().str.replace(r'[-\s]+', ' ', regex=True).str.strip() == variation)
-            ]
-
-            if len(candidates) > 0:
+        for variation in self._get_road_name_variations(road_name):
+            if variation == normalized:  # Already tried
+                continue
+            candidates = self._scoped(road_index.positions(variation), county)
+            if candidates is not None:
                 logging.debug(f"Found road using variation: {road_name} -> {variation}")
                 return candidates
 
-        # Try partial match as last resort
+        # Try partial match as last resort (name or ref contains the tokens)
         tokens = normalized.split()
-        if len(tokens) >= 2:
-            mask = self.roads["name"].str.upper().str.contains(tokens[0], na=False) & \
-                   self.roads["name"].str.upper().str.contains(tokens[1], na=False)
-            mask |= self.roads["ref"].str.upper().str.contains(tokens[0], na=False) & \
-                    self.roads["ref"].str.upper().str.contains(tokens[1], na=False)
-            candidates = self.roads[mask]
-        else:
-            candidates = self.roads[
-                self.roads["name"].str.upper().str.contains(normalized, na=False) |
-                self.roads["ref"].str.upper().str.contains(normalized, na=False)
-            ]
+        patterns = tokens[:2] if len(tokens) >= 2 else [normalized]
+        return self._scoped(road_index.positions_containing(patterns), county)
+
+    def find_road(self, road_name: str, county: Optional[str] = None) -> Optional[gpd.GeoDataFrame]:
+        """Segments a ticket road name resolves to (the lookup geocoding uses), or None."""
+        return self._find_road_paged(road_name, county)
+
+    def correct_road_name(
+        self,
+        road_name: str,
+        county: Optional[str] = None,
+        max_distance: Optional[int] = None,
+    ) -> Optional[FuzzyMatch]:
+        """Network road name within a small edit distance of an unresolvable name.
 
-        return candidates if len(candidates) > 0 else None
+        Args:
+            road_name: Ticket road name that find_road() does not resolve
+            county: Ticket county (candidates are that county's roads)
+            max_distance: Largest edit distance (default: the matcher's)
+
+        Returns:
+            FuzzyMatch whose name resolves with find_road(), or None when the
+            name already resolves or has no unambiguous close match
+        """
+        if not road_name or self.find_road(road_name, county) is not None:
+            return None
+        match = self.fuzzy_matcher.match(road_name, county, max_distance)
+        if match is None or self.find_road(match.name, county) is None:
+            return None
+        return match
 
     def _approach_2_closest_point(
         self,
         primary_roads: gpd.GeoDataFrame,
         reference_roads: gpd.GeoDataFrame,
-        ticket_type: Optional[str] = None,
-        duration: Optional[str] = None,
-        work_type: Optional[str] = None,
     ) -> Tuple[Point, float, str]:
         """Approach 2: Find closest point on primary road to reference road.
 
         Best for: Parallel county roads in rural areas.
-        Returns: (point, confidence, reasoning)
+        Returns: (point, base confidence, reasoning)
         """
-        # Combine all geometries
-        primary_geom = primary_roads.unary_union
-        reference_geom = reference_roads.unary_union
+        # Combine all geometries (projected, meters)
+        primary_geom = self._dissolve(primary_roads).geometry
+        reference_geom = self._dissolve(reference_roads).geometry
 
         # Find nearest points
         nearest = nearest_points(primary_geom, reference_geom)
         point_on_primary = nearest[0]
 
         # Calculate distance for confidence (closer = higher confidence)
-        distance = point_on_primary.distance(reference_geom)
+        distance_m = point_on_primary.distance(reference_geom)
+        base_confidence, reasoning = self._closest_point_scores(distance_m)
 
-        # Confidence: high if within 0.01 degrees (~1km), decreasing with distance
-        base_confidence = max(0.5, min(0.95, 1.0 - (distance * 50)))
+        return self.projection.to_geographic(point_on_primary), base_confidence, reasoning
 
-        # Apply adjustment based on ticket metadata
-        adjustment_factor = self._calculate_adjustment_factor(
-            ticket_type, duration, work_type
-        )
-        confidence = min(0.95, base_confidence * adjustment_factor)
+    def _closest_point_scores(self, distance_m: float) -> Tuple[float, str]:
+        """Approach 2 base confidence and reasoning for a road-to-road distance."""
+        # Confidence: 0.95 within 100m, falling to 0.5 at 1km and beyond
+        base_confidence = max(0.5, min(0.95, 1.0 - distance_m / self.CLOSEST_POINT_FALLOFF_M))
 
         reasoning = (
             f"Rural/parallel roads: Found closest approach point between roads. "
-            f"Distance: {distance:.4f} degrees (~{distance * 111:.1f}km). "
-            f"Adjustment factor: {adjustment_factor:.2f} "
-            f"(base: {base_confidence:.2%}, adjusted: {confidence:.2%})"
+            f"Distance: {distance_m:.0f}m (~{distance_m / 1000:.1f}km). "
         )
-
-        return point_on_primary, confidence, reasoning
+        return base_confidence, reasoning
 
     def _approach_3_corridor_midpoint(
         self,
         major_roads: gpd.GeoDataFrame,
         minor_roads: gpd.GeoDataFrame,
-        ticket_type: Optional[str] = None,
-        duration: Optional[str] = None,
-        work_type: Optional[str] = None,
     ) -> Tuple[Point, float, str]:
         """Approach 3: Midpoint of major road segment near minor road.
 
         Best for: Work on major highway, referenced by local road.
-        Returns: (point, confidence, reasoning)
+        Returns: (point, base confidence, reasoning)
         """
-        minor_geom = minor_roads.unary_union
-
         # Find major road segments within reasonable distance of minor road
-        buffer_distance = 0.05  # ~5km buffer
-        search_area = minor_geom.buffer(buffer_distance)
-
-        nearby_segments = major_roads[major_roads.intersects(search_area)]
+        nearby_positions = self.segment_tree.query(
+            minor_roads[PROJECTED_COLUMN].values,
+            predicate="dwithin",
+            distance=self.CORRIDOR_BUFFER_M,
+        )[1]
+        nearby_segments = major_roads[self._corridor_mask(major_roads, nearby_positions)]
 
         if len(nearby_segments) == 0:
             # Fall back to closest point on any major road segment
-            major_geom = major_roads.unary_union
-            nearest = nearest_points(major_geom, minor_geom)
-            point = nearest[0]
-            base_confidence = 0.6
-            reasoning_prefix = "Major highway: Used closest point (no segments in buffer)"
+            point = self._nearest_point_on(major_roads, minor_roads)
         else:
             # Use centroid of nearby segments
-            combined_geom = nearby_segments.unary_union
-            point = combined_geom.centroid
-            base_confidence = 0.75
-            reasoning_prefix = (
-                f"Major highway corridor: Used midpoint of {len(nearby_segments)} "
-                f"segment(s) near reference road."
-            )
+            point = self._dissolve(nearby_segments).centroid
 
-        # Apply adjustment based on ticket metadata
-        adjustment_factor = self._calculate_adjustment_factor(
-            ticket_type, duration, work_type
+        base_confidence, reasoning = self._corridor_scores(len(nearby_segments))
+        return self.projection.to_geographic(point), base_confidence, reasoning
+
+    def _corridor_mask(self, major_roads: gpd.GeoDataFrame, nearby_positions: np.ndarray) -> np.ndarray:
+        """Which major road segments are among the segment_tree positions near the minor road."""
+        return np.isin(self.roads.index.get_indexer(major_roads.index), nearby_positions)
+
+    @staticmethod
+    def _nearest_point_on(roads: gpd.GeoDataFrame, reference_roads: gpd.GeoDataFrame) -> Point:
+        """Point on roads closest to reference_roads, from the nearest pair of segments."""
+        reference_tree = shapely.STRtree(reference_roads[PROJECTED_COLUMN].values)
+        (segment, reference), distances = reference_tree.query_nearest(
+            roads[PROJECTED_COLUMN].values, return_distance=True
+        )
+        closest = np.argmin(distances)
+        line = shapely.shortest_line(
+            roads[PROJECTED_COLUMN].values[segment[closest]],
+            reference_roads[PROJECTED_COLUMN].values[reference[closest]],
         )
-        confidence = min(0.95, base_confidence * adjustment_factor)
+        return shapely.get_point(line, 0)
+
+    @staticmethod
+    def _corridor_scores(nearby_count: int) -> Tuple[float, str]:
+        """Approach 3 base confidence and reasoning for the segments found in the buffer."""
+        if nearby_count == 0:
+            return 0.6, "Major highway: Used closest point (no segments in buffer) "
+        return 0.75, (
+            f"Major highway corridor: Used midpoint of {nearby_count} "
+            f"segment(s) near reference road. "
+        )
+
+    def _network_search(
+        self,
+        street_roads: gpd.GeoDataFrame,
+        intersection_roads: gpd.GeoDataFrame,
+    ) -> Optional[NetworkMatch]:
+        """Street node closest along the network to a junction of the intersection road."""
+        graph = self.road_graph
+        if graph is None:
+            return None
+        sources = graph.junctions(self._graph_positions(intersection_roads))
+        if len(sources) == 0:
+            return None
+        targets = graph.segment_nodes_of(self._graph_positions(street_roads))
+        return graph.nearest(sources, targets)
+
+    def _approach_5_network_distance(
+        self,
+        street_roads: gpd.GeoDataFrame,
+        intersection_roads: gpd.GeoDataFrame,
+    ) -> Tuple[Point, float, str]:
+        """Approach 5: Point on the street where the network path from the reference road arrives.
+
+        Best for: Connected roads ("work on A near B"), including B meeting A.
+        Returns: (point, base confidence, reasoning)
+        """
+        match = self._network_search(street_roads, intersection_roads)
+        if match is None:
+            raise ValueError(f"No network path within {self.NETWORK_SEARCH_M:.0f}m")
 
+        x, y = self.road_graph.node_xy[match.target]
+        base_confidence, reasoning = self._network_scores(match.distance)
+        return self.projection.to_geographic(Point(x, y)), base_confidence, reasoning
+
+    def _network_scores(self, distance_m: float) -> Tuple[float, str]:
+        """Approach 5 base confidence and reasoning for a distance along the network."""
+        if distance_m == 0:
+            return 0.9, "Road network: Roads meet at a junction. "
+
+        # Confidence: 0.85 next to the junction, falling to 0.6 at the search bound
+        base_confidence = 0.85 - 0.25 * min(1.0, distance_m / self.NETWORK_SEARCH_M)
         reasoning = (
-            f"{reasoning_prefix} Adjustment factor: {adjustment_factor:.2f} "
-            f"(base: {base_confidence:.2%}, adjusted: {confidence:.2%})"
+            f"Road network: Reached street {distance_m:.0f}m along the network "
+            f"from a junction of the reference road. "
         )
-
-        return point, confidence, reasoning
+        return base_confidence, reasoning
 
     def _fallback_city_centroid(
         self,
         city: str,
         county: str,
-        ticket_type: Optional[str] = None,
-        duration: Optional[str] = None,
-        work_type: Optional[str] = None,
     ) -> Tuple[Point, float, str]:
         """Fallback: Use city centroid when both roads are missing.
 
         Best for: Complete road data unavailability.
-        Returns: (point, low confidence, reasoning)
+        Returns: (point, low base confidence, reasoning template)
         """
-        city_key = (city.upper(), county.upper())
-
         # Try exact city/county match
-        if city_key in self.CITY_CENTROIDS:
-            lat, lng = self.CITY_CENTROIDS[city_key]
+        centroid = self.gazetteer.lookup(city, county)
+        if centroid is not None:
+            lat, lng = centroid
             point = Point(lng, lat)
             base_confidence = 0.35
 
-            # Apply minimal adjustment (city fallback inherently uncertain)
-            adjustment_factor = self._calculate_adjustment_factor(
-                ticket_type, duration, work_type
-            )
-            confidence = min(0.50, base_confidence * adjustment_factor)
-
             reasoning = (
-                f"City centroid fallback: Both roads missing from network. "
-                f"Using approximate city center for {city}, {county}. "
-                f"Adjustment factor: {adjustment_factor:.2f} "
-                f"(base: {base_confidence:.2%}, adjusted: {confidence:.2%}). "
-                f"⚠️ Low confidence - recommend manual review."
+                "City centroid fallback: Both roads missing from network. "
+                "Using approximate city center for {city}, {county}. "
             )
 
-            return point, confidence, reasoning
+            return point, base_confidence, reasoning
 
         # If city not in our centroid database, fail
         raise ValueError(f"City centroid not available for {city}, {county}")
@@ -406,37 +726,25 @@ class ProximityGeocoder:
     def _approach_4_city_primary(
         self,
         available_road: gpd.GeoDataFrame,
-        city: str,
-        county: str,
-        ticket_type: Optional[str] = None,
-        duration: Optional[str] = None,
-        work_type: Optional[str] = None,
     ) -> Tuple[Point, float, str]:
         """Approach 4: Point on available road biased toward city center.
 
         Best for: One road missing, use city + available road.
-        Returns: (point, confidence, reasoning)
+        Returns: (point, base confidence, reasoning template)
         """
         # Use centroid of available road as approximation
-        road_geom = available_road.unary_union
-        point = road_geom.centroid
+        point = self.projection.to_geographic(self._dissolve(available_road).centroid)
 
-        base_confidence = 0.65
-
-        # Apply adjustment based on ticket metadata
-        adjustment_factor = self._calculate_adjustment_factor(
-            ticket_type, duration, work_type
-        )
-        confidence = min(0.95, base_confidence * adjustment_factor)
+        return point, *self._city_primary_scores()
 
+    @staticmethod
+    def _city_primary_scores() -> Tuple[float, str]:
+        """Approach 4 base confidence and reasoning template."""
         reasoning = (
-            f"City-based approximation: One road not found in network. "
-            f"Using centroid of available road near {city}, {county}. "
-            f"Adjustment factor: {adjustment_factor:.2f} "
-            f"(base: {base_confidence:.2%}, adjusted: {confidence:.2%})"
+            "City-based approximation: One road not found in network. "
+            "Using centroid of available road near {city}, {county}. "
         )
-
-        return point, confidence, reasoning
+        return 0.65, reasoning
 
     def _calculate_adjustment_factor(
         self,
@@ -506,12 +814,16 @@ class ProximityGeocoder:
     ) -> str:
         """Select best geocoding approach based on characteristics.
 
-        Returns: "approach_2", "approach_3", or "approach_4"
+        Returns: "approach_2", "approach_3", "approach_4" or "approach_5"
         """
         # If either road is missing, use approach 4
         if street_roads is None or intersection_roads is None:
             return "approach_4"
 
+        # Roads connected along the network → Approach 5 (network distance)
+        if self._network_search(street_roads, intersection_roads) is not None:
+            return "approach_5"
+
         # Get road types
         street_type = street_roads.iloc[0]["road_type"] if len(street_roads) > 0 else "OTHER"
         intersection_type = intersection_roads.iloc[0]["road_type"] if len(intersection_roads) > 0 else "OTHER"
@@ -538,176 +850,466 @@ class ProximityGeocoder:
         # Default: Approach 3 (works for most cases)
         return "approach_3"
 
-    def geocode_proximity(
+    def _memo_key(self, street: str, intersection: str, county: str, city: str) -> tuple:
+        """Memo key: normalized road names plus county and city.
+
+        Empty inputs stay distinct from names that normalize to "" because
+        _find_road treats them differently.
+        """
+        return (
+            self._normalize_road_name(street) if street else None,
+            self._normalize_road_name(intersection) if intersection else None,
+            (county or "").upper(),
+            (city or "").upper(),
+        )
+
+    def _resolve_roads(
         self,
         street: str,
         intersection: str,
         county: str,
         city: str,
-        ticket_type: Optional[str] = None,
-        duration: Optional[str] = None,
-        work_type: Optional[str] = None,
-    ) -> ProximityResult:
-        """Geocode using proximity-based approach with intelligent selection.
-
-        Args:
-            street: Primary street name
-            intersection: Reference/intersection street name
-            county: County name
-            city: City name
-            ticket_type: Optional ticket type (Emergency, Normal, Update, Survey/Design)
-            duration: Optional work duration (e.g., "1 DAY", "2 MONTHS")
-            work_type: Optional nature of work (e.g., "Hydro-excavation", "Pipeline Maintenance")
+    ):
+        """Find both roads and select the approach.
 
         Returns:
-            ProximityResult with adjusted confidence scores based on ticket metadata
+            Tuple of (approach, street_roads, intersection_roads), or a finished
+            ProximityGeometry when neither road is in the network
         """
-
         # Find roads
-        street_roads = self._find_road(street)
-        intersection_roads = self._find_road(intersection)
+        self._ensure_county_loaded(county)
+        street_roads = self._find_road_paged(street, county)
+        intersection_roads = self._find_road_paged(intersection, county)
 
         # Check if we found both roads
         if street_roads is None and intersection_roads is None:
             # Try city-centroid fallback as last resort
             try:
-                point, confidence, reasoning = self._fallback_city_centroid(
-                    city, county,
-                    ticket_type, duration, work_type
-                )
+                point, base_confidence, reasoning = self._fallback_city_centroid(city, county)
 
-                return ProximityResult(
+                return ProximityGeometry(
                     success=True,
                     lat=point.y,
                     lng=point.x,
-                    confidence=confidence,
-                    method="proximity",
+                    base_confidence=base_confidence,
+                    # City fallback inherently uncertain
+                    max_confidence=0.50,
                     approach="city_centroid_fallback",
                     reasoning=reasoning,
-                    metadata={
-                        "street": street,
-                        "intersection": intersection,
-                        "county": county,
-                        "city": city,
-                        "ticket_type": ticket_type,
-                        "duration": duration,
-                        "work_type": work_type,
-                        "fallback_reason": "Both roads missing from network",
-                    }
+                    warning=". ⚠️ Low confidence - recommend manual review.",
+                    metadata={"fallback_reason": "Both roads missing from network"},
                 )
-            except ValueError as e:
+            except ValueError:
                 # City centroid not available
-                return ProximityResult(
+                return ProximityGeometry(
                     success=False,
-                    error=f"Neither road found in network: {street}, {intersection}. {str(e)}",
+                    error=(
+                        "Neither road found in network: {street}, {intersection}. "
+                        "City centroid not available for {city}, {county}"
+                    ),
                 )
 
         # Select approach
         approach = self._select_approach(
             street, intersection, street_roads, intersection_roads, county, city
         )
+        return approach, street_roads, intersection_roads
+
+    @staticmethod
+    def _major_minor(
+        street_roads: gpd.GeoDataFrame,
+        intersection_roads: gpd.GeoDataFrame,
+    ) -> Tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+        """(major, minor) roads for approach 3."""
+        street_type = street_roads.iloc[0]["road_type"]
+
+        if RoadCharacteristics.is_major_road(street_type):
+            return street_roads, intersection_roads
+        return intersection_roads, street_roads
+
+    @staticmethod
+    def _approach_geometry(
+        approach: str,
+        street_roads: Optional[gpd.GeoDataFrame],
+        intersection_roads: Optional[gpd.GeoDataFrame],
+        lat: float,
+        lng: float,
+        base_confidence: float,
+        reasoning: str,
+    ) -> ProximityGeometry:
+        """ProximityGeometry for the point an approach produced."""
+        if approach == "approach_4":
+            available_side = "street" if street_roads is not None else "intersection"
+            return ProximityGeometry(
+                success=True,
+                lat=lat,
+                lng=lng,
+                base_confidence=base_confidence,
+                approach="city_primary",
+                reasoning=reasoning,
+                metadata={"available_road": available_side},
+            )
+
+        if approach in ("approach_2", "approach_5"):
+            return ProximityGeometry(
+                success=True,
+                lat=lat,
+                lng=lng,
+                base_confidence=base_confidence,
+                approach="closest_point" if approach == "approach_2" else "network_distance",
+                reasoning=reasoning,
+                metadata={
+                    "street_segments": len(street_roads),
+                    "intersection_segments": len(intersection_roads),
+                },
+            )
+
+        return ProximityGeometry(
+            success=True,
+            lat=lat,
+            lng=lng,
+            base_confidence=base_confidence,
+            approach="corridor_midpoint",
+            reasoning=reasoning,
+        )
 
+    @staticmethod
+    def _error_geometry(error: Exception) -> ProximityGeometry:
+        return ProximityGeometry(
+            success=False,
+            error=f"Error calculating proximity: {str(error)}",
+            cacheable=False,
+        )
+
+    def _compute_geometry(
+        self,
+        approach: str,
+        street_roads: Optional[gpd.GeoDataFrame],
+        intersection_roads: Optional[gpd.GeoDataFrame],
+    ) -> ProximityGeometry:
+        """Run the selected approach for one ticket."""
         try:
             if approach == "approach_4":
                 # One road missing - use city + available road
                 available_road = street_roads if street_roads is not None else intersection_roads
-                available_name = street if street_roads is not None else intersection
-
-                point, confidence, reasoning = self._approach_4_city_primary(
-                    available_road, city, county,
-                    ticket_type, duration, work_type
-                )
-
-                return ProximityResult(
-                    success=True,
-                    lat=point.y,
-                    lng=point.x,
-                    confidence=confidence,
-                    method="proximity",
-                    approach="city_primary",
-                    reasoning=reasoning,
-                    metadata={
-                        "street": street,
-                        "intersection": intersection,
-                        "available_road": available_name,
-                        "county": county,
-                        "city": city,
-                        "ticket_type": ticket_type,
-                        "duration": duration,
-                        "work_type": work_type,
-                    }
-                )
+                point, base_confidence, reasoning = self._approach_4_city_primary(available_road)
 
             elif approach == "approach_2":
                 # Closest point between parallel roads
-                point, confidence, reasoning = self._approach_2_closest_point(
-                    street_roads, intersection_roads,
-                    ticket_type, duration, work_type
+                point, base_confidence, reasoning = self._approach_2_closest_point(
+                    street_roads, intersection_roads
                 )
 
-                return ProximityResult(
-                    success=True,
-                    lat=point.y,
-                    lng=point.x,
-                    confidence=confidence,
-                    method="proximity",
-                    approach="closest_point",
-                    reasoning=reasoning,
-                    metadata={
-                        "street": street,
-                        "intersection": intersection,
-                        "street_segments": len(street_roads),
-                        "intersection_segments": len(intersection_roads),
-                        "county": county,
-                        "city": city,
-                        "ticket_type": ticket_type,
-                        "duration": duration,
-                        "work_type": work_type,
-                    }
+            elif approach == "approach_5":
+                # Street point reached along the network from the reference road
+                point, base_confidence, reasoning = self._approach_5_network_distance(
+                    street_roads, intersection_roads
                 )
 
             else:  # approach_3
-                # Corridor midpoint
-                # Determine which is major road
-                street_type = street_roads.iloc[0]["road_type"]
-                intersection_type = intersection_roads.iloc[0]["road_type"]
-
-                if RoadCharacteristics.is_major_road(street_type):
-                    major_roads = street_roads
-                    minor_roads = intersection_roads
-                else:
-                    major_roads = intersection_roads
-                    minor_roads = street_roads
-
-                point, confidence, reasoning = self._approach_3_corridor_midpoint(
-                    major_roads, minor_roads,
-                    ticket_type, duration, work_type
+                # Corridor midpoint along the major road
+                major_roads, minor_roads = self._major_minor(street_roads, intersection_roads)
+                point, base_confidence, reasoning = self._approach_3_corridor_midpoint(
+                    major_roads, minor_roads
                 )
 
-                return ProximityResult(
-                    success=True,
-                    lat=point.y,
-                    lng=point.x,
-                    confidence=confidence,
-                    method="proximity",
-                    approach="corridor_midpoint",
-                    reasoning=reasoning,
-                    metadata={
-                        "street": street,
-                        "intersection": intersection,
-                        "county": county,
-                        "city": city,
-                        "ticket_type": ticket_type,
-                        "duration": duration,
-                        "work_type": work_type,
-                    }
-                )
+            return self._approach_geometry(
+                approach, street_roads, intersection_roads,
+                point.y, point.x, base_confidence, reasoning,
+            )
 
         except Exception as e:
-            return ProximityResult(
-                success=False,
-                error=f"Error calculating proximity: {str(e)}",
+            return self._error_geometry(e)
+
+    def _geocode_geometry(
+        self,
+        street: str,
+        intersection: str,
+        county: str,
+        city: str,
+    ) -> ProximityGeometry:
+        """Geometric part of geocode_proximity (independent of ticket metadata)."""
+        resolved = self._resolve_roads(street, intersection, county, city)
+        if isinstance(resolved, ProximityGeometry):
+            return resolved
+        return self._compute_geometry(*resolved)
+
+    def _apply_adjustment(
+        self,
+        geometry: ProximityGeometry,
+        street: str,
+        intersection: str,
+        county: str,
+        city: str,
+        ticket_type: Optional[str] = None,
+        duration: Optional[str] = None,
+        work_type: Optional[str] = None,
+    ) -> ProximityResult:
+        """Turn memoized geometry into a ticket result by applying the metadata adjustment."""
+        names = {"street": street, "intersection": intersection, "county": county, "city": city}
+
+        if not geometry.success:
+            error = geometry.error if not geometry.cacheable else geometry.error.format(**names)
+            return ProximityResult(success=False, error=error)
+
+        adjustment_factor = self._calculate_adjustment_factor(
+            ticket_type, duration, work_type
+        )
+        confidence = min(geometry.max_confidence, geometry.base_confidence * adjustment_factor)
+
+        reasoning = (
+            f"{geometry.reasoning.format(county=county, city=city)}"
+            f"Adjustment factor: {adjustment_factor:.2f} "
+            f"(base: {geometry.base_confidence:.2%}, adjusted: {confidence:.2%})"
+            f"{geometry.warning}"
+        )
+
+        metadata: dict = {"street": street, "intersection": intersection}
+        for name, value in geometry.metadata.items():
+            if name == "available_road":
+                value = names[value]
+            metadata[name] = value
+        metadata.update({
+            "county": county,
+            "city": city,
+            "ticket_type": ticket_type,
+            "duration": duration,
+            "work_type": work_type,
+        })
+
+        return ProximityResult(
+            success=True,
+            lat=geometry.lat,
+            lng=geometry.lng,
+            confidence=confidence,
+            method="proximity",
+            approach=geometry.approach,
+            reasoning=reasoning,
+            metadata=metadata,
+        )
+
+    def geocode_proximity(
+        self,
+        street: str,
+        intersection: str,
+        county: str,
+        city: str,
+        ticket_type: Optional[str] = None,
+        duration: Optional[str] = None,
+        work_type: Optional[str] = None,
+    ) -> ProximityResult:
+        """Geocode using proximity-based approach with intelligent selection.
+
+        The geometric part is memoized on the normalized (street,
+        intersection, county, city) key; ticket metadata only scales the
+        confidence afterwards.
+
+        Args:
+            street: Primary street name
+            intersection: Reference/intersection street name
+            county: County name
+            city: City name
+            ticket_type: Optional ticket type (Emergency, Normal, Update, Survey/Design)
+            duration: Optional work duration (e.g., "1 DAY", "2 MONTHS")
+            work_type: Optional nature of work (e.g., "Hydro-excavation", "Pipeline Maintenance")
+
+        Returns:
+            ProximityResult with adjusted confidence scores based on ticket metadata
+        """
+        key = self._memo_key(street, intersection, county, city)
+        geometry = self.memo.get(key)
+        if geometry is None:
+            geometry = self._geocode_geometry(street, intersection, county, city)
+            self.memo.put(key, geometry)
+
+        return self._apply_adjustment(
+            geometry, street, intersection, county, city,
+            ticket_type, duration, work_type,
+        )
+
+    # Columns read by geocode_batch (the first four are required)
+    BATCH_COLUMNS = ("street", "intersection", "county", "city", "ticket_type", "duration", "work_type")
+
+    def geocode_batch(self, df: pd.DataFrame) -> list[ProximityResult]:
+        """Geocode a DataFrame of tickets, computing each approach on geometry arrays.
+
+        Candidate roads are resolved once per distinct (street, intersection,
+        county, city) key through the name index. Keys are then grouped by
+        approach and their geometry is computed together with shapely's
+        vectorized shortest_line, distance, intersects and centroid, and the
+        final points are transformed back to WGS84 in one call. Results are
+        identical to calling geocode_proximity() on each row in turn (with
+        region paging the tiles may be paged in a different order).
+
+        Args:
+            df: Tickets with street, intersection, county and city columns and
+                optional ticket_type, duration and work_type columns (missing
+                values become "" for the required columns and None otherwise)
+
+        Returns:
+            ProximityResult for each row, in row order
+        """
+        rows = []
+        for record in df.to_dict("records"):
+            values = []
+            for n, column in enumerate(self.BATCH_COLUMNS):
+                value = record.get(column)
+                if value is None or (isinstance(value, float) and pd.isna(value)):
+                    value = "" if n < 4 else None
+                values.append(value)
+            rows.append(tuple(values))
+
+        keys = [self._memo_key(*row[:4]) for row in rows]
+
+        # Memoized keys need no geometry
+        geometries: dict = {}
+        pending: dict = {}
+        for key, row in zip(keys, rows):
+            if key in geometries or key in pending:
+                continue
+            geometry = self.memo.get(key)
+            if geometry is not None:
+                geometries[key] = geometry
+            else:
+                pending[key] = row[:4]
+
+        # Resolve candidate roads and group keys by approach
+        groups: dict[str, list] = {
+            "approach_2": [], "approach_3": [], "approach_4": [], "approach_5": [],
+        }
+        for key, (street, intersection, county, city) in pending.items():
+            resolved = self._resolve_roads(street, intersection, county, city)
+            if isinstance(resolved, ProximityGeometry):
+                geometries[key] = resolved
+            else:
+                approach, street_roads, intersection_roads = resolved
+                groups[approach].append((key, street_roads, intersection_roads))
+
+        for approach, items in groups.items():
+            if items:
+                geometries.update(self._batch_geometry(approach, items))
+
+        for key in pending:
+            self.memo.put(key, geometries[key])
+
+        return [self._apply_adjustment(geometries[key], *row) for key, row in zip(keys, rows)]
+
+    def _batch_geometry(self, approach: str, items: list) -> dict:
+        """Geometry for all (key, street_roads, intersection_roads) items of one approach."""
+        batched = {
+            "approach_2": self._batch_closest_point,
+            "approach_3": self._batch_corridor_midpoint,
+            "approach_4": self._batch_city_primary,
+        }.get(approach)
+        if batched is not None:
+            try:
+                return batched(items)
+            except Exception:
+                # The per-ticket path reports errors per ticket
+                logging.warning(
+                    f"Batched {approach} failed for {len(items)} ticket(s); geocoding them one by one",
+                    exc_info=True,
+                )
+
+        # Approach 5 runs per ticket on the graph's cached shortest-path trees
+        return {key: self._compute_geometry(approach, s, i) for key, s, i in items}
+
+    def _batch_points(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(lat, lng) arrays of projected points."""
+        lng, lat = self.projection.to_geographic_xy(shapely.get_x(points), shapely.get_y(points))
+        return lat, lng
+
+    def _batch_closest_point(self, items: list) -> dict:
+        """Approach 2 for many tickets (see _approach_2_closest_point)."""
+        primary = np.array([self._dissolve(s).geometry for _, s, _ in items], dtype=object)
+        reference = np.array([self._dissolve(i).geometry for _, _, i in items], dtype=object)
+
+        lines = shapely.shortest_line(primary, reference)
+        points = shapely.get_point(lines, 0)
+        distances = shapely.distance(points, reference)
+        lat, lng = self._batch_points(points)
+
+        results = {}
+        for n, (key, street_roads, intersection_roads) in enumerate(items):
+            if lines[n] is None:
+                # Empty geometry: the per-ticket path reports the error
+                results[key] = self._compute_geometry("approach_2", street_roads, intersection_roads)
+                continue
+            base_confidence, reasoning = self._closest_point_scores(float(distances[n]))
+            results[key] = self._approach_geometry(
+                "approach_2", street_roads, intersection_roads,
+                float(lat[n]), float(lng[n]), base_confidence, reasoning,
+            )
+        return results
+
+    def _batch_corridor_midpoint(self, items: list) -> dict:
+        """Approach 3 for many tickets (see _approach_3_corridor_midpoint)."""
+        results = {}
+        corridors = []
+        for key, street_roads, intersection_roads in items:
+            try:
+                major_roads, minor_roads = self._major_minor(street_roads, intersection_roads)
+            except Exception as e:
+                results[key] = self._error_geometry(e)
+                continue
+            corridors.append((key, street_roads, intersection_roads, major_roads, minor_roads))
+        if not corridors:
+            return results
+
+        # Major segments within the buffer distance of each minor road, as one tree query
+        minor_segments = [minor_roads[PROJECTED_COLUMN].values for *_, minor_roads in corridors]
+        owners = np.repeat(np.arange(len(corridors)), [len(m) for m in minor_segments])
+        query, nearby_positions = self.segment_tree.query(
+            np.concatenate(minor_segments), predicate="dwithin", distance=self.CORRIDOR_BUFFER_M
+        )
+        order = np.argsort(owners[query], kind="stable")
+        offsets = np.searchsorted(owners[query][order], np.arange(len(corridors) + 1))
+        nearby_positions = nearby_positions[order]
+
+        geoms = np.empty(len(corridors), dtype=object)
+        points = np.empty(len(corridors), dtype=object)
+        nearby_counts = []
+        for n, (*_, major_roads, minor_roads) in enumerate(corridors):
+            mask = self._corridor_mask(major_roads, nearby_positions[offsets[n]:offsets[n + 1]])
+            nearby_segments = major_roads[mask]
+            nearby_counts.append(len(nearby_segments))
+            if len(nearby_segments) > 0:
+                geoms[n] = self._dissolve(nearby_segments).geometry
+            else:
+                # Closest point on the whole major road (rare, done per ticket)
+                points[n] = self._nearest_point_on(major_roads, minor_roads)
+
+        # Centroid of nearby segments
+        nearby = np.array([count > 0 for count in nearby_counts], dtype=bool)
+        points[nearby] = shapely.centroid(geoms[nearby])
+        lat, lng = self._batch_points(points)
+
+        for n, (key, street_roads, intersection_roads, _, _) in enumerate(corridors):
+            if points[n] is None:
+                results[key] = self._compute_geometry("approach_3", street_roads, intersection_roads)
+                continue
+            base_confidence, reasoning = self._corridor_scores(nearby_counts[n])
+            results[key] = self._approach_geometry(
+                "approach_3", street_roads, intersection_roads,
+                float(lat[n]), float(lng[n]), base_confidence, reasoning,
             )
+        return results
+
+    def _batch_city_primary(self, items: list) -> dict:
+        """Approach 4 for many tickets (see _approach_4_city_primary)."""
+        geoms = np.array(
+            [self._dissolve(s if s is not None else i).geometry for _, s, i in items], dtype=object
+        )
+        lat, lng = self._batch_points(shapely.centroid(geoms))
+        base_confidence, reasoning = self._city_primary_scores()
+
+        return {
+            key: self._approach_geometry(
+                "approach_4", street_roads, intersection_roads,
+                float(lat[n]), float(lng[n]), base_confidence, reasoning,
+            )
+            for n, (key, street_roads, intersection_roads) in enumerate(items)
+        }
 
 
 def main():
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+proximity_memo.py
+
+Memo of proximity geocoding geometry keyed by the normalized
+(street, intersection, county, city) tuple.
+
+Everything expensive in ``ProximityGeocoder.geocode_proximity`` (road lookup,
+approach selection, nearest points, buffers, centroids) depends only on the
+normalized road names plus county and city; ticket type, duration and work
+type only scale the confidence at the end. ProximityMemo stores the
+metadata-independent part so repeated pairs cost a lookup plus the
+adjustment multiply.
+
+Entries live in an in-memory LRU and, optionally, in a SQLite file so they
+survive restarts. Disk entries are tagged with a fingerprint of the road
+network and ignored once the network changes.
+
+Usage:
+    from proximity_memo import ProximityMemo
+
+    memo = ProximityMemo(maxsize=10000, path="proximity_memo.db", fingerprint="...")
+    geometry = memo.get(key)
+    memo.put(key, geometry)
+    memo.stats()
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional, Union
+
+MemoKey = tuple
+
+
+@dataclass
+class ProximityGeometry:
+    """Metadata-independent result of proximity geocoding.
+
+    ``reasoning`` and ``error`` are templates formatted with the caller's
+    street, intersection, county and city, so the memo can be shared by
+    tickets whose raw spelling differs but normalizes identically.
+    """
+    success: bool
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    base_confidence: float = 0.0
+    max_confidence: float = 0.95
+    approach: Optional[str] = None
+    reasoning: str = ""  # Text before "Adjustment factor: ..."
+    warning: str = ""    # Text after the adjustment summary
+    error: Optional[str] = None
+    metadata: dict = field(default_factory=dict)
+    cacheable: bool = True
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "ProximityGeometry":
+        return cls(**json.loads(data))
+
+
+class ProximityMemo:
+    """In-memory LRU (plus optional SQLite) memo of ProximityGeometry."""
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        path: Optional[Union[str, Path]] = None,
+        fingerprint: str = "",
+    ):
+        """Initialize memo.
+
+        Args:
+            maxsize: Entries kept in memory (0 disables the in-memory memo)
+            path: Optional SQLite file for a persistent memo
+            fingerprint: Road network fingerprint; disk entries with another
+                fingerprint are ignored
+        """
+        self.maxsize = maxsize
+        self.path = Path(path) if path else None
+        self.fingerprint = fingerprint
+
+        self._entries: OrderedDict[MemoKey, ProximityGeometry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS proximity_memo ("
+                " memo_key TEXT PRIMARY KEY,"
+                " fingerprint TEXT NOT NULL,"
+                " geometry TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _disk_key(key: MemoKey) -> str:
+        return json.dumps(list(key))
+
+    def get(self, key: MemoKey) -> Optional[ProximityGeometry]:
+        """Memoized geometry for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT geometry FROM proximity_memo WHERE memo_key = ? AND fingerprint = ?",
+                    (self._disk_key(key), self.fingerprint),
+                ).fetchone()
+                if row is not None:
+                    entry = ProximityGeometry.from_json(row[0])
+                    self._remember(key, entry)
+                    self.disk_hits += 1
+                    return entry
+
+            self.misses += 1
+            return None
+
+    def put(self, key: MemoKey, geometry: ProximityGeometry) -> None:
+        """Memoize geometry for key (in memory and on disk)."""
+        if not geometry.cacheable:
+            return
+        with self._lock:
+            self._remember(key, geometry)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO proximity_memo (memo_key, fingerprint, geometry) "
+                    "VALUES (?, ?, ?)",
+                    (self._disk_key(key), self.fingerprint, geometry.to_json()),
+                )
+                self._conn.commit()
+
+    def _remember(self, key: MemoKey, geometry: ProximityGeometry) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = geometry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        """Change the in-memory bound, evicting least recently used entries if needed."""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > max(0, maxsize):
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop in-memory entries (the disk memo is fingerprinted instead)."""
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def stats(self) -> dict:
+        """Memo hit statistics."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "path": str(self.path) if self.path else None,
+        }
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memo = ProximityMemo(maxsize=2, path=Path(tmp) / "memo.db", fingerprint="v1")
+        key = ("CR 426", "CR 432", "WARD", "PYOTE")
+        memo.put(key, ProximityGeometry(success=True, lat=31.5, lng=-103.1, base_confidence=0.8))
+        memo.close()
+
+        reopened = ProximityMemo(path=Path(tmp) / "memo.db", fingerprint="v1")
+        print(reopened.get(key))
+        print(reopened.stats())
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+road_fuzzy.py
+
+Typo-tolerant road-name matching over the road name index.
+
+Ticket road names that match nothing in the network after normalization and
+the HWY/SH/FM variations ("MONAHNS HWY", "FN 1216") are looked up by edit
+distance instead. FuzzyRoadMatcher keeps BK-trees over the normalized
+names/refs of the segments in each county (from RoadNameIndex and
+CountyRoadIndex), one per county and road number ("FM 1216" is only compared
+with names numbered 1216). A lookup visits only the part of one small tree
+within the edit bound rather than every name in the network, and trees are
+built on first use.
+
+Matches are bounded and conservative:
+
+- the allowed edit distance grows with name length (none below 4 characters)
+- numbers must be identical: "CR 462" for "CR 426" is another road, not a typo
+- a tie between different names at the best distance is ambiguous and not matched
+
+Usage:
+    from road_fuzzy import FuzzyRoadMatcher
+
+    matcher = FuzzyRoadMatcher(road_index, county_index, normalize=normalize_road_name)
+    match = matcher.match("MONAHNS HWY", "Ward")  # FuzzyMatch(name="MONAHANS HWY", distance=1, ...)
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+
+from county_index import SCOPE_UNSCOPED, CountyRoadIndex, normalize_county
+from road_index import RoadNameIndex
+
+# Largest edit distance ever allowed, and name length per allowed edit
+MAX_DISTANCE = 2
+CHARS_PER_EDIT = 4
+
+_NUMBERS = re.compile(r"\d+")
+
+
+def _pattern(word: str) -> dict[str, int]:
+    """Bit mask of each character's positions in word (Myers' Peq table)."""
+    masks: dict[str, int] = {}
+    for i, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def _distance(pattern: dict[str, int], length: int, text: str) -> int:
+    """Edit distance between the word behind pattern (of length) and text.
+
+    Myers' bit-parallel algorithm: one pass over text with the DP column
+    held in the bits of an int, instead of a row of cells per character.
+    """
+    if length == 0:
+        return len(text)
+    mask = (1 << length) - 1
+    last = 1 << (length - 1)
+    pv, mv, score = mask, 0, length
+    for char in text:
+        eq = pattern.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+class BKTree:
+    """Burkhard-Keller tree of strings under edit distance."""
+
+    def __init__(self, words=()):
+        self._root: Optional[tuple[str, dict]] = None
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, word: str) -> None:
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return
+        pattern = _pattern(word)
+        node_word, children = self._root
+        while True:
+            distance = _distance(pattern, len(word), node_word)
+            if distance == 0:
+                return
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (word, {})
+                self._size += 1
+                return
+            node_word, children = child
+
+    def search(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+        """(distance, word) for every word within max_distance, closest first."""
+        if self._root is None:
+            return []
+        pattern = _pattern(word)
+        found = []
+        stack = [self._root]
+        while stack:
+            node_word, children = stack.pop()
+            # Exact distance is needed to pick children by the triangle inequality
+            distance = _distance(pattern, len(word), node_word)
+            if distance <= max_distance:
+                found.append((distance, node_word))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return sorted(found)
+
+
+@dataclass
+class FuzzyMatch:
+    """A road name resolved by edit distance."""
+    query: str
+    name: str          # Index key (normalized name/ref present in the network)
+    distance: int
+    scope: str         # County the tree covered, or "unscoped"
+    alternatives: list[str] = field(default_factory=list)  # Same-canonical index keys
+
+
+class FuzzyRoadMatcher:
+    """Per-county BK-trees over normalized road names/refs."""
+
+    def __init__(
+        self,
+        road_index: RoadNameIndex,
+        county_index: Optional[CountyRoadIndex] = None,
+        normalize: Optional[Callable[[str], str]] = None,
+        max_distance: int = MAX_DISTANCE,
+    ):
+        """Prepare the matcher (trees are built per county on first lookup).
+
+        Args:
+            road_index: Name index whose keys are the matchable names
+            county_index: Optional county membership of the same road positions;
+                without it (or for unindexed counties) all names are searched
+            normalize: Canonical form used for comparison, applied to both the
+                query and the index keys (e.g. the geocoder's road-name
+                normalization, which strips RD/HWY suffixes); default identity
+            max_distance: Largest edit distance allowed
+        """
+        self.road_index = road_index
+        self.county_index = county_index if county_index is not None and county_index.enabled else None
+        self.normalize = normalize or (lambda name: name)
+        self.max_distance = max_distance
+
+        self._keys = road_index.names()
+        # canonical form -> index keys with that form
+        self._canonical: dict[str, list[str]] = {}
+        self._key_canonical: list[str] = []
+        for key in self._keys:
+            canonical = self.normalize(key)
+            self._key_canonical.append(canonical)
+            self._canonical.setdefault(canonical, []).append(key)
+
+        self._trees: dict[tuple[str, tuple[str, ...]], BKTree] = {}
+        self._scope_names: dict[str, dict[tuple[str, ...], list[str]]] = {}
+        self._county_scopes: dict[str, str] = {}
+        self._memo: dict[tuple, Optional[FuzzyMatch]] = {}
+        self._flat_keys: Optional[np.ndarray] = None
+        self._flat_positions: Optional[np.ndarray] = None
+
+    def _county_key_ids(self, county: str) -> tuple[Optional[np.ndarray], str]:
+        """Ids of the index keys with segments in county (None = all keys)."""
+        if self.county_index is None or not county:
+            return None, SCOPE_UNSCOPED
+
+        if self._flat_keys is None or self._flat_positions is None:
+            key_ids, positions = [], []
+            for key_id, key in enumerate(self._keys):
+                found = self.road_index.positions(key)
+                key_ids.append(np.full(len(found), key_id, dtype=np.int64))
+                positions.append(found)
+            self._flat_keys = np.concatenate(key_ids) if key_ids else np.empty(0, dtype=np.int64)
+            self._flat_positions = np.concatenate(positions) if positions else np.empty(0, dtype=np.int64)
+
+        in_county, scope = self.county_index.restrict(np.unique(self._flat_positions), county)
+        if scope == SCOPE_UNSCOPED:
+            return None, SCOPE_UNSCOPED
+        return np.unique(self._flat_keys[np.isin(self._flat_positions, in_county)]), normalize_county(county)
+
+    def _tree(self, county: str, numbers: tuple[str, ...]) -> tuple[BKTree, str]:
+        """BK-tree of a county's canonical names carrying these road numbers (built once)."""
+        scope = self._county_scopes.get(normalize_county(county))
+        if scope is None or scope not in self._scope_names:
+            key_ids, scope = self._county_key_ids(county)
+            self._county_scopes[normalize_county(county)] = scope
+            if scope not in self._scope_names:
+                if key_ids is None:
+                    canonical = set(self._key_canonical)
+                else:
+                    canonical = {self._key_canonical[i] for i in key_ids.tolist()}
+                names: dict[tuple[str, ...], list[str]] = {}
+                for name in sorted(name for name in canonical if name):
+                    names.setdefault(tuple(_NUMBERS.findall(name)), []).append(name)
+                self._scope_names[scope] = names
+                logging.debug(f"Indexed {len(canonical)} road names for fuzzy matching in {scope}")
+        by_numbers = self._scope_names[scope]
+
+        tree = self._trees.get((scope, numbers))
+        if tree is None:
+            tree = BKTree(by_numbers.get(numbers, []))
+            self._trees[(scope, numbers)] = tree
+        return tree, scope
+
+    def allowed_distance(self, canonical: str, max_distance: Optional[int] = None) -> int:
+        """Edit distance allowed for a name of this length."""
+        limit = self.max_distance if max_distance is None else max_distance
+        return min(limit, len(canonical.replace(" ", "")) // CHARS_PER_EDIT)
+
+    def match(
+        self,
+        name: str,
+        county: Optional[str] = None,
+        max_distance: Optional[int] = None,
+    ) -> Optional[FuzzyMatch]:
+        """Closest network road name to name within the edit bound, or None.
+
+        Args:
+            name: Ticket road name
+            county: Ticket county (limits candidates to its roads)
+            max_distance: Override of the matcher's max_distance
+
+        Returns:
+            FuzzyMatch, or None when nothing is close enough or the closest
+            names are tied
+        """
+        canonical = self.normalize(name) if name else ""
+        allowed = self.allowed_distance(canonical, max_distance)
+        if allowed == 0:
+            return None
+
+        memo_key = (normalize_county(county or ""), canonical, allowed)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+
+        tree, scope = self._tree(county or "", tuple(_NUMBERS.findall(canonical)))
+        candidates = tree.search(canonical, allowed)
+
+        match = None
+        if candidates:
+            best_distance, best = candidates[0]
+            tied = [candidate for distance, candidate in candidates if distance == best_distance]
+            if best_distance == 0:
+                # Same canonical form; nothing to correct
+                match = None
+            elif len(tied) > 1:
+                logging.debug(f"Ambiguous fuzzy road match for {name!r}: {tied}")
+            else:
+                keys = sorted(self._canonical[best], key=lambda key: (key != best, key))
+                match = FuzzyMatch(
+                    query=name,
+                    name=keys[0],
+                    distance=best_distance,
+                    scope=scope,
+                    alternatives=keys[1:],
+                )
+
+        self._memo[memo_key] = match
+        return match
+
+    def stats(self) -> dict:
+        """Matcher summary."""
+        return {
+            "names": len(self._canonical),
+            "scopes": {
+                scope: sum(len(names) for names in by_numbers.values())
+                for scope, by_numbers in self._scope_names.items()
+            },
+            "trees": len(self._trees),
+            "memoized": len(self._memo),
+        }
+
+
+if __name__ == "__main__":
+    import geopandas as gpd
+    from shapely.geometry import LineString
+
+    roads = gpd.GeoDataFrame({
+        "name": ["Monahans Highway", "County Road 426", "County Road 432", None],
+        "ref": [None, "CR 426", "CR 432", "FM 1216"],
+        "geometry": [LineString([(0, 0), (1, 1)])] * 4,
+    }, crs="EPSG:4326")
+
+    matcher = FuzzyRoadMatcher(RoadNameIndex(roads))
+    for query in ["MONAHNS HIGHWAY", "FN 1216", "CR 462", "COUNTY RAOD 426", "CR 4"]:
+        print(f"{query}: {matcher.match(query)}")
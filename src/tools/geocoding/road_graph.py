@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+road_graph.py
+
+Road topology graph for along-network proximity search.
+
+The proximity approaches treat the two roads of a ticket as unconnected
+geometries. "Work on A near B" usually means a point on A a short drive
+from where B meets the network, so RoadGraph turns the road segments into a
+graph: segment endpoints are snapped to a small grid and become nodes, and
+every segment is an edge weighted by its length. Adjacency is kept in
+compressed sparse row (CSR) arrays:
+
+- ``indptr[n]:indptr[n + 1]`` slices the edges leaving node ``n``
+- ``neighbors`` / ``weights`` / ``edge_segments`` hold the far node, the
+  segment length and the segment position of each edge
+
+Searches are bounded Dijkstra runs up to ``max_distance`` (meters on the
+projected geometry). The shortest-path tree of each source node is kept in
+an LRU cache, so tickets sharing a reference road reuse the same trees.
+
+Usage:
+    from road_graph import RoadGraph
+
+    graph = RoadGraph.from_segments(roads["geometry_m"].values, max_distance=5000)
+    sources = graph.junctions(reference_positions)     # nodes where B meets other roads
+    match = graph.nearest(sources, graph.segment_nodes_of(street_positions))
+    match.distance, graph.node_xy[match.target]
+"""
+
+import heapq
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+import shapely
+
+# Endpoint snapping grid (meters): coordinates closer than this are one node
+SNAP_M = 0.5
+
+
+@dataclass
+class ShortestPathTree:
+    """Bounded Dijkstra result from one source node."""
+    source: int
+    distances: dict  # node -> network distance
+    predecessors: dict  # node -> previous node on the shortest path
+
+
+@dataclass
+class NetworkMatch:
+    """Closest (source, target) node pair along the network."""
+    source: int
+    target: int
+    distance: float
+
+
+class RoadGraph:
+    """Junction nodes and segment edges of a road network in CSR form."""
+
+    def __init__(
+        self,
+        node_xy: np.ndarray,
+        segment_nodes: np.ndarray,
+        segment_lengths: np.ndarray,
+        max_distance: float = 5000.0,
+        tree_cache_size: int = 4096,
+    ):
+        """Initialize graph (see from_segments).
+
+        Args:
+            node_xy: (nodes, 2) node coordinates
+            segment_nodes: (segments, 2) start/end node per segment (-1 for empty geometry)
+            segment_lengths: Length of each segment
+            max_distance: Dijkstra search bound
+            tree_cache_size: Shortest-path trees kept (LRU)
+        """
+        self.node_xy = node_xy
+        self.segment_nodes = segment_nodes
+        self._init_search(max_distance, tree_cache_size)
+
+        # Both directions of every segment, grouped by start node
+        valid = np.flatnonzero(segment_nodes[:, 0] >= 0)
+        starts = np.concatenate([segment_nodes[valid, 0], segment_nodes[valid, 1]])
+        ends = np.concatenate([segment_nodes[valid, 1], segment_nodes[valid, 0]])
+        order = np.argsort(starts, kind="stable")
+
+        self.neighbors = ends[order]
+        self.weights = np.concatenate([segment_lengths[valid], segment_lengths[valid]])[order]
+        self.edge_segments = np.concatenate([valid, valid])[order]
+        self.indptr = np.zeros(len(node_xy) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(starts, minlength=len(node_xy)), out=self.indptr[1:])
+
+    def _init_search(self, max_distance: float, tree_cache_size: int) -> None:
+        self.max_distance = max_distance
+        self.tree_cache_size = tree_cache_size
+        self._trees: OrderedDict[int, ShortestPathTree] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_csr(
+        cls,
+        node_xy: np.ndarray,
+        segment_nodes: np.ndarray,
+        indptr: np.ndarray,
+        neighbors: np.ndarray,
+        weights: np.ndarray,
+        edge_segments: np.ndarray,
+        max_distance: float = 5000.0,
+        tree_cache_size: int = 4096,
+    ) -> "RoadGraph":
+        """Graph over prebuilt arrays (e.g. memory-mapped by road_shared.py), used without copying.
+
+        Args:
+            node_xy, segment_nodes: As for RoadGraph
+            indptr, neighbors, weights, edge_segments: CSR adjacency of an existing graph
+            max_distance: Dijkstra search bound
+            tree_cache_size: Shortest-path trees kept (LRU)
+        """
+        graph = cls.__new__(cls)
+        graph.node_xy = node_xy
+        graph.segment_nodes = segment_nodes
+        graph.indptr = indptr
+        graph.neighbors = neighbors
+        graph.weights = weights
+        graph.edge_segments = edge_segments
+        graph._init_search(max_distance, tree_cache_size)
+        return graph
+
+    @classmethod
+    def from_segments(
+        cls,
+        geometries: np.ndarray,
+        snap: float = SNAP_M,
+        **kwargs,
+    ) -> "RoadGraph":
+        """Build the graph from (projected) segment geometries.
+
+        Args:
+            geometries: Line geometries; positions become segment ids
+            snap: Endpoint snapping grid in CRS units
+            **kwargs: Passed to RoadGraph (max_distance, tree_cache_size)
+        """
+        geometries = np.asarray(geometries, dtype=object)
+        coords, owners = shapely.get_coordinates(geometries, return_index=True)
+        segments = np.arange(len(geometries))
+        first = np.searchsorted(owners, segments, side="left")
+        last = np.searchsorted(owners, segments, side="right") - 1
+        has_coords = last >= first
+
+        starts = np.full((len(geometries), 2), np.nan)
+        ends = np.full((len(geometries), 2), np.nan)
+        starts[has_coords] = coords[first[has_coords]]
+        ends[has_coords] = coords[last[has_coords]]
+        lengths = np.nan_to_num(shapely.length(geometries))
+        return cls.from_endpoints(starts, ends, lengths, snap=snap, **kwargs)
+
+    @classmethod
+    def from_endpoints(
+        cls,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        lengths: np.ndarray,
+        snap: float = SNAP_M,
+        **kwargs,
+    ) -> "RoadGraph":
+        """Build the graph from segment endpoint coordinates and lengths.
+
+        Args:
+            starts: (segments, 2) first coordinate per segment (NaN for empty geometry)
+            ends: (segments, 2) last coordinate per segment
+            lengths: Length of each segment
+            snap: Endpoint snapping grid in CRS units
+            **kwargs: Passed to RoadGraph (max_distance, tree_cache_size)
+        """
+        has_coords = ~np.isnan(starts).any(axis=1)
+
+        # Snap both endpoints of every segment and number the distinct points
+        endpoints = np.concatenate([starts[has_coords], ends[has_coords]])
+        keys = np.round(endpoints / snap).astype(np.int64)
+        unique_keys, node_ids = np.unique(keys, axis=0, return_inverse=True)
+        node_ids = node_ids.reshape(-1)
+
+        segment_nodes = np.full((len(starts), 2), -1, dtype=np.int64)
+        count = int(has_coords.sum())
+        segment_nodes[has_coords, 0] = node_ids[:count]
+        segment_nodes[has_coords, 1] = node_ids[count:]
+
+        return cls(unique_keys * snap, segment_nodes, np.asarray(lengths, dtype=float), **kwargs)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_xy)
+
+    def degree(self, node: int) -> int:
+        return int(self.indptr[node + 1] - self.indptr[node])
+
+    def segment_nodes_of(self, positions: Iterable[int]) -> np.ndarray:
+        """Distinct nodes of the given segments."""
+        nodes = self.segment_nodes[np.asarray(list(positions), dtype=np.int64)].reshape(-1)
+        return np.unique(nodes[nodes >= 0])
+
+    def junctions(self, positions: Iterable[int]) -> np.ndarray:
+        """Nodes of the given segments where a segment outside the set also connects."""
+        positions = np.asarray(list(positions), dtype=np.int64)
+        junctions = [
+            node for node in self.segment_nodes_of(positions)
+            if not np.isin(
+                self.edge_segments[self.indptr[node]:self.indptr[node + 1]], positions
+            ).all()
+        ]
+        return np.array(junctions, dtype=np.int64)
+
+    def shortest_paths(self, source: int) -> ShortestPathTree:
+        """Shortest-path tree from a node, up to max_distance (LRU cached)."""
+        tree = self._trees.get(source)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(source)
+            return tree
+        self.misses += 1
+
+        distances = {source: 0.0}
+        predecessors = {}
+        heap = [(0.0, source)]
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > distances[node]:
+                continue
+            start, end = self.indptr[node], self.indptr[node + 1]
+            for neighbor, weight in zip(
+                self.neighbors[start:end].tolist(), self.weights[start:end].tolist()
+            ):
+                candidate = distance + weight
+                if candidate <= self.max_distance and candidate < distances.get(neighbor, np.inf):
+                    distances[neighbor] = candidate
+                    predecessors[neighbor] = node
+                    heapq.heappush(heap, (candidate, neighbor))
+
+        tree = ShortestPathTree(source, distances, predecessors)
+        if self.tree_cache_size > 0:
+            self._trees[source] = tree
+            if len(self._trees) > self.tree_cache_size:
+                self._trees.popitem(last=False)
+        return tree
+
+    def nearest(self, sources: Iterable[int], targets: Iterable[int]) -> Optional[NetworkMatch]:
+        """Closest target reachable from any source within max_distance, or None."""
+        targets = set(np.asarray(list(targets)).tolist())
+        best = None
+        for source in sorted(set(np.asarray(list(sources)).tolist())):
+            distances = self.shortest_paths(source).distances
+            for target in targets.intersection(distances):
+                distance = distances[target]
+                if best is None or (distance, source, target) < (best.distance, best.source, best.target):
+                    best = NetworkMatch(source, target, distance)
+            if best is not None and best.distance == 0:
+                break
+        return best
+
+    def path(self, match: NetworkMatch) -> list[int]:
+        """Nodes from match.source to match.target."""
+        predecessors = self.shortest_paths(match.source).predecessors
+        nodes = [match.target]
+        while nodes[-1] != match.source:
+            nodes.append(predecessors[nodes[-1]])
+        return nodes[::-1]
+
+    def clear(self) -> None:
+        self._trees.clear()
+
+    def stats(self) -> dict:
+        """Graph size and shortest-path tree cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "nodes": self.node_count,
+            "edges": len(self.neighbors) // 2,
+            "trees": len(self._trees),
+            "tree_cache_size": self.tree_cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+if __name__ == "__main__":
+    from shapely.geometry import LineString
+
+    # A runs east, B meets it at x=1000, C connects B's far end back to A at x=3000
+    segments = [
+        LineString([(0, 0), (1000, 0)]),        # A
+        LineString([(1000, 0), (3000, 0)]),     # A
+        LineString([(1000, 0), (1000, 2000)]),  # B
+        LineString([(1000, 2000), (3000, 0)]),  # C
+    ]
+    graph = RoadGraph.from_segments(np.array(segments, dtype=object))
+    match = graph.nearest(graph.junctions([2]), graph.segment_nodes_of([0, 1]))
+    print(graph.stats())
+    if match is not None:
+        print(f"A meets B at {graph.node_xy[match.target]} ({match.distance:.0f} m)")
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+road_index.py
+
+Precomputed road-name lookup for the road network GeoDataFrame.
+
+The geocoders match ticket road names against the ``name`` and ``ref``
+columns after upper-casing and collapsing runs of spaces/hyphens. Doing that
+with pandas string methods costs a full pass over every segment per lookup;
+RoadNameIndex normalizes each segment once at load time and keeps a
+normalized-name → segment-positions dictionary, so exact and variation
+lookups are dictionary hits.
+
+The partial-match fallback ("name contains every token") is answered from an
+n-gram inverted index over the distinct upper-cased names and refs: posting
+lists of the pattern's n-grams are intersected to get candidate values, which
+are then verified with a plain substring test. Results are identical to the
+``str.upper().str.contains(...)`` scans they replace.
+
+Usage:
+    from road_index import RoadNameIndex
+
+    index = RoadNameIndex(roads)
+    segments = index.select("FM 516")  # GeoDataFrame or None
+    segments = index.select_containing(["FM", "516"])  # partial match
+"""
+
+import logging
+import re
+from typing import Iterable, Optional, Sequence
+
+import geopandas as gpd
+import numpy as np
+
+# Same normalization the geocoders apply to the road columns
+_SEPARATORS = re.compile(r'[-\s]+')
+
+# Longest n-gram kept in the partial-match index
+GRAM_SIZE = 3
+
+# Patterns with these characters are regular expressions to str.contains
+_REGEX_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+def normalize_column_value(value) -> Optional[str]:
+    """Normalize a road ``name``/``ref`` value the way the lookups compare it.
+
+    Equivalent to ``.str.upper().str.replace(r'[-\\s]+', ' ', regex=True).str.strip()``;
+    non-string values (missing names/refs) return None and never match.
+    """
+    if not isinstance(value, str):
+        return None
+    return _SEPARATORS.sub(' ', value.upper()).strip()
+
+
+class RoadNameIndex:
+    """Normalized road name/ref → segment positions."""
+
+    COLUMNS = ("name", "ref")
+
+    def __init__(self, roads: gpd.GeoDataFrame):
+        """Build the index.
+
+        Args:
+            roads: Road segments with ``name`` and/or ``ref`` columns
+        """
+        self.roads = roads
+
+        positions: dict[str, set[int]] = {}
+        for column in self.COLUMNS:
+            if column not in roads.columns:
+                continue
+            for position, value in enumerate(roads[column].to_numpy()):
+                key = normalize_column_value(value)
+                if key is not None:
+                    positions.setdefault(key, set()).add(position)
+
+        # Sorted positions keep results in road-network order (same as a boolean mask)
+        self._positions: dict[str, np.ndarray] = {
+            key: np.array(sorted(found), dtype=np.int64) for key, found in positions.items()
+        }
+
+        # Partial matching: distinct upper-cased values per column and their n-grams
+        self._values: dict[str, list[str]] = {}
+        self._value_positions: dict[str, list[np.ndarray]] = {}
+        self._grams: dict[str, dict[str, np.ndarray]] = {}
+        for column in self.COLUMNS:
+            if column in roads.columns:
+                self._index_column(column, roads[column].to_numpy())
+
+        logging.info(f"Indexed {len(self._positions)} normalized road names/refs")
+
+    def _index_column(self, column: str, values: np.ndarray) -> None:
+        """Build the n-gram posting lists for one column."""
+        value_ids: dict[str, int] = {}
+        value_positions: list[list[int]] = []
+        for position, value in enumerate(values):
+            if not isinstance(value, str):
+                continue
+            upper = value.upper()
+            value_id = value_ids.setdefault(upper, len(value_ids))
+            if value_id == len(value_positions):
+                value_positions.append([])
+            value_positions[value_id].append(position)
+
+        grams: dict[str, list[int]] = {}
+        for upper, value_id in value_ids.items():
+            seen = set()
+            for size in range(1, GRAM_SIZE + 1):
+                for start in range(len(upper) - size + 1):
+                    gram = upper[start:start + size]
+                    if gram not in seen:
+                        seen.add(gram)
+                        grams.setdefault(gram, []).append(value_id)
+
+        self._values[column] = list(value_ids)
+        self._value_positions[column] = [np.array(p, dtype=np.int64) for p in value_positions]
+        # Value ids are appended in increasing order, so posting lists are sorted
+        self._grams[column] = {gram: np.array(ids, dtype=np.int64) for gram, ids in grams.items()}
+
+    def to_state(self) -> dict:
+        """Index contents without the roads (for road snapshots)."""
+        return {
+            "positions": self._positions,
+            "values": self._values,
+            "value_positions": self._value_positions,
+            "grams": self._grams,
+        }
+
+    @classmethod
+    def from_state(cls, roads: gpd.GeoDataFrame, state: dict) -> "RoadNameIndex":
+        """Restore an index built by to_state() for the same roads, without rebuilding."""
+        index = cls.__new__(cls)
+        index.roads = roads
+        index._positions = state["positions"]
+        index._values = state["values"]
+        index._value_positions = state["value_positions"]
+        index._grams = state["grams"]
+        return index
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._positions
+
+    def names(self) -> list[str]:
+        """All normalized names/refs in the index."""
+        return list(self._positions)
+
+    def positions(self, key: str) -> np.ndarray:
+        """Segment positions whose normalized name or ref equals key."""
+        return self._positions.get(key, np.empty(0, dtype=np.int64))
+
+    def select(self, key: str) -> Optional[gpd.GeoDataFrame]:
+        """Segments whose normalized name or ref equals key, or None."""
+        found = self._positions.get(key)
+        if found is None:
+            return None
+        return self.roads.iloc[found]
+
+    def select_first(self, keys: Iterable[str]) -> tuple[Optional[str], Optional[gpd.GeoDataFrame]]:
+        """Segments for the first key that matches.
+
+        Args:
+            keys: Normalized names to try in order
+
+        Returns:
+            Tuple of (matching key, segments), or (None, None)
+        """
+        for key in keys:
+            found = self.select(key)
+            if found is not None:
+                return key, found
+        return None, None
+
+    def _values_containing(self, column: str, pattern: str) -> np.ndarray:
+        """Ids of distinct column values containing pattern."""
+        values = self._values.get(column, [])
+
+        if _REGEX_CHARS.intersection(pattern):
+            # Keep str.contains' regex semantics for the rare metacharacter token
+            regex = re.compile(pattern)
+            return np.array(
+                [i for i, value in enumerate(values) if regex.search(value)], dtype=np.int64
+            )
+
+        if not pattern:
+            return np.arange(len(values), dtype=np.int64)
+
+        grams = self._grams.get(column, {})
+        if len(pattern) <= GRAM_SIZE:
+            return grams.get(pattern, np.empty(0, dtype=np.int64))
+
+        # Intersect the shortest posting lists first, then verify
+        postings = sorted(
+            (grams.get(pattern[i:i + GRAM_SIZE], np.empty(0, dtype=np.int64))
+             for i in range(len(pattern) - GRAM_SIZE + 1)),
+            key=len,
+        )
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+
+        return np.array(
+            [i for i in candidates if pattern in values[i]], dtype=np.int64
+        )
+
+    def positions_containing(self, patterns: Sequence[str]) -> np.ndarray:
+        """Positions whose upper-cased name, or ref, contains every pattern.
+
+        Equivalent to OR-ing, over name and ref, the AND of
+        ``column.str.upper().str.contains(pattern, na=False)`` for each pattern.
+
+        Args:
+            patterns: Upper-case substrings that must all appear in one column
+
+        Returns:
+            Sorted segment positions
+        """
+        matched: list[np.ndarray] = []
+        for column in self._values:
+            value_ids = None
+            for pattern in patterns:
+                found = self._values_containing(column, pattern)
+                value_ids = found if value_ids is None else np.intersect1d(
+                    value_ids, found, assume_unique=True
+                )
+                if len(value_ids) == 0:
+                    break
+            if value_ids is not None and len(value_ids) > 0:
+                matched.extend(self._value_positions[column][i] for i in value_ids)
+
+        if not matched:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(matched))
+
+    def select_containing(self, patterns: Sequence[str]) -> Optional[gpd.GeoDataFrame]:
+        """Segments whose name or ref contains every pattern, or None."""
+        found = self.positions_containing(patterns)
+        if len(found) == 0:
+            return None
+        return self.roads.iloc[found]
+
+
+if __name__ == "__main__":
+    from shapely.geometry import LineString
+
+    roads = gpd.GeoDataFrame({
+        "name": ["Farm-to-Market Road 516", "County Road 426", None],
+        "ref": ["FM 516", "CR-426", "I-20"],
+        "geometry": [LineString([(0, 0), (1, 1)])] * 3,
+    }, crs="EPSG:4326")
+
+    index = RoadNameIndex(roads)
+    for key in ["FM 516", "CR 426", "I 20", "US 385"]:
+        found = index.select(key)
+        print(f"{key}: {0 if found is None else len(found)} segment(s)")
+
+    found = index.select_containing(["ROAD", "516"])
+    print(f"contains ROAD & 516: {0 if found is None else len(found)} segment(s)")
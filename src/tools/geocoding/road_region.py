@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+road_region.py
+
+Project-bounded, tile-paged loading of large road networks.
+
+A statewide TxDOT/OSM network does not fit in memory on every worker, and a
+project only touches a few counties of it. RoadRegion divides the plane into
+square tiles (in the network's CRS units) and reads only the tiles covering
+the project bounds, using pyogrio's bbox filter so the GeoPackage's R-tree
+spatial index does the work. Further tiles are paged in on demand:
+
+- ``load(bounds)``: tiles covering a bounding box (e.g. a ticket's county)
+- ``expand()``: one ring of tiles around everything loaded so far, for
+  roads that could not be found (limited to ``max_rings`` rings)
+
+Segments are identified by their GeoPackage feature id, so a segment that
+crosses tile edges is loaded once, and every loaded frame is returned in
+feature-id order (the order a full read would have).
+
+Usage:
+    from road_region import RoadRegion
+
+    region = RoadRegion(Path("roads_texas.gpkg"), bounds=(-103.6, 31.2, -102.3, 32.5))
+    roads = region.load_initial()
+    more = region.load(county_bounds)   # GeoDataFrame of new segments or None
+    more = region.expand()
+"""
+
+import logging
+import math
+from pathlib import Path
+from typing import Optional, Tuple
+
+import geopandas as gpd
+import pandas as pd
+
+from road_snapshot import read_gpkg_roads
+
+Bounds = Tuple[float, float, float, float]
+Tile = Tuple[int, int]
+
+
+class RoadRegion:
+    """Tiles of a road network GeoPackage loaded so far."""
+
+    def __init__(
+        self,
+        roads_file: Path,
+        bounds: Bounds,
+        tile_size: float = 0.5,
+        max_rings: int = 2,
+    ):
+        """Initialize region.
+
+        Args:
+            roads_file: Road network GeoPackage with a "roads" layer
+            bounds: (minx, miny, maxx, maxy) loaded initially, in the network CRS
+            tile_size: Tile edge length in CRS units (degrees for EPSG:4326)
+            max_rings: Tile rings expand() may add around the loaded area
+        """
+        self.roads_file = Path(roads_file)
+        minx, miny, maxx, maxy = (float(v) for v in bounds)
+        self.initial_bounds: Bounds = (minx, miny, maxx, maxy)
+        self.tile_size = tile_size
+        self.max_rings = max_rings
+
+        self.tiles: set[Tile] = set()
+        self.rings = 0
+        self._fids = pd.Index([], dtype="int64")
+
+    def tiles_for(self, bounds: Bounds) -> set[Tile]:
+        """Tiles intersecting a bounding box."""
+        minx, miny, maxx, maxy = bounds
+        size = self.tile_size
+        return {
+            (i, j)
+            for i in range(math.floor(minx / size), math.floor(maxx / size) + 1)
+            for j in range(math.floor(miny / size), math.floor(maxy / size) + 1)
+        }
+
+    def tile_bounds(self, tile: Tile) -> Bounds:
+        i, j = tile
+        size = self.tile_size
+        return (i * size, j * size, (i + 1) * size, (j + 1) * size)
+
+    @property
+    def bounds(self) -> Optional[Bounds]:
+        """Extent of the loaded tiles."""
+        if not self.tiles:
+            return None
+        i_values = [i for i, _ in self.tiles]
+        j_values = [j for _, j in self.tiles]
+        size = self.tile_size
+        return (
+            min(i_values) * size, min(j_values) * size,
+            (max(i_values) + 1) * size, (max(j_values) + 1) * size,
+        )
+
+    def _read_tiles(self, tiles: set[Tile]) -> Optional[gpd.GeoDataFrame]:
+        """Read segments of new tiles that are not loaded yet."""
+        if not tiles:
+            return None
+
+        frames = [
+            read_gpkg_roads(self.roads_file, bbox=self.tile_bounds(tile), fid_as_index=True)
+            for tile in sorted(tiles)
+        ]
+        self.tiles |= tiles
+
+        segments = pd.concat(frames)
+        segments = segments[~segments.index.duplicated()]
+        segments = segments[~segments.index.isin(self._fids)].sort_index()
+        self._fids = self._fids.append(segments.index)
+
+        logging.info(
+            f"Loaded {len(segments)} road segments from {len(tiles)} tile(s) of {self.roads_file}"
+        )
+        return segments
+
+    def load_initial(self) -> gpd.GeoDataFrame:
+        """Read the tiles covering the initial bounds."""
+        return self._read_tiles(self.tiles_for(self.initial_bounds))
+
+    def load(self, bounds: Bounds) -> Optional[gpd.GeoDataFrame]:
+        """Page in tiles covering bounds.
+
+        Returns:
+            Newly loaded segments, or None if the bounds were already loaded
+        """
+        return self._read_tiles(self.tiles_for(bounds) - self.tiles)
+
+    def expand(self) -> Optional[gpd.GeoDataFrame]:
+        """Page in one ring of tiles around the loaded area.
+
+        Returns:
+            Newly loaded segments, or None once max_rings rings were added
+        """
+        if self.rings >= self.max_rings or not self.tiles:
+            return None
+        self.rings += 1
+
+        ring = {
+            (i + di, j + dj)
+            for i, j in self.tiles
+            for di in (-1, 0, 1)
+            for dj in (-1, 0, 1)
+        } - self.tiles
+        return self._read_tiles(ring)
+
+    def stats(self) -> dict:
+        """Loaded tiles and segments."""
+        return {
+            "tiles": len(self.tiles),
+            "rings": self.rings,
+            "max_rings": self.max_rings,
+            "segments": len(self._fids),
+            "bounds": self.bounds,
+        }
+
+
+def merge_segments(roads: gpd.GeoDataFrame, segments: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Add paged-in segments to loaded roads, keeping feature-id order."""
+    return pd.concat([roads, segments]).sort_index()
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    if len(sys.argv) != 6:
+        print("Usage: python road_region.py roads.gpkg MINX MINY MAXX MAXY")
+        sys.exit(1)
+
+    minx, miny, maxx, maxy = (float(v) for v in sys.argv[2:6])
+    region = RoadRegion(Path(sys.argv[1]), (minx, miny, maxx, maxy))
+    roads = region.load_initial()
+    print(f"Initial: {len(roads)} segments in {len(region.tiles)} tiles")
+    more = region.expand()
+    print(f"After one ring: +{0 if more is None else len(more)} segments")
+    print(region.stats())
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+road_shared.py
+
+Road network shared read-only between concurrent geocoder processes.
+
+Running the Wink, Floydada, ... pipelines side by side loads the same merged
+road GeoDataFrame and name index into every process. ``build_shared_network``
+writes the network once, as two uncompressed Arrow IPC files in a
+``<stem>.shared`` directory next to the GPKG:
+
+- ``segments.arrow``: the attribute columns plus the geometry as ragged
+  arrays (coordinates, part offsets, segment offsets)
+- ``index.arrow``: the RoadNameIndex posting lists (normalized name/ref →
+  positions, and the distinct names/refs with their n-grams for partial
+  matches)
+- ``graph.arrow`` (optional, ``--graph``): the RoadGraph CSR arrays for
+  network distance, in the metric projection the geocoder will use
+
+``SharedRoadNetwork.open`` memory-maps both files. Coordinates, offsets,
+names and posting lists are numpy/Arrow views of the mapping, so every
+process opening the same files shares their pages through the OS page cache
+(put the directory on /dev/shm to keep it in shared memory). A worker only
+materializes shapely geometries and attribute rows for the segments its
+tickets match, so its own footprint does not grow with the network. The same
+holds for network distance only when ``graph.arrow`` was written; otherwise
+each worker builds the graph of the whole network in its own memory.
+
+Requires the optional ``pyarrow`` package (``pip install kcci-maintenance[snapshot]``).
+
+Usage:
+    python road_shared.py roads_merged.gpkg                 # writes roads_merged.shared/
+    python road_shared.py roads_merged.gpkg --output /dev/shm/roads.shared
+    python road_shared.py roads_merged.gpkg --graph          # also graph.arrow
+
+    from road_shared import SharedRoadNetwork
+    network = SharedRoadNetwork.open(Path("roads_merged.gpkg"))
+    positions = network.index.positions("CR 426")    # RoadNameIndex interface
+    segments = network.segments(positions)           # GeoDataFrame indexed by position
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely import GeometryType
+
+from projection import MetricProjection
+from road_graph import RoadGraph
+from road_index import RoadNameIndex
+from road_snapshot import (
+    attribute_arrays,
+    is_fresh,
+    name_index_from_table,
+    name_index_table,
+    read_gpkg_roads,
+    single_chunk,
+    source_metadata,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401 (loads pa.ipc)
+except ImportError:
+    pa = None
+
+SHARED_SUFFIX = ".shared"
+SHARED_VERSION = "shared-1"
+SEGMENTS_FILE = "segments.arrow"
+INDEX_FILE = "index.arrow"
+GRAPH_FILE = "graph.arrow"
+
+# RoadGraph arrays in graph.arrow (one row; each column a list of the flattened array)
+GRAPH_ARRAYS = ("node_xy", "segment_nodes", "indptr", "neighbors", "weights", "edge_segments")
+
+# Geometry columns of segments.arrow
+PARTS_COLUMN = "geometry_parts"  # list<list<[x, y]>>: segment → parts → coordinates
+KIND_COLUMN = "geometry_kind"    # 0 LineString, 1 MultiLineString, -1 missing/empty
+LINE, MULTI, MISSING = 0, 1, -1
+
+
+def shared_path_for(roads_file: Path) -> Path:
+    """Shared network directory for a road network GPKG (stored next to it)."""
+    roads_file = Path(roads_file)
+    return roads_file.with_name(roads_file.stem + SHARED_SUFFIX)
+
+
+def _write_table(table: "pa.Table", path: Path) -> None:
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _geometry_arrays(geometries: np.ndarray) -> Tuple["pa.Array", "pa.Array"]:
+    """Line geometries as nested coordinate lists plus their kind."""
+    geometry_type, coords, offsets = shapely.to_ragged_array(geometries)
+    if geometry_type == GeometryType.LINESTRING:
+        (part_offsets,) = offsets
+        segment_offsets = np.arange(len(geometries) + 1)
+    elif geometry_type == GeometryType.MULTILINESTRING:
+        part_offsets, segment_offsets = offsets
+    else:
+        raise ValueError(f"Road geometries must be lines, not {geometry_type.name}")
+
+    kind = np.where(shapely.get_type_id(geometries) == GeometryType.MULTILINESTRING, MULTI, LINE)
+    kind[shapely.is_missing(geometries) | shapely.is_empty(geometries)] = MISSING
+
+    points = pa.FixedSizeListArray.from_arrays(pa.array(coords.ravel(), type=pa.float64()), 2)
+    parts = pa.LargeListArray.from_arrays(pa.array(part_offsets, type=pa.int64()), points)
+    segments = pa.LargeListArray.from_arrays(pa.array(segment_offsets, type=pa.int64()), parts)
+    return segments, pa.array(kind, type=pa.int8())
+
+
+def _graph_table(graph: RoadGraph, projection: MetricProjection) -> "pa.Table":
+    """RoadGraph arrays as a one-row table of list columns (mapped back by SharedRoadNetwork.graph)."""
+    arrays = {}
+    for name in GRAPH_ARRAYS:
+        values = np.ravel(getattr(graph, name))
+        arrays[name] = pa.LargeListArray.from_arrays(
+            pa.array([0, len(values)], type=pa.int64()), pa.array(values)
+        )
+    return pa.table(arrays).replace_schema_metadata({
+        b"kcci.snapshot_version": SHARED_VERSION.encode(),
+        b"kcci.graph_crs": projection.name.encode(),
+    })
+
+
+def build_shared_network(
+    roads_file: Path,
+    shared_path: Optional[Path] = None,
+    graph: bool = False,
+    projected_crs: Optional[str] = None,
+) -> Path:
+    """Write a road network GPKG as memory-mappable shared files.
+
+    Args:
+        roads_file: Road network GeoPackage with a "roads" layer
+        shared_path: Output directory (default: next to the GPKG)
+        graph: Also write the network distance graph (graph.arrow)
+        projected_crs: Metric CRS of the graph; must match the geocoder's
+            projected_crs (default: UTM zone of the network, as the geocoder picks)
+
+    Returns:
+        Path of the written directory
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to build shared road networks (pip install pyarrow)")
+
+    roads_file = Path(roads_file)
+    shared_path = Path(shared_path) if shared_path else shared_path_for(roads_file)
+
+    start = time.time()
+    roads = read_gpkg_roads(roads_file)
+    geometry_name = roads.geometry.name
+
+    arrays = attribute_arrays(roads)
+    arrays[PARTS_COLUMN], arrays[KIND_COLUMN] = _geometry_arrays(roads.geometry.values)
+    bounds = (
+        roads.geometry.to_crs("EPSG:4326").total_bounds.tolist()
+        if len(roads) > 0 and roads.crs is not None else None
+    )
+    metadata = {
+        b"kcci.snapshot_version": SHARED_VERSION.encode(),
+        **source_metadata(roads_file),
+        b"kcci.crs": (roads.crs.to_wkt() if roads.crs else "").encode(),
+        b"kcci.geometry_column": geometry_name.encode(),
+        b"kcci.columns": json.dumps(list(roads.columns)).encode(),
+        b"kcci.bounds": json.dumps(bounds).encode(),
+    }
+    segments = pa.table(arrays).replace_schema_metadata(metadata)
+
+    index_table = name_index_table(RoadNameIndex(roads), metadata)
+
+    # Write next to the target and swap it in; processes that already mapped
+    # the old files keep reading them until they close
+    tmp_path = shared_path.with_name(shared_path.name + ".tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+    _write_table(segments, tmp_path / SEGMENTS_FILE)
+    _write_table(index_table, tmp_path / INDEX_FILE)
+    if graph:
+        network = SharedRoadNetwork(tmp_path, segments, index_table)
+        projection = MetricProjection.for_bounds(network.bounds, network.crs, projected_crs)
+        road_graph = network.build_graph(projection)
+        _write_table(_graph_table(road_graph, projection), tmp_path / GRAPH_FILE)
+        logging.info(f"Wrote road graph ({road_graph.node_count} nodes, {projection.name})")
+    shutil.rmtree(shared_path, ignore_errors=True)
+    tmp_path.rename(shared_path)
+
+    size = sum(f.stat().st_size for f in shared_path.iterdir())
+    logging.info(
+        f"Wrote shared road network {shared_path} ({len(roads)} segments, "
+        f"{size / 1e6:.1f} MB) in {time.time() - start:.1f}s"
+    )
+    return shared_path
+
+
+def _ranges(offsets: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Concatenated ``range(offsets[i], offsets[i + 1])`` for each id."""
+    starts = offsets[ids]
+    counts = offsets[ids + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    shifts = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+    return shifts + np.arange(total)
+
+
+def _offsets(counts: np.ndarray) -> np.ndarray:
+    return np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+
+class SharedRoadNetwork:
+    """Memory-mapped road network; geometries are materialized per segment on demand."""
+
+    def __init__(self, path: Path, segments: "pa.Table", index_table: "pa.Table"):
+        """Wrap tables read from a shared network directory (see open)."""
+        self.path = Path(path)
+        metadata = segments.schema.metadata
+        self.crs = metadata.get(b"kcci.crs", b"").decode() or None
+        self.geometry_name = metadata[b"kcci.geometry_column"].decode()
+        self.columns = json.loads(metadata[b"kcci.columns"])
+        bounds = json.loads(metadata.get(b"kcci.bounds", b"null"))
+        self.bounds = tuple(bounds) if bounds else None
+
+        # Zero-copy views of the mapped geometry
+        parts = single_chunk(segments.column(PARTS_COLUMN))
+        self.segment_offsets = parts.offsets.to_numpy()
+        self.part_offsets = parts.values.offsets.to_numpy()
+        self.coords = parts.values.values.values.to_numpy().reshape(-1, 2)
+        self.kind = single_chunk(segments.column(KIND_COLUMN)).to_numpy()
+        self._attributes = segments.drop_columns([PARTS_COLUMN, KIND_COLUMN])
+
+        self.index = name_index_from_table(index_table, None)  # Positions only
+        self.materialized = 0
+
+    @classmethod
+    def open(cls, roads_file: Path, shared_path: Optional[Path] = None) -> Optional["SharedRoadNetwork"]:
+        """Memory-map a fresh shared network for a road network GPKG.
+
+        Args:
+            roads_file: Source road network GeoPackage
+            shared_path: Shared network directory (default: next to the GPKG)
+
+        Returns:
+            SharedRoadNetwork, or None if there are no fresh shared files
+        """
+        roads_file = Path(roads_file)
+        shared_path = Path(shared_path) if shared_path else shared_path_for(roads_file)
+        if pa is None or not (shared_path / SEGMENTS_FILE).exists():
+            return None
+
+        try:
+            tables = []
+            for name in (SEGMENTS_FILE, INDEX_FILE):
+                path = shared_path / name
+                reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+                if not is_fresh(reader.schema.metadata or {}, roads_file, version=SHARED_VERSION, path=path):
+                    logging.info(f"Shared road network {shared_path} is stale; not using it")
+                    return None
+                tables.append(reader.read_all())
+            network = cls(shared_path, *tables)
+        except (OSError, KeyError, ValueError, pa.ArrowException) as e:
+            logging.warning(f"Could not open shared road network {shared_path}: {e}")
+            return None
+
+        logging.info(f"Attached shared road network {shared_path} ({len(network)} segments)")
+        return network
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def geometries(self, positions: np.ndarray) -> np.ndarray:
+        """Shapely geometries of the given segments."""
+        positions = np.asarray(positions, dtype=np.int64)
+        geometries = np.full(len(positions), None, dtype=object)
+        kind = self.kind[positions]
+        present = kind != MISSING
+        if not present.any():
+            return geometries
+
+        segment_ids = positions[present]
+        part_ids = _ranges(self.segment_offsets, segment_ids)
+        coords = self.coords[_ranges(self.part_offsets, part_ids)]
+        multi = shapely.from_ragged_array(
+            GeometryType.MULTILINESTRING,
+            coords,
+            (
+                _offsets(self.part_offsets[part_ids + 1] - self.part_offsets[part_ids]),
+                _offsets(self.segment_offsets[segment_ids + 1] - self.segment_offsets[segment_ids]),
+            ),
+        )
+        lines = kind[present] == LINE
+        multi[lines] = shapely.get_geometry(multi[lines], 0)
+        geometries[present] = multi
+        return geometries
+
+    def segments(self, positions) -> gpd.GeoDataFrame:
+        """Segments as a GeoDataFrame indexed by their network position."""
+        positions = np.asarray(positions, dtype=np.int64)
+        attributes = self._attributes.take(pa.array(positions)).to_pandas()
+        attributes.index = positions
+        roads = gpd.GeoDataFrame(attributes, geometry=self.geometries(positions), crs=self.crs)
+        if self.geometry_name != "geometry":
+            roads = roads.rename_geometry(self.geometry_name)
+        self.materialized += len(positions)
+        return roads[self.columns]
+
+    def endpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(first, last) coordinate of every segment, NaN for missing geometry."""
+        starts = np.full((len(self), 2), np.nan)
+        ends = np.full((len(self), 2), np.nan)
+        present = np.flatnonzero(self.kind != MISSING)
+        first_part = self.segment_offsets[present]
+        last_part = self.segment_offsets[present + 1] - 1
+        starts[present] = self.coords[self.part_offsets[first_part]]
+        ends[present] = self.coords[self.part_offsets[last_part + 1] - 1]
+        return starts, ends
+
+    def lengths(self, transform=None, chunk_size: int = 1 << 20) -> np.ndarray:
+        """Length of every segment, optionally after transforming the coordinates.
+
+        Coordinates are processed in chunks, so only O(chunk) transformed
+        coordinates are held at a time.
+
+        Args:
+            transform: Optional ``(x, y) -> (x, y)`` array transform (e.g. to meters)
+            chunk_size: Coordinates per chunk
+        """
+        part_lengths = np.zeros(len(self.part_offsets) - 1)
+        for start in range(0, len(self.coords), chunk_size):
+            # One coordinate of overlap so steps across chunk edges are counted
+            stop = min(start + chunk_size + 1, len(self.coords))
+            x, y = self.coords[start:stop, 0], self.coords[start:stop, 1]
+            if transform is not None:
+                x, y = transform(x, y)
+            steps = np.hypot(np.diff(x), np.diff(y))
+            step_parts = np.searchsorted(self.part_offsets, np.arange(start + 1, stop), side="right") - 1
+            first_parts = np.searchsorted(self.part_offsets, np.arange(start, stop - 1), side="right") - 1
+            within = step_parts == first_parts
+            part_lengths += np.bincount(
+                step_parts[within], weights=steps[within], minlength=len(part_lengths)
+            )
+
+        cumulative = np.concatenate([[0.0], np.cumsum(part_lengths)])
+        return cumulative[self.segment_offsets[1:]] - cumulative[self.segment_offsets[:-1]]
+
+    def build_graph(self, projection: MetricProjection, **kwargs) -> RoadGraph:
+        """Road graph of the whole network, built in memory from the coordinate arrays.
+
+        Args:
+            projection: Metric projection of the graph's coordinates and lengths
+            **kwargs: Passed to RoadGraph (max_distance, tree_cache_size)
+        """
+        starts, ends = self.endpoints()
+        project = projection.to_projected_xy
+        return RoadGraph.from_endpoints(
+            np.column_stack(project(starts[:, 0], starts[:, 1])),
+            np.column_stack(project(ends[:, 0], ends[:, 1])),
+            self.lengths(project),
+            **kwargs,
+        )
+
+    def graph(self, projection: MetricProjection, **kwargs) -> Optional[RoadGraph]:
+        """Road graph over the memory-mapped graph.arrow, shared like the segments.
+
+        Args:
+            projection: Metric projection the geocoder uses
+            **kwargs: Passed to RoadGraph.from_csr (max_distance, tree_cache_size)
+
+        Returns:
+            RoadGraph, or None if no graph was written for this projection
+        """
+        path = self.path / GRAPH_FILE
+        if not path.exists():
+            return None
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+            graph_crs = (reader.schema.metadata or {}).get(b"kcci.graph_crs", b"").decode()
+            if graph_crs != projection.name:
+                logging.info(
+                    f"Shared road graph is in {graph_crs or 'an unknown CRS'}, not {projection.name}; not using it"
+                )
+                return None
+            table = reader.read_all()
+            arrays = {name: single_chunk(table.column(name)).values.to_numpy() for name in GRAPH_ARRAYS}
+        except (OSError, KeyError, ValueError, pa.ArrowException) as e:
+            logging.warning(f"Could not open shared road graph {path}: {e}")
+            return None
+
+        arrays["node_xy"] = arrays["node_xy"].reshape(-1, 2)
+        arrays["segment_nodes"] = arrays["segment_nodes"].reshape(-1, 2)
+        return RoadGraph.from_csr(**arrays, **kwargs)
+
+    def stats(self) -> dict:
+        """Shared file sizes and segments materialized by this process."""
+        return {
+            "path": str(self.path),
+            "segments": len(self),
+            "coordinates": len(self.coords),
+            "mapped_mb": round(sum(f.stat().st_size for f in self.path.iterdir()) / 1e6, 1),
+            "materialized": self.materialized,
+            "graph": (self.path / GRAPH_FILE).exists(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a road network for shared, memory-mapped use")
+    parser.add_argument("roads_file", type=Path, help="Road network GeoPackage (roads layer)")
+    parser.add_argument("--output", type=Path, help="Output directory (default: next to the GPKG)")
+    parser.add_argument(
+        "--graph", action="store_true", help="Also write the network distance graph (graph.arrow)"
+    )
+    parser.add_argument(
+        "--projected-crs", help="Metric CRS of the graph (default: UTM zone of the network)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    shared_path = build_shared_network(
+        args.roads_file, args.output, graph=args.graph, projected_crs=args.projected_crs
+    )
+
+    start = time.time()
+    network = SharedRoadNetwork.open(args.roads_file, shared_path)
+    if network is not None:
+        print(f"✅ {shared_path}: {len(network)} segments, attaches in {time.time() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
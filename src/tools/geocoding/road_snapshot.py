@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+road_snapshot.py
+
+Startup-optimized snapshot of the road network.
+
+Parsing ``roads_merged.gpkg`` with ``gpd.read_file`` and building the name
+index takes tens of seconds on every geocoder start. ``build_snapshot``
+compiles the network once into an Arrow IPC file next to the GPKG with:
+
+- WKB geometry
+- the original attribute columns plus ``name``/``ref``
+- precomputed normalized names/refs (``name_normalized``, ``ref_normalized``)
+- road hierarchy codes (``road_type_code``, see RoadCharacteristics)
+- a content fingerprint of the source GPKG
+
+and the RoadNameIndex posting lists in a companion ``.snapshot.index.arrow``
+file, as plain Arrow rows (the layout road_shared.py uses too).
+
+``load_roads`` memory-maps the snapshot when it is fresh and falls back to
+the GPKG otherwise, so the geocoders work the same with or without it. A
+GPKG whose mtime changed but whose content did not (a copy, a touch, a
+checkout) is fingerprinted once; the new mtime is then recorded in the
+derived file so later starts skip the hash.
+
+Requires the optional ``pyarrow`` package (``pip install kcci-maintenance[snapshot]``).
+
+Usage:
+    python road_snapshot.py roads_merged.gpkg    # writes roads_merged.snapshot.arrow
+
+    from road_snapshot import load_roads
+    roads, index = load_roads(Path("roads_merged.gpkg"))
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from road_index import RoadNameIndex, normalize_column_value
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401 (loads pa.ipc)
+except ImportError:
+    pa = None
+
+SNAPSHOT_SUFFIX = ".snapshot.arrow"
+INDEX_SUFFIX = ".snapshot.index.arrow"
+SNAPSHOT_VERSION = "2"
+
+# Columns added by the snapshot (dropped again on load)
+DERIVED_COLUMNS = ("name_normalized", "ref_normalized", "road_type_code")
+
+
+def snapshot_path_for(roads_file: Path) -> Path:
+    """Snapshot location for a road network GPKG (stored next to it)."""
+    roads_file = Path(roads_file)
+    return roads_file.with_name(roads_file.stem + SNAPSHOT_SUFFIX)
+
+
+def index_path_for(snapshot_path: Path) -> Path:
+    """Name index file stored alongside a snapshot."""
+    snapshot_path = Path(snapshot_path)
+    return snapshot_path.with_name(snapshot_path.name.removesuffix(".arrow") + ".index.arrow")
+
+
+def file_fingerprint(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Content fingerprint (BLAKE2b) of a file."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# (path, size, mtime_ns) -> fingerprint, so a process hashes each source version once
+_FINGERPRINTS: Dict[Tuple[str, int, int], str] = {}
+
+
+def source_fingerprint(path: Path) -> str:
+    """file_fingerprint of a source file, computed at most once per process and version."""
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    if key not in _FINGERPRINTS:
+        _FINGERPRINTS[key] = file_fingerprint(path)
+    return _FINGERPRINTS[key]
+
+
+def source_metadata(roads_file: Path) -> dict:
+    """Schema metadata identifying the source GPKG (checked by is_fresh)."""
+    stat = roads_file.stat()
+    return {
+        b"kcci.source_fingerprint": source_fingerprint(roads_file).encode(),
+        b"kcci.source_size": str(stat.st_size).encode(),
+        b"kcci.source_mtime_ns": str(stat.st_mtime_ns).encode(),
+    }
+
+
+def read_gpkg_roads(roads_file: Path, **read_kwargs) -> gpd.GeoDataFrame:
+    """Read the "roads" layer and add the ``name``/``ref`` columns the geocoders use.
+
+    Extra keyword arguments (``bbox``, ``mask``, ``fid_as_index``, ...) go to
+    ``gpd.read_file``.
+    """
+    roads = gpd.read_file(roads_file, layer="roads", **read_kwargs)
+
+    # Normalize column names
+    if "road_name" in roads.columns and "name" not in roads.columns:
+        roads["name"] = roads["road_name"]
+    if "road_ref" in roads.columns and "ref" not in roads.columns:
+        roads["ref"] = roads["road_ref"]
+
+    return roads
+
+
+def attribute_arrays(roads: gpd.GeoDataFrame) -> dict:
+    """Arrow arrays of the non-geometry columns (missing strings become nulls)."""
+    arrays = {}
+    for column in roads.columns:
+        if column == roads.geometry.name:
+            continue
+        values = roads[column]
+        if values.dtype == object or str(values.dtype) in ("str", "string"):
+            values = values.astype(object).where(values.notna(), None)
+        arrays[column] = pa.array(values.to_numpy(), from_pandas=True)
+    return arrays
+
+
+def write_table(table: "pa.Table", path: Path) -> None:
+    """Write an Arrow IPC file next to its target and swap it in."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    tmp_path.replace(path)
+
+
+# -- Name index as Arrow rows (also used by road_shared) -----------------------
+
+
+def single_chunk(column: "pa.ChunkedArray") -> "pa.Array":
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+class _Strings(Sequence):
+    """Rows [start, stop) of an Arrow string array as a sequence of str."""
+
+    def __init__(self, array: "pa.StringArray", start: int, stop: int):
+        self._array = array
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, i: int) -> str:  # type: ignore[override]  # No slicing
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._array[self._start + int(i)].as_py()
+
+
+class _Lists(Sequence):
+    """Rows [start, stop) of the index item lists as numpy views."""
+
+    def __init__(self, offsets: np.ndarray, items: np.ndarray, start: int, stop: int):
+        self._offsets = offsets
+        self._items = items
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, i: int) -> np.ndarray:  # type: ignore[override]  # No slicing
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        row = self._start + int(i)
+        return self._items[self._offsets[row]:self._offsets[row + 1]]
+
+
+class _Postings(Mapping):
+    """Sorted key → item list rows, looked up by binary search."""
+
+    def __init__(self, keys: _Strings, lists: _Lists):
+        self._keys = keys
+        self._lists = lists
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        i = bisect.bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            raise KeyError(key)
+        return self._lists[i]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def name_index_table(index: RoadNameIndex, metadata: dict) -> "pa.Table":
+    """RoadNameIndex posting lists as (key, items) rows.
+
+    The row range of each section is stored in the ``kcci.index_sections``
+    metadata, next to the given metadata.
+    """
+    state = index.to_state()
+    keys: list[str] = []
+    items: list[np.ndarray] = []
+    sections: dict = {}
+
+    def add(section, pairs):
+        start = len(keys)
+        for key, values in pairs:
+            keys.append(key)
+            items.append(np.asarray(values, dtype=np.int64))
+        sections[section] = [start, len(keys)]
+
+    # Exact and n-gram keys are sorted for binary search; values stay in id order
+    add("positions", sorted(state["positions"].items()))
+    for column, values in state["values"].items():
+        add(f"values:{column}", zip(values, state["value_positions"][column]))
+        add(f"grams:{column}", sorted(state["grams"][column].items()))
+
+    offsets = np.concatenate([[0], np.cumsum([len(v) for v in items], dtype=np.int64)])
+    flat = np.concatenate(items) if items else np.empty(0, dtype=np.int64)
+    table = pa.table({
+        "key": pa.array(keys, type=pa.string()),
+        "items": pa.LargeListArray.from_arrays(
+            pa.array(offsets, type=pa.int64()), pa.array(flat, type=pa.int64())
+        ),
+    })
+    return table.replace_schema_metadata({
+        **metadata, b"kcci.index_sections": json.dumps(sections).encode(),
+    })
+
+
+def name_index_from_table(
+    index_table: "pa.Table", roads: Optional[gpd.GeoDataFrame]
+) -> RoadNameIndex:
+    """RoadNameIndex whose posting lists are views of a name_index_table."""
+    sections = json.loads(index_table.schema.metadata[b"kcci.index_sections"])
+    keys = single_chunk(index_table.column("key"))
+    lists = single_chunk(index_table.column("items"))
+    offsets = lists.offsets.to_numpy()
+    items = lists.values.to_numpy()
+
+    def rows(section):
+        start, stop = sections[section]
+        return _Strings(keys, start, stop), _Lists(offsets, items, start, stop)
+
+    state: dict = {"positions": _Postings(*rows("positions")), "values": {}, "value_positions": {}, "grams": {}}
+    for section in sections:
+        kind, _, column = section.partition(":")
+        if kind == "values":
+            state["values"][column], state["value_positions"][column] = rows(section)
+        elif kind == "grams":
+            state["grams"][column] = _Postings(*rows(section))
+
+    return RoadNameIndex.from_state(roads, state)
+
+
+def build_snapshot(roads_file: Path, snapshot_path: Optional[Path] = None) -> Path:
+    """Compile a road network GPKG into an Arrow IPC snapshot.
+
+    Args:
+        roads_file: Road network GeoPackage with a "roads" layer
+        snapshot_path: Output path (default: next to the GPKG)
+
+    Returns:
+        Path of the written snapshot
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to build road snapshots (pip install pyarrow)")
+
+    # Imported here: proximity_geocoder imports this module for load_roads()
+    from proximity_geocoder import RoadCharacteristics
+
+    roads_file = Path(roads_file)
+    snapshot_path = Path(snapshot_path) if snapshot_path else snapshot_path_for(roads_file)
+
+    start = time.time()
+    roads = read_gpkg_roads(roads_file)
+    index = RoadNameIndex(roads)
+
+    geometry_name = roads.geometry.name
+    arrays = attribute_arrays(roads)
+
+    for column in ("name", "ref"):
+        source = roads[column] if column in roads.columns else [None] * len(roads)
+        arrays[f"{column}_normalized"] = pa.array(
+            [normalize_column_value(v) for v in source], type=pa.string()
+        )
+
+    road_types = roads["road_type"] if "road_type" in roads.columns else ["OTHER"] * len(roads)
+    arrays["road_type_code"] = pa.array(
+        [RoadCharacteristics.get_hierarchy(t) for t in road_types], type=pa.int8()
+    )
+    arrays[geometry_name] = pa.array(shapely.to_wkb(roads.geometry.values), type=pa.binary())
+
+    metadata = {
+        b"kcci.snapshot_version": SNAPSHOT_VERSION.encode(),
+        **source_metadata(roads_file),
+        b"kcci.crs": (roads.crs.to_wkt() if roads.crs else "").encode(),
+        b"kcci.geometry_column": geometry_name.encode(),
+        b"kcci.columns": json.dumps(list(roads.columns)).encode(),
+    }
+    # Index first: a snapshot is only used with a fresh index next to it
+    write_table(name_index_table(index, metadata), index_path_for(snapshot_path))
+    write_table(pa.table(arrays).replace_schema_metadata(metadata), snapshot_path)
+
+    logging.info(
+        f"Wrote road snapshot {snapshot_path} ({len(roads)} segments, "
+        f"{snapshot_path.stat().st_size / 1e6:.1f} MB) in {time.time() - start:.1f}s"
+    )
+    return snapshot_path
+
+
+def restamp(path: Path, roads_file: Path) -> None:
+    """Record the source GPKG's current mtime in a derived Arrow file.
+
+    Called once the content fingerprint matched, so later freshness checks
+    succeed on size and mtime alone. Readers that mapped the old file keep it.
+    """
+    try:
+        table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"kcci.source_mtime_ns"] = str(roads_file.stat().st_mtime_ns).encode()
+        write_table(table.replace_schema_metadata(metadata), path)
+    except (OSError, pa.ArrowException) as e:
+        logging.warning(f"Could not update the source mtime of {path}: {e}")
+
+
+def is_fresh(
+    metadata: dict,
+    roads_file: Path,
+    version: str = SNAPSHOT_VERSION,
+    path: Optional[Path] = None,
+) -> bool:
+    """Check a derived file against its source GPKG.
+
+    Size and mtime unchanged is trusted; otherwise the content fingerprint
+    decides (so a copied or touched but identical GPKG still uses the file).
+    When it matches and the file's path is given, the new mtime is recorded
+    in the file (see restamp).
+    """
+    if metadata.get(b"kcci.snapshot_version", b"").decode() != version:
+        return False
+
+    stat = roads_file.stat()
+    if str(stat.st_size) != metadata.get(b"kcci.source_size", b"").decode():
+        return False
+    if str(stat.st_mtime_ns) == metadata.get(b"kcci.source_mtime_ns", b"").decode():
+        return True
+    if source_fingerprint(roads_file) != metadata.get(b"kcci.source_fingerprint", b"").decode():
+        return False
+    if path is not None:
+        restamp(path, roads_file)
+    return True
+
+
+def load_snapshot(
+    roads_file: Path,
+    snapshot_path: Optional[Path] = None,
+) -> Optional[Tuple[gpd.GeoDataFrame, RoadNameIndex]]:
+    """Load a fresh snapshot (memory-mapped) for a road network GPKG.
+
+    Args:
+        roads_file: Source road network GeoPackage
+        snapshot_path: Snapshot location (default: next to the GPKG)
+
+    Returns:
+        Tuple of (roads, name index), or None if there is no fresh snapshot
+    """
+    roads_file = Path(roads_file)
+    snapshot_path = Path(snapshot_path) if snapshot_path else snapshot_path_for(roads_file)
+    index_path = index_path_for(snapshot_path)
+    if pa is None or not snapshot_path.exists() or not index_path.exists():
+        return None
+
+    try:
+        tables = []
+        for path in (snapshot_path, index_path):
+            reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+            if not is_fresh(reader.schema.metadata or {}, roads_file, path=path):
+                logging.info(f"Road snapshot {snapshot_path} is stale; reading {roads_file}")
+                return None
+            tables.append(reader.read_all())
+        table, index_table = tables
+
+        metadata = table.schema.metadata
+        geometry_name = metadata[b"kcci.geometry_column"].decode()
+        geometry = shapely.from_wkb(
+            table.column(geometry_name).to_numpy(zero_copy_only=False)
+        )
+        attributes = table.drop_columns([geometry_name, *DERIVED_COLUMNS]).to_pandas()
+    except (OSError, KeyError, pa.ArrowException) as e:
+        logging.warning(f"Could not read road snapshot {snapshot_path}: {e}")
+        return None
+
+    crs = metadata.get(b"kcci.crs", b"").decode() or None
+    roads = gpd.GeoDataFrame(attributes, geometry=geometry, crs=crs)
+    if geometry_name != "geometry":
+        roads = roads.rename_geometry(geometry_name)
+    roads = roads[json.loads(metadata[b"kcci.columns"])]
+
+    return roads, name_index_from_table(index_table, roads)
+
+
+def load_roads(roads_file: Path) -> Tuple[gpd.GeoDataFrame, RoadNameIndex]:
+    """Load the road network and its name index, preferring a fresh snapshot.
+
+    Args:
+        roads_file: Road network GeoPackage with a "roads" layer
+
+    Returns:
+        Tuple of (roads, name index)
+    """
+    roads_file = Path(roads_file)
+    if not roads_file.exists():
+        raise FileNotFoundError(f"Road network file not found: {roads_file}")
+
+    snapshot = load_snapshot(roads_file)
+    if snapshot is not None:
+        logging.info(f"Loaded road network snapshot for {roads_file}")
+        return snapshot
+
+    logging.info(f"Loading road network from {roads_file}")
+    roads = read_gpkg_roads(roads_file)
+    # Normalize names/refs once instead of on every lookup
+    return roads, RoadNameIndex(roads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a startup-optimized road network snapshot")
+    parser.add_argument("roads_file", type=Path, help="Road network GeoPackage (roads layer)")
+    parser.add_argument("--output", type=Path, help="Snapshot path (default: next to the GPKG)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    snapshot_path = build_snapshot(args.roads_file, args.output)
+
+    start = time.time()
+    loaded = load_snapshot(args.roads_file, snapshot_path)
+    if loaded is not None:
+        print(f"✅ {snapshot_path}: {len(loaded[0])} segments, loads in {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
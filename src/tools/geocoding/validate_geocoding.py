@@ -14,53 +14,35 @@ Checks:
 
 import json
 from pathlib import Path
+from typing import Optional
 
 import pandas as pd
-import geopandas as gpd
-from shapely.geometry import Point
-
-# City centroids for distance validation (same as ProximityGeocoder)
-CITY_CENTROIDS = {
-    ("KERMIT", "WINKLER"): (31.8576, -103.0930),
-    ("PYOTE", "WARD"): (31.5401, -103.1293),
-    ("BARSTOW", "WARD"): (31.4596, -103.3954),
-    ("MONAHANS", "WARD"): (31.5943, -102.8929),
-    ("ANDREWS", "ANDREWS"): (32.3185, -102.5457),
-    ("GARDENDALE", "ANDREWS"): (32.0165, -102.3779),
-    ("COYANOSA", "WARD"): (31.2693, -103.0324),
-    ("WICKETT", "WARD"): (31.5768, -103.0010),
-    ("THORNTONVILLE", "WARD"): (31.4446, -103.1079),
-}
+
+from gazetteer import Gazetteer, load_gazetteer
 
 RESULTS_FILE = Path("proximity_results.csv")
 OUTPUT_VALIDATION = Path("geocoding_validation_report.csv")
 OUTPUT_SUMMARY = Path("validation_summary.json")
 
 
-def haversine_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance in km between two lat/lng points."""
-    from math import radians, sin, cos, sqrt, atan2
-
-    R = 6371  # Earth radius in km
-
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-
-    return R * c
-
-
-def validate_results(df: pd.DataFrame) -> pd.DataFrame:
+def validate_results(df: pd.DataFrame, gazetteer: Optional[Gazetteer] = None) -> pd.DataFrame:
     """Validate geocoding results and flag issues.
 
+    Args:
+        df: Proximity results
+        gazetteer: City centroids (default: built-in project cities)
+
     Returns DataFrame with validation flags and reasons.
     """
+    gazetteer = gazetteer or load_gazetteer()
     validation_flags = []
 
-    for idx, row in df.iterrows():
+    # Distance from city center for the whole file at once (NaN: city unknown)
+    city_distances = gazetteer.distances_km(
+        df["proximity_lat"], df["proximity_lng"], df["city"], df["county"]
+    )
+
+    for position, (idx, row) in enumerate(df.iterrows()):
         if not row["proximity_success"]:
             validation_flags.append(
                 {
@@ -83,8 +65,6 @@ def validate_results(df: pd.DataFrame) -> pd.DataFrame:
         approach = row["proximity_approach"]
         city = row["city"]
         county = row["county"]
-        lat = row["proximity_lat"]
-        lng = row["proximity_lng"]
 
         # Get ticket metadata
         ticket_type = row.get("ticket_type", None)
@@ -109,13 +89,11 @@ def validate_results(df: pd.DataFrame) -> pd.DataFrame:
             actions.append("Locate actual work area - city centroid is approximate")
 
         # Check 4: Distance from city center
-        city_key = (city.upper(), county.upper())
-        if city_key in CITY_CENTROIDS:
-            city_lat, city_lng = CITY_CENTROIDS[city_key]
-            distance = haversine_distance(lat, lng, city_lat, city_lng)
-
-            if distance > 50:
-                flags.append(f"Location {distance:.1f}km from {city} center")
+        city_distance = float(city_distances[position])
+        distance: Optional[float] = city_distance
+        if pd.notna(city_distance):
+            if city_distance > 50:
+                flags.append(f"Location {city_distance:.1f}km from {city} center")
                 severity = "MEDIUM" if severity == "OK" else severity
                 actions.append("Verify location is correct for city")
         else:
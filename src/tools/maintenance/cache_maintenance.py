@@ -2,24 +2,30 @@
 """
 purge_stale_cache.py
 
-Removes stale/failed entries from geocode_cache.json so they can be
-re-geocoded on the next run of geocode-routes.py.
+Removes stale/failed entries from the geocode cache journal
+(geocode_cache.jsonl) so they can be re-geocoded on the next run of
+geocode_routes.py.
 
 Entries removed:
   - Old-format (flat dict without nested 'geocode' key)
   - New-format with non-OK geocode status (ZERO_RESULTS, exception, etc.)
 
-A backup is saved to geocode_cache.backup.json before any changes.
+A backup is saved to geocode_cache.backup.jsonl before any changes.
 """
 
-import json
 import logging
 import shutil
+import sys
 from pathlib import Path
 from typing import Any
 
-CACHE_FILE = Path("geocode_cache.json")
-BACKUP_FILE = Path("geocode_cache.backup.json")
+# src/scripts isn't a package; add it to the path like geocode_routes.py does.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from geocode_journal import journal_path_for, open_geocode_cache
+
+CACHE_FILE = Path("geocode_cache.json")  # legacy JSON cache, migrated on open
+BACKUP_FILE = Path("geocode_cache.backup.jsonl")
 
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
@@ -84,20 +90,20 @@ def report(label: str, stats: dict[str, int], status_counts: dict[str, int]) ->
 
 
 def main() -> None:
-    if not CACHE_FILE.exists():
-        logging.error(f"Cache file not found: {CACHE_FILE}")
+    if not CACHE_FILE.exists() and not journal_path_for(CACHE_FILE).exists():
+        logging.error(f"Cache file not found: {journal_path_for(CACHE_FILE)}")
         return
 
-    logging.info(f"Loading cache from {CACHE_FILE}")
-    with CACHE_FILE.open("r", encoding="utf-8") as f:
-        cache = json.load(f)
+    journal = open_geocode_cache(CACHE_FILE)
+    logging.info(f"Loading cache from {journal.path}")
+    cache = journal.to_dict()
 
     before_stats, before_status = classify_cache(cache)
     report("BEFORE PURGE", before_stats, before_status)
 
     # Backup
     logging.info(f"Backing up to {BACKUP_FILE}")
-    shutil.copy2(CACHE_FILE, BACKUP_FILE)
+    shutil.copy2(journal.path, BACKUP_FILE)
 
     # Purge
     cleaned = purge_cache(cache)
@@ -109,10 +115,9 @@ def main() -> None:
     logging.info(f"Removed {removed} entries")
     logging.info(f"Retained {len(cleaned)} entries")
 
-    # Save
-    with CACHE_FILE.open("w", encoding="utf-8") as f:
-        json.dump(cleaned, f, ensure_ascii=False, indent=2)
-    logging.info(f"Saved cleaned cache to {CACHE_FILE}")
+    # Save (rewrites the journal, dropping superseded lines too)
+    journal.replace_all(cleaned)
+    logging.info(f"Saved cleaned cache to {journal.path}")
 
 
 if __name__ == "__main__":
@@ -2,9 +2,9 @@
 """
 migrate_cache_road_names.py
 
-Rekeys geocode_cache.json using the new normalize_road_name() function,
-deduplicating entries whose raw road-name variants now collapse to the
-same canonical key.
+Rekeys the geocode cache journal (geocode_cache.jsonl) using the new
+normalize_road_name() function, deduplicating entries whose raw road-name
+variants now collapse to the same canonical key.
 
 When multiple old entries map to a single new key, the entry with
 geocode.status == "OK" is preferred (i.e. one that actually has lat/lng).
@@ -15,20 +15,19 @@ Usage:
 """
 
 import argparse
-import json
 import logging
 import shutil
 import sys
 from pathlib import Path
 
-# geocode-routes.py isn't a package; import via importlib.
-from importlib import import_module
+# src/scripts isn't a package; add it to the path like geocode_routes.py does.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
 
-geocode_routes = import_module("geocode-routes")
-make_geo_key = geocode_routes.make_geo_key
+from geocode_journal import journal_path_for, open_geocode_cache
+from geocode_routes import make_geo_key
 
-CACHE_FILE = Path("geocode_cache.json")
-BACKUP_FILE = Path("geocode_cache.pre_road_norm.backup.json")
+CACHE_FILE = Path("geocode_cache.json")  # legacy JSON cache, migrated on open
+BACKUP_FILE = Path("geocode_cache.pre_road_norm.backup.jsonl")
 
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
@@ -84,13 +83,13 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    if not CACHE_FILE.exists():
-        logging.error(f"Cache file not found: {CACHE_FILE}")
+    if not CACHE_FILE.exists() and not journal_path_for(CACHE_FILE).exists():
+        logging.error(f"Cache file not found: {journal_path_for(CACHE_FILE)}")
         sys.exit(1)
 
-    logging.info(f"Loading cache from {CACHE_FILE}")
-    with CACHE_FILE.open("r", encoding="utf-8") as f:
-        cache = json.load(f)
+    journal = open_geocode_cache(CACHE_FILE)
+    logging.info(f"Loading cache from {journal.path}")
+    cache = journal.to_dict()
 
     before_count = len(cache)
     logging.info(f"Entries before migration: {before_count}")
@@ -108,12 +107,11 @@ def main() -> None:
 
     # Backup original cache
     logging.info(f"Backing up to {BACKUP_FILE}")
-    shutil.copy2(CACHE_FILE, BACKUP_FILE)
+    shutil.copy2(journal.path, BACKUP_FILE)
 
-    # Write migrated cache
-    with CACHE_FILE.open("w", encoding="utf-8") as f:
-        json.dump(new_cache, f, ensure_ascii=False, indent=2)
-    logging.info(f"Saved migrated cache to {CACHE_FILE}")
+    # Write migrated cache (rewrites the journal with the rekeyed entries)
+    journal.replace_all(new_cache)
+    logging.info(f"Saved migrated cache to {journal.path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+test_county_index.py
+
+Tests for county-scoped road candidates in ProximityGeocoder._find_road.
+"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import LineString, box
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+from county_index import CountyRoadIndex, normalize_county
+from proximity_geocoder import ProximityGeocoder
+
+
+# Four counties in a row (x: -104..-100), Brewster far from the rest
+COUNTIES = [
+    ("Reeves", box(-104.0, 31.0, -103.5, 32.0)),
+    ("Ward", box(-103.5, 31.0, -103.0, 32.0)),
+    ("Winkler", box(-103.0, 31.0, -102.5, 32.0)),
+    ("Brewster", box(-101.0, 31.0, -100.5, 32.0)),
+]
+
+ROADS = [
+    # road_name, road_ref, road_type, geometry
+    ("County Road 426", "CR 426", "CR", LineString([(-103.4, 31.5), (-103.3, 31.5)])),    # Ward
+    ("County Road 426", "CR 426", "CR", LineString([(-100.9, 31.5), (-100.8, 31.5)])),    # Brewster
+    ("County Road 432", "CR 432", "CR", LineString([(-103.35, 31.4), (-103.35, 31.6)])),  # Ward
+    ("County Road 432", "CR 432", "CR", LineString([(-100.85, 31.4), (-100.85, 31.6)])),  # Brewster
+    ("County Road 516", "CR 516", "CR", LineString([(-102.9, 31.5), (-102.8, 31.5)])),    # Winkler
+    ("County Road 516", "CR 516", "CR", LineString([(-100.7, 31.5), (-100.6, 31.5)])),    # Brewster
+    ("County Road 700", "CR 700", "CR", LineString([(-100.7, 31.7), (-100.6, 31.7)])),    # Brewster
+    ("Interstate 20", "I-20", "Interstate", LineString([(-103.8, 31.45), (-102.6, 31.45)])),  # spans 3
+]
+
+
+@pytest.fixture(scope="module")
+def network(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("county")
+    roads_file = tmp / "roads.gpkg"
+    gpd.GeoDataFrame(
+        {
+            "road_name": [r[0] for r in ROADS],
+            "road_ref": [r[1] for r in ROADS],
+            "road_type": [r[2] for r in ROADS],
+        },
+        geometry=[r[3] for r in ROADS],
+        crs="EPSG:4326",
+    ).to_file(roads_file, layer="roads", driver="GPKG")
+
+    counties_file = tmp / "counties.geojson"
+    gpd.GeoDataFrame(
+        {"CNTY_NM": [c[0] for c in COUNTIES]},
+        geometry=[c[1] for c in COUNTIES],
+        crs="EPSG:4326",
+    ).to_file(counties_file, driver="GeoJSON")
+    return roads_file, counties_file
+
+
+def test_normalize_county():
+    assert normalize_county("Ward County") == "WARD"
+    assert normalize_county(" winkler ") == "WINKLER"
+    assert normalize_county(None) == ""
+
+
+def test_polygon_membership_and_neighbors():
+    roads = gpd.GeoDataFrame(geometry=[r[3] for r in ROADS], crs="EPSG:4326")
+    counties = gpd.GeoDataFrame(
+        {"county": [c[0] for c in COUNTIES]}, geometry=[c[1] for c in COUNTIES], crs="EPSG:4326"
+    )
+    index = CountyRoadIndex(roads, counties)
+    everything = np.arange(len(ROADS))
+
+    assert sorted(index.neighbors("Ward")) == ["REEVES", "WINKLER"]
+    assert index.neighbors("Brewster") == []
+
+    positions, scope = index.restrict(everything, "Ward County")
+    assert scope == "county"
+    assert positions.tolist() == [0, 2, 7]  # I-20 crosses Ward as a boundary segment
+
+    positions, scope = index.restrict(np.array([4, 5]), "Ward")
+    assert (positions.tolist(), scope) == ([4], "neighbors")
+
+    positions, scope = index.restrict(np.array([6]), "Ward")
+    assert (positions.tolist(), scope) == ([], "neighbors")
+
+    positions, scope = index.restrict(everything, "Harris")
+    assert scope == "unscoped"
+    assert positions is everything
+
+
+def test_county_column_membership():
+    roads = gpd.GeoDataFrame(
+        {"county": ["Ward", "Brewster", "Winkler", None, "Ward", "Winkler"]},
+        geometry=[
+            ROADS[0][3], ROADS[1][3], ROADS[4][3], ROADS[7][3],
+            # Segments meeting at the Ward/Winkler line make the extents touch
+            LineString([(-103.2, 31.45), (-103.0, 31.45)]),
+            LineString([(-103.0, 31.45), (-102.8, 31.45)]),
+        ],
+        crs="EPSG:4326",
+    )
+    index = CountyRoadIndex(roads)
+
+    assert index.enabled
+    assert index.restrict(np.arange(4), "WARD")[0].tolist() == [0]
+    assert index.restrict(np.array([1, 2]), "Ward")[0].tolist() == [2]
+    assert index.neighbors("Ward") == ["WINKLER"]
+    assert index.neighbors("Brewster") == []
+
+
+@pytest.mark.parametrize("with_polygons", [True, False])
+def test_extend_matches_rebuild(with_polygons):
+    """Paged-in segments are assigned without re-indexing the loaded ones."""
+    roads = gpd.GeoDataFrame(
+        {"county": ["Ward", "Brewster", "Ward", "Brewster", "Winkler", "Brewster", "Brewster", "Ward"]},
+        geometry=[r[3] for r in ROADS],
+        crs="EPSG:4326",
+    )
+    counties = gpd.GeoDataFrame(
+        {"county": [c[0] for c in COUNTIES]}, geometry=[c[1] for c in COUNTIES], crs="EPSG:4326"
+    ) if with_polygons else None
+    loaded = [1, 5, 7]
+
+    index = CountyRoadIndex(roads.iloc[loaded], counties)
+    index.extend(roads)
+    rebuilt = CountyRoadIndex(roads, counties)
+
+    assert index.roads is roads
+    everything = np.arange(len(ROADS))
+    for county in ["Ward", "Winkler", "Brewster", "Reeves"]:
+        assert index.restrict(everything, county)[0].tolist() == rebuilt.restrict(everything, county)[0].tolist()
+        assert sorted(index.neighbors(county)) == sorted(rebuilt.neighbors(county))
+    with pytest.raises(ValueError):
+        index.extend(roads.iloc[:2])
+
+
+def test_disabled_without_county_data():
+    roads = gpd.GeoDataFrame(geometry=[r[3] for r in ROADS], crs="EPSG:4326")
+    index = CountyRoadIndex(roads)
+
+    assert not index.enabled
+    positions, scope = index.restrict(np.arange(3), "Ward")
+    assert scope == "unscoped"
+    assert positions.tolist() == [0, 1, 2]
+
+
+def test_find_road_scoped_to_county(network):
+    roads_file, counties_file = network
+    scoped = ProximityGeocoder(roads_file, memo_size=0, county_boundaries=counties_file)
+    statewide = ProximityGeocoder(roads_file, memo_size=0)
+
+    assert list(statewide._find_road("CR 426", "Ward").index) == [0, 1]
+    assert list(scoped._find_road("CR 426", "Ward").index) == [0]
+    # Not in Ward, found in neighboring Winkler
+    assert list(scoped._find_road("CR 516", "Ward").index) == [4]
+    # Only exists in a distant county
+    assert scoped._find_road("CR 700", "Ward") is None
+    # Unknown county or no county keeps the statewide match
+    assert list(scoped._find_road("CR 426", "Harris").index) == [0, 1]
+    assert list(scoped._find_road("CR 426").index) == [0, 1]
+
+
+def test_geocode_uses_county_candidates(network):
+    roads_file, counties_file = network
+    geocoder = ProximityGeocoder(roads_file, memo_size=0, county_boundaries=counties_file)
+
+    result = geocoder.geocode_proximity("CR 426", "CR 432", "Ward", "Pyote")
+    assert result.success
+    assert result.approach == "closest_point"
+    assert result.metadata["street_segments"] == 1
+    assert result.lng == pytest.approx(-103.35)
+    assert result.lat == pytest.approx(31.5)
+
+    result = geocoder.geocode_proximity("CR 426", "CR 432", "Brewster", "")
+    assert result.lng == pytest.approx(-100.85)
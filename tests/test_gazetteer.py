@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+test_gazetteer.py
+
+Tests for the city gazetteer (lookups, nearest place, batch distances).
+"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import LineString, box
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+from gazetteer import Gazetteer, haversine_km, load_gazetteer, normalize_place
+from proximity_geocoder import ProximityGeocoder
+
+
+CENSUS_PLACES = (
+    "USPS\tGEOID\tNAME\tLSAD\tINTPTLAT\tINTPTLONG                \n"
+    "TX\t4839400\tKermit city\t25\t31.8576\t-103.0930\n"
+    "TX\t4828284\tGardendale CDP\t57\t32.0165\t-102.3779\n"
+    "TX\t4860932\tPecos city\t25\t31.4229\t-103.4932\n"
+    "NM\t3532520\tJal city\t25\t32.1132\t-103.1930\n"
+)
+
+
+@pytest.fixture
+def census_file(tmp_path):
+    path = tmp_path / "2023_Gaz_place_48.txt"
+    path.write_text(CENSUS_PLACES)
+    return path
+
+
+def test_builtin_lookup():
+    gazetteer = load_gazetteer()
+    assert gazetteer is load_gazetteer()  # Loaded once, shared
+    assert gazetteer.lookup("Kermit", "Winkler County") == (31.8576, -103.0930)
+    assert gazetteer.lookup("kermit", "Ward") is None
+    assert gazetteer.lookup(None, "Ward") is None
+
+
+def test_census_places_without_counties(census_file):
+    gazetteer = Gazetteer.from_file(census_file, state="TX")
+    assert len(gazetteer) == 3
+    assert normalize_place("Gardendale CDP") == "GARDENDALE"
+    # No county column: unique names match in any county
+    assert gazetteer.lookup("Pecos", "Reeves") == (31.4229, -103.4932)
+    assert gazetteer.lookup("Jal", "Lea") is None  # Filtered by state
+
+
+def test_counties_from_boundaries(census_file):
+    counties = gpd.GeoDataFrame(
+        {"county": ["WINKLER", "REEVES"]},
+        geometry=[box(-103.3, 31.7, -102.8, 32.0), box(-103.9, 31.0, -103.3, 31.7)],
+        crs="EPSG:4326",
+    )
+    gazetteer = Gazetteer.from_file(census_file, state="TX", counties=counties)
+    assert gazetteer.lookup("Kermit", "Winkler") == (31.8576, -103.0930)
+    assert gazetteer.lookup("Kermit", "Ward") is None
+    # Outside every county polygon: still matched by unique name
+    assert gazetteer.lookup("Gardendale", "Andrews") == (32.0165, -102.3779)
+
+
+def test_batch_distances_match_single_lookups():
+    gazetteer = load_gazetteer()
+    lats = [32.0, 31.5401, 31.0, np.nan]
+    lngs = [-102.0, -103.1293, -103.0, np.nan]
+    cities = ["Barstow", "Pyote", "Nowhere", "Kermit"]
+    counties = ["Ward", "Ward", "Ward", "Winkler"]
+
+    distances = gazetteer.distances_km(lats, lngs, cities, counties)
+    barstow = gazetteer.lookup("Barstow", "Ward")
+    assert distances[0] == pytest.approx(haversine_km(32.0, -102.0, *barstow))
+    assert distances[1] == pytest.approx(0.0)
+    assert np.isnan(distances[2]) and np.isnan(distances[3])
+
+
+def test_nearest_matches_brute_force():
+    rng = np.random.default_rng(7)
+    lats, lngs = rng.uniform(26, 36, 500), rng.uniform(-106, -94, 500)
+    gazetteer = Gazetteer(
+        np.array([f"P{i}" for i in range(500)], dtype=object), np.full(500, "", dtype=object),
+        lats, lngs, cell_deg=0.25,
+    )
+    for lat, lng in rng.uniform((24, -108), (38, -92), size=(100, 2)):
+        match = gazetteer.nearest(lat, lng)
+        distances = haversine_km(lat, lng, lats, lngs)
+        assert match.city == f"P{np.argmin(distances)}"
+        assert match.distance_km == pytest.approx(distances.min())
+
+    assert gazetteer.nearest(45.0, -80.0, max_km=10) is None
+
+
+def test_geocoder_fallback_uses_places_file(tmp_path):
+    roads_file = tmp_path / "roads.gpkg"
+    gpd.GeoDataFrame(
+        {"road_name": ["County Road 426"], "road_ref": ["CR 426"], "road_type": ["CR"]},
+        geometry=[LineString([(-103.15, 31.45), (-103.15, 31.6)])],
+        crs="EPSG:4326",
+    ).to_file(roads_file, layer="roads", driver="GPKG")
+    places_file = tmp_path / "places.csv"
+    places_file.write_text("city,county,lat,lng\nToyah,Reeves,31.3135,-103.7930\n")
+
+    result = ProximityGeocoder(roads_file, memo_size=0).geocode_proximity(
+        "LAKEVIEW DR", "MAIN ST", "Reeves", "Toyah"
+    )
+    assert not result.success
+
+    geocoder = ProximityGeocoder(roads_file, memo_size=0, places_file=places_file)
+    result = geocoder.geocode_proximity("LAKEVIEW DR", "MAIN ST", "Reeves", "Toyah")
+    assert result.approach == "city_centroid_fallback"
+    assert (result.lat, result.lng) == (31.3135, -103.7930)
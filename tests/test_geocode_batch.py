@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+test_geocode_batch.py
+
+Tests that ProximityGeocoder.geocode_batch matches the per-ticket path.
+"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import LineString
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+from proximity_geocoder import ProximityGeocoder
+
+
+@pytest.fixture(scope="module")
+def roads_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("batch") / "roads.gpkg"
+    gpd.GeoDataFrame(
+        {
+            "road_name": [
+                "Interstate 20", "Interstate 20", "County Road 426", "County Road 432",
+                "Farm-to-Market Road 1788", "US Highway 285",
+            ],
+            "road_ref": ["I-20", "I-20", "CR 426", "CR 432", "FM 1788", "US 285"],
+            "road_type": ["Interstate", "Interstate", "CR", "CR", "FM", "US"],
+        },
+        geometry=[
+            LineString([(-103.2, 31.5), (-103.1, 31.5)]),
+            LineString([(-103.1, 31.5), (-103.0, 31.5)]),
+            LineString([(-103.15, 31.45), (-103.15, 31.6)]),
+            LineString([(-103.12, 31.45), (-103.12, 31.6)]),
+            LineString([(-103.05, 31.3), (-103.05, 31.7)]),
+            # No segment within 5 km of CR 432: closest-point fallback of approach 3
+            LineString([(-102.5, 31.9), (-102.4, 31.9)]),
+        ],
+        crs="EPSG:4326",
+    ).to_file(path, layer="roads", driver="GPKG")
+    return path
+
+
+TICKETS = pd.DataFrame(
+    [
+        # street, intersection, county, city, ticket_type, duration, work_type
+        ("CR 426", "CR 432", "Ward", "Pyote", "Normal", "1 DAY", "Hydro-excavation"),  # approach 2
+        ("I-20", "CR 426", "Ward", "Pyote", "Emergency", None, None),                  # approach 3
+        ("I-20", "FM 1788", "Ward", "Pyote", None, "2 MONTHS", None),                  # approach 3
+        ("CR 426", "LAKEVIEW DR", "Ward", "Barstow", None, None, None),                 # approach 4
+        ("LAKEVIEW DR", "MAIN ST", "Ward", "Barstow", "Normal", None, None),           # city fallback
+        ("LAKEVIEW DR", "MAIN ST", "Ward", "Nowhere", None, None, None),               # failure
+        ("cr 426", " CR 432", "WARD", "PYOTE", "Update", None, None),                 # same key as row 0
+        ("CR 426", np.nan, "Ward", "Pyote", np.nan, np.nan, np.nan),                  # missing values
+        ("US 285", "CR 432", "Reeves", "Pecos", None, None, None),                     # approach 3, no segments
+    ],
+    columns=["street", "intersection", "county", "city", "ticket_type", "duration", "work_type"],
+)
+
+
+def per_ticket(geocoder, df):
+    results = []
+    for row in df.itertuples(index=False):
+        results.append(geocoder.geocode_proximity(
+            row.street, "" if pd.isna(row.intersection) else row.intersection, row.county, row.city,
+            ticket_type=None if pd.isna(row.ticket_type) else row.ticket_type,
+            duration=None if pd.isna(row.duration) else row.duration,
+            work_type=None if pd.isna(row.work_type) else row.work_type,
+        ))
+    return results
+
+
+def test_batch_matches_per_ticket(roads_file):
+    expected = per_ticket(ProximityGeocoder(roads_file, memo_size=0), TICKETS)
+    results = ProximityGeocoder(roads_file).geocode_batch(TICKETS)
+
+    assert [r.approach for r in results[:4]] == [
+        "closest_point", "corridor_midpoint", "corridor_midpoint", "city_primary",
+    ]
+    assert results[4].approach == "city_centroid_fallback"
+    assert not results[5].success
+    assert "no segments in buffer" in results[8].reasoning
+    assert [r.to_dict() for r in results] == [r.to_dict() for r in expected]
+
+
+def test_batch_warms_memo(roads_file):
+    geocoder = ProximityGeocoder(roads_file)
+    geocoder.geocode_batch(TICKETS)
+
+    # Rows 0 and 6 share a key; failures without a city centroid are memoized too
+    assert len(geocoder.memo) == 8
+    hits = geocoder.memo.hits
+    geocoder.geocode_proximity("I-20", "CR 426", "Ward", "Pyote")
+    assert geocoder.memo.hits == hits + 1
+
+
+def test_batch_without_optional_columns(roads_file):
+    df = TICKETS[["street", "intersection", "county", "city"]].head(3)
+    results = ProximityGeocoder(roads_file).geocode_batch(df)
+
+    assert [r.success for r in results] == [True, True, True]
+    assert results[0].metadata["ticket_type"] is None
+    assert ProximityGeocoder(roads_file).geocode_batch(df.iloc[0:0]) == []
+
+
+def test_batch_failure_falls_back_per_ticket(roads_file, monkeypatch, caplog):
+    geocoder = ProximityGeocoder(roads_file, memo_size=0)
+
+    def broken(items):
+        raise RuntimeError("vectorized path broke")
+
+    monkeypatch.setattr(geocoder, "_batch_closest_point", broken)
+    results = geocoder.geocode_batch(TICKETS.head(1))
+
+    assert results[0].approach == "closest_point"
+    assert "Batched approach_2 failed" in caplog.text
+    assert "vectorized path broke" in caplog.text
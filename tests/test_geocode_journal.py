@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+test_geocode_journal.py
+
+Tests for the append-only geocode cache journal used by geocode_routes.py.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# scripts isn't a package; add it to the path like the maintenance tools do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "scripts"))
+
+import geocode_journal
+from geocode_journal import GeocodeJournal, journal_path_for, open_geocode_cache
+
+
+def entry(key, status="OK"):
+    return {"geo_key": key, "county": "Ward", "geocode": {"status": status, "lat": 31.5, "lng": -103.1}}
+
+
+def test_flush_appends_only_new_entries(tmp_path):
+    path = tmp_path / "geocode_cache.jsonl"
+    journal = GeocodeJournal(path)
+    journal["a"] = entry("a")
+    journal["b"] = entry("b")
+    assert journal.flush() == 2
+    size = path.stat().st_size
+
+    journal["c"] = entry("c")
+    assert journal.flush() == 1
+    lines = path.read_bytes()
+    assert len(lines.splitlines()) == 3
+    assert lines[size:].startswith(b'["c", ')
+
+    # Nothing pending: nothing written
+    assert journal.flush() == 0
+    assert path.stat().st_size == len(lines)
+
+
+def test_reopen_sees_latest_value_and_deletes(tmp_path):
+    path = tmp_path / "geocode_cache.jsonl"
+    journal = GeocodeJournal(path)
+    journal["a"] = entry("a", "ZERO_RESULTS")
+    journal["b"] = entry("b")
+    journal.flush()
+    journal["a"] = entry("a")
+    del journal["b"]
+    journal.flush()
+    journal.close()
+
+    reopened = GeocodeJournal(path)
+    assert "b" not in reopened
+    assert reopened["a"]["geocode"]["status"] == "OK"
+    assert len(reopened) == 1
+    assert reopened.stale_lines == 3
+    assert dict(reopened.items()) == {"a": entry("a")}
+
+
+def test_pending_entries_visible_before_flush(tmp_path):
+    journal = GeocodeJournal(tmp_path / "geocode_cache.jsonl")
+    journal["a"] = entry("a")
+    assert "a" in journal
+    assert journal.get("a") == entry("a")
+    assert journal.get("missing", {}) == {}
+    with pytest.raises(ValueError):
+        journal["b"] = None
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    path = tmp_path / "geocode_cache.jsonl"
+    journal = GeocodeJournal(path)
+    journal["a"] = entry("a")
+    journal.flush()
+    journal.close()
+    with path.open("ab") as f:
+        f.write(b'["b", {"geo_key": "b", "cou')
+
+    reopened = GeocodeJournal(path)
+    assert list(reopened) == ["a"]
+    reopened["c"] = entry("c")
+    reopened.flush()
+    assert GeocodeJournal(path).to_dict() == {"a": entry("a"), "c": entry("c")}
+
+
+def test_flush_compacts_when_stale_lines_dominate(tmp_path, monkeypatch):
+    monkeypatch.setattr(geocode_journal, "COMPACT_MIN_LINES", 10)
+    path = tmp_path / "geocode_cache.jsonl"
+    journal = GeocodeJournal(path)
+    for round_ in range(3):
+        for i in range(4):
+            journal[f"k{i}"] = entry(f"k{i}", status=f"S{round_}")
+        journal.flush()
+
+    # 12 lines written, 8 stale -> compacted back to the 4 live entries
+    assert len(path.read_bytes().splitlines()) == 4
+    assert journal.stale_lines == 0
+    assert journal["k3"]["geocode"]["status"] == "S2"
+
+
+def test_legacy_json_cache_is_migrated_once(tmp_path):
+    cache_file = tmp_path / "geocode_cache.json"
+    legacy = {"a": entry("a"), "b": entry("b", "ZERO_RESULTS")}
+    cache_file.write_text(json.dumps(legacy, indent=2), encoding="utf-8")
+
+    journal = open_geocode_cache(cache_file)
+    assert journal.path == journal_path_for(cache_file)
+    assert journal.to_dict() == legacy
+    assert not cache_file.exists()
+    assert (tmp_path / "geocode_cache.pre_journal.backup.json").exists()
+
+    journal["c"] = entry("c")
+    journal.flush()
+    assert set(open_geocode_cache(cache_file)) == {"a", "b", "c"}
+
+
+def test_replace_all_rewrites_journal(tmp_path):
+    journal = GeocodeJournal(tmp_path / "geocode_cache.jsonl")
+    journal["a"] = entry("a")
+    journal["b"] = entry("b")
+    journal.flush()
+
+    journal.replace_all({"b": entry("b")})
+    assert journal.to_dict() == {"b": entry("b")}
+    assert GeocodeJournal(journal.path).to_dict() == {"b": entry("b")}
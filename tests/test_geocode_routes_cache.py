@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+test_geocode_routes_cache.py
+
+geocode_routes.py and Stage 1 must build the same Google Geocoding request
+for a location, so they share API response cache entries.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+# scripts isn't a package; Stage 1's modules import relative to kcci_maintenance
+sys.path.insert(0, str(SRC / "scripts"))
+sys.path.insert(0, str(SRC / "kcci_maintenance"))
+
+pytest.importorskip("pandas")
+pytest.importorskip("requests")
+
+import geocode_routes
+from core.api_client import GeocodeQuery, GoogleGeocodingProvider
+from kcci_maintenance.cache.response_cache import ApiResponseCache
+
+
+@pytest.mark.parametrize("street, intersection, county", [
+    ("CR 426", "CR 432", "Ward"),
+    ("TX 302", "", "Winkler"),
+    ("FM 1232", "", ""),
+])
+def test_request_key_matches_stage1(street, intersection, county):
+    line = geocode_routes.build_geocode_query(street, intersection, bool(intersection))
+    script_request = geocode_routes.google_geocode_request(
+        "script-key", line, "Kermit", county, "TX"
+    )
+    stage1_request = GoogleGeocodingProvider("stage1-key").build_request(GeocodeQuery(
+        key="k", street=street, intersection=intersection, city="Kermit", county=county,
+    ))
+
+    assert ApiResponseCache.request_key(script_request) == ApiResponseCache.request_key(stage1_request)
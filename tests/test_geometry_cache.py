@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+test_geometry_cache.py
+
+Tests for the dissolved road geometry LRU cache used by ProximityGeocoder.
+"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import LineString
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+from geometry_cache import GeometryCache
+from proximity_geocoder import ProximityGeocoder
+
+
+@pytest.fixture(scope="module")
+def roads_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("roads") / "roads.gpkg"
+    gdf = gpd.GeoDataFrame(
+        {
+            "road_name": ["Interstate 20", "Interstate 20", "County Road 426", "County Road 432", "FM 1788"],
+            "road_ref": ["I-20", "I-20", "CR 426", "CR 432", "FM 1788"],
+            "road_type": ["Interstate", "Interstate", "CR", "CR", "FM"],
+        },
+        geometry=[
+            LineString([(-103.2, 31.5), (-103.1, 31.5)]),
+            LineString([(-103.1, 31.5), (-103.0, 31.5)]),
+            LineString([(-103.15, 31.45), (-103.15, 31.6)]),
+            LineString([(-103.12, 31.45), (-103.12, 31.6)]),
+            LineString([(-103.05, 31.3), (-103.05, 31.7)]),
+        ],
+        crs="EPSG:4326",
+    )
+    gdf.to_file(path, layer="roads", driver="GPKG")
+    return path
+
+
+TICKETS = [
+    ("CR 426", "CR 432", "Ward", "Pyote"),
+    ("I-20", "CR 426", "Ward", "Pyote"),
+    ("I-20", "FM 1788", "Ward", "Pyote"),
+    ("LAKEVIEW DR", "I-20", "Ward", "Barstow"),
+]
+
+
+def test_lru_eviction_and_stats():
+    roads = gpd.GeoDataFrame(
+        geometry=[LineString([(i, 0), (i + 1, 0)]) for i in range(3)], crs="EPSG:4326"
+    )
+    cache = GeometryCache(maxsize=2)
+
+    first = cache.dissolve(roads.iloc[[0]])
+    assert cache.dissolve(roads.iloc[[0]]) is first
+    cache.dissolve(roads.iloc[[1]])
+    cache.dissolve(roads.iloc[[2]])  # evicts segment 0
+    assert cache.dissolve(roads.iloc[[0]]) is not first
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+    assert stats["evictions"] == 2
+    assert stats["size"] == 2
+    assert stats["hit_rate"] == pytest.approx(0.2)
+
+
+def test_dissolved_road_derived_shapes():
+    roads = gpd.GeoDataFrame(
+        geometry=[LineString([(0, 0), (1, 0)]), LineString([(1, 0), (2, 0)])], crs="EPSG:4326"
+    )
+    road = GeometryCache().dissolve(roads)
+
+    assert road.segment_count == 2
+    assert road.centroid.equals_exact(roads.geometry.union_all().centroid, 1e-12)
+    assert road.buffer(0.5) is road.buffer(0.5)
+    assert road.buffer(0.5).equals(roads.geometry.union_all().buffer(0.5))
+
+
+def test_cached_results_match_uncached(roads_file):
+    # No result memo, so every call goes through the geometry cache
+    cached = ProximityGeocoder(roads_file, memo_size=0)
+    uncached = ProximityGeocoder(roads_file, geometry_cache_size=0, memo_size=0)
+
+    for _ in range(3):
+        for street, intersection, county, city in TICKETS:
+            a = cached.geocode_proximity(street, intersection, county, city, ticket_type="Normal")
+            b = uncached.geocode_proximity(street, intersection, county, city, ticket_type="Normal")
+            assert a.to_dict() == b.to_dict()
+
+    stats = cached.geometry_cache.stats()
+    assert stats["hits"] > stats["misses"]
+    assert uncached.geometry_cache.stats()["size"] == 0
+
+
+def test_cache_cleared_when_roads_replaced(roads_file):
+    geocoder = ProximityGeocoder(roads_file, memo_size=0)
+    geocoder.geocode_proximity("CR 426", "CR 432", "Ward", "Pyote")
+    assert len(geocoder.geometry_cache) > 0
+
+    geocoder.roads = geocoder.roads.copy()
+    geocoder._sync_roads()
+    assert len(geocoder.geometry_cache) == 0
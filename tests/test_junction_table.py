@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+test_junction_table.py
+
+Tests for the precomputed road junction table and its use by GeometricGeocoder.
+"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import LineString, Point, box
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+from geometric_geocoder import GeometricGeocoder
+from junction_table import JunctionTable, junctions_path_for, load_junctions
+from road_snapshot import read_gpkg_roads
+
+
+@pytest.fixture
+def roads_file(tmp_path):
+    path = tmp_path / "roads.gpkg"
+    gpd.GeoDataFrame(
+        {
+            "road_name": [
+                "County Road 426", "County Road 426", "County Road 432", None,
+                "Farm-to-Market Road 1788", "County Road 426", "County Road 432",
+            ],
+            "road_ref": ["CR 426", "CR 426", "CR 432", "CR 432", "FM 1788", "CR 426", "CR 432"],
+            "road_type": ["CR", "CR", "CR", "CR", "FM", "CR", "CR"],
+        },
+        geometry=[
+            LineString([(-103.2, 31.5), (-103.1, 31.5)]),
+            LineString([(-103.1, 31.5), (-103.0, 31.5)]),
+            LineString([(-103.15, 31.45), (-103.15, 31.55)]),
+            # Continues CR 432 (same ref): not a junction with its other segment
+            LineString([(-103.15, 31.55), (-103.15, 31.6)]),
+            # FM 1788 crosses CR 432 but not CR 426
+            LineString([(-103.3, 31.58), (-103.0, 31.58)]),
+            # Another CR 426 / CR 432 pair in a different county
+            LineString([(-101.2, 32.5), (-101.0, 32.5)]),
+            LineString([(-101.1, 32.4), (-101.1, 32.6)]),
+        ],
+        crs="EPSG:4326",
+    ).to_file(path, layer="roads", driver="GPKG")
+    return path
+
+
+@pytest.fixture
+def counties_file(tmp_path):
+    path = tmp_path / "counties.geojson"
+    gpd.GeoDataFrame(
+        {"CNTY_NM": ["Ward", "Howard"]},
+        geometry=[box(-103.5, 31.0, -102.5, 32.0), box(-101.5, 32.0, -100.5, 33.0)],
+        crs="EPSG:4326",
+    ).to_file(path, driver="GeoJSON")
+    return path
+
+
+def test_self_join_finds_junctions_between_different_roads(roads_file):
+    table = JunctionTable.build(read_gpkg_roads(roads_file))
+
+    points = table.points(["CR 426"], ["CR 432"])
+    assert sorted((p.x, p.y) for p in points) == [(-103.15, 31.5), (-101.1, 32.5)]
+    # Keyed by every name/ref pair, in either order
+    assert len(table.points(["COUNTY ROAD 432"], ["COUNTY ROAD 426"])) == 2
+    assert [(p.x, p.y) for p in table.points(["FM 1788"], ["CR 432"])] == [(-103.15, 31.58)]
+    assert table.points(["CR 426"], ["FM 1788"]) == []
+    assert table.points(["CR 432"], ["CR 432"]) == []
+
+
+def test_county_filter(roads_file, counties_file):
+    table = load_junctions(roads_file, county_boundaries=counties_file)
+    assert table.stats()["with_county"] == len(table)
+
+    points = table.points(["CR 426"], ["CR 432"], county="Ward County")
+    assert [(p.x, p.y) for p in points] == [(-103.15, 31.5)]
+    assert table.points(["CR 426"], ["CR 432"], county="Andrews") == []
+
+
+def test_table_is_stored_and_reused(roads_file):
+    pytest.importorskip("pyarrow")
+    table = load_junctions(roads_file)
+    assert junctions_path_for(roads_file).exists()
+
+    reloaded = load_junctions(roads_file)
+    assert reloaded.junctions.equals(table.junctions)
+    assert reloaded._rows.keys() == table._rows.keys()
+
+
+def test_geocoder_uses_junction_table(roads_file, counties_file):
+    legacy = GeometricGeocoder(roads_file)
+    geocoder = GeometricGeocoder(roads_file, junctions=True, county_boundaries=counties_file)
+
+    result = geocoder.geocode_intersection("CR 426", "CR 432", "Ward", "Pyote")
+    assert result.success
+    assert (result.lat, result.lng, result.confidence) == (31.5, -103.15, 0.95)
+    assert result.metadata["source"] == "junction_table"
+    # Per-ticket intersection matches the table's answer
+    legacy_result = legacy.geocode_intersection("CR 426", "CR 432", "Ward", "Pyote")
+    assert (legacy_result.lat, legacy_result.lng) == (result.lat, result.lng)
+
+    result = geocoder.geocode_intersection("CR 426", "FM 1788", "Ward", "Pyote")
+    assert not result.success
+    assert "do not intersect" in result.error
+
+
+def test_bounds_and_city_disambiguation(roads_file, counties_file):
+    geocoder = GeometricGeocoder(roads_file, county_boundaries=counties_file)
+    ward, howard = Point(-103.15, 31.5), Point(-101.1, 32.5)
+
+    # County polygons drop points outside the ticket county
+    assert geocoder._filter_by_bounds([ward, howard], "Ward County", "Nowhere") == [ward]
+    assert geocoder._filter_by_bounds([ward, howard], "Howard", "Nowhere") == [howard]
+    assert geocoder._filter_by_bounds([ward], "Howard", "Nowhere") == []
+    # City radius (Pyote is in the built-in gazetteer), preferred but not required
+    unbounded = GeometricGeocoder(roads_file)
+    assert unbounded._filter_by_bounds([howard, ward], "Ward", "Pyote") == [ward]
+    assert unbounded._filter_by_bounds([howard], "Ward", "Pyote") == [howard]
+
+    # Several points: nearest to the city center wins
+    near, far = Point(-103.13, 31.55), Point(-103.6, 31.3)
+    assert geocoder._choose_best_intersection([far, near], "Pyote", "Ward") == (near, 0.85)
+    other = Point(-103.12, 31.53)  # About as close as near
+    point, confidence = geocoder._choose_best_intersection([far, other, near], "Pyote", "Ward")
+    assert point == near and confidence == 0.6
+    point, confidence = geocoder._choose_best_intersection([far, near, ward], "Nowhere", "Ward")
+    assert point == ward and confidence == 0.6  # Centroid fallback
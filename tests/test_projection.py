@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+test_projection.py
+
+Tests for the metric (UTM) geometry used by ProximityGeocoder.
+"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import LineString
+from shapely.ops import nearest_points
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+from projection import PROJECTED_COLUMN, MetricProjection, utm_crs_for
+from proximity_geocoder import ProximityGeocoder
+
+# ~1 km of longitude at 31.5°N
+KM_LNG = 1 / 94.9
+
+
+@pytest.fixture(scope="module")
+def roads_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("projection") / "roads.gpkg"
+    x = -103.2
+    gpd.GeoDataFrame(
+        {
+            "road_name": ["County Road 426", "County Road 432", "Interstate 20", "Interstate 20"],
+            "road_ref": ["CR 426", "CR 432", "I-20", "I-20"],
+            "road_type": ["CR", "CR", "Interstate", "Interstate"],
+        },
+        geometry=[
+            LineString([(x, 31.4), (x, 31.6)]),
+            LineString([(x + 0.5 * KM_LNG, 31.4), (x + 0.5 * KM_LNG, 31.6)]),  # 500 m east
+            LineString([(x + 3 * KM_LNG, 31.5), (x + 4 * KM_LNG, 31.5)]),    # 3-4 km east
+            LineString([(x + 7 * KM_LNG, 31.5), (x + 8 * KM_LNG, 31.5)]),    # 7-8 km east
+        ],
+        crs="EPSG:4326",
+    ).to_file(path, layer="roads", driver="GPKG")
+    return path
+
+
+def test_utm_zone_selection():
+    assert utm_crs_for(-103.1, 31.5) == "EPSG:32613"  # Ward County
+    assert utm_crs_for(-101.9, 33.6) == "EPSG:32614"  # Lubbock
+    assert utm_crs_for(151.2, -33.9) == "EPSG:32756"
+
+
+def test_round_trip_to_geographic():
+    roads = gpd.GeoDataFrame(
+        geometry=[LineString([(-103.2, 31.5), (-103.1, 31.5)])], crs="EPSG:4326"
+    )
+    projection = MetricProjection.for_roads(roads)
+    projected = projection.project(roads)
+
+    assert projection.name == "EPSG:32613"
+    assert projected[PROJECTED_COLUMN].iloc[0].length == pytest.approx(9495, rel=0.01)
+    start = projection.to_geographic(projected[PROJECTED_COLUMN].iloc[0].interpolate(0))
+    assert (start.x, start.y) == (pytest.approx(-103.2), pytest.approx(31.5))
+
+
+def test_roads_without_crs_are_taken_as_wgs84():
+    roads = gpd.GeoDataFrame(geometry=[LineString([(-101.9, 33.6), (-101.8, 33.6)])])
+    projection = MetricProjection.for_roads(roads)
+
+    assert projection.name == "EPSG:32614"
+    assert projection.geographic_crs.to_string() == "EPSG:4326"
+    length = projection.project(roads)[PROJECTED_COLUMN].iloc[0].length
+    assert length == pytest.approx(9280, rel=0.01)
+
+
+def test_closest_point_distance_in_meters(roads_file):
+    geocoder = ProximityGeocoder(roads_file, memo_size=0)
+    result = geocoder.geocode_proximity("CR 426", "CR 432", "Ward", "Pyote")
+
+    assert result.approach == "closest_point"
+    assert "Distance: 500m" in result.reasoning
+    # 0.95 within 100 m, 0.5 at 1 km: 500 m -> 0.75
+    assert result.confidence == pytest.approx(0.75, abs=0.01)
+    assert result.lng == pytest.approx(-103.2)
+
+
+def test_corridor_buffer_in_meters(roads_file):
+    geocoder = ProximityGeocoder(roads_file, memo_size=0)
+    result = geocoder.geocode_proximity("I-20", "CR 426", "Ward", "Pyote")
+
+    # Only the I-20 segment within 5 km of CR 426 is used
+    assert result.approach == "corridor_midpoint"
+    assert "1 segment(s)" in result.reasoning
+    assert result.lng == pytest.approx(-103.2 + 3.5 * KM_LNG, abs=1e-4)
+
+
+def test_corridor_uses_segment_tree(roads_file):
+    geocoder = ProximityGeocoder(roads_file, memo_size=0)
+    interstate = geocoder._find_road("I-20")
+    county_road = geocoder._find_road("CR 426")
+
+    near = geocoder.segment_tree.query(
+        county_road[PROJECTED_COLUMN].values, predicate="dwithin", distance=5000
+    )[1]
+    assert interstate[geocoder._corridor_mask(interstate, near)].index.tolist() == [2]
+
+    # Fallback: closest point of the nearest segment pair equals nearest_points on the unions
+    point = geocoder._nearest_point_on(interstate, county_road)
+    expected = nearest_points(
+        interstate[PROJECTED_COLUMN].union_all(), county_road[PROJECTED_COLUMN].union_all()
+    )[0]
+    assert point.equals(expected)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+test_proximity_memo.py
+
+Tests for memoizing ProximityGeocoder.geocode_proximity on the normalized
+(street, intersection, county, city) key.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import LineString, box
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+from proximity_geocoder import ProximityGeocoder
+from proximity_memo import ProximityGeometry, ProximityMemo
+
+
+@pytest.fixture
+def roads_file(tmp_path):
+    path = tmp_path / "roads.gpkg"
+    gdf = gpd.GeoDataFrame(
+        {
+            "road_name": ["Interstate 20", "County Road 426", "County Road 432"],
+            "road_ref": ["I-20", "CR 426", "CR 432"],
+            "road_type": ["Interstate", "CR", "CR"],
+        },
+        geometry=[
+            LineString([(-103.2, 31.5), (-103.0, 31.5)]),
+            LineString([(-103.15, 31.45), (-103.15, 31.6)]),
+            LineString([(-103.12, 31.45), (-103.12, 31.6)]),
+        ],
+        crs="EPSG:4326",
+    )
+    gdf.to_file(path, layer="roads", driver="GPKG")
+    return path
+
+
+def test_metadata_only_changes_hit_memo(roads_file):
+    geocoder = ProximityGeocoder(roads_file)
+
+    normal = geocoder.geocode_proximity("CR 426", "CR 432", "Ward", "Pyote", ticket_type="Normal")
+    emergency = geocoder.geocode_proximity(
+        "cr426", "cr-432", "WARD", "PYOTE",
+        ticket_type="Emergency", duration="1 DAY",
+    )
+
+    stats = geocoder.memo.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+    assert (emergency.lat, emergency.lng) == (normal.lat, normal.lng)
+    assert emergency.confidence > normal.confidence
+    # Metadata and reasoning reflect the caller's own inputs
+    assert emergency.metadata["street"] == "cr426"
+    assert emergency.metadata["ticket_type"] == "Emergency"
+
+
+def test_memoized_result_matches_uncached(roads_file):
+    memoized = ProximityGeocoder(roads_file)
+    uncached = ProximityGeocoder(roads_file, memo_size=0)
+
+    tickets = [
+        ("CR 426", "CR 432", "Ward", "Pyote"),
+        ("I-20", "CR 426", "Ward", "Pyote"),
+        ("LAKEVIEW DR", "I-20", "Ward", "Barstow"),
+        ("NOPE", "NADA", "Ward", "Pyote"),
+        ("NOPE", "NADA", "Dallas", "Dallas"),
+    ]
+    for _ in range(2):
+        for ticket in tickets:
+            a = memoized.geocode_proximity(*ticket, duration="2 MONTHS")
+            b = uncached.geocode_proximity(*ticket, duration="2 MONTHS")
+            assert a.to_dict() == b.to_dict()
+
+    assert memoized.memo.stats()["hits"] == len(tickets)
+
+
+def test_disk_memo_survives_restart(roads_file, tmp_path):
+    memo_path = tmp_path / "memo.db"
+    first = ProximityGeocoder(roads_file, memo_path=memo_path)
+    expected = first.geocode_proximity("I-20", "CR 426", "Ward", "Pyote").to_dict()
+    first.memo.close()
+
+    second = ProximityGeocoder(roads_file, memo_path=memo_path)
+    assert second.geocode_proximity("I-20", "CR 426", "Ward", "Pyote").to_dict() == expected
+    assert second.memo.stats()["disk_hits"] == 1
+
+
+def test_disk_memo_ignored_when_roads_change(roads_file, tmp_path):
+    memo_path = tmp_path / "memo.db"
+    first = ProximityGeocoder(roads_file, memo_path=memo_path)
+    first.geocode_proximity("I-20", "CR 426", "Ward", "Pyote")
+    first.memo.close()
+
+    stat = roads_file.stat()
+    os.utime(roads_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    second = ProximityGeocoder(roads_file, memo_path=memo_path)
+    second.geocode_proximity("I-20", "CR 426", "Ward", "Pyote")
+    assert second.memo.stats()["disk_hits"] == 0
+    assert second.memo.stats()["misses"] == 1
+
+
+def test_errors_from_exceptions_are_not_memoized():
+    memo = ProximityMemo()
+    memo.put(("A",), ProximityGeometry(success=False, error="boom", cacheable=False))
+    assert memo.get(("A",)) is None
+
+
+def test_lru_bound():
+    memo = ProximityMemo(maxsize=2)
+    for name in ("A", "B", "C"):
+        memo.put((name,), ProximityGeometry(success=True, lat=1.0, lng=2.0))
+    assert len(memo) == 2
+    assert memo.get(("A",)) is None
+    assert memo.get(("C",)) is not None
+
+
+def test_disk_memo_ignored_when_county_scoping_changes(roads_file, tmp_path):
+    memo_path = tmp_path / "memo.db"
+    counties_file = tmp_path / "counties.geojson"
+    gpd.GeoDataFrame(
+        {"county": ["Ward"]}, geometry=[box(-104, 31, -103, 32)], crs="EPSG:4326"
+    ).to_file(counties_file, driver="GeoJSON")
+
+    unscoped = ProximityGeocoder(roads_file, memo_path=memo_path)
+    unscoped.geocode_proximity("I-20", "CR 426", "Ward", "Pyote")
+    unscoped.memo.close()
+
+    scoped = ProximityGeocoder(roads_file, memo_path=memo_path, county_boundaries=counties_file)
+    scoped.geocode_proximity("I-20", "CR 426", "Ward", "Pyote")
+    assert scoped.memo.stats()["disk_hits"] == 0
+    scoped.memo.close()
+
+    # Replacing the boundaries file invalidates the memo too
+    stat = counties_file.stat()
+    os.utime(counties_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    replaced = ProximityGeocoder(roads_file, memo_path=memo_path, county_boundaries=counties_file)
+    replaced.geocode_proximity("I-20", "CR 426", "Ward", "Pyote")
+    assert replaced.memo.stats()["disk_hits"] == 0
+
+
+def test_resize_evicts_least_recently_used():
+    memo = ProximityMemo(maxsize=3)
+    for name in ("A", "B", "C"):
+        memo.put((name,), ProximityGeometry(success=True, lat=1.0, lng=2.0))
+    memo.get(("A",))
+
+    memo.resize(2)
+    assert len(memo) == 2
+    assert memo.get(("B",)) is None
+    assert memo.get(("A",)) is not None
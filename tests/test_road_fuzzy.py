@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+test_road_fuzzy.py
+
+Tests for typo-tolerant road-name matching (BK-tree per county).
+"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import LineString, box
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+from county_index import CountyRoadIndex
+from proximity_geocoder import ProximityGeocoder
+from road_fuzzy import BKTree, FuzzyRoadMatcher, _distance, _pattern
+from road_index import RoadNameIndex
+
+
+def edit_distance(a, b):
+    return _distance(_pattern(a), len(a), b)
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("MONAHANS", "MONAHANS", 0),
+    ("MONAHNS", "MONAHANS", 1),
+    ("FN 1216", "FM 1216", 1),
+    ("COUNTY RAOD", "COUNTY ROAD", 2),
+    ("KERMIT", "PYOTE", 6),
+    ("", "CR 426", 6),
+])
+def test_edit_distance(a, b, expected):
+    assert edit_distance(a, b) == expected
+    assert edit_distance(b, a) == expected
+
+
+def test_bk_tree_search_matches_brute_force():
+    words = ["CR 426", "CR 432", "FM 1216", "FM 1219", "MONAHANS HWY", "KERMIT HWY", "SH 115"]
+    tree = BKTree(words)
+    assert len(tree) == len(words)
+    for query in ["CR 427", "FM 121", "MONAHNS HWY", "SH 15"]:
+        expected = sorted(
+            (edit_distance(query, word), word) for word in words
+            if edit_distance(query, word) <= 2
+        )
+        assert tree.search(query, 2) == expected
+
+
+@pytest.fixture
+def roads():
+    return gpd.GeoDataFrame(
+        {
+            "name": ["Monahans Highway", "Kermit Highway", "County Road 426", "Mermit Highway"],
+            "ref": [None, None, "CR 426", None],
+        },
+        geometry=[
+            LineString([(0.2, 0.5), (0.8, 0.5)]),   # Ward
+            LineString([(1.2, 0.5), (1.8, 0.5)]),   # Winkler
+            LineString([(0.2, 0.2), (0.8, 0.2)]),   # Ward
+            LineString([(1.2, 0.2), (1.8, 0.2)]),   # Winkler
+        ],
+        crs="EPSG:4326",
+    )
+
+
+@pytest.fixture
+def counties():
+    return gpd.GeoDataFrame(
+        {"county": ["WARD", "WINKLER"]},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)],
+        crs="EPSG:4326",
+    )
+
+
+def test_matcher_corrects_typos(roads):
+    matcher = FuzzyRoadMatcher(RoadNameIndex(roads))
+    match = matcher.match("MONAHNS HIGHWAY")
+    assert match.name == "MONAHANS HIGHWAY"
+    assert match.distance == 1
+    assert matcher.match("COUNTY RAOD 426").name == "COUNTY ROAD 426"
+
+
+def test_matcher_rejects_number_changes_and_short_names(roads):
+    matcher = FuzzyRoadMatcher(RoadNameIndex(roads))
+    assert matcher.match("CR 427") is None
+    assert matcher.match("CR 4") is None
+
+
+def test_matcher_leaves_ties_alone(roads):
+    # One edit from both KERMIT and MERMIT without county scoping
+    matcher = FuzzyRoadMatcher(RoadNameIndex(roads))
+    assert matcher.match("LERMIT HIGHWAY") is None
+
+
+def test_matcher_scopes_candidates_to_county(roads, counties):
+    matcher = FuzzyRoadMatcher(RoadNameIndex(roads), CountyRoadIndex(roads, counties))
+    # Only MONAHANS and COUNTY ROAD 426 / CR 426 are in Ward
+    assert matcher.match("KERMT HIGHWAY", "Ward") is None
+    match = matcher.match("KERMT HIGHWAY", "Winkler")
+    assert (match.name, match.scope) == ("KERMIT HIGHWAY", "WINKLER")
+    assert matcher.stats()["scopes"] == {"WARD": 3, "WINKLER": 2}
+
+
+def test_proximity_geocoder_corrects_unresolved_names(tmp_path, roads, counties):
+    roads_file = tmp_path / "roads.gpkg"
+    roads.to_file(roads_file, layer="roads", driver="GPKG")
+    counties_file = tmp_path / "counties.geojson"
+    counties.to_file(counties_file, driver="GeoJSON")
+
+    geocoder = ProximityGeocoder(roads_file, county_boundaries=counties_file)
+    assert geocoder.correct_road_name("CR 426", "Ward") is None  # Resolves as is
+    match = geocoder.correct_road_name("MONAHNS HWY", "Ward")
+    assert match.name == "MONAHANS HIGHWAY"
+    assert geocoder.find_road(match.name, "Ward") is not None
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+test_road_graph.py
+
+Tests for the road topology graph and network-distance approach (approach 5).
+"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import LineString
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+from proximity_geocoder import ProximityGeocoder
+from road_graph import RoadGraph
+
+
+# Meters: A runs east; B meets A at x=1000; C links B's north end to D; D is isolated from A
+SEGMENTS = [
+    LineString([(0, 0), (1000, 0)]),            # 0 A
+    LineString([(1000, 0), (3000, 0)]),         # 1 A
+    LineString([(1000, 0), (1000, 2000)]),      # 2 B
+    LineString([(1000, 2000), (1000, 2500)]),   # 3 B
+    LineString([(1000, 2500), (4000, 2500)]),   # 4 C
+    LineString([(4000, 2500), (4000, 9000)]),   # 5 D
+    LineString([(9000, 9000), (9500, 9000)]),   # 6 E (disconnected)
+]
+
+
+@pytest.fixture
+def graph():
+    return RoadGraph.from_segments(np.array(SEGMENTS, dtype=object), max_distance=5000)
+
+
+def test_csr_adjacency(graph):
+    assert graph.node_count == 9
+    assert len(graph.neighbors) == 2 * len(SEGMENTS)
+    node = graph.segment_nodes[2, 0]  # (1000, 0): A, A and B meet here
+    assert graph.degree(node) == 3
+    edges = graph.edge_segments[graph.indptr[node]:graph.indptr[node + 1]]
+    assert sorted(edges.tolist()) == [0, 1, 2]
+
+
+def test_snapping_joins_nearby_endpoints():
+    graph = RoadGraph.from_segments(np.array([
+        LineString([(0, 0), (100, 0)]),
+        LineString([(100.2, 0.1), (200, 0)]),
+    ], dtype=object))
+    assert graph.segment_nodes[0, 1] == graph.segment_nodes[1, 0]
+
+
+def test_junctions_and_nearest(graph):
+    # B connects to A at (1000, 0) and to C at (1000, 2500), not at its inner node
+    junctions = graph.junctions([2, 3])
+    assert sorted(map(tuple, graph.node_xy[junctions])) == [(1000, 0), (1000, 2500)]
+
+    match = graph.nearest(junctions, graph.segment_nodes_of([0, 1]))
+    assert match.distance == 0
+    assert tuple(graph.node_xy[match.target]) == (1000, 0)
+
+    # D is reached from B's north junction through C
+    match = graph.nearest(graph.junctions([2, 3]), graph.segment_nodes_of([5]))
+    assert match.distance == pytest.approx(3000)
+    assert [tuple(graph.node_xy[n]) for n in graph.path(match)] == [(1000, 2500), (4000, 2500)]
+
+
+def test_search_is_bounded_and_cached(graph):
+    assert graph.nearest(graph.junctions([2, 3]), graph.segment_nodes_of([6])) is None
+
+    source = int(graph.segment_nodes[4, 0])
+    tree = graph.shortest_paths(source)
+    assert max(tree.distances.values()) <= 5000
+    assert graph.shortest_paths(source) is tree
+    assert graph.stats()["hits"] >= 1
+
+
+# Degrees at 31.5°N: ~1 km of longitude / latitude
+KM_LNG = 1 / 94.9
+KM_LAT = 1 / 110.9
+
+
+@pytest.fixture(scope="module")
+def roads_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("graph") / "roads.gpkg"
+    x, y = -103.2, 31.5
+    gpd.GeoDataFrame(
+        {
+            "road_name": ["County Road 426", "County Road 426", "County Road 432", "Farm-to-Market Road 1788", "County Road 440"],
+            "road_ref": ["CR 426", "CR 426", "CR 432", "FM 1788", "CR 440"],
+            "road_type": ["CR", "CR", "CR", "FM", "CR"],
+        },
+        geometry=[
+            LineString([(x, y), (x + 2 * KM_LNG, y)]),
+            LineString([(x + 2 * KM_LNG, y), (x + 4 * KM_LNG, y)]),
+            # CR 432 tees into CR 426 at 2 km
+            LineString([(x + 2 * KM_LNG, y), (x + 2 * KM_LNG, y + 3 * KM_LAT)]),
+            # FM 1788 leaves CR 432's north end; CR 440 crosses CR 432 without a shared node
+            LineString([(x + 2 * KM_LNG, y + 3 * KM_LAT), (x + 6 * KM_LNG, y + 3 * KM_LAT)]),
+            LineString([(x, y + 0.3 * KM_LAT), (x + 4 * KM_LNG, y + 0.3 * KM_LAT)]),
+        ],
+        crs="EPSG:4326",
+    ).to_file(path, layer="roads", driver="GPKG")
+    return path
+
+
+def test_network_approach_selected_for_connected_roads(roads_file):
+    geocoder = ProximityGeocoder(roads_file, memo_size=0, network_distance=True)
+
+    result = geocoder.geocode_proximity("CR 426", "CR 432", "Ward", "Pyote")
+    assert result.approach == "network_distance"
+    assert "meet at a junction" in result.reasoning
+    assert result.lng == pytest.approx(-103.2 + 2 * KM_LNG, abs=1e-6)
+    assert result.lat == pytest.approx(31.5, abs=1e-6)
+
+    # FM 1788 is 3 km from CR 426 along CR 432
+    result = geocoder.geocode_proximity("CR 426", "FM 1788", "Ward", "Pyote")
+    assert result.approach == "network_distance"
+    assert "along the network" in result.reasoning
+    assert result.confidence == pytest.approx(0.85 - 0.25 * 3000 / 5000, abs=0.001)
+
+    # Unconnected roads keep the geometric approaches
+    result = geocoder.geocode_proximity("CR 440", "CR 432", "Ward", "Pyote")
+    assert result.approach == "closest_point"
+
+
+def test_network_approach_on_shared_graph(roads_file):
+    """Workers on a shared network map the graph written with it."""
+    pytest.importorskip("pyarrow")
+    from road_shared import build_shared_network
+
+    shared_path = build_shared_network(roads_file, graph=True)
+    geocoder = ProximityGeocoder(
+        roads_file, memo_size=0, shared_network=shared_path, network_distance=True
+    )
+    expected = ProximityGeocoder(roads_file, memo_size=0, network_distance=True)
+
+    for street, reference in [("CR 426", "CR 432"), ("CR 426", "FM 1788")]:
+        result = geocoder.geocode_proximity(street, reference, "Ward", "Pyote")
+        direct = expected.geocode_proximity(street, reference, "Ward", "Pyote")
+        assert result.approach == "network_distance"
+        assert (result.lat, result.lng, result.confidence) == pytest.approx(
+            (direct.lat, direct.lng, direct.confidence)
+        )
+    assert not geocoder.road_graph.neighbors.flags.writeable
+
+
+def test_network_distance_is_opt_in(roads_file):
+    geocoder = ProximityGeocoder(roads_file, memo_size=0)
+    assert geocoder.road_graph is None
+    assert geocoder.geocode_proximity("CR 426", "CR 432", "Ward", "Pyote").approach == "closest_point"
+
+
+def test_batch_matches_per_ticket_with_network(roads_file):
+    df = pd.DataFrame(
+        [("CR 426", "CR 432"), ("CR 426", "FM 1788"), ("CR 440", "CR 432"), ("CR 426", "CR 432")],
+        columns=["street", "intersection"],
+    ).assign(county="Ward", city="Pyote")
+    expected = [
+        ProximityGeocoder(roads_file, memo_size=0, network_distance=True).geocode_proximity(
+            row.street, row.intersection, row.county, row.city
+        )
+        for row in df.itertuples()
+    ]
+    results = ProximityGeocoder(roads_file, network_distance=True).geocode_batch(df)
+    assert [r.to_dict() for r in results] == [r.to_dict() for r in expected]
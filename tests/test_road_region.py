@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+test_road_region.py
+
+Tests for project-bounded, tile-paged road network loading.
+"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import LineString, box
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+from road_region import RoadRegion
+from proximity_geocoder import ProximityGeocoder
+
+
+ROADS = [
+    # road_name, road_ref, road_type, geometry (tiles are 0.5 degrees)
+    ("County Road 426", "CR 426", "CR", LineString([(-103.4, 31.6), (-103.2, 31.6)])),
+    ("County Road 432", "CR 432", "CR", LineString([(-103.3, 31.55), (-103.3, 31.7)])),
+    # Crosses from tile x=-207 into x=-206
+    ("Interstate 20", "I-20", "Interstate", LineString([(-103.3, 31.52), (-102.7, 31.52)])),
+    # One ring east of the initial tile
+    ("Farm-to-Market Road 1788", "FM 1788", "FM", LineString([(-102.8, 31.6), (-102.6, 31.6)])),
+    # Far away (Brewster)
+    ("County Road 700", "CR 700", "CR", LineString([(-100.8, 31.6), (-100.6, 31.6)])),
+]
+
+
+@pytest.fixture(scope="module")
+def network(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("region")
+    roads_file = tmp / "roads.gpkg"
+    gpd.GeoDataFrame(
+        {
+            "road_name": [r[0] for r in ROADS],
+            "road_ref": [r[1] for r in ROADS],
+            "road_type": [r[2] for r in ROADS],
+        },
+        geometry=[r[3] for r in ROADS],
+        crs="EPSG:4326",
+    ).to_file(roads_file, layer="roads", driver="GPKG")
+
+    counties_file = tmp / "counties.geojson"
+    gpd.GeoDataFrame(
+        {"county": ["Ward", "Brewster"]},
+        geometry=[box(-103.5, 31.5, -103.0, 32.0), box(-101.0, 31.5, -100.5, 32.0)],
+        crs="EPSG:4326",
+    ).to_file(counties_file, driver="GeoJSON")
+    return roads_file, counties_file
+
+
+PROJECT = (-103.45, 31.55, -103.1, 31.75)
+
+
+def test_region_loads_only_intersecting_tiles(network):
+    roads_file, _ = network
+    region = RoadRegion(roads_file, PROJECT)
+    roads = region.load_initial()
+
+    assert region.tiles == {(-207, 63)}
+    assert list(roads["ref"]) == ["CR 426", "CR 432", "I-20"]
+    assert list(roads.index) == [1, 2, 3]  # GeoPackage feature ids
+    assert region.load(PROJECT) is None
+
+
+def test_expand_pages_in_rings_once(network):
+    roads_file, _ = network
+    region = RoadRegion(roads_file, PROJECT, max_rings=1)
+    region.load_initial()
+
+    added = region.expand()
+    # I-20 also lies in the new tile but is not loaded twice
+    assert list(added["ref"]) == ["FM 1788"]
+    assert len(region.tiles) == 9
+    assert region.expand() is None
+
+
+def test_geocoder_pages_in_missing_road(network):
+    roads_file, _ = network
+    # Same projection for both (the default UTM zone follows the loaded extent)
+    full = ProximityGeocoder(roads_file, memo_size=0, projected_crs="EPSG:32613")
+    bounded = ProximityGeocoder(
+        roads_file, memo_size=0, region_bounds=PROJECT, projected_crs="EPSG:32613"
+    )
+    assert len(bounded.roads) == 3
+
+    # Inside the region: same answer as the full network
+    a = full.geocode_proximity("CR 426", "CR 432", "Ward", "Pyote")
+    b = bounded.geocode_proximity("CR 426", "CR 432", "Ward", "Pyote")
+    assert (a.lat, a.lng, a.approach) == (b.lat, b.lng, b.approach)
+
+    # FM 1788 is one tile ring away
+    result = bounded.geocode_proximity("I-20", "FM 1788", "Ward", "Pyote")
+    assert result.success
+    assert result.approach == "corridor_midpoint"
+    assert "FM 1788" in set(bounded.roads["ref"])
+    assert bounded.region.rings == 1
+
+
+def test_geocoder_pages_in_ticket_county(network):
+    roads_file, counties_file = network
+    geocoder = ProximityGeocoder(
+        roads_file, memo_size=0, county_boundaries=counties_file,
+        region_bounds=PROJECT, max_page_rings=0,
+    )
+    assert "CR 700" not in set(geocoder.roads["ref"])
+
+    result = geocoder.geocode_proximity("CR 700", "", "Brewster", "")
+    assert result.success
+    assert result.lng == pytest.approx(-100.7)
+    assert geocoder.region.rings == 0
+
+
+def test_missing_road_stops_after_max_rings(network):
+    roads_file, _ = network
+    geocoder = ProximityGeocoder(roads_file, memo_size=0, region_bounds=PROJECT, max_page_rings=2)
+
+    assert geocoder._find_road_paged("CR 999", "Ward") is None
+    assert geocoder.region.rings == 2
+    assert "CR 700" not in set(geocoder.roads["ref"])
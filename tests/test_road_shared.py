@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+test_road_shared.py
+
+Tests for the memory-mapped shared road network (road_shared.py).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import LineString, MultiLineString
+
+pytest.importorskip("pyarrow")
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+from projection import MetricProjection
+from proximity_geocoder import ProximityGeocoder
+from road_index import RoadNameIndex
+from road_shared import SharedRoadNetwork, build_shared_network
+from road_snapshot import read_gpkg_roads
+
+
+@pytest.fixture
+def roads_file(tmp_path):
+    path = tmp_path / "roads.gpkg"
+    gpd.GeoDataFrame(
+        {
+            "road_name": ["Interstate 20", "Interstate 20", "County Road 426", "County Road 432", None],
+            "road_ref": ["I-20", "I-20", "CR 426", "CR 432", "FM 1788"],
+            "road_type": ["Interstate", "Interstate", "CR", "CR", "FM"],
+        },
+        geometry=[
+            LineString([(-103.2, 31.5), (-103.1, 31.5)]),
+            LineString([(-103.1, 31.5), (-103.0, 31.5)]),
+            LineString([(-103.15, 31.45), (-103.15, 31.55), (-103.16, 31.6)]),
+            LineString([(-103.12, 31.45), (-103.12, 31.6)]),
+            MultiLineString([[(-103.05, 31.3), (-103.05, 31.5)], [(-103.05, 31.5), (-103.04, 31.7)]]),
+        ],
+        crs="EPSG:4326",
+    ).to_file(path, layer="roads", driver="GPKG")
+    return path
+
+
+def test_shared_network_matches_gpkg(roads_file):
+    network = SharedRoadNetwork.open(roads_file, build_shared_network(roads_file))
+    roads = read_gpkg_roads(roads_file)
+
+    assert len(network) == len(roads)
+    assert not network.coords.flags.owndata  # Mapped, not copied
+
+    segments = network.segments([4, 0])
+    assert segments.index.tolist() == [4, 0]
+    assert list(segments.columns) == list(roads.columns)
+    assert segments.geometry.geom_equals(roads.geometry.iloc[[4, 0]].set_axis([4, 0])).all()
+    assert segments["name"].isna().tolist() == [True, False]
+    assert network.materialized == 2
+
+    index = RoadNameIndex(roads)
+    for name in ("I-20", "CR 426", "FM 1788", "MISSING"):
+        assert network.index.positions(name).tolist() == index.positions(name).tolist()
+    assert network.index.positions_containing(["CR"]).tolist() == index.positions_containing(["CR"]).tolist()
+
+    lengths = network.lengths()
+    assert lengths == pytest.approx(roads.geometry.length.to_numpy())
+
+
+def test_stale_shared_network_is_ignored(roads_file):
+    shared_path = build_shared_network(roads_file)
+    with open(roads_file, "ab") as f:
+        f.write(b"\0")
+    assert SharedRoadNetwork.open(roads_file, shared_path) is None
+
+    # The geocoder falls back to loading the GeoPackage
+    geocoder = ProximityGeocoder(roads_file, memo_size=0, shared_network=shared_path)
+    assert geocoder.shared is None
+    assert len(geocoder.roads) == 5
+
+
+def test_geocoder_materializes_only_matched_segments(roads_file):
+    shared_path = build_shared_network(roads_file)
+    geocoder = ProximityGeocoder(roads_file, memo_size=0, shared_network=shared_path)
+    assert len(geocoder.roads) == 0
+
+    result = geocoder.geocode_proximity("CR 426", "CR 432", "Ward", "Pyote")
+    expected = ProximityGeocoder(roads_file, memo_size=0).geocode_proximity(
+        "CR 426", "CR 432", "Ward", "Pyote"
+    )
+    assert result.to_dict() == expected.to_dict()
+    assert sorted(geocoder.roads.index) == [2, 3]
+
+    result = geocoder.geocode_proximity("I-20", "FM 1788", "Ward", "Pyote")
+    assert result.approach == "corridor_midpoint"
+    assert sorted(geocoder.roads.index) == [0, 1, 2, 3, 4]
+    assert geocoder.shared.stats()["materialized"] == 5
+
+
+def test_shared_network_rejects_region(roads_file):
+    with pytest.raises(ValueError):
+        ProximityGeocoder(
+            roads_file, shared_network=roads_file.with_suffix(".shared"),
+            region_bounds=(-103.2, 31.4, -103.0, 31.6),
+        )
+
+
+def test_workers_attach_read_only(roads_file):
+    shared_path = build_shared_network(roads_file)
+    network = SharedRoadNetwork.open(roads_file, shared_path)
+    with pytest.raises(ValueError):
+        network.coords[0, 0] = 0.0
+    assert all(os.access(p, os.R_OK) for p in shared_path.iterdir())
+    assert np.isfinite(network.endpoints()[0]).all()
+
+
+def test_network_graph_is_mapped_from_shared_files(roads_file):
+    shared_path = build_shared_network(roads_file, graph=True)
+    network = SharedRoadNetwork.open(roads_file, shared_path)
+    projection = MetricProjection.for_bounds(network.bounds, network.crs)
+
+    mapped = network.graph(projection)
+    built = network.build_graph(projection)
+    for name in ("node_xy", "segment_nodes", "indptr", "neighbors", "weights", "edge_segments"):
+        np.testing.assert_array_equal(getattr(mapped, name), getattr(built, name))
+    with pytest.raises(ValueError):
+        mapped.weights[0] = 0.0  # Read-only view of the mapping
+    assert network.graph(MetricProjection("EPSG:32614")) is None
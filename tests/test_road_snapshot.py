@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+test_road_snapshot.py
+
+Tests for the memory-mapped road network snapshot loaded by the geocoders.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import LineString
+
+# tools/geocoding isn't a package; add it to the path like the stages do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tools" / "geocoding"))
+
+pytest.importorskip("pyarrow")
+
+import road_snapshot
+from road_index import RoadNameIndex
+from road_snapshot import (
+    build_snapshot, file_fingerprint, index_path_for, load_roads, load_snapshot, read_gpkg_roads,
+    snapshot_path_for,
+)
+from proximity_geocoder import ProximityGeocoder
+
+
+ROADS = [
+    ("Interstate 20", "I-20", "Interstate"),
+    ("County Road 426", "CR 426", "CR"),
+    ("County Road 432", "CR  432", "CR"),
+    ("Farm-to-Market Road 1788", "FM-1788", "FM"),
+    ("Lakeview Drive", None, "OTHER"),
+    (None, "CR 516", "CR"),
+]
+
+
+def _write_roads(path, roads=ROADS):
+    gdf = gpd.GeoDataFrame(
+        {
+            "road_name": [r[0] for r in roads],
+            "road_ref": [r[1] for r in roads],
+            "road_type": [r[2] for r in roads],
+        },
+        geometry=[
+            LineString([(-103.2 + i * 0.03, 31.45), (-103.2 + i * 0.03, 31.6)])
+            for i in range(len(roads))
+        ],
+        crs="EPSG:4326",
+    )
+    gdf.to_file(path, layer="roads", driver="GPKG")
+    return path
+
+
+@pytest.fixture
+def roads_file(tmp_path):
+    return _write_roads(tmp_path / "roads.gpkg")
+
+
+def test_snapshot_round_trip(roads_file):
+    snapshot = build_snapshot(roads_file)
+    assert snapshot == snapshot_path_for(roads_file)
+    assert snapshot.name == "roads.snapshot.arrow"
+    assert index_path_for(snapshot).name == "roads.snapshot.index.arrow"
+
+    roads, index = load_snapshot(roads_file)
+    expected = read_gpkg_roads(roads_file)
+
+    assert list(roads.columns) == list(expected.columns)
+    assert roads.crs == expected.crs
+    assert roads.drop(columns="geometry").equals(expected.drop(columns="geometry"))
+    assert all(a.equals_exact(b, 0) for a, b in zip(roads.geometry, expected.geometry))
+    assert index.roads is roads
+    assert len(index.positions("CR 426")) > 0
+
+
+def test_snapshot_index_matches_rebuilt_index(roads_file):
+    build_snapshot(roads_file)
+    roads, index = load_snapshot(roads_file)
+    rebuilt = RoadNameIndex(roads)
+
+    assert index.roads is roads
+    for key in ["I 20", "CR 432", "FM 1788", "LAKEVIEW DRIVE", "CR 516", "FM 999"]:
+        assert list(index.positions(key)) == list(rebuilt.positions(key))
+    for patterns in (["COUNTY", "42"], ["LAKE"], ["1788"], ["ZZZ"]):
+        assert list(index.positions_containing(patterns)) == list(rebuilt.positions_containing(patterns))
+
+
+def test_stale_snapshot_is_ignored(roads_file):
+    build_snapshot(roads_file)
+    _write_roads(roads_file, ROADS[:3])
+
+    assert load_snapshot(roads_file) is None
+    roads, index = load_roads(roads_file)
+    assert len(roads) == 3
+    assert index.select("FM 1788") is None
+
+
+def test_touched_but_identical_gpkg_keeps_snapshot(roads_file, monkeypatch):
+    build_snapshot(roads_file)
+    stat = roads_file.stat()
+    os.utime(roads_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    hashed = []
+
+    def fingerprint(path):
+        hashed.append(path)
+        return file_fingerprint(path)
+
+    monkeypatch.setattr(road_snapshot, "file_fingerprint", fingerprint)
+    assert load_snapshot(roads_file) is not None
+    assert len(hashed) == 1  # Both snapshot files checked with one hash
+
+    # The new mtime was recorded: a fresh process does not hash again
+    road_snapshot._FINGERPRINTS.clear()
+    assert load_snapshot(roads_file) is not None
+    assert len(hashed) == 1
+
+
+def test_geocoder_results_identical_with_snapshot(roads_file):
+    without = ProximityGeocoder(roads_file, memo_size=0)
+    build_snapshot(roads_file)
+    with_snapshot = ProximityGeocoder(roads_file, memo_size=0)
+
+    for street, intersection in [("CR 426", "CR 432"), ("I-20", "FM 1788"), ("Lakeview Dr", "I-20")]:
+        a = without.geocode_proximity(street, intersection, "Ward", "Pyote")
+        b = with_snapshot.geocode_proximity(street, intersection, "Ward", "Pyote")
+        assert a.to_dict() == b.to_dict()
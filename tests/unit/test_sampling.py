@@ -0,0 +1,191 @@
+"""
+Unit tests for stratified sampling and sampled maintenance estimates.
+"""
+
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kcci_maintenance.utils.sampling import (
+    StratifiedSampler,
+    estimate_leg_totals,
+    progressive_sample,
+    ticket_stratum,
+)
+from kcci_maintenance.utils.maintenance_estimate import MaintenanceEstimateGenerator
+
+
+@pytest.fixture
+def population():
+    """2000 tickets across 2 counties, 2 ticket types and 2 years."""
+    rng = np.random.default_rng(7)
+    tickets = []
+    for i in range(2000):
+        county = "Ward" if i % 3 else "Winkler"
+        tickets.append({
+            "ticket_number": f"T{i:05d}",
+            "county": county,
+            "ticket_type": "Emergency" if i % 10 == 0 else "Normal",
+            "creation": f"{2023 + i % 2}-03-15",
+            # Leg 1 is much denser in Winkler
+            "_leg": "Leg 1" if rng.random() < (0.6 if county == "Winkler" else 0.1) else "Unassigned",
+        })
+    return tickets
+
+
+def test_ticket_stratum_uses_creation_year_and_fallbacks():
+    ticket = {"ticket_number": "1", "county": None, "_source_county": "Ward",
+              "ticket_type": "Normal", "creation": "2024-07-01"}
+    assert ticket_stratum(ticket) == ("WARD", "NORMAL", "2024")
+
+    ticket = {"ticket_number": "2", "county": "Winkler", "ticket_type": "Emergency",
+              "creation": None, "_source_year": 2023}
+    assert ticket_stratum(ticket) == ("WINKLER", "EMERGENCY", "2023")
+
+
+def test_draw_is_proportional_and_covers_every_stratum(population):
+    sampler = StratifiedSampler(population, seed=1)
+    drawn = sampler.draw(200)
+
+    assert len(drawn) == 200
+    assert len({t["ticket_number"] for t in drawn}) == 200
+
+    sizes = sampler.sample.sample_sizes
+    assert set(sizes) == set(sampler.sample.population_sizes)
+    for key, n in sizes.items():
+        expected = 200 * sampler.sample.population_sizes[key] / len(population)
+        assert n >= 2
+        assert abs(n - expected) <= 2
+
+
+def test_draw_extends_existing_sample(population):
+    sampler = StratifiedSampler(population, seed=1)
+    first = {t["ticket_number"] for t in sampler.draw(100)}
+    second = {t["ticket_number"] for t in sampler.draw(100)}
+
+    assert not first & second
+    assert sampler.sample.size == 200
+
+
+def test_same_seed_gives_same_sample(population):
+    a = StratifiedSampler(population, seed=3).draw(50)
+    b = StratifiedSampler(population, seed=3).draw(50)
+    assert [t["ticket_number"] for t in a] == [t["ticket_number"] for t in b]
+
+
+def test_full_census_is_exact_with_zero_width(population):
+    sampler = StratifiedSampler(population, seed=1)
+    drawn = sampler.draw(len(population))
+    assert sampler.exhausted
+
+    observed = pd.Series([t["ticket_number"] for t in drawn])
+    legs = pd.Series({t["ticket_number"]: t["_leg"] for t in drawn})
+    estimate = estimate_leg_totals(observed, legs, sampler.sample, ["Leg 1"])
+
+    row = estimate.set_index("Route Leg").loc["Leg 1"]
+    assert row["Estimated Tickets"] == sum(t["_leg"] == "Leg 1" for t in population)
+    assert row["CI Low"] == row["CI High"] == row["Estimated Tickets"]
+
+
+def test_interval_covers_true_total(population):
+    truth = sum(t["_leg"] == "Leg 1" for t in population)
+    sampler = StratifiedSampler(population, seed=11)
+    drawn = sampler.draw(400)
+
+    observed = pd.Series([t["ticket_number"] for t in drawn])
+    legs = pd.Series({t["ticket_number"]: t["_leg"] for t in drawn})
+    estimate = estimate_leg_totals(observed, legs, sampler.sample, ["Leg 1"], years_span=2.0)
+
+    row = estimate.set_index("Route Leg").loc["Leg 1"]
+    assert row["CI Low"] <= truth <= row["CI High"]
+    assert row["Estimated Annual Tickets"] == pytest.approx(row["Estimated Tickets"] / 2, abs=0.1)
+
+
+def test_progressive_sample_stops_at_target(population):
+    sampler = StratifiedSampler(population, seed=5)
+    observed = []
+
+    def evaluate(new_tickets):
+        observed.extend(new_tickets)
+        numbers = pd.Series([t["ticket_number"] for t in observed])
+        legs = pd.Series({t["ticket_number"]: t["_leg"] for t in observed})
+        return estimate_leg_totals(numbers, legs, sampler.sample, ["Leg 1"])
+
+    estimate = progressive_sample(
+        sampler, evaluate, initial_size=50, step_size=100, target_relative_half_width=0.15,
+    )
+
+    overall = estimate.set_index("Route Leg").loc["All Legs"]
+    assert overall["Relative Half-Width"] <= 0.15
+    assert 50 < sampler.sample.size < len(population)
+
+
+def _write_kmz(path):
+    kml = """<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2"><Document>
+<Placemark><name>Leg 1</name><LineString><coordinates>
+-103.10,31.50,0 -103.00,31.50,0
+</coordinates></LineString></Placemark>
+</Document></kml>"""
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("doc.kml", kml)
+
+
+def test_generate_estimate_with_sample_extrapolates_leg_counts(population, tmp_path):
+    kmz_path = tmp_path / "route.kmz"
+    _write_kmz(kmz_path)
+    generator = MaintenanceEstimateGenerator(kmz_path=kmz_path)
+
+    sampler = StratifiedSampler(population, seed=2)
+    drawn = sampler.draw(300)
+    rows = []
+    for t in drawn:
+        on_leg = t["_leg"] == "Leg 1"
+        rows.append({
+            "ticket_number": t["ticket_number"],
+            "latitude": 31.5001 if on_leg else 32.5,
+            "longitude": -103.05,
+            "ticket_type": t["ticket_type"],
+            "Creation": t["creation"],
+            "confidence": 0.9,
+        })
+    sample_df = pd.DataFrame(rows)
+
+    output_path = tmp_path / "estimate.xlsx"
+    generator.generate_estimate(sample_df, output_path, sample=sampler.sample)
+
+    sheets = pd.read_excel(output_path, sheet_name=None)
+    assert "Sample Estimate" in sheets
+
+    estimate = sheets["Sample Estimate"].set_index("Route Leg").loc["Leg 1"]
+    leg_details = sheets["Leg Details"].set_index("Route Leg").loc["Leg 1"]
+    # Leg Details shows the same extrapolated annual count as the interval table
+    assert leg_details["Total Tickets"] == pytest.approx(estimate["Estimated Annual Tickets"], abs=1)
+    assert leg_details["Total Tickets"] > len(sample_df)
+
+
+def test_generate_estimate_uses_population_years_span(population, tmp_path):
+    kmz_path = tmp_path / "route.kmz"
+    _write_kmz(kmz_path)
+    generator = MaintenanceEstimateGenerator(kmz_path=kmz_path)
+
+    sampler = StratifiedSampler(population, seed=2)
+    sample_df = pd.DataFrame([{
+        "ticket_number": t["ticket_number"], "latitude": 31.5001, "longitude": -103.05,
+        "ticket_type": t["ticket_type"], "Creation": t["creation"], "confidence": 0.9,
+    } for t in sampler.draw(300)])
+
+    # The sample's own dates span about a year; the population's span is passed in
+    totals = {}
+    for years_span in (None, 4.0):
+        output_path = tmp_path / f"estimate_{years_span}.xlsx"
+        generator.generate_estimate(sample_df, output_path, sample=sampler.sample, years_span=years_span)
+        sheets = pd.read_excel(output_path, sheet_name=None)
+        leg_details = sheets["Leg Details"].set_index("Route Leg").loc["Leg 1"]
+        estimate = sheets["Sample Estimate"].set_index("Route Leg").loc["Leg 1"]
+        assert leg_details["Total Tickets"] == pytest.approx(estimate["Estimated Annual Tickets"], abs=1)
+        totals[years_span] = leg_details["Total Tickets"]
+
+    assert totals[4.0] == pytest.approx(totals[None] / 4, rel=0.01)